@@ -36,9 +36,85 @@ entries (ACEs).
 ACE models a single access control entry (ACE)
 Standard_ACE is a convenience class for modelling standard ACEs for standard
 ACLs.
+
+Functions:
+parse_ipv4(address) converts an IPv4 address to a 32 bit integer.
+format_ipv4(value) converts a 32 bit integer to a dotted quad string.
+wildcard_prefixlen(wildcard) returns the prefix length matching a wildcard.
+
+ACEs store IPv4 addresses and wildcards as 32 bit integers. The getters
+returning ipaddress.IPv4Address objects are kept for compatibility, the
+*_int getters avoid creating objects when processing large ACLs.
 """
 
 import ipaddress
+import re
+
+_ALL_ONES = 0xffffffff
+# an octet of a dotted quad, ASCII digits without leading zeros like ipaddress
+_OCTET_REGEX = re.compile(r'(0|[1-9][0-9]{0,2})\Z')
+
+
+def parse_ipv4(address):
+    """Return the IPv4 address as 32 bit integer, or None if invalid.
+
+    The address can be given as dotted quad string, ipaddress.IPv4Address,
+    or integer.
+
+    >>> parse_ipv4('192.0.2.1')
+    3221225985
+    >>> parse_ipv4('192.0.2.256') is None
+    True
+    >>> parse_ipv4('192.0.2.01') is None
+    True
+    >>> parse_ipv4(ipaddress.IPv4Address('0.0.0.1'))
+    1
+    """
+    if type(address) is int:
+        return address if 0 <= address <= _ALL_ONES else None
+    if isinstance(address, ipaddress.IPv4Address):
+        return int(address)
+    if not isinstance(address, str):
+        return None
+    octets = address.split('.')
+    if len(octets) != 4:
+        return None
+    value = 0
+    for octet in octets:
+        if not _OCTET_REGEX.match(octet):
+            return None
+        n = int(octet)
+        if n > 255:
+            return None
+        value = value << 8 | n
+    return value
+
+
+def format_ipv4(value):
+    """Return the 32 bit integer as dotted quad IPv4 address.
+
+    >>> format_ipv4(3221225985)
+    '192.0.2.1'
+    """
+    return '%d.%d.%d.%d' % (value >> 24, value >> 16 & 255, value >> 8 & 255,
+                            value & 255)
+
+
+def wildcard_prefixlen(wildcard):
+    """Return the prefix length of a contiguous wildcard, None otherwise.
+
+    >>> wildcard_prefixlen(parse_ipv4('0.0.0.255'))
+    24
+    >>> wildcard_prefixlen(parse_ipv4('0.255.0.255')) is None
+    True
+    """
+    if wildcard & (wildcard + 1):
+        return None
+    return 32 - wildcard.bit_length()
+
+
+def _ipv4_address(value):
+    return None if value is None else ipaddress.IPv4Address(value)
 
 
 class ACL:
@@ -54,13 +130,19 @@ class ACL:
         self._number = self._convert_and_validate(number)
         self._name = name
         self._entries = []
+        # keys of the entries, used to detect duplicate ACEs
+        self._entry_keys = set()
         self._surplus_params = ''
 
     def __eq__(self, other):
         if self is other:
             return True
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            # the entry keys are derived from the entries
+            return ({k: v for k, v in self.__dict__.items()
+                     if k != '_entry_keys'} ==
+                    {k: v for k, v in other.__dict__.items()
+                     if k != '_entry_keys'})
         return False
 
     def _convert_and_validate(self, number):
@@ -118,6 +200,13 @@ class ACL:
         """Get the list of ACEs comprising the ACL."""
         return self._entries
 
+    def set_entries(self, entries):
+        """Replace the ACEs comprising the ACL, ignoring duplicates."""
+        self._entries = []
+        self._entry_keys = set()
+        for ace in entries:
+            self.add_ace(ace)
+
     def add_entry(self, number=None, action=None, protocol=None, source=None,
                   source_op=None, source_port=None, dest=None, dest_op=None,
                   dest_port=None):
@@ -125,11 +214,16 @@ class ACL:
         new_ace = ACE(number, action, protocol, source, source_op, source_port,
                       dest, dest_op, dest_port)
         self._entries.append(new_ace)
+        self._entry_keys.add(new_ace.key())
 
     def add_ace(self, ace):
-        """Add an existing ACE object to the ACL."""
-        if isinstance(ace, ACE) and ace not in self._entries:
+        """Add an existing ACE object to the ACL, ignoring duplicates."""
+        if not isinstance(ace, ACE):
+            return
+        key = ace.key()
+        if key not in self._entry_keys:
             self._entries.append(ace)
+            self._entry_keys.add(key)
 
     @staticmethod
     def is_supported_type(type):
@@ -144,6 +238,10 @@ class ACE:
     _ALLOWED_PROTOCOLS = ['ip', 'udp', 'tcp', 'icmp', 'igmp']
     _ALLOWED_OPS = ['eq']
 
+    __slots__ = ('_number', '_action', '_protocol', '_source', '_source_mask',
+                 '_source_op', '_source_port', '_dest', '_dest_mask',
+                 '_dest_op', '_dest_port')
+
     def __init__(self, number=None, action=None, protocol=None, source=None,
                  source_mask=None, source_op=None, source_port=None, dest=None,
                  dest_mask=None, dest_op=None, dest_port=None):
@@ -151,12 +249,12 @@ class ACE:
         self._number = self._convert_and_validate_ace_number(number)
         self._action = action
         self._protocol = protocol
-        self._source = source
-        self._source_mask = source_mask
+        self._source = parse_ipv4(source)
+        self._source_mask = parse_ipv4(source_mask)
         self._source_op = source_op
         self._source_port = source_port
-        self._dest = dest
-        self._dest_mask = dest_mask
+        self._dest = parse_ipv4(dest)
+        self._dest_mask = parse_ipv4(dest_mask)
         self._dest_op = dest_op
         self._dest_port = dest_port
 
@@ -164,9 +262,24 @@ class ACE:
         if self is other:
             return True
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return (all(getattr(self, a) == getattr(other, a)
+                        for a in ACE.__slots__) and
+                    getattr(self, '__dict__', None) ==
+                    getattr(other, '__dict__', None))
         return NotImplemented
 
+    def key(self):
+        """Return a hashable key, equal ACEs have equal keys.
+
+        ACEs are mutable, thus the key must not be kept after changing
+        the ACE.
+        """
+        key = tuple([getattr(self, a) for a in ACE.__slots__])
+        extra = getattr(self, '__dict__', None)
+        if extra:
+            key += tuple(sorted(extra.items()))
+        return key
+
     def _convert_and_validate_ace_number(self, number):
         try:
             n = int(number)
@@ -178,11 +291,7 @@ class ACE:
 
     @staticmethod
     def is_valid_ip_address(ip):
-        try:
-            ip = ipaddress.IPv4Address(ip)
-        except:
-            return False
-        return True
+        return parse_ipv4(ip) is not None
 
     @staticmethod
     def _is_port_number(n):
@@ -217,10 +326,12 @@ class ACE:
         desc += 'number=' + str(self._number)
         desc += ', action=' + str(self._action)
         desc += ', proto=' + str(self._protocol)
-        desc += ', source=' + str(self._source) + '/' + str(self._source_mask)
+        desc += (', source=' + str(_ipv4_address(self._source)) + '/' +
+                 str(_ipv4_address(self._source_mask)))
         desc += ', s_op=' + str(self._source_op)
         desc += ', s_port=' + str(self._source_port)
-        desc += ', dest=' + str(self._dest) + '/' + str(self._dest_mask)
+        desc += (', dest=' + str(_ipv4_address(self._dest)) + '/' +
+                 str(_ipv4_address(self._dest_mask)))
         desc += ', d_op=' + str(self._dest_op)
         desc += ', d_port=' + str(self._dest_port)
         desc += '}'
@@ -258,42 +369,47 @@ class ACE:
             self._protocol = str(prot)
         return self._protocol
 
-    def _is_ip_address(self, ip):
-        try:
-            ip = ipaddress.IPv4Address(ip)
-        except:
-            return False
-        return True
-
     def get_source(self):
         """Get the ACE's source address."""
+        return _ipv4_address(self._source)
+
+    def get_source_int(self):
+        """Get the ACE's source address as integer."""
         return self._source
 
     def set_source(self, source):
         """Set the ACE's source address."""
-        if self._is_ip_address(source):
-            self._source = ipaddress.IPv4Address(source)
-        return self._source
+        value = parse_ipv4(source)
+        if value is not None:
+            self._source = value
+        return _ipv4_address(self._source)
 
     def get_source_mask(self):
         """Get the ACE's source wildcard."""
-        return self._source_mask
+        return _ipv4_address(self._source_mask)
 
-    def _invert_ipv4_address(self, address):
-        inv_address = bytes([b ^ 0xff for b in address.packed])
-        return ipaddress.IPv4Address(inv_address)
+    def get_source_mask_int(self):
+        """Get the ACE's source wildcard as integer."""
+        return self._source_mask
 
     def get_source_mask_inverted(self):
         """Get the ACE's source standard mask."""
-        if self._source_mask:
-            return self._invert_ipv4_address(self._source_mask)
+        if self._source_mask is not None:
+            return ipaddress.IPv4Address(self._source_mask ^ _ALL_ONES)
+        return None
+
+    def get_source_prefixlen(self):
+        """Get the prefix length of the source wildcard (None if none)."""
+        if self._source_mask is not None:
+            return wildcard_prefixlen(self._source_mask)
         return None
 
     def set_source_mask(self, source_mask):
         """Set the ACE's source wildcard."""
-        if self._is_ip_address(source_mask):
-            self._source_mask = ipaddress.IPv4Address(source_mask)
-        return self._source_mask
+        value = parse_ipv4(source_mask)
+        if value is not None:
+            self._source_mask = value
+        return _ipv4_address(self._source_mask)
 
     def get_source_op(self):
         """Get the ACE's source address operator."""
@@ -317,29 +433,45 @@ class ACE:
 
     def get_dest(self):
         """Get the ACE's destination address."""
+        return _ipv4_address(self._dest)
+
+    def get_dest_int(self):
+        """Get the ACE's destination address as integer."""
         return self._dest
 
     def set_dest(self, dest):
         """Set the ACE's destination address."""
-        if self._is_ip_address(dest):
-            self._dest = ipaddress.IPv4Address(dest)
-        return self._dest
+        value = parse_ipv4(dest)
+        if value is not None:
+            self._dest = value
+        return _ipv4_address(self._dest)
 
     def get_dest_mask(self):
         """Get the ACE's dest wildcard."""
+        return _ipv4_address(self._dest_mask)
+
+    def get_dest_mask_int(self):
+        """Get the ACE's dest wildcard as integer."""
         return self._dest_mask
 
     def get_dest_mask_inverted(self):
         """Get the ACE's destination standard mask."""
-        if self._dest_mask:
-            return self._invert_ipv4_address(self._dest_mask)
+        if self._dest_mask is not None:
+            return ipaddress.IPv4Address(self._dest_mask ^ _ALL_ONES)
+        return None
+
+    def get_dest_prefixlen(self):
+        """Get the prefix length of the dest wildcard (None if none)."""
+        if self._dest_mask is not None:
+            return wildcard_prefixlen(self._dest_mask)
         return None
 
     def set_dest_mask(self, dest_mask):
         """Set the ACE's destination address wildcard mask."""
-        if self._is_ip_address(dest_mask):
-            self._dest_mask = ipaddress.IPv4Address(dest_mask)
-        return self._dest_mask
+        value = parse_ipv4(dest_mask)
+        if value is not None:
+            self._dest_mask = value
+        return _ipv4_address(self._dest_mask)
 
     def get_dest_op(self):
         """Get the ACE's destination address operator."""
@@ -372,9 +504,15 @@ class Standard_ACE(ACE):
 
     """Convenience class for standard ACEs."""
 
+    __slots__ = ()
+
     def __init__(self, number=None, action=None, source=None,
                  source_mask=None):
         super().__init__(number=number, action=action, protocol='ip',
                          source=source, source_mask=source_mask)
 
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
+
 # vim:filetype=python:expandtab:shiftwidth=4:tabstop=4
@@ -0,0 +1,326 @@
+# CDDL HEADER START
+#
+# The contents of this file are subject to the terms
+# of the Common Development and Distribution License
+# (the "License").  You may not use this file except
+# in compliance with the License.
+#
+# You can obtain a copy of the license at
+# LICENSE.txt or http://opensource.org/licenses/CDDL-1.0.
+# See the License for the specific language governing
+# permissions and limitations under the License.
+#
+# When distributing Covered Code, include this CDDL
+# HEADER in each file and include the License file at
+# LICENSE.txt  If applicable,
+# add the following below this CDDL HEADER, with the
+# fields enclosed by brackets "[]" replaced with your
+# own identifying information: Portions Copyright [yyyy]
+# [name of copyright owner]
+#
+# CDDL HEADER END
+
+# Copyright 2014-2017 Extreme Networks, Inc.  All rights reserved.
+# Use is subject to license terms.
+
+# This file is part of e2x (translate EOS switch configuration to ExtremeXOS)
+
+"""Optimize layer 3 ACLs before writing them to the target switch.
+
+Large ACLs often contain entries that never match a packet, because an
+earlier entry already matches all of its packets, or entries that do not
+change the result of the ACL. Every entry uses resources (e.g. TCAM slots)
+on the target switch, thus removing or merging such entries is worthwhile.
+
+The optimization preserves first-match semantics including the implicit
+deny at the end of an ACL:
+
+1. Shadowed entries, i.e. entries whose packets are all matched by a single
+   earlier entry, are removed (this includes duplicates).
+2. Redundant entries are removed. An entry is redundant if a later entry
+   with the same action matches all of its packets and no entry in between
+   with a different action matches any of them. A deny entry not
+   intersecting any later entry is covered by the implicit deny.
+3. Adjacent entries that differ only in one address prefix are merged into
+   one entry with a shorter prefix, if both prefixes combine into one.
+
+Entries are compared using the packets they match in the XOS policy
+written for them, e.g. an address without a wildcard matches any address.
+
+Entries are looked up in an index of their source address prefixes, so
+large ACLs of mostly distinct prefixes are optimized in roughly linear time.
+
+Functions:
+optimize_acl(acl) optimizes an ACL in place and returns messages.
+"""
+
+import bisect
+
+import ACL
+from Messages import Message
+
+_ALL_ONES = 0xffffffff
+_ANY_ADDRESS = (0, _ALL_ONES)
+_PROTOCOL_NUMBERS = {'icmp': '1', 'igmp': '2', 'tcp': '6', 'udp': '17'}
+
+
+class _Entry:
+
+    """An ACE with the set of packets it matches and its position.
+
+    The protocol and ports are None if any value matches, addresses are
+    (address, wildcard) tuples with the wildcard bits of the address
+    cleared.
+    """
+
+    __slots__ = ('ace', 'position', 'label', 'action', 'protocol', 'source',
+                 'source_port', 'dest', 'dest_port')
+
+    def __init__(self, ace, position):
+        self.ace = ace
+        self.position = position
+        self.label = str(position)
+        self.action = ace.get_action()
+        protocol = ace.get_protocol()
+        if not protocol or protocol == 'ip':
+            self.protocol = None
+        else:
+            self.protocol = _PROTOCOL_NUMBERS.get(str(protocol),
+                                                  str(protocol))
+        self.source = _address(ace.get_source_int(), ace.get_source_mask_int())
+        self.source_port = _port(ace.get_source_op(), ace.get_source_port())
+        self.dest = _address(ace.get_dest_int(), ace.get_dest_mask_int())
+        self.dest_port = _port(ace.get_dest_op(), ace.get_dest_port())
+
+    def covers(self, other):
+        """Return True if this entry matches every packet other matches."""
+        return (_value_covers(self.protocol, other.protocol) and
+                _value_covers(self.source_port, other.source_port) and
+                _value_covers(self.dest_port, other.dest_port) and
+                _address_covers(self.source, other.source) and
+                _address_covers(self.dest, other.dest))
+
+    def intersects(self, other):
+        """Return True if a packet exists that both entries match."""
+        return (_value_intersects(self.protocol, other.protocol) and
+                _value_intersects(self.source_port, other.source_port) and
+                _value_intersects(self.dest_port, other.dest_port) and
+                _address_intersects(self.source, other.source) and
+                _address_intersects(self.dest, other.dest))
+
+
+class _SourceIndex:
+
+    """Index of entries by source address prefix.
+
+    The lookups return a superset of the entries covering resp. intersecting
+    a given source address, the caller needs to check the candidates.
+    """
+
+    def __init__(self):
+        # wildcard -> (entries by network, sorted list of networks)
+        self._prefixes = {}
+        # entries with a non-contiguous source wildcard
+        self._others = []
+
+    def add(self, entry):
+        address, wildcard = entry.source
+        if ACL.wildcard_prefixlen(wildcard) is None:
+            self._others.append(entry)
+            return
+        networks, ordered = self._prefixes.setdefault(wildcard, ({}, []))
+        entries = networks.get(address)
+        if entries is None:
+            entries = networks[address] = []
+            bisect.insort(ordered, address)
+        entries.append(entry)
+
+    def containing(self, source):
+        """Yield the entries whose source may contain source."""
+        address, wildcard = source
+        for prefix_wildcard, (networks, _) in self._prefixes.items():
+            if wildcard & ~prefix_wildcard == 0:
+                network = address & ~prefix_wildcard & _ALL_ONES
+                yield from networks.get(network, ())
+        yield from self._others
+
+    def intersecting(self, source):
+        """Yield the entries whose source may intersect source."""
+        address, wildcard = source
+        contiguous = ACL.wildcard_prefixlen(wildcard) is not None
+        for prefix_wildcard, (networks, ordered) in self._prefixes.items():
+            if wildcard & ~prefix_wildcard == 0:
+                network = address & ~prefix_wildcard & _ALL_ONES
+                yield from networks.get(network, ())
+            elif contiguous:
+                # indexed prefixes are longer, find those inside source
+                low = bisect.bisect_left(ordered, address)
+                high = bisect.bisect_right(ordered, address | wildcard)
+                for network in ordered[low:high]:
+                    yield from networks[network]
+            else:
+                for entries in networks.values():
+                    yield from entries
+        yield from self._others
+
+
+def _first(entries):
+    return min(entries, key=lambda e: e.position, default=None)
+
+
+def _address(address, wildcard):
+    if address is None or wildcard is None:
+        return _ANY_ADDRESS
+    return (address & ~wildcard & _ALL_ONES, wildcard)
+
+
+def _port(op, port):
+    if op != 'eq' or port is None:
+        return None
+    return int(port)
+
+
+def _value_covers(outer, inner):
+    return outer is None or outer == inner
+
+
+def _value_intersects(a, b):
+    return a is None or b is None or a == b
+
+
+def _address_covers(outer, inner):
+    return (inner[1] & ~outer[1] == 0 and
+            (outer[0] ^ inner[0]) & ~outer[1] == 0)
+
+
+def _address_intersects(a, b):
+    return (a[0] ^ b[0]) & ~a[1] & ~b[1] == 0
+
+
+def _merged_prefix(a, b):
+    """Return the address combining prefixes a and b, or None."""
+    wildcard = a[1]
+    if wildcard != b[1] or wildcard == _ALL_ONES:
+        return None
+    if ACL.wildcard_prefixlen(wildcard) is None:
+        return None
+    bit = wildcard + 1
+    if a[0] ^ b[0] != bit:
+        return None
+    return (a[0] & ~bit, wildcard | bit)
+
+
+def _merge(first, second):
+    """Return an entry matching the packets of both entries, or None."""
+    if (first.action != second.action or
+            first.protocol != second.protocol or
+            first.source_port != second.source_port or
+            first.dest_port != second.dest_port):
+        return None
+    source, dest = first.source, first.dest
+    if first.dest == second.dest:
+        source = _merged_prefix(first.source, second.source)
+    elif first.source == second.source:
+        dest = _merged_prefix(first.dest, second.dest)
+    else:
+        return None
+    if source is None or dest is None:
+        return None
+    ace = first.ace
+    # keep an unchanged address as is, e.g. no address for any address
+    if source is first.source:
+        source = (ace.get_source_int(), ace.get_source_mask_int())
+    if dest is first.dest:
+        dest = (ace.get_dest_int(), ace.get_dest_mask_int())
+    merged = ACL.ACE(ace.get_number(), ace.get_action(), ace.get_protocol(),
+                     source[0], source[1], ace.get_source_op(),
+                     ace.get_source_port(), dest[0], dest[1],
+                     ace.get_dest_op(), ace.get_dest_port())
+    return _Entry(merged, first.position)
+
+
+def _remove_shadowed(entries, acl_desc, messages):
+    kept, index = [], _SourceIndex()
+    for entry in entries:
+        shadow = _first(k for k in index.containing(entry.source)
+                        if k.covers(entry))
+        if shadow is None:
+            kept.append(entry)
+            index.add(entry)
+        else:
+            messages.append(Message('INFO', '{}: Removed entry {}, shadowed'
+                                    ' by entry {}', acl_desc, entry.label,
+                                    shadow.label))
+    return kept
+
+
+def _remove_redundant(entries, acl_desc, messages):
+    # the index contains the later entries that are kept
+    kept, index = [], _SourceIndex()
+    for i in range(len(entries) - 1, -1, -1):
+        entry = entries[i]
+        cover = _first(k for k in index.containing(entry.source)
+                       if k.action == entry.action and k.covers(entry))
+        conflict = _first(k for k in index.intersecting(entry.source)
+                          if k.action != entry.action and
+                          k.intersects(entry))
+        removal = None
+        if cover and (conflict is None or cover.position < conflict.position):
+            removal = Message('INFO', '{}: Removed redundant entry {}, '
+                             'covered by entry {}', acl_desc, entry.label,
+                             cover.label)
+        elif conflict is None and entry.action == 'deny' and (i or kept):
+            # the implicit deny covers the entry, but keep one entry
+            removal = Message('INFO', '{}: Removed redundant entry {}, '
+                             'covered by the implicit deny', acl_desc,
+                             entry.label)
+        if removal is not None:
+            messages.append(removal)
+        else:
+            kept.append(entry)
+            index.add(entry)
+    kept.reverse()
+    return kept
+
+
+def _merge_adjacent(entries, acl_desc, messages):
+    merged = []
+    for entry in entries:
+        while merged:
+            combined = _merge(merged[-1], entry)
+            if combined is None:
+                break
+            messages.append(Message('INFO', '{}: Merged entry {} into entry'
+                                    ' {}', acl_desc, entry.label,
+                                    merged[-1].label))
+            merged.pop()
+            entry = combined
+        merged.append(entry)
+    return merged
+
+
+def optimize_acl(acl):
+    """Remove and merge redundant entries of acl in place.
+
+    Return a list of messages describing the changes.
+    """
+    messages = []
+    aces = acl.get_entries()
+    if not aces:
+        return messages
+    if acl.get_number() is not None:
+        acl_desc = 'ACL "' + str(acl.get_number()) + '"'
+    else:
+        acl_desc = 'ACL "' + str(acl.get_name()) + '"'
+    entries = [_Entry(ace, pos) for pos, ace in enumerate(aces, 1)]
+    entries = _remove_shadowed(entries, acl_desc, messages)
+    entries = _remove_redundant(entries, acl_desc, messages)
+    entries = _merge_adjacent(entries, acl_desc, messages)
+    if len(entries) < len(aces):
+        acl.set_entries([entry.ace for entry in entries])
+        messages.append('NOTICE: Optimized ' + acl_desc + ' from ' +
+                        str(len(aces)) + ' to ' + str(len(entries)) +
+                        ' entries')
+    return messages
+
+# vim:filetype=python:expandtab:shiftwidth=4:tabstop=4
@@ -0,0 +1,123 @@
+# CDDL HEADER START
+#
+# The contents of this file are subject to the terms
+# of the Common Development and Distribution License
+# (the "License").  You may not use this file except
+# in compliance with the License.
+#
+# You can obtain a copy of the license at
+# LICENSE.txt or http://opensource.org/licenses/CDDL-1.0.
+# See the License for the specific language governing
+# permissions and limitations under the License.
+#
+# When distributing Covered Code, include this CDDL
+# HEADER in each file and include the License file at
+# LICENSE.txt  If applicable,
+# add the following below this CDDL HEADER, with the
+# fields enclosed by brackets "[]" replaced with your
+# own identifying information: Portions Copyright [yyyy]
+# [name of copyright owner]
+#
+# CDDL HEADER END
+
+# Copyright 2014-2017 Extreme Networks, Inc.  All rights reserved.
+# Use is subject to license terms.
+
+# This file is part of e2x (translate EOS switch configuration to ExtremeXOS)
+
+"""Translate many configurations concurrently using asyncio.
+
+This module uses coroutines and asynchronous generators, it is imported
+on demand only, keeping the core module usable with older Python versions.
+Every job is translated by CM.translate_job() using source and target
+switches of its own.
+
+Classes:
+AsyncTranslator translates jobs concurrently using an executor.
+
+Functions:
+translate_many(jobs) yields the results of translating jobs as they finish.
+"""
+
+import asyncio
+
+import CM
+
+
+class AsyncTranslator:
+
+    """Translate jobs concurrently using asyncio and an executor.
+
+    Translation is CPU bound, thus jobs are translated in a process pool
+    by default. Another executor, e.g. a thread pool, can be provided.
+    A job not finished within its timeout (or the default timeout given
+    here) results in an error message. It is not possible to interrupt a
+    job already running in the executor, its result is just discarded.
+
+    Methods:
+    translate(job) is a coroutine returning the TranslationResult of job.
+    translate_many(jobs) yields TranslationResults as jobs finish.
+    close() shuts down the executor created by the AsyncTranslator.
+    """
+
+    def __init__(self, executor=None, max_workers=None, timeout=None):
+        self._own_executor = executor is None
+        if executor is None:
+            import concurrent.futures
+            executor = concurrent.futures.ProcessPoolExecutor(max_workers)
+        self._executor = executor
+        self._timeout = timeout
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._own_executor:
+            self._executor.shutdown(wait=False)
+
+    async def translate(self, job):
+        """Translate job in the executor, return a TranslationResult."""
+        loop = asyncio.get_event_loop()
+        timeout = job.timeout if job.timeout is not None else self._timeout
+        future = loop.run_in_executor(self._executor, CM.translate_job,
+                                      job)
+        try:
+            translation, messages = await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            name = job.name if job.name is not None else 'configuration'
+            return CM.TranslationResult(job, [], [
+                'ERROR: Translation of "' + str(name) + '" timed out after ' +
+                str(timeout) + ' seconds'])
+        except Exception as e:
+            return CM.TranslationResult(job, [], [
+                'ERROR: Translation failed (' + str(e) + ')'])
+        return CM.TranslationResult(job, translation, messages)
+
+    async def translate_many(self, jobs):
+        """Translate jobs concurrently, yield results as they finish.
+
+        Jobs not yet finished are cancelled if the consumer stops
+        iterating or the task consuming the results is cancelled.
+        """
+        tasks = [asyncio.ensure_future(self.translate(job)) for job in jobs]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+async def translate_many(jobs, executor=None, timeout=None):
+    """Translate jobs concurrently, yield results as they finish.
+
+    See AsyncTranslator for the parameters.
+    """
+    with AsyncTranslator(executor, timeout=timeout) as translator:
+        async for result in translator.translate_many(jobs):
+            yield result
+
+# vim:filetype=python:expandtab:shiftwidth=4:tabstop=4
@@ -31,18 +31,42 @@ The Core Module (CM) of E2X provides the translation interface to front ends,
 e.g. the command line front end implemented by cli.py.
 
 The class CoreModule provides the translation interface.
+
+Many configurations can be translated concurrently using asyncio with the
+module AsyncTranslator. Every job is translated using source and target
+switches of its own, see translate_job(job).
+
+Classes:
+CoreModule provides the translation interface.
+
+Functions:
+get_source_switches() returns a list of supported source switches.
+get_target_switches() returns a list of supported target switches.
+create_core_module(source, target, options) creates a core module with
+source and target switches.
+translate_job(job) translates a TranslationJob.
+
+Variables:
+TranslationJob describes a configuration to translate.
+TranslationResult contains the translation of a TranslationJob.
 """
 
+import collections
+import itertools
+import sys
+import threading
 import traceback
 
 import ACL
 import LAG
+import Messages
 import STP
+import Switch
 import VLAN
+from Messages import Message
 
-# import switch definitions
-import EOS
-import XOS
+# switch definitions (the OS modules EOS and XOS are imported on first use)
+import Devices
 
 _devices = {}
 
@@ -53,8 +77,20 @@ def _register_devices(devices):
         _devices[dev] = devices[dev]
 
 # register network devices by OS (one module per operating system)
-_register_devices(EOS.devices)
-_register_devices(XOS.devices)
+_register_devices(Devices.eos_devices)
+_register_devices(Devices.xos_devices)
+
+
+def get_source_switches():
+    """Return a list of the switch models supported as source switch."""
+    return [dev for dev in _devices
+            if _devices[dev]['use_as'] in ('source', 'both')]
+
+
+def get_target_switches():
+    """Return a list of the switch models supported as target switch."""
+    return [dev for dev in _devices
+            if _devices[dev]['use_as'] in ('target', 'both')]
 
 
 class CoreModule:
@@ -68,13 +104,24 @@ class CoreModule:
     enable_copy_unknown() enables copying unknown input lines to the output.
     enable_comment_unknown() outputs unknown lines as comments, not verbatim.
     disable_unused_ports() generates configuration to disable unmapped ports.
+    enable_acl_optimization() removes and merges redundant ACL entries.
+    set_jobs(jobs) uses jobs worker processes to translate several targets.
+    enable_parse_stats() collects statistics per parsed command path.
+    get_parse_stats() returns the statistics of parsed command paths.
+    set_log_level(level) drops messages below level during translation.
     use_oob_mgmt() specifies if an OOB management port is used or not.
     get_source_switches() returns a list of supported source switches.
     get_target_switches() returns a list of supported target switches.
     set_source_switch(model) sets the source switch used for translation.
     set_target_switch(model) sets the target switch used for translation.
+    set_target_switches(models) sets several target switches.
     transfer_config() transfers the configuration from source to target.
     translate(config) translates config from source to target switches.
+    translate_targets(config) translates config to every target switch.
+    translate_diff(old_config, config) creates commands changing old_config.
+    export_target_model(out, messages) exports the translated target switch.
+    save_source_model(path) saves the parsed source switch model.
+    load_source_model(path) loads a source switch model saved before.
     """
 
     def __init__(self):
@@ -83,25 +130,26 @@ class CoreModule:
         self._copy_unknown = False
         self._comment_unknown = False
         self._disable_unused_ports = False
+        self._optimize_acls = False
+        self._jobs = 1
+        self._parse_stats = None
+        self._log_level = 'DEBUG'
         self._use_oob_mgmt = False
-        # retrieve list of supported source switches
-        self._source_switches = []
-        for dev in _devices:
-            if (_devices[dev]['use_as'] == 'source' or
-                    _devices[dev]['use_as'] == 'both'):
-                self._source_switches.append(dev)
-        # retrieve list of supported target switches
-        self._target_switches = []
-        for dev in _devices:
-            if (_devices[dev]['use_as'] == 'target' or
-                    _devices[dev]['use_as'] == 'both'):
-                self._target_switches.append(dev)
+        self._source_switches = get_source_switches()
+        self._target_switches = get_target_switches()
         self.source = None
         self.target = None
+        self.targets = []
+        # target switch for the old configuration of translate_diff()
+        self._old_target = None
+        # (name, unknown lines, messages) of the parsed source configuration
+        self._parsed_source = None
         self._port_mapping_s2t = None
         self._port_mapping_t2s = None
         self._lag_mapping_s2t = None
         self._lag_mapping_t2s = None
+        # initial switch states, key is (id(switch), apply defaults)
+        self._snapshots = {}
 
     def enable_debug(self):
         self._debug = True
@@ -121,6 +169,37 @@ class CoreModule:
     def disable_unused_ports(self):
         self._disable_unused_ports = True
 
+    def enable_acl_optimization(self):
+        self._optimize_acls = True
+
+    def set_jobs(self, jobs):
+        """Use jobs worker processes for work that can be parallelized.
+
+        The worker processes are forked for each translation, see
+        translate_targets().
+        """
+        self._jobs = jobs
+
+    def enable_parse_stats(self):
+        """Collect the number of lines and parse time per command path.
+
+        The statistics (see Switch.ParseStats) of all configurations
+        parsed afterwards are added up.
+        """
+        if self._parse_stats is None:
+            self._parse_stats = Switch.ParseStats()
+
+    def get_parse_stats(self):
+        return self._parse_stats
+
+    def set_log_level(self, level):
+        """Drop messages below level during translation.
+
+        Dropped messages are not formatted if they are given as records.
+        """
+        Messages.severity(level)
+        self._log_level = level
+
     def use_oob_mgmt(self, state):
         self._use_oob_mgmt = state
 
@@ -160,36 +239,78 @@ class CoreModule:
         if not model_ok:
             return None, errors
         if os == 'EOS':
+            import EOS
             return EOS.EosSwitchHardware(model), ''
         elif os == 'XOS':
+            import XOS
             return XOS.XosSwitchHardware(model), ''
         return None, 'ERROR: Cannot determine ' + use_as + ' stack OS'
 
     def set_source_switch(self, model):
         self.source, errors = self._set_switch(model, 'source')
+        self._parsed_source = None
         return bool(self.source), errors
 
     def set_target_switch(self, model):
         self.target, errors = self._set_switch(model, 'target')
+        self.targets = [self.target] if self.target else []
         return bool(self.target), errors
 
+    def set_target_switches(self, models):
+        """Set the target switches used by translate_targets().
+
+        The first target switch is used by translate() as well. Return
+        False and an error message if a model cannot be used.
+        """
+        targets = []
+        for model in models:
+            target, errors = self._set_switch(model, 'target')
+            if not target:
+                return False, errors
+            targets.append(target)
+        self.targets = targets
+        self.target = targets[0] if targets else None
+        return bool(targets), ''
+
+    def _init_switch(self, switch):
+        """Put switch into its initial state for a new translation.
+
+        Initializing a switch and applying its default settings is done
+        once per switch, the resulting state is saved as a snapshot.
+        Subsequent translations restore this snapshot, so that no state of
+        a previous translation is carried over.
+        """
+        key = (id(switch), self._apply_defaults)
+        saved = self._snapshots.get(key)
+        if saved is not None and saved[0] is switch:
+            switch.restore(saved[1])
+            return
+        switch.init_conf_values()
+        if self._apply_defaults:
+            switch.apply_default_settings()
+        # forget snapshots of switches no longer in use
+        in_use = [self.source, self.target, self._old_target] + self.targets
+        self._snapshots = {k: v for k, v in self._snapshots.items()
+                           if any(v[0] is sw for sw in in_use)}
+        self._snapshots[key] = (switch, switch.snapshot())
+
     def _check_mapping_consistency(self, name, s2t, t2s):
         ret, err = True, []
         for key in s2t:
             s_name, t_name = key, s2t[key]
             if self._debug:
-                err.append('DEBUG: mapping ' + name + ' ' + s_name + ' <-> ' +
-                           t_name)
+                err.append(Message('DEBUG', 'mapping {} {} <-> {}', name,
+                                   s_name, t_name))
             t2s_key = s2t[key]
             if t2s_key not in t2s or t2s[s2t[key]] != key:
                 err.append('ERROR: ' + name + ' mapping is not reflexive')
                 ret = False
             if len(self.source.get_ports_by_name(s_name)) > 1:
-                err.append('DEBUG: ' + name + ' name "' + s_name +
-                           '" not unique')
+                err.append(Message('DEBUG', '{} name "{}" not unique', name,
+                                   s_name))
             if len(self.target.get_ports_by_name(t_name)) > 1:
-                err.append('DEBUG: ' + name + ' name "' + t_name +
-                           '" not unique')
+                err.append(Message('DEBUG', '{} name "{}" not unique', name,
+                                   t_name))
         return ret, err
 
     def _create_port_mapping(self):
@@ -215,12 +336,11 @@ class CoreModule:
             if candidate:
                 self._port_mapping_s2t[sp.get_name()] = candidate.get_name()
                 self._port_mapping_t2s[candidate.get_name()] = sp.get_name()
-                msg = ('Mapping port "' + sp.get_name() + '" to port "' +
-                       candidate.get_name() + '"')
+                level = 'INFO'
                 if candidate.get_label() != sp.get_label():
-                    err.append('NOTICE: ' + msg)
-                else:
-                    err.append('INFO: ' + msg)
+                    level = 'NOTICE'
+                err.append(Message(level, 'Mapping port "{}" to port "{}"',
+                                   sp.get_name(), candidate.get_name()))
                 tmp_target_port_list.pop(candidate_nr)
             else:
                 err.append('WARN: Could not map port %s' % (sp.get_name()))
@@ -269,8 +389,8 @@ class CoreModule:
                         err.append('WARN: LAG "' + sl.get_name() + '" '
                                    'cannot be mapped to target switch')
                     else:
-                        err.append('INFO: Mapping LAG "' + sl.get_name() +
-                                   '" to "' + new_lag_name + '"')
+                        err.append(Message('INFO', 'Mapping LAG "{}" to "{}"',
+                                           sl.get_name(), new_lag_name))
                         param = [sl.get_label(), new_lag_name,
                                  sl.get_lacp_enabled(),
                                  sl.get_lacp_aadminkey()]
@@ -306,8 +426,9 @@ class CoreModule:
                 tp = self.target.get_physical_ports_by_name(tp_name)[0]
                 tp.transfer_config(sp)
             else:
-                ret.append('INFO: Port "' + sp.get_name() + '" not mapped to'
-                           ' target switch, no config transferred')
+                ret.append(Message('INFO', 'Port "{}" not mapped to target '
+                                   'switch, no config transferred',
+                                   sp.get_name()))
                 if sp.is_configured():
                     ret.append('ERROR: Port "' + sp.get_name() + '" is '
                                'configured, but not mapped to target switch')
@@ -340,8 +461,8 @@ class CoreModule:
                 tl = self.target.get_lags_by_name(tl_name)[0]
                 tl.transfer_config(sl)
             else:
-                ret.append('INFO: LAG "' + sl_name + '" not mapped to'
-                           ' target switch, no config transferred')
+                ret.append(Message('INFO', 'LAG "{}" not mapped to target '
+                                   'switch, no config transferred', sl_name))
                 if sl.is_configured() and not (sl.is_disabled_only() or
                                                sl.accidental_config_only()):
                     ret.append('ERROR: LAG "' + sl_name + '" is '
@@ -358,6 +479,8 @@ class CoreModule:
         # keep target switch defaults by transfering to existing instances
         for (s_stp, t_stp) in zip(source_stps, target_stps):
             t_stp.transfer_config(s_stp)
+        # the MST instances of the target STPs may have changed
+        self.target.reset_indexes()
         # transfer remaining source STP instances
         if nr_src_stps > nr_of_target_stps:
             for s_stp in source_stps[-(nr_src_stps - nr_of_target_stps):]:
@@ -374,11 +497,11 @@ class CoreModule:
             new_acl = ACL.ACL(number, name)
             for ace in acl.get_entries():
                 new_ace = ACL.ACE(ace.get_number(), ace.get_action(),
-                                  ace.get_protocol(), ace.get_source(),
-                                  ace.get_source_mask(), ace.get_source_op(),
-                                  ace.get_source_port(), ace.get_dest(),
-                                  ace.get_dest_mask(), ace.get_dest_op(),
-                                  ace.get_dest_port())
+                                  ace.get_protocol(), ace.get_source_int(),
+                                  ace.get_source_mask_int(),
+                                  ace.get_source_op(), ace.get_source_port(),
+                                  ace.get_dest_int(), ace.get_dest_mask_int(),
+                                  ace.get_dest_op(), ace.get_dest_port())
                 new_acl.add_ace(new_ace)
             self.target.add_complete_acl(new_acl)
 
@@ -392,63 +515,342 @@ class CoreModule:
 
         return ret
 
-    def translate(self, config):
-        """Translate the provided source switch config to a target config."""
-        translation, unknown, err = [], [], []
+    def translate(self, config, name='-'):
+        """Translate the provided source switch config to a target config.
+
+        If config is None, the source switch model loaded with
+        load_source_model() is translated without parsing. The name of
+        the configuration is saved by save_source_model(). Return the
+        translation and a list of Message records, containing messages of
+        at least the level given to set_log_level(). Records are no
+        strings, use str() to get the message string 'LEVEL: text'.
+        """
+        # messages below the log level are dropped and never formatted
+        log = Messages.MessageLog(self._log_level)
         if not self.source or not self.target:
-            err.append(
-                'ERROR: Source and target switch needed for translation'
-            )
-            return (translation, err)
-
-        self.source.init_conf_values()
-        self.target.init_conf_values()
-        if self._apply_defaults:
-            self.source.apply_default_settings()
-            self.target.apply_default_settings()
-
+            log.error('Source and target switch needed for translation')
+            return ([], log.records)
+        if config is None and self._parsed_source is None:
+            log.error('No source switch model loaded for translation')
+            return ([], log.records)
+
+        if config is not None:
+            self._init_switch(self.source)
+        self._init_switch(self.target)
+
+        if not self._map_ports(log):
+            return ([], log.records)
+
+        unknown = self._read_source(config, name, log)
+        return (self._write_target(log, unknown), log.records)
+
+    def translate_targets(self, config, name='-'):
+        """Translate config from the source to every target switch.
+
+        The source configuration is normalized and parsed once. Port and
+        LAG mapping, transfer, and creation of the configuration is done
+        for every target switch set with set_target_switches(). With more
+        than one job (see set_jobs()), the targets are translated in
+        worker processes forked after parsing, if the platform supports
+        this. Return a list of (translation, messages) tuples in the order
+        of the target switches. The messages for a target are the same as
+        translate() returns for it. As with translate(), a config of None
+        translates the loaded source switch model.
+        """
+        log = Messages.MessageLog(self._log_level)
+        if not self.source or not self.targets:
+            log.error('Source and target switch needed for translation')
+            return [([], log.records)]
+        if config is None and self._parsed_source is None:
+            log.error('No source switch model loaded for translation')
+            return [([], log.records)]
+
+        if config is not None:
+            self._init_switch(self.source)
+        unknown = self._read_source(config, name, log)
+
+        if self._jobs > 1 and len(self.targets) > 1 and _can_fork():
+            global _forked_core_module
+            _forked_core_module = self
+            try:
+                with _fork_pool(min(self._jobs, len(self.targets))) as p:
+                    return list(p.map(_translate_forked_target,
+                                      range(len(self.targets)),
+                                      itertools.repeat(unknown),
+                                      itertools.repeat(log.records)))
+            finally:
+                _forked_core_module = None
+        try:
+            return [self._translate_target(target, unknown, log.records)
+                    for target in self.targets]
+        finally:
+            self.target = self.targets[0]
+
+    def translate_diff(self, old_config, config, old_name='-', name='-'):
+        """Translate old_config and config, return the changes between them.
+
+        Both configurations are translated to the target switch. The
+        translated switch models are compared to create the commands that
+        change the translation of old_config into that of config. Return
+        these commands and the messages of translating config, followed by
+        those of comparing the translations. If old_config cannot be
+        translated, its empty translation and messages are returned.
+        """
+        if not self.source or not self.target:
+            return self.translate(config, name)
+        target = self.target
+        if (self._old_target is None or
+                self._old_target.get_model() != target.get_model()):
+            self._old_target, _ = self._set_switch(target.get_model(),
+                                                   'target')
+        self.target = self._old_target
+        try:
+            old_translation, old_messages = self.translate(old_config,
+                                                           old_name)
+        finally:
+            self.target = target
+        if not old_translation:
+            return old_translation, old_messages
+        translation, messages = self.translate(config, name)
+        if not translation:
+            return translation, messages
+        log = Messages.MessageLog(self._log_level)
+        diff, errors = target.create_config_diff(self._old_target)
+        log.extend(errors)
+        return diff, messages + log.records
+
+    def _translate_target(self, target, unknown, source_messages):
+        """Translate the parsed source configuration to target."""
+        log = Messages.MessageLog(self._log_level)
+        self.target = target
+        self._init_switch(self.target)
+        if not self._map_ports(log):
+            return ([], log.records)
+        log.extend(source_messages)
+        return (self._write_target(log, unknown), log.records)
+
+    def _map_ports(self, log):
+        """Map source to target ports, return False if this fails."""
         ret, errors = self._create_port_mapping()
-        err.extend(errors)
+        log.extend(errors)
         if not ret:
-            err.append('ERROR: Could not create valid port mapping from '
-                       'source to target.')
-            return (translation, err)
-
-        config, errors = self.source.normalize_config(config)
-        err.extend(errors)
-        config, errors = self.source.expand_macros(config)
-        err.extend(errors)
+            log.error('Could not create valid port mapping from source to '
+                      'target.')
+        return ret
 
-        for line in config:
-            ret = self.source.configure(line)
-            if ret:
-                err.append(ret)
-                if (self._copy_unknown and 'Ignoring unknown command' in ret):
-                    if self._comment_unknown:
-                        comment = self.target.get_cmd().get_comment()
-                        if comment:
-                            unknown.append(comment + ' ' + line)
-                        else:
-                            err.append('ERROR: Cannot create comment line '
-                                       'for unknown command')
-                    else:
+    def _read_source(self, config, name, log):
+        """Configure the source switch, return the unknown lines.
+
+        The unknown lines and messages are kept for save_source_model().
+        If config is None, those of the loaded source model are used.
+        """
+        if config is not None:
+            source_log = Messages.MessageLog(self._log_level)
+            unknown = []
+            config, errors = self.source.normalize_config(config)
+            source_log.extend(errors)
+            config, errors = self.source.expand_macros(config)
+            source_log.extend(errors)
+
+            if self._parse_stats is not None:
+                results = [self._parse_stats.configure(self.source, line)
+                           for line in config]
+            else:
+                results = [self.source.configure(line) for line in config]
+            for line, ret in zip(config, results):
+                if ret:
+                    source_log.add(ret)
+                    if 'Ignoring unknown command' in ret:
                         unknown.append(line)
-
+            self._parsed_source = (name, unknown, source_log.records)
+        _, unknown, records = self._parsed_source
+        log.extend(records)
+        return unknown if self._copy_unknown else []
+
+    def export_target_model(self, out, messages):
+        """Write the target switch model of the last translation to out.
+
+        The target switch, the port and LAG mappings, and the messages of
+        the translation are written as JSON to the text file out, see
+        ModelExport. This works for the target switch used by translate()
+        and translate_diff() only.
+        """
+        import ModelExport
+        ModelExport.write_json(out, self.target,
+                               (self._port_mapping_s2t or {},
+                                self._port_mapping_t2s or {}),
+                               (self._lag_mapping_s2t or {},
+                                self._lag_mapping_t2s or {}),
+                               Messages.to_records(messages))
+
+    def save_source_model(self, path):
+        """Save the source switch model of the last translation to path.
+
+        The saved model contains the configured source switch, the unknown
+        configuration lines and the messages of parsing the configuration,
+        which can be loaded with load_source_model() to translate the
+        configuration again without parsing it. Return a list of errors.
+        """
+        if not self.source or self._parsed_source is None:
+            return ['ERROR: No parsed source switch model to save']
+        import ModelFile
+        name, unknown, records = self._parsed_source
+        try:
+            ModelFile.save(path, self.source, name, unknown, records)
+        except OSError as e:
+            return ['ERROR: Cannot save source switch model to "' + path +
+                    '": ' + str(e)]
+        return []
+
+    def load_source_model(self, path):
+        """Load a source switch model saved with save_source_model().
+
+        The source switch is replaced by a switch of the saved model in the
+        saved state. Calling translate() or translate_targets() with a
+        config of None translates it. Return True and the name of the
+        configuration the model was parsed from, or False and an error
+        message.
+        """
+        import ModelFile
+
+        def create_switch(model):
+            return self._set_switch(model, 'source')[0]
+
+        try:
+            data = ModelFile.load(path, create_switch)
+        except (OSError, ValueError) as e:
+            return False, 'ERROR: Cannot load source switch model: ' + str(e)
+        self.source = data.switch
+        self._parsed_source = (data.name, data.unknown, data.messages)
+        return True, data.name
+
+    def _write_target(self, log, unknown):
+        """Transfer the source configuration and create the translation."""
         ret, errors = self._create_lag_mapping()
-        err.extend(errors)
+        log.extend(errors)
         if not ret:
-            err.append('ERROR: Could not create valid LAG mapping from '
-                       'source to target.')
-            err.append('ERROR: LAG configuration missing from translation')
+            log.error('Could not create valid LAG mapping from source to '
+                      'target.')
+            log.error('LAG configuration missing from translation')
 
         transfer_errs = self.transfer_config()
-        err.extend(transfer_errs)
+        log.extend(transfer_errs)
+        if self._optimize_acls:
+            import ACLOptimizer
+            for acl in self.target.get_acls():
+                log.extend(ACLOptimizer.optimize_acl(acl))
         translation, errors = self.target.create_config(self._use_oob_mgmt)
+        if unknown and self._comment_unknown:
+            comment = self.target.get_cmd().get_comment()
+            if comment:
+                unknown = [comment + ' ' + line for line in unknown]
+            else:
+                for line in unknown:
+                    log.error('Cannot create comment line for unknown '
+                              'command')
+                unknown = []
         if unknown:
             translation.append('')
             translation.extend(unknown)
-        err.extend(errors)
+        log.extend(errors)
+
+        return translation
+
+
+def create_core_module(source, target, options=None):
+    """Create a core module using the given switch models and options.
+
+    The options are given as a dictionary using the names of the command
+    line options, e.g. 'ignore_defaults' or 'sfp_list'. Return the core
+    module and a list of errors. The core module is None on errors.
+    """
+    options = options or {}
+    c = CoreModule()
+    if options.get('ignore_defaults'):
+        c.disable_defaults()
+    if options.get('keep_unknown_lines'):
+        c.enable_copy_unknown()
+    if options.get('comment_unknown_lines'):
+        c.enable_copy_unknown()
+        c.enable_comment_unknown()
+    if options.get('disable_unused_ports'):
+        c.disable_unused_ports()
+    if options.get('optimize_acls'):
+        c.enable_acl_optimization()
+    if options.get('jobs'):
+        c.set_jobs(options['jobs'])
+    if options.get('parse_stats'):
+        c.enable_parse_stats()
+    if options.get('mgmt_port'):
+        c.use_oob_mgmt(True)
+    ret, error = c.set_source_switch(source)
+    if not ret:
+        return None, [error or 'ERROR: Could not set source switch']
+    if options.get('sfp_list'):
+        errors = c.source.set_combo_using_sfp(options['sfp_list'])
+        if errors:
+            return None, errors
+    ret, error = c.set_target_switch(target)
+    if not ret:
+        return None, [error or 'ERROR: Could not set target switch']
+    return c, []
+
 
-        return (translation, err)
+# core module translating targets in forked worker processes
+_forked_core_module = None
+
+
+def _can_fork():
+    import multiprocessing
+    return 'fork' in multiprocessing.get_all_start_methods()
+
+
+def _fork_pool(workers):
+    """Return a process pool with workers forked from this process."""
+    import concurrent.futures
+    import multiprocessing
+    if sys.version_info < (3, 7):
+        # without mp_context, workers are forked where fork is available
+        return concurrent.futures.ProcessPoolExecutor(workers)
+    return concurrent.futures.ProcessPoolExecutor(
+        workers, mp_context=multiprocessing.get_context('fork'))
+
+
+def _translate_forked_target(index, unknown, source_messages):
+    """Translate a target of the core module inherited from the parent."""
+    c = _forked_core_module
+    return c._translate_target(c.targets[index], unknown, source_messages)
+
+
+TranslationJob = collections.namedtuple(
+    'TranslationJob', ['config', 'source', 'target', 'options', 'name',
+                       'timeout'])
+TranslationJob.__new__.__defaults__ = (None, None, None)
+
+TranslationResult = collections.namedtuple(
+    'TranslationResult', ['job', 'translation', 'messages'])
+
+# core modules of translate_job(), one set per thread
+_job_core_modules = threading.local()
+
+
+def translate_job(job):
+    """Translate a TranslationJob, return translation and messages.
+
+    Core modules are reused for later jobs with the same switch models
+    and options in the same thread (or process). The switches are
+    restored to their initial state for every job.
+    """
+    key = (job.source, job.target, repr(sorted((job.options or {}).items())))
+    cache = getattr(_job_core_modules, 'cache', None)
+    if cache is None:
+        cache = _job_core_modules.cache = {}
+    c = cache.get(key)
+    if c is None:
+        c, err = create_core_module(job.source, job.target, job.options)
+        if c is None:
+            return [], err
+        cache[key] = c
+    return c.translate(job.config)
 
 # vim:filetype=python:expandtab:shiftwidth=4:tabstop=4
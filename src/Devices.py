@@ -0,0 +1,90 @@
+# CDDL HEADER START
+#
+# The contents of this file are subject to the terms
+# of the Common Development and Distribution License
+# (the "License").  You may not use this file except
+# in compliance with the License.
+#
+# You can obtain a copy of the license at
+# LICENSE.txt or http://opensource.org/licenses/CDDL-1.0.
+# See the License for the specific language governing
+# permissions and limitations under the License.
+#
+# When distributing Covered Code, include this CDDL
+# HEADER in each file and include the License file at
+# LICENSE.txt  If applicable,
+# add the following below this CDDL HEADER, with the
+# fields enclosed by brackets "[]" replaced with your
+# own identifying information: Portions Copyright [yyyy]
+# [name of copyright owner]
+#
+# CDDL HEADER END
+
+# Copyright 2014-2017 Extreme Networks, Inc.  All rights reserved.
+# Use is subject to license terms.
+
+# This file is part of e2x (translate EOS switch configuration to ExtremeXOS)
+
+"""Registry of the switch models supported by E2X.
+
+The registry describes every switch model without importing the module
+implementing the switch operating system. This keeps start-up fast, the OS
+modules are imported when a switch model is actually used.
+
+Variables:
+eos_devices defines the supported switch models running EOS.
+xos_devices defines the supported switch models running XOS.
+"""
+
+eos_devices = {
+    'C5G124-24': {'use_as': 'source', 'os': 'EOS'},
+    'C5G124-24P2': {'use_as': 'source', 'os': 'EOS'},
+    'C5G124-48': {'use_as': 'source', 'os': 'EOS'},
+    'C5G124-48P2': {'use_as': 'source', 'os': 'EOS'},
+    'C5K125-24': {'use_as': 'source', 'os': 'EOS'},
+    'C5K125-24P2': {'use_as': 'source', 'os': 'EOS'},
+    'C5K125-48': {'use_as': 'source', 'os': 'EOS'},
+    'C5K125-48P2': {'use_as': 'source', 'os': 'EOS'},
+    'C5K175-24': {'use_as': 'source', 'os': 'EOS'},
+    }
+
+xos_devices = {
+    'SummitX460-48t': {'use_as': 'target', 'os': 'XOS'},
+    'SummitX460-48t+2xf': {'use_as': 'target', 'os': 'XOS'},
+    'SummitX460-48t+2sf': {'use_as': 'target', 'os': 'XOS'},
+    'SummitX460-48t+4sf': {'use_as': 'target', 'os': 'XOS'},
+    'SummitX460-48t+2xf+4sf': {'use_as': 'target', 'os': 'XOS'},
+    'SummitX460-48t+2sf+4sf': {'use_as': 'target', 'os': 'XOS'},
+    'SummitX460-48p': {'use_as': 'target', 'os': 'XOS'},
+    'SummitX460-48p+2xf': {'use_as': 'target', 'os': 'XOS'},
+    'SummitX460-48p+2sf': {'use_as': 'target', 'os': 'XOS'},
+    'SummitX460-48p+4sf': {'use_as': 'target', 'os': 'XOS'},
+    'SummitX460-48p+2xf+4sf': {'use_as': 'target', 'os': 'XOS'},
+    'SummitX460-48p+2sf+4sf': {'use_as': 'target', 'os': 'XOS'},
+    'SummitX460-24t': {'use_as': 'target', 'os': 'XOS'},
+    'SummitX460-24t+2xf': {'use_as': 'target', 'os': 'XOS'},
+    'SummitX460-24t+2sf': {'use_as': 'target', 'os': 'XOS'},
+    'SummitX460-24t+4sf': {'use_as': 'target', 'os': 'XOS'},
+    'SummitX460-24t+2xf+4sf': {'use_as': 'target', 'os': 'XOS'},
+    'SummitX460-24t+2sf+4sf': {'use_as': 'target', 'os': 'XOS'},
+    'SummitX460-24p': {'use_as': 'target', 'os': 'XOS'},
+    'SummitX460-24p+2xf': {'use_as': 'target', 'os': 'XOS'},
+    'SummitX460-24p+2sf': {'use_as': 'target', 'os': 'XOS'},
+    'SummitX460-24p+4sf': {'use_as': 'target', 'os': 'XOS'},
+    'SummitX460-24p+2xf+4sf': {'use_as': 'target', 'os': 'XOS'},
+    'SummitX460-24p+2sf+4sf': {'use_as': 'target', 'os': 'XOS'},
+    'SummitX460-24x': {'use_as': 'target', 'os': 'XOS'},
+    'SummitX460-24x+2xf': {'use_as': 'target', 'os': 'XOS'},
+    'SummitX460-24x+2sf': {'use_as': 'target', 'os': 'XOS'},
+    'SummitX460-24x+4sf': {'use_as': 'target', 'os': 'XOS'},
+    'SummitX460-24x+2xf+4sf': {'use_as': 'target', 'os': 'XOS'},
+    'SummitX460-24x+2sf+4sf': {'use_as': 'target', 'os': 'XOS'},
+    'SummitX460-48x': {'use_as': 'target', 'os': 'XOS'},
+    'SummitX460-48x+2xf': {'use_as': 'target', 'os': 'XOS'},
+    'SummitX460-48x+2sf': {'use_as': 'target', 'os': 'XOS'},
+    'SummitX460-48x+4sf': {'use_as': 'target', 'os': 'XOS'},
+    'SummitX460-48x+2xf+4sf': {'use_as': 'target', 'os': 'XOS'},
+    'SummitX460-48x+2sf+4sf': {'use_as': 'target', 'os': 'XOS'},
+    }
+
+# vim:filetype=python:expandtab:shiftwidth=4:tabstop=4
@@ -39,6 +39,7 @@ devices defines the switch models supported by this module.
 
 import re
 
+import Devices
 import EOS_read
 import LAG
 import STP
@@ -47,6 +48,13 @@ import Switch
 import SyslogServer
 import Utils
 
+# syntax of EOS port strings, e.g. 'ge.1.1-4,7;tg.*.1'
+_PORT_TYPE = '[a-zA-Z]+(,[a-zA-Z]+)*'
+_PORT_LIST = '{0}(,{0})*'.format('[0-9]+(-[0-9]+)?')
+_PORT_STRING = r'(\*|({0}))\.(\*|({1}))\.(\*|({1}))'.format(_PORT_TYPE,
+                                                             _PORT_LIST)
+_PORT_STRING_REGEX = re.compile('^{0}(;{0})*$'.format(_PORT_STRING))
+
 
 class EosSwitch(Switch.Switch):
 
@@ -63,6 +71,34 @@ class EosSwitch(Switch.Switch):
     expand_macros() expands macro commands in the input configuration.
     """
 
+    # keywords converted to lower case by normalize_config()
+    _KEYWORDS = frozenset({
+        'enable', 'disable', 'cfgname', 'rev', 'sid', 'mstp', 'rstp',
+        'stpcompatible', 'version', 'msti', 'mstmap', 'mstcfgid', 'priority',
+        'spanguard', 'autoedge', 'portadmin', 'adminedge', 'egress', 'create',
+        'name', 'lacp', 'port', 'alias', 'speed', 'duplex', 'negotiation',
+        'jumbo', 'vlan', 'aadminkey', 'static', 'singleportlag',
+        'access-group', 'access-list', 'spantree', 'set', 'clear', 'router',
+        'exit', 'configure', 'terminal', 'interface', 'ip', 'udp', 'tcp',
+        'icmp', 'address', 'sequence', 'any', 'host', 'permit', 'deny', 'in',
+        'out', 'key', 'prompt', 'system', 'contact', 'location', 'banner',
+        'ssh', 'telnet', 'webview', 'logout', 'logging', 'server', 'sntp',
+        'client', 'summertime', 'recurring', 'timezone', 'radius', 'realm',
+        'management-access', 'network-access', 'all', 'tacacs', 'snmp',
+        'targetaddr', 'login', 'shutdown', 'no', 'helper-address', 'routing',
+        'cdp', 'ciscodp', 'lldp', 'broadcast', 'ingress-filter', 'trap', 'mac',
+        'lock', 'igmp', 'ipv6', 'ipv6mode', 'inbound', 'outbound', 'loopback',
+        'enabled', 'disabled', 'begin', 'end', 'ssl', 'ssl-only', 'protocol',
+        'gateway', 'mask', 'bootp', 'dhcp', 'none', 'boot', 'state', 'descr',
+        'facility', 'local0', 'local1', 'local2', 'local3', 'local4', 'local5',
+        'local6', 'local7', 'ip-addr', 'port', 'severity', 'unicast', 'route',
+        'first', 'second', 'third', 'fourth', 'last',
+    })
+
+    # macro commands and the methods expanding them
+    _MACROS = {'set lacp static': '_expand_set_lacp_static',
+               'set port lacp port': '_expand_set_port_lacp_port'}
+
     def __init__(self):
         super().__init__()
         self._model = 'generic'
@@ -76,6 +112,7 @@ class EosSwitch(Switch.Switch):
         for i in range(1, number + 1):
             lag_name = 'lag.0.' + str(i)
             lag = LAG.LAG(number=i, name=lag_name, use_lacp=True)
+            lag.set_member_index(self._lag_of_port)
             self._lags.append(lag)
 
     def _build_port_name(self, index, name_dict, slot):
@@ -168,41 +205,48 @@ class EosSwitch(Switch.Switch):
 
     def _verify_port_string_syntax(self, portstring):
         """Verify that a given string is syntactically correct."""
-        port_type = '[a-zA-Z]+(,[a-zA-Z]+)*'
-        lst_el = '[0-9]+(-[0-9]+)?'
-        lst = '{0}(,{0})*'.format(lst_el)
-        port_str = '(\*|({0}))\.(\*|({1}))\.(\*|({1}))'.format(port_type, lst)
-        port_str_lst = '{0}(;{0})*'.format(port_str)
-        anchored_ps_regex = '^' + port_str_lst + '$'
+        return bool(_PORT_STRING_REGEX.match(portstring))
 
-        regex = re.compile(anchored_ps_regex)
-        return True if regex.match(portstring) else False
+    def _exact_port_name(self, description):
+        """Return the port name if a port string matches this name only."""
+        description = description.strip()
+        if (self._verify_port_string_syntax(description) and
+                any(c in description for c in '*,-;')):
+            return None
+        return description
 
     def _port_name_matches_description(self, name, description):
         """Match a port name against a port string."""
+        exact = self._exact_port_name(description)
+        if exact is not None:
+            return name == exact
+        return self._port_name_matcher(description)(name)
+
+    def _port_name_matcher(self, description):
+        """Return a function matching port names against a port string.
+
+        The port string is parsed once, matching a port name against it
+        is a lookup in sets of speeds, slots, and ports.
+        """
         description = description.strip()
-        if name == description:
-            return True
-        if not self._verify_port_string_syntax(description):
-            return False
-        ret = False
         # port strings can be concatenated using ;
-        if ';' in description:
-            port_string_list = description.split(';')
-            for ps in port_string_list:
-                ret = ret or self._port_name_matches_description(name, ps)
-        # this port string is a 3-tuple
-        else:
+        # each port string is a 3-tuple, None matches any element
+        port_strings = [
+            tuple(None if d == '*' else frozenset(Utils.expand_sequence(d))
+                  for d in ps.split('.'))
+            for ps in description.split(';')]
+
+        def matches(name):
+            if name == description:
+                return True
             (n_speed, n_slot, n_port) = name.split('.')
-            (d_speed, d_slot, d_port) = description.split('.')
-            speed_match = ((d_speed == '*') or
-                           (n_speed in Utils.expand_sequence(d_speed)))
-            slot_match = ((d_slot == '*') or
-                          (n_slot in Utils.expand_sequence(d_slot)))
-            port_match = ((d_port == '*') or
-                          (n_port in Utils.expand_sequence(d_port)))
-            ret = speed_match and slot_match and port_match
-        return ret
+            for speeds, slots, ports in port_strings:
+                if ((speeds is None or n_speed in speeds) and
+                        (slots is None or n_slot in slots) and
+                        (ports is None or n_port in ports)):
+                    return True
+            return False
+        return matches
 
     def _create_syslog_server(self):
         ret = SyslogServer.SyslogServer()
@@ -225,34 +269,8 @@ class EosSwitch(Switch.Switch):
 
     def normalize_config(self, config):
         """Convert keywords to lower case."""
-        keywords = {'enable', 'disable', 'cfgname', 'rev', 'sid', 'mstp',
-                    'rstp', 'stpcompatible', 'version', 'msti', 'mstmap',
-                    'mstcfgid', 'priority', 'spanguard', 'autoedge',
-                    'portadmin', 'adminedge', 'egress', 'create', 'name',
-                    'lacp', 'port', 'alias', 'speed', 'duplex', 'negotiation',
-                    'jumbo', 'vlan', 'aadminkey', 'static', 'singleportlag',
-                    'access-group', 'access-list', 'spantree', 'set', 'clear',
-                    'router', 'exit', 'configure', 'terminal', 'interface',
-                    'ip', 'udp', 'tcp', 'icmp', 'address', 'sequence', 'any',
-                    'host', 'permit', 'deny', 'in', 'out', 'key', 'prompt',
-                    'system', 'contact', 'location', 'banner', 'ssh', 'telnet',
-                    'webview', 'logout', 'logging', 'server', 'sntp', 'client',
-                    'summertime', 'recurring', 'timezone', 'radius', 'realm',
-                    'management-access', 'network-access', 'all', 'tacacs',
-                    'snmp', 'targetaddr', 'login', 'shutdown', 'no',
-                    'helper-address', 'routing', 'cdp', 'ciscodp', 'lldp',
-                    'broadcast', 'ingress-filter', 'trap', 'mac', 'lock',
-                    'igmp', 'ipv6', 'ipv6mode', 'inbound', 'outbound',
-                    'loopback', 'enabled', 'disabled', 'begin', 'end',
-                    'ssl', 'ssl-only', 'protocol', 'gateway', 'mask', 'bootp',
-                    'dhcp', 'none', 'boot', 'state', 'descr', 'facility',
-                    'local0', 'local1', 'local2', 'local3', 'local4', 'local5',
-                    'local6', 'local7', 'ip-addr', 'port', 'severity',
-                    'unicast', 'route', 'first', 'second', 'third', 'fourth',
-                    'last',
-                    }
         comments = self.get_cmd().get_comment()
-        return (Utils.words_to_lower(config, keywords, comments), [])
+        return (Utils.words_to_lower(config, self._KEYWORDS, comments), [])
 
     def expand_macros(self, config):
         """Expand macro commands in the configuration to basic commands."""
@@ -271,9 +289,7 @@ class EosSwitch(Switch.Switch):
 
     def _register_macros(self):
         """Dictionary of supported macro expansion methods."""
-        return {'set lacp static': '_expand_set_lacp_static',
-                'set port lacp port': '_expand_set_port_lacp_port',
-                }
+        return self._MACROS
 
     def _expand_set_lacp_static(self, line):
         """Expand 'set lacp static' macro command."""
@@ -472,16 +488,6 @@ class EosSwitchHardware(EosSwitch):
         self._setup_hw()
 
 # Dictionary of supported switch models used to register devices in the CM
-devices = {
-    'C5G124-24': {'use_as': 'source', 'os': 'EOS'},
-    'C5G124-24P2': {'use_as': 'source', 'os': 'EOS'},
-    'C5G124-48': {'use_as': 'source', 'os': 'EOS'},
-    'C5G124-48P2': {'use_as': 'source', 'os': 'EOS'},
-    'C5K125-24': {'use_as': 'source', 'os': 'EOS'},
-    'C5K125-24P2': {'use_as': 'source', 'os': 'EOS'},
-    'C5K125-48': {'use_as': 'source', 'os': 'EOS'},
-    'C5K125-48P2': {'use_as': 'source', 'os': 'EOS'},
-    'C5K175-24': {'use_as': 'source', 'os': 'EOS'},
-    }
+devices = Devices.eos_devices
 
 # vim:filetype=python:expandtab:shiftwidth=4:tabstop=4
@@ -84,7 +84,7 @@ import Switch
 import Utils
 import VLAN
 
-from ACL import ACL, ACE, Standard_ACE
+from ACL import ACL, ACE, Standard_ACE, parse_ipv4
 from Tokenizer import Tokenizer
 
 
@@ -363,9 +363,10 @@ class EosSetSpantreeCommand(Switch.CmdInterpreter):
             sid = int(sid)
         except:
             return 'ERROR: MST instance ID must be an integer'
-        stp_list = self._switch.get_stps()
-        for stp in stp_list:
-            stp.del_vlans(fid_list, 'config')
+        fid_bitmap = STP.vlan_bitmap(fid_list)
+        for stp in self._switch.get_stps():
+            if stp.get_vlan_bitmap() & fid_bitmap:
+                stp.del_vlans(fid_list, 'config')
         stp = self._switch.get_stp_by_mst_instance(sid)
         stp.add_vlans(fid_list, 'config')
         return ''
@@ -2694,28 +2695,33 @@ class EosNumberedAclLineParser:
         if not token_list:
             raise(EosAclParseError('ERROR: Address definition missing in ACE '
                                    'config'))
+        # addresses are converted to integers once, ACEs store integers
         address = token_list.pop(0)
-        if ACE.is_valid_ip_address(address):
-            address_definition['addr'] = address
-            mask = '0.0.0.0'
+        address_int = parse_ipv4(address)
+        if address_int is not None:
+            address_definition['addr'] = address_int
+            mask = 0
             if token_list:
-                mask = token_list[0]
-                if ACE.is_valid_ip_address(mask):
+                mask = parse_ipv4(token_list[0])
+                if mask is not None:
                     token_list.pop(0)
+                else:
+                    # keep the (invalid) wildcard, it is not applied
+                    mask = token_list[0]
             address_definition['mask'] = mask
         elif address == 'host':
-            address = None
+            address_int = None
             if token_list:
-                address = token_list[0]
-            if not address or not ACE.is_valid_ip_address(address):
+                address_int = parse_ipv4(token_list[0])
+            if address_int is None:
                 raise(EosAclParseError('ERROR: Missing address parameter in '
                                        'ACE config'))
             token_list.pop(0)
-            address_definition['addr'] = address
-            address_definition['mask'] = '0.0.0.0'
+            address_definition['addr'] = address_int
+            address_definition['mask'] = 0
         elif address == 'any':
-            address_definition['addr'] = '0.0.0.0'
-            address_definition['mask'] = '255.255.255.255'
+            address_definition['addr'] = 0
+            address_definition['mask'] = 0xffffffff
         else:
             raise(EosAclParseError('ERROR: Invalid address in ACE config'))
         if token_list:
@@ -27,7 +27,10 @@
 
 """Model a link aggregation group (LAG)."""
 
+import copy
+
 import Port
+from Utils import conf_value
 
 
 class LAG(Port.Port):
@@ -41,14 +44,22 @@ class LAG(Port.Port):
     are removed/ignored.
 
     Properties specific to an LAG (e.g. member ports) have been added.
+
+    The member ports are kept as an ordered set, the first member port is
+    the master port. The switch of the LAG provides a member index, see
+    set_member_index(), mapping each member port name to its LAG.
     """
 
+    __slots__ = ('_data', '_members', '_member_index')
+
     def __init__(self, number, name=None, use_lacp=None, aadminkey=None):
         self._data = {"type": "LAG", "speedrange": [], "PoE": "no"}
         super().__init__(number, name, self._data, False)
-        self._lacp_enabled = (use_lacp, None)
-        self._lacp_aadminkey = (aadminkey, None)
-        self._members = []
+        self._lacp_enabled = conf_value(use_lacp, None)
+        self._lacp_aadminkey = conf_value(aadminkey, None)
+        # ordered set of member port names (dictionary keys)
+        self._members = {}
+        self._member_index = None
 
     def __str__(self):
         description = 'Number: ' + str(self._label)
@@ -59,6 +70,12 @@ class LAG(Port.Port):
         description += ', Admin State: ' + str(self._admin_state[0])
         return description
 
+    def __deepcopy__(self, memo):
+        lag = super().__deepcopy__(memo)
+        lag._members = dict(self._members)
+        lag._member_index = copy.deepcopy(self._member_index, memo)
+        return lag
+
     def is_disabled_only(self):
         reason = 'config'
         return (not self._admin_state[0] and
@@ -104,18 +121,43 @@ class LAG(Port.Port):
     def set_jumbo(self, state, reason):
         return None
 
+    def set_member_index(self, index):
+        """Keep the member ports of this LAG in index.
+
+        The index is a dictionary shared by all LAGs of a switch, mapping
+        member port names to their LAG. It is updated whenever a member
+        port is added or removed.
+        """
+        self._member_index = index
+        if index is not None:
+            for portname in self._members:
+                index[portname] = self
+
     def get_members(self):
-        return self._members
+        return list(self._members)
 
     def add_member_port(self, portname):
         if not portname:
             return False
         if portname not in self._members:
-            self._members.append(portname)
+            self._members[portname] = None
+            if self._member_index is not None:
+                self._member_index[portname] = self
+        return True
+
+    def remove_member_port(self, portname):
+        if portname not in self._members:
+            return False
+        del self._members[portname]
+        if (self._member_index is not None and
+                self._member_index.get(portname) is self):
+            del self._member_index[portname]
         return True
 
     def get_master_port(self):
-        if self._members:
-            return self._members[0]
+        return next(iter(self._members), None)
+
+    def is_master_port(self, portname):
+        return portname == self.get_master_port()
 
 # vim:filetype=python:expandtab:shiftwidth=4:tabstop=4
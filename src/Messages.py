@@ -0,0 +1,228 @@
+# CDDL HEADER START
+#
+# The contents of this file are subject to the terms
+# of the Common Development and Distribution License
+# (the "License").  You may not use this file except
+# in compliance with the License.
+#
+# You can obtain a copy of the license at
+# LICENSE.txt or http://opensource.org/licenses/CDDL-1.0.
+# See the License for the specific language governing
+# permissions and limitations under the License.
+#
+# When distributing Covered Code, include this CDDL
+# HEADER in each file and include the License file at
+# LICENSE.txt  If applicable,
+# add the following below this CDDL HEADER, with the
+# fields enclosed by brackets "[]" replaced with your
+# own identifying information: Portions Copyright [yyyy]
+# [name of copyright owner]
+#
+# CDDL HEADER END
+
+# Copyright 2014-2017 Extreme Networks, Inc.  All rights reserved.
+# Use is subject to license terms.
+
+# This file is part of e2x (translate EOS switch configuration to ExtremeXOS)
+
+"""Structured messages of E2X.
+
+Translation functions report errors, warnings, and informational messages
+as a list of strings of the form 'LEVEL: text'. Messages that are created
+in large numbers, e.g. one per port or per VLAN, can instead be given as a
+Message record containing the level, a str.format() template, and its
+arguments. The message text is formatted on first use only, so records
+dropped because of their level are never formatted.
+
+A MessageLog is a sink collecting messages with a level equal to or higher
+than its own level, both strings and records. Strings are converted to
+records when they are added, so the level of a message is known without
+splitting its text again.
+
+Classes:
+Message is a message record with level, template, and arguments.
+MessageLog collects messages of a minimum level as records.
+
+Functions:
+severity(level) returns the severity of a message level.
+to_records(messages) converts a list of messages to a list of records.
+
+Variables:
+LEVELS is the tuple of message levels, ordered by severity.
+"""
+
+LEVELS = ('DEBUG', 'INFO', 'NOTICE', 'WARN', 'ERROR')
+_SEVERITY = {level: sev for sev, level in enumerate(LEVELS)}
+
+
+def severity(level):
+    """Return the severity of a message level, higher is more severe.
+
+    >>> severity('DEBUG') < severity('NOTICE') < severity('ERROR')
+    True
+    """
+    return _SEVERITY[level]
+
+
+class Message:
+
+    """A message record with a level, a template, and template arguments.
+
+    The text of the message is template.format(*args), it is created when
+    needed only. Arguments must not be changed after creating the record.
+    A record compares equal to the string 'LEVEL: text' of the message,
+    which is returned by str(). Other string methods are not supported,
+    use str() or the text property instead.
+
+    >>> m = Message('DEBUG', 'Ports of VLAN "{}": {}', 1, ['1', '2'])
+    >>> m.level
+    'DEBUG'
+    >>> str(m)
+    'DEBUG: Ports of VLAN "1": [\\'1\\', \\'2\\']'
+    >>> m == 'DEBUG: Ports of VLAN "1": [\\'1\\', \\'2\\']'
+    True
+    >>> Message.from_string('WARN: Could not map port ge.1.1').text
+    'Could not map port ge.1.1'
+    """
+
+    __slots__ = ('level', 'template', 'args')
+
+    def __init__(self, level, template, *args):
+        if level not in _SEVERITY:
+            raise ValueError('Unknown message level "' + str(level) + '"')
+        self.level = level
+        self.template = template
+        self.args = args
+
+    @classmethod
+    def from_string(cls, message):
+        """Create a record from a message string 'LEVEL: text'."""
+        level, _, text = message.partition(':')
+        if text.startswith(' '):
+            text = text[1:]
+        return cls(level.strip(), text)
+
+    @property
+    def text(self):
+        if self.args:
+            return self.template.format(*self.args)
+        return self.template
+
+    def with_level(self, level):
+        """Return a copy of the record using level."""
+        return Message(level, self.template, *self.args)
+
+    def startswith(self, prefix):
+        """Check if the message string starts with prefix.
+
+        Checking for a level prefix does not format the message text.
+        """
+        head = self.level + ': '
+        if len(prefix) <= len(head):
+            return head.startswith(prefix)
+        return str(self).startswith(prefix)
+
+    def __str__(self):
+        return self.level + ': ' + self.text
+
+    def __contains__(self, s):
+        return s in str(self)
+
+    def __repr__(self):
+        return 'Message(' + repr(str(self)) + ')'
+
+    def __eq__(self, other):
+        if isinstance(other, (Message, str)):
+            return str(self) == str(other)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(str(self))
+
+
+def to_records(messages):
+    """Convert a list of messages to a list of Message records.
+
+    Strings are split into lines, every non-empty line is converted to a
+    record. Records are used unchanged.
+
+    >>> to_records(['DEBUG: a\\nNOTICE: b', '', Message('INFO', 'c')])
+    [Message('DEBUG: a'), Message('NOTICE: b'), Message('INFO: c')]
+    """
+    records = []
+    for m in messages:
+        if isinstance(m, str):
+            records.extend(Message.from_string(l) for l in m.splitlines()
+                           if l)
+        elif m:
+            records.append(m)
+    return records
+
+
+class MessageLog:
+
+    """A logger-style sink for messages of at least a minimum level.
+
+    Messages below the level are dropped when added. Records are not
+    formatted to do this, thus messages that are not needed are never
+    formatted when they are logged as records, e.g. using debug().
+
+    Methods:
+    is_enabled_for(level) checks if messages of level are kept.
+    log(level, template, *args) adds a message created from a template.
+    debug(), info(), notice(), warn(), error() log using a fixed level.
+    add(message) adds a message string or record.
+    extend(messages) adds a list of message strings or records.
+
+    >>> log = MessageLog('NOTICE')
+    >>> log.debug('Ports: {}', ['1', '2'])
+    >>> log.extend(['INFO: dropped', Message('WARN', 'Port {}', 1)])
+    >>> log.records
+    [Message('WARN: Port 1')]
+    """
+
+    def __init__(self, level='DEBUG'):
+        self.level = level
+        self._min_severity = severity(level)
+        self.records = []
+
+    def is_enabled_for(self, level):
+        return _SEVERITY[level] >= self._min_severity
+
+    def log(self, level, template, *args):
+        if _SEVERITY[level] >= self._min_severity:
+            self.records.append(Message(level, template, *args))
+
+    def debug(self, template, *args):
+        self.log('DEBUG', template, *args)
+
+    def info(self, template, *args):
+        self.log('INFO', template, *args)
+
+    def notice(self, template, *args):
+        self.log('NOTICE', template, *args)
+
+    def warn(self, template, *args):
+        self.log('WARN', template, *args)
+
+    def error(self, template, *args):
+        self.log('ERROR', template, *args)
+
+    def add(self, message):
+        """Add a message string (possibly multi-line) or record."""
+        if isinstance(message, str):
+            for record in to_records([message]):
+                self.add(record)
+        elif message and _SEVERITY[message.level] >= self._min_severity:
+            self.records.append(message)
+
+    def extend(self, messages):
+        for m in messages:
+            self.add(m)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
+
+# vim:filetype=python:expandtab:shiftwidth=4:tabstop=4
@@ -0,0 +1,161 @@
+# CDDL HEADER START
+#
+# The contents of this file are subject to the terms
+# of the Common Development and Distribution License
+# (the "License").  You may not use this file except
+# in compliance with the License.
+#
+# You can obtain a copy of the license at
+# LICENSE.txt or http://opensource.org/licenses/CDDL-1.0.
+# See the License for the specific language governing
+# permissions and limitations under the License.
+#
+# When distributing Covered Code, include this CDDL
+# HEADER in each file and include the License file at
+# LICENSE.txt  If applicable,
+# add the following below this CDDL HEADER, with the
+# fields enclosed by brackets "[]" replaced with your
+# own identifying information: Portions Copyright [yyyy]
+# [name of copyright owner]
+#
+# CDDL HEADER END
+
+# Copyright 2014-2017 Extreme Networks, Inc.  All rights reserved.
+# Use is subject to license terms.
+
+# This file is part of e2x (translate EOS switch configuration to ExtremeXOS)
+
+"""Export the translated target switch model in a machine-readable format.
+
+The export describes the target switch after creating its configuration,
+i.e. including every change made while writing the configuration. It
+contains the port and LAG mappings from source to target switch, the
+ports, LAGs, VLANs with their port membership, spanning tree instances,
+ACLs with their XOS policies, and the messages of the translation.
+
+The JSON export is one object, written member by member and one array
+element at a time, so that the export of large stacks is never built in
+memory completely. Array elements are separated by newlines.
+
+Functions:
+write_json(out, switch, port_mapping, lag_mapping, messages) writes the
+JSON export of switch to the text file out.
+
+Variables:
+FORMAT_VERSION is the version of the export format.
+"""
+
+import json
+
+FORMAT_VERSION = 1
+
+
+def _port(port, t2s):
+    return {'name': port.get_name(),
+            'label': port.get_label(),
+            'source': t2s.get(port.get_name()),
+            'admin_state': port.get_admin_state(),
+            'auto_neg': port.get_auto_neg(),
+            'speed': port.get_speed(),
+            'duplex': port.get_duplex(),
+            'short_description': port.get_short_description(),
+            'description': port.get_description(),
+            'jumbo': port.get_jumbo(),
+            'lacp_enabled': port.get_lacp_enabled(),
+            'lacp_aadminkey': port.get_lacp_aadminkey(),
+            'stp_enabled': port.get_stp_enabled(),
+            'stp_edge': port.get_stp_edge(),
+            'stp_bpdu_guard': port.get_stp_bpdu_guard(),
+            'ipv4_acl_in': port.get_ipv4_acl_in()}
+
+
+def _lag(lag, t2s):
+    return {'name': lag.get_name(),
+            'source': t2s.get(lag.get_name()),
+            'master_port': lag.get_master_port(),
+            'members': lag.get_members(),
+            'lacp_enabled': lag.get_lacp_enabled(),
+            'lacp_aadminkey': lag.get_lacp_aadminkey(),
+            'short_description': lag.get_short_description(),
+            'description': lag.get_description()}
+
+
+def _vlan(vlan):
+    return {'tag': vlan.get_tag(),
+            'name': vlan.get_name(),
+            'untagged': vlan.get_egress_ports('untagged'),
+            'tagged': vlan.get_egress_ports('tagged'),
+            'untagged_ingress': vlan.get_ingress_ports('untagged'),
+            'ipv4_addresses': vlan.get_ipv4_addresses(),
+            'ipv4_helper_addresses': vlan.get_ipv4_helper_addresses(),
+            'ipv4_acl_in': vlan.get_ipv4_acl_in()}
+
+
+def _stp(stp):
+    return {'name': stp.get_name(),
+            'enabled': stp.is_enabled(),
+            'version': stp.get_version(),
+            'priority': stp.get_priority(),
+            'mst_instance': stp.get_mst_instance(),
+            'mst_cfgname': stp.get_mst_cfgname(),
+            'mst_rev': stp.get_mst_rev(),
+            'vlans': stp.get_vlans()}
+
+
+def _acl(acl, policies):
+    return {'name': acl.get_name(),
+            'number': acl.get_number(),
+            'policy': policies.get(acl.get_name())}
+
+
+def _message(message):
+    return {'level': message.level, 'text': message.text}
+
+
+def _dumps(value):
+    return json.dumps(value, default=str)
+
+
+def _write_array(out, items):
+    out.write('[')
+    sep = '\n'
+    for item in items:
+        out.write(sep + _dumps(item))
+        sep = ',\n'
+    out.write('\n]')
+
+
+def write_json(out, switch, port_mapping, lag_mapping, messages):
+    """Write the JSON export of switch to the text file out.
+
+    The switch must have created its configuration before. The port and
+    LAG mappings are given as (source to target, target to source) tuples
+    of dictionaries mapping port or LAG names, the messages as a list of
+    Message records.
+    """
+    port_s2t, port_t2s = port_mapping
+    lag_s2t, lag_t2s = lag_mapping
+    policies = {p[0]: ''.join(p[1:]).rstrip() + '\n'
+                for p in switch.get_written_config('acl')}
+    out.write('{"format_version": ' + _dumps(FORMAT_VERSION))
+    out.write(',\n"model": ' + _dumps(switch.get_model()))
+    out.write(',\n"os": ' + _dumps(switch.get_os()))
+    out.write(',\n"port_mapping": ' +
+              _dumps({'s2t': port_s2t, 't2s': port_t2s}))
+    out.write(',\n"lag_mapping": ' +
+              _dumps({'s2t': lag_s2t, 't2s': lag_t2s}))
+    out.write(',\n"ports": ')
+    _write_array(out, (_port(p, port_t2s) for p in switch.get_ports()))
+    out.write(',\n"lags": ')
+    _write_array(out, (_lag(l, lag_t2s) for l in switch.get_lags()))
+    out.write(',\n"vlans": ')
+    _write_array(out, (_vlan(v) for v in switch.get_all_vlans()))
+    out.write(',\n"stps": ')
+    _write_array(out, (_stp(s) for s in switch.get_stps()))
+    out.write(',\n"acls": ')
+    _write_array(out, (_acl(a, policies) for a in switch.get_acls()))
+    out.write(',\n"messages": ')
+    _write_array(out, (_message(m) for m in messages))
+    out.write('\n}\n')
+
+# vim:filetype=python:expandtab:shiftwidth=4:tabstop=4
@@ -0,0 +1,143 @@
+# CDDL HEADER START
+#
+# The contents of this file are subject to the terms
+# of the Common Development and Distribution License
+# (the "License").  You may not use this file except
+# in compliance with the License.
+#
+# You can obtain a copy of the license at
+# LICENSE.txt or http://opensource.org/licenses/CDDL-1.0.
+# See the License for the specific language governing
+# permissions and limitations under the License.
+#
+# When distributing Covered Code, include this CDDL
+# HEADER in each file and include the License file at
+# LICENSE.txt  If applicable,
+# add the following below this CDDL HEADER, with the
+# fields enclosed by brackets "[]" replaced with your
+# own identifying information: Portions Copyright [yyyy]
+# [name of copyright owner]
+#
+# CDDL HEADER END
+
+# Copyright 2014-2017 Extreme Networks, Inc.  All rights reserved.
+# Use is subject to license terms.
+
+# This file is part of e2x (translate EOS switch configuration to ExtremeXOS)
+
+"""Save and load the configured source switch model.
+
+A model file contains the state of a source switch after parsing a
+configuration, together with the unknown configuration lines and the
+messages of parsing. Loading a model file restores this state without
+parsing the configuration again, e.g. to translate it to other target
+switches or with other options.
+
+A model file starts with a header line giving the file format version
+and the switch model, followed by the compressed switch state. The state
+is stored using pickle, so model files must only be loaded from trusted
+sources. FORMAT_VERSION must be incremented whenever the model classes
+change in an incompatible way.
+
+Functions:
+save(path, switch, name, unknown, messages) saves the state of switch.
+load(path, create_switch) loads a model file using a new switch.
+
+Variables:
+FORMAT_VERSION is the version of the model file format.
+ModelData contains the data of a model file.
+"""
+
+import collections
+import io
+import pickle
+import zlib
+
+MAGIC = b'E2X-MODEL'
+FORMAT_VERSION = 3
+
+# name is the name of the parsed configuration file, unknown are the
+# unknown configuration lines, messages the Message records of parsing
+ModelData = collections.namedtuple(
+    'ModelData', ['switch', 'name', 'unknown', 'messages'])
+
+# the switch is referenced by parts of its state, e.g. VLANs, and stored
+# as a reference to the switch of the loading process
+_SWITCH_ID = 'switch'
+
+
+class _Pickler(pickle.Pickler):
+
+    def __init__(self, file, switch):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._switch = switch
+
+    def persistent_id(self, obj):
+        return _SWITCH_ID if obj is self._switch else None
+
+
+class _Unpickler(pickle.Unpickler):
+
+    def __init__(self, file, switch):
+        super().__init__(file)
+        self._switch = switch
+
+    def persistent_load(self, pid):
+        if pid != _SWITCH_ID:
+            raise pickle.UnpicklingError('unknown reference ' + repr(pid))
+        return self._switch
+
+
+def save(path, switch, name, unknown, messages):
+    """Save the configuration state of switch to the file path.
+
+    The name of the parsed configuration, the unknown configuration lines
+    and the messages of parsing are saved as well.
+    """
+    data = {'state': switch.snapshot(), 'name': name,
+            'unknown': list(unknown), 'messages': list(messages)}
+    buf = io.BytesIO()
+    _Pickler(buf, switch).dump(data)
+    header = b' '.join([MAGIC, str(FORMAT_VERSION).encode(),
+                        switch.get_model().encode()])
+    with open(path, 'wb') as f:
+        f.write(header + b'\n')
+        f.write(zlib.compress(buf.getvalue()))
+
+
+def load(path, create_switch):
+    """Load the model file path, return a ModelData tuple.
+
+    The function create_switch(model) must return a new switch of the
+    given model, or None if the model cannot be used. The state of the
+    new switch is restored from the file. Raise OSError if the file cannot
+    be read, and ValueError if it is not a valid model file.
+    """
+    with open(path, 'rb') as f:
+        header = f.readline().split()
+        body = f.read()
+    if len(header) != 3 or header[0] != MAGIC:
+        raise ValueError('"' + path + '" is not a model file')
+    version = header[1].decode(errors='replace')
+    if version != str(FORMAT_VERSION):
+        raise ValueError('Model file "' + path + '" uses format version ' +
+                         version + ', but version ' + str(FORMAT_VERSION) +
+                         ' is needed')
+    model = header[2].decode(errors='replace')
+    switch = create_switch(model)
+    if switch is None:
+        raise ValueError('Cannot create switch "' + model +
+                         '" of model file "' + path + '"')
+    try:
+        data = _Unpickler(io.BytesIO(zlib.decompress(body)), switch).load()
+        state = data['state']
+        if set(state) != set(switch.snapshot()):
+            raise ValueError('switch attributes differ')
+        switch.restore(state)
+        return ModelData(switch, data['name'], data['unknown'],
+                         data['messages'])
+    except Exception as e:
+        raise ValueError('Model file "' + path + '" is damaged or was saved '
+                         'by another version: ' + str(e)) from e
+
+# vim:filetype=python:expandtab:shiftwidth=4:tabstop=4
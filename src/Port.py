@@ -27,8 +27,11 @@
 
 """Model the attributes of a switch port."""
 
+import Schema
+from Utils import conf_value
 
-class Port:
+
+class Port(Schema.Tracked):
 
     """Model the attributes of a switch port.
 
@@ -38,6 +41,7 @@ class Port:
 
     Methods:
     init_conf_values() initializes configurable attributes.
+    is_dirty(feature) returns if the port has transferred, unwritten values.
     is_configured() returns if the port has been configured.
     is_equivalent(port) returns if this port can be used in the same role as
     the given port.
@@ -45,6 +49,33 @@ class Port:
     this port.
     """
 
+    __slots__ = ('_label', '_name', '_connector', '_connector_used',
+                 '_allowed_speeds', '_poe', '_is_hardware', '_speed',
+                 '_admin_state', '_duplex', '_auto_neg', '_description',
+                 '_short_description', '_jumbo', '_lacp_enabled',
+                 '_lacp_aadminkey', '_stp_enabled', '_stp_auto_edge',
+                 '_stp_edge', '_stp_bpdu_guard',
+                 '_stp_bpdu_guard_recovery_time', '_ipv4_acl_in', '_dirty')
+
+    # configurable attributes transferred by transfer_config()
+    SCHEMA = Schema.Schema([
+        Schema.Attribute('speed', feature='port'),
+        Schema.Attribute('duplex', feature='port'),
+        Schema.Attribute('auto_neg', feature='port'),
+        Schema.Attribute('admin_state', skip_none=False, feature='port'),
+        Schema.Attribute('description', skip_none=False, feature='port'),
+        Schema.Attribute('short_description', skip_none=False, feature='port'),
+        Schema.Attribute('jumbo', feature='port'),
+        Schema.Attribute('lacp_enabled', skip_none=False, feature='lag'),
+        Schema.Attribute('lacp_aadminkey', skip_none=False, feature='lag'),
+        Schema.Attribute('stp_enabled', skip_none=False, feature='stp'),
+        Schema.Attribute('stp_auto_edge', skip_none=False, feature='stp'),
+        Schema.Attribute('stp_edge', skip_none=False, feature='stp'),
+        Schema.Attribute('stp_bpdu_guard', skip_none=False, feature='stp'),
+        Schema.Attribute('stp_bpdu_guard_recovery_time', skip_none=False,
+                         feature='stp'),
+        Schema.Attribute('ipv4_acl_in', feature='port')])
+
     def __init__(self, label, name, data, is_hardware=True):
         self._label = label
         self._name = name
@@ -84,7 +115,19 @@ class Port:
         description += 'Inbound ACL: ' + str(self._ipv4_acl_in[0])
         return description
 
+    def __deepcopy__(self, memo):
+        """Copy the port, sharing the immutable attribute values."""
+        port = object.__new__(type(self))
+        memo[id(self)] = port
+        for cls in type(self).__mro__:
+            for attr in getattr(cls, '__slots__', ()):
+                object.__setattr__(port, attr, getattr(self, attr))
+        port._dirty = dict(self._dirty)
+        port._ipv4_acl_in = (list(self._ipv4_acl_in[0]), self._ipv4_acl_in[1])
+        return port
+
     def init_conf_values(self):
+        self._dirty = {}
         self._speed = (None, None)
         self._admin_state = (None, None)
         self._duplex = (None, None)
@@ -153,7 +196,7 @@ class Port:
     def set_speed(self, speed, reason):
         if speed not in self._allowed_speeds:
             return False
-        self._speed = (speed, reason)
+        self._speed = conf_value(speed, reason)
         return True
 
     def get_duplex(self):
@@ -163,7 +206,7 @@ class Port:
         return self._duplex[1]
 
     def set_duplex(self, mode, reason):
-        self._duplex = (mode, reason)
+        self._duplex = conf_value(mode, reason)
         return self._duplex[0]
 
     def get_auto_neg(self):
@@ -173,7 +216,7 @@ class Port:
         return self._auto_neg[1]
 
     def set_auto_neg(self, state, reason):
-        self._auto_neg = (bool(state), reason)
+        self._auto_neg = conf_value(bool(state), reason)
         return self._auto_neg[0]
 
     def get_admin_state(self):
@@ -183,7 +226,7 @@ class Port:
         return self._admin_state[1]
 
     def set_admin_state(self, state, reason):
-        self._admin_state = (bool(state), reason)
+        self._admin_state = conf_value(bool(state), reason)
         return self._admin_state[0]
 
     def get_description(self):
@@ -193,7 +236,7 @@ class Port:
         return self._description[1]
 
     def set_description(self, desc, reason):
-        self._description = (desc, reason)
+        self._description = conf_value(desc, reason)
         return self._description[0]
 
     def get_short_description(self):
@@ -203,7 +246,7 @@ class Port:
         return self._short_description[1]
 
     def set_short_description(self, desc, reason):
-        self._short_description = (desc, reason)
+        self._short_description = conf_value(desc, reason)
         return self._short_description[0]
 
     def get_jumbo(self):
@@ -213,7 +256,7 @@ class Port:
         return self._jumbo[1]
 
     def set_jumbo(self, state, reason):
-        self._jumbo = (bool(state), reason)
+        self._jumbo = conf_value(bool(state), reason)
         return self._jumbo[0]
 
     def get_lacp_enabled(self):
@@ -223,7 +266,7 @@ class Port:
         return self._lacp_enabled[1]
 
     def set_lacp_enabled(self, state, reason):
-        self._lacp_enabled = (bool(state), reason)
+        self._lacp_enabled = conf_value(bool(state), reason)
         return self._lacp_enabled[0]
 
     def get_lacp_aadminkey(self):
@@ -239,7 +282,7 @@ class Port:
             return None
         if key < 0 or key > 65535:
             return None
-        self._lacp_aadminkey = (key, reason)
+        self._lacp_aadminkey = conf_value(key, reason)
         return self._lacp_aadminkey[0]
 
     def get_stp_enabled(self):
@@ -249,7 +292,7 @@ class Port:
         return self._stp_enabled[1]
 
     def set_stp_enabled(self, state, reason):
-        self._stp_enabled = (bool(state), reason)
+        self._stp_enabled = conf_value(bool(state), reason)
         return self._stp_enabled[0]
 
     def enable_stp(self, reason):
@@ -265,7 +308,7 @@ class Port:
         return self._stp_auto_edge[1]
 
     def set_stp_auto_edge(self, state, reason):
-        self._stp_auto_edge = (bool(state), reason)
+        self._stp_auto_edge = conf_value(bool(state), reason)
         return self._stp_auto_edge[0]
 
     def get_stp_edge(self):
@@ -275,7 +318,7 @@ class Port:
         return self._stp_edge[1]
 
     def set_stp_edge(self, state, reason):
-        self._stp_edge = (bool(state), reason)
+        self._stp_edge = conf_value(bool(state), reason)
         return self._stp_edge[0]
 
     def get_stp_bpdu_guard(self):
@@ -285,7 +328,7 @@ class Port:
         return self._stp_bpdu_guard[1]
 
     def set_stp_bpdu_guard(self, state, reason):
-        self._stp_bpdu_guard = (bool(state), reason)
+        self._stp_bpdu_guard = conf_value(bool(state), reason)
         return self._stp_bpdu_guard[0]
 
     def get_stp_bpdu_guard_recovery_time(self):
@@ -299,7 +342,7 @@ class Port:
             rec_time = int(time)
         except:
             return self._stp_bpdu_guard_recovery_time[0]
-        self._stp_bpdu_guard_recovery_time = (rec_time, reason)
+        self._stp_bpdu_guard_recovery_time = conf_value(rec_time, reason)
         return self._stp_bpdu_guard_recovery_time[0]
 
     def get_ipv4_acl_in(self):
@@ -310,21 +353,21 @@ class Port:
 
     def set_ipv4_acl_in(self, acl_id, reason):
         tmp_acl_lst = [acl_id]
-        self._ipv4_acl_in = (tmp_acl_lst, reason)
+        self._ipv4_acl_in = conf_value(tmp_acl_lst, reason)
         return self._ipv4_acl_in[0]
 
     def add_ipv4_acl_in(self, acl_id, reason):
         if acl_id not in self._ipv4_acl_in[0]:
             tmp_acl_lst = self._ipv4_acl_in[0]
             tmp_acl_lst.append(acl_id)
-            self._ipv4_acl_in = (tmp_acl_lst, reason)
+            self._ipv4_acl_in = conf_value(tmp_acl_lst, reason)
         return self._ipv4_acl_in[0]
 
     def del_ipv4_acl_in(self, acl_id, reason):
         tmp_acl_lst = self._ipv4_acl_in[0]
         if acl_id in tmp_acl_lst:
             tmp_acl_lst.remove(acl_id)
-        self._ipv4_acl_in = (tmp_acl_lst, reason)
+        self._ipv4_acl_in = conf_value(tmp_acl_lst, reason)
         return self._ipv4_acl_in[0]
 
     def is_equivalent(self, port):
@@ -352,117 +395,6 @@ class Port:
 
         """Transfer configuration of from_port to this port."""
 
-        reason_def = 'transfer_def'
-        reason_conf = 'transfer_conf'
-
-        t_speed = from_port.get_speed()
-        if t_speed is not None and self._speed[0] != t_speed:
-            if from_port.get_speed_reason() == 'default':
-                self._speed = (t_speed, reason_def)
-            else:
-                self._speed = (t_speed, reason_conf)
-
-        t_duplex = from_port.get_duplex()
-        if t_duplex is not None and self._duplex[0] != t_duplex:
-            if from_port.get_duplex_reason() == 'default':
-                self._duplex = (t_duplex, reason_def)
-            else:
-                self._duplex = (t_duplex, reason_conf)
-
-        t_auto_neg = from_port.get_auto_neg()
-        if t_auto_neg is not None and self._auto_neg[0] != t_auto_neg:
-            if from_port.get_auto_neg_reason() == 'default':
-                self._auto_neg = (t_auto_neg, reason_def)
-            else:
-                self._auto_neg = (t_auto_neg, reason_conf)
-
-        t_admin_state = from_port.get_admin_state()
-        if self._admin_state[0] != t_admin_state:
-            if from_port.get_admin_state_reason() == 'default':
-                self._admin_state = (t_admin_state, reason_def)
-            else:
-                self._admin_state = (t_admin_state, reason_conf)
-
-        t_description = from_port.get_description()
-        if self._description[0] != t_description:
-            if from_port.get_description_reason() == 'default':
-                self._description = (t_description, reason_def)
-            else:
-                self._description = (t_description, reason_conf)
-
-        t_short_description = from_port.get_short_description()
-        if self._short_description[0] != t_short_description:
-            if from_port.get_short_description_reason() == 'default':
-                self._short_description = (t_short_description, reason_def)
-            else:
-                self._short_description = (t_short_description, reason_conf)
-
-        t_jumbo = from_port.get_jumbo()
-        if t_jumbo is not None and self._jumbo[0] != t_jumbo:
-            if from_port.get_jumbo_reason() == 'default':
-                self._jumbo = (t_jumbo, reason_def)
-            else:
-                self._jumbo = (t_jumbo, reason_conf)
-
-        t_lacp_enabled = from_port.get_lacp_enabled()
-        if self._lacp_enabled[0] != t_lacp_enabled:
-            t_reason = (reason_def
-                        if from_port.get_lacp_enabled_reason() == 'default'
-                        else reason_conf)
-            self._lacp_enabled = (t_lacp_enabled, t_reason)
-
-        t_lacp_aadminkey = from_port.get_lacp_aadminkey()
-        if self._lacp_aadminkey[0] != t_lacp_aadminkey:
-            t_reason = (reason_def
-                        if from_port.get_lacp_aadminkey_reason() == 'default'
-                        else reason_conf)
-            self._lacp_aadminkey = (t_lacp_aadminkey, t_reason)
-
-        t_stp_enabled = from_port.get_stp_enabled()
-        if self._stp_enabled[0] != t_stp_enabled:
-            t_reason = (reason_def
-                        if from_port.get_stp_enabled_reason() == 'default'
-                        else reason_conf)
-            self._stp_enabled = (t_stp_enabled, t_reason)
-
-        t_stp_auto_edge = from_port.get_stp_auto_edge()
-        if self._stp_auto_edge[0] != t_stp_auto_edge:
-            t_reason = (reason_def
-                        if from_port.get_stp_auto_edge_reason() == 'default'
-                        else reason_conf)
-            self._stp_auto_edge = (t_stp_auto_edge, t_reason)
-
-        t_stp_edge = from_port.get_stp_edge()
-        if self._stp_edge[0] != t_stp_edge:
-            t_reason = (reason_def
-                        if from_port.get_stp_edge_reason() == 'default'
-                        else reason_conf)
-            self._stp_edge = (t_stp_edge, t_reason)
-
-        t_stp_bpdu_guard = from_port.get_stp_bpdu_guard()
-        if self._stp_bpdu_guard[0] != t_stp_bpdu_guard:
-            t_reason = (reason_def
-                        if from_port.get_stp_bpdu_guard_reason() == 'default'
-                        else reason_conf)
-            self._stp_bpdu_guard = (t_stp_bpdu_guard, t_reason)
-
-        t_stp_bpdu_guard_recovery_time = \
-            from_port.get_stp_bpdu_guard_recovery_time()
-        if (self._stp_bpdu_guard_recovery_time[0] !=
-                t_stp_bpdu_guard_recovery_time):
-            t_reason = \
-                (reason_def
-                 if (from_port.get_stp_bpdu_guard_recovery_time_reason() ==
-                     'default')
-                 else reason_conf)
-            self._stp_bpdu_guard_recovery_time = \
-                (t_stp_bpdu_guard_recovery_time, t_reason)
-
-        t_ipv4_acl_in = from_port.get_ipv4_acl_in()
-        if t_ipv4_acl_in is not None and self._ipv4_acl_in[0] != t_ipv4_acl_in:
-            if from_port.get_ipv4_acl_in_reason() == 'default':
-                self._ipv4_acl_in = (t_ipv4_acl_in, reason_def)
-            else:
-                self._ipv4_acl_in = (t_ipv4_acl_in, reason_conf)
+        self.SCHEMA.transfer(self, from_port)
 
 # vim:filetype=python:expandtab:shiftwidth=4:tabstop=4
@@ -25,7 +25,50 @@
 
 # This file is part of e2x (translate EOS switch configuration to ExtremeXOS)
 
-"""Model the Spanning Tree Protocol (STP)."""
+"""Model the Spanning Tree Protocol (STP).
+
+The VLANs mapped to an STP instance are kept in a VLAN bitmap, i.e. an int
+with bit n set if VLAN tag n is mapped. Bitmaps are immutable and allow
+bulk operations and intersections in linear time.
+
+Classes:
+STP models a Spanning Tree Protocol instance.
+
+Functions:
+vlan_bitmap(vlan_tags) returns the VLAN bitmap of an iterable of VLAN tags.
+vlan_tags(bitmap) returns the sorted list of VLAN tags in a VLAN bitmap.
+"""
+
+import Schema
+from Utils import conf_value
+
+# number of VLAN tags that fit into a VLAN bitmap
+_VLAN_TAGS = 4096
+
+
+def vlan_bitmap(vlan_tags):
+    """Return the VLAN bitmap of the VLAN tags (ints from 0 to 4095).
+
+    >>> bin(vlan_bitmap([1, 3, 1]))
+    '0b1010'
+    """
+    octets = bytearray(_VLAN_TAGS // 8)
+    for tag in vlan_tags:
+        octets[tag >> 3] |= 1 << (tag & 7)
+    return int.from_bytes(octets, 'little')
+
+
+def vlan_tags(bitmap):
+    """Return the sorted list of VLAN tags in the VLAN bitmap.
+
+    >>> vlan_tags(0b1010)
+    [1, 3]
+    """
+    bits = bin(bitmap)[:1:-1]
+    return [tag for tag, bit in enumerate(bits) if bit == '1']
+
+# bitmap of all VLAN tags usable on a switch
+_ALL_VLANS = vlan_bitmap(range(1, 4095))
 
 
 class STP():
@@ -39,15 +82,30 @@ class STP():
     this STP.
     """
 
+    __slots__ = ('_name', '_enabled', '_version', '_priority', '_mst_cfgname',
+                 '_mst_rev', '_mst_instance', '_vlans')
+
+    # configurable attributes transferred by transfer_config(), the state
+    # and the VLANs are transferred explicitly
+    SCHEMA = Schema.Schema([
+        Schema.Attribute('name'),
+        Schema.Attribute('version'),
+        Schema.Attribute('priority'),
+        Schema.Attribute('mst_cfgname'),
+        Schema.Attribute('mst_rev'),
+        Schema.Attribute('mst_instance')],
+        Schema.transfer_reason_if_config)
+
     def __init__(self, name=None, version=None, enabled=None):
-        self._name = (name, None)
-        self._enabled = (enabled, None)
-        self._version = (version, None)
+        self._name = conf_value(name, None)
+        self._enabled = conf_value(enabled, None)
+        self._version = conf_value(version, None)
         self._priority = (None, None)
         self._mst_cfgname = (None, None)    # only used with MST instance 0
         self._mst_rev = (None, None)        # only used with MST instance 0
         self._mst_instance = (None, None)
-        self._vlans = ([], None)
+        # VLAN bitmaps are not put into the shared conf_value() table
+        self._vlans = (0, None)
 
     def __str__(self):
         description = 'Name: ' + str(self._name[0]) + ', '
@@ -55,7 +113,7 @@ class STP():
         description += ('enabled' if self._enabled else 'disabled') + ', '
         description += 'Version: ' + str(self._version[0]) + ', '
         description += 'Priority: ' + str(self._priority[0]) + ', '
-        description += 'VLANs: ' + str(self._vlans[0]) + ', '
+        description += 'VLANs: ' + str(self.get_vlans()) + ', '
         if (self._version is not None and
                 isinstance(self._version[0], str) and
                 self._version[0].lower() == 'mstp'):
@@ -67,8 +125,19 @@ class STP():
             description += str(self._mst_instance[0]) + ', '
         return description
 
+    def __deepcopy__(self, memo):
+        """Copy the STP, sharing the immutable attribute values."""
+        stp = object.__new__(type(self))
+        memo[id(self)] = stp
+        for attr in self.__slots__:
+            setattr(stp, attr, getattr(self, attr))
+        return stp
+
     def __eq__(self, other):
-        return self.__dict__ == other.__dict__
+        # STPs of a switch differ mostly in the MST instance
+        return (self._mst_instance == other._mst_instance and
+                all(getattr(self, a) == getattr(other, a)
+                    for a in self.__slots__))
 
     def is_basic_stp_config(self):
         """Return True if this config is just a basic STP.
@@ -77,8 +146,7 @@ class STP():
         Extend this if more complex STP variants are added to possible
         input configurations (e.g. Extreme XOS STP configs).
         """
-        _vlans = list(range(1, 4095))
-        is_vlans_equal = len(set(_vlans).difference(self._vlans[0])) == 0
+        is_vlans_equal = _ALL_VLANS & ~self._vlans[0] == 0
         is_cfg_none = self._mst_cfgname[0] is None
         is_mst_rev_0 = self._mst_rev[0] == 0
         is_mst_instance_0 = self._mst_instance[0] == 0
@@ -97,14 +165,14 @@ class STP():
         return self._enabled[1]
 
     def set_enabled(self, state, reason):
-        self._enabled = (bool(state), reason)
+        self._enabled = conf_value(bool(state), reason)
         return self._enabled[0]
 
     def enable(self, reason):
-        self._enabled = (True, reason)
+        self._enabled = conf_value(True, reason)
 
     def disable(self, reason):
-        self._enabled = (False, reason)
+        self._enabled = conf_value(False, reason)
 
     def get_name(self):
         return self._name[0]
@@ -113,7 +181,7 @@ class STP():
         return self._name[1]
 
     def set_name(self, name, reason):
-        self._name = (name, reason)
+        self._name = conf_value(name, reason)
         return self._name[0]
 
     def get_version(self):
@@ -123,7 +191,7 @@ class STP():
         return self._version[1]
 
     def set_version(self, version, reason):
-        self._version = (version, reason)
+        self._version = conf_value(version, reason)
         return self._version[0]
 
     def get_priority(self):
@@ -139,7 +207,7 @@ class STP():
             return None
         if prio < 0 or prio > 65535:
             return self._priority[0]
-        self._priority = (prio, reason)
+        self._priority = conf_value(prio, reason)
         return self._priority[0]
 
     def get_mst_cfgname(self):
@@ -149,7 +217,7 @@ class STP():
         return self._mst_cfgname[1]
 
     def set_mst_cfgname(self, mst_cfgname, reason):
-        self._mst_cfgname = (mst_cfgname, reason)
+        self._mst_cfgname = conf_value(mst_cfgname, reason)
         return self._mst_cfgname[0]
 
     def get_mst_rev(self):
@@ -163,7 +231,7 @@ class STP():
             rev = int(mst_rev)
         except:
             return self._mst_rev[0]
-        self._mst_rev = (rev, reason)
+        self._mst_rev = conf_value(rev, reason)
         return self._mst_rev[0]
 
     def get_mst_instance(self):
@@ -177,12 +245,18 @@ class STP():
             instance = int(mst_instance)
         except:
             return self._mst_instance[0]
-        self._mst_instance = (instance, reason)
+        self._mst_instance = conf_value(instance, reason)
         return self._mst_instance[0]
 
     def get_vlans(self):
+        return vlan_tags(self._vlans[0])
+
+    def get_vlan_bitmap(self):
         return self._vlans[0]
 
+    def has_vlan(self, vlan_tag):
+        return bool(self._vlans[0] >> vlan_tag & 1)
+
     def get_vlans_reason(self):
         return self._vlans[1]
 
@@ -191,69 +265,39 @@ class STP():
         return self._vlans[1]
 
     def add_vlan(self, vlan_tag, reason):
-        vlan_list = self._vlans[0][:]
-        if vlan_tag not in vlan_list:
-            vlan_list.append(vlan_tag)
-        self._vlans = (vlan_list, reason)
+        self._vlans = (self._vlans[0] | 1 << vlan_tag, reason)
 
     def add_vlans(self, vlan_tag_list, reason):
-        for vlan_tag in vlan_tag_list:
-            self.add_vlan(vlan_tag, reason)
+        bitmap = vlan_bitmap(vlan_tag_list)
+        if bitmap:
+            self._vlans = (self._vlans[0] | bitmap, reason)
 
     def del_vlan(self, vlan_tag, reason):
-        vlan_list = self._vlans[0][:]
-        if vlan_tag in vlan_list:
-            vlan_list.remove(vlan_tag)
-            self._vlans = (vlan_list, reason)
+        if self.has_vlan(vlan_tag):
+            self._vlans = (self._vlans[0] & ~(1 << vlan_tag), reason)
 
     def del_vlans(self, vlan_tag_list, reason):
-        for vlan_tag in vlan_tag_list:
-            self.del_vlan(vlan_tag, reason)
+        bitmap = self._vlans[0] & vlan_bitmap(vlan_tag_list)
+        if bitmap:
+            self._vlans = (self._vlans[0] & ~bitmap, reason)
 
     def transfer_config(self, from_stp):
-
-        def trans_reason(r):
-            return 'transfer_conf' if r == 'config' else 'transfer_def'
-
-        from_name = from_stp.get_name()
-        if from_name is not None and from_name != self._name[0]:
-            self._name = (from_name, trans_reason(from_stp.get_name_reason()))
+        self.SCHEMA.transfer(self, from_stp)
 
         from_enabled = from_stp.is_enabled()
         if from_enabled != self.is_enabled():
             from_reason = from_stp.get_enabled_reason()
-            self._enabled = (from_enabled, trans_reason(from_reason))
-
-        from_version = from_stp.get_version()
-        if from_version is not None and from_version != self._version[0]:
-            from_reason = from_stp.get_version_reason()
-            self._version = (from_version, trans_reason(from_reason))
-
-        from_priority = from_stp.get_priority()
-        if from_priority is not None and from_priority != self._priority[0]:
-            from_reason = from_stp.get_priority_reason()
-            self._priority = (from_priority, trans_reason(from_reason))
-
-        from_mst_cfgname = from_stp.get_mst_cfgname()
-        if (from_mst_cfgname is not None and
-                from_mst_cfgname != self._mst_cfgname[0]):
-            from_reason = from_stp.get_mst_cfgname_reason()
-            self._mst_cfgname = (from_mst_cfgname, trans_reason(from_reason))
-
-        from_mst_rev = from_stp.get_mst_rev()
-        if from_mst_rev is not None and from_mst_rev != self._mst_rev[0]:
-            from_reason = from_stp.get_mst_rev_reason()
-            self._mst_rev = (from_mst_rev, trans_reason(from_reason))
-
-        from_mst_instance = from_stp.get_mst_instance()
-        if (from_mst_instance is not None and
-                self._mst_instance[0] != from_mst_instance):
-            from_reason = from_stp.get_mst_instance_reason()
-            self._mst_instance = (from_mst_instance, trans_reason(from_reason))
-
-        from_vlans = from_stp.get_vlans()
-        if from_vlans and from_vlans != self._vlans:
+            self._enabled = conf_value(
+                from_enabled, Schema.transfer_reason_if_config(from_reason))
+
+        from_vlans = from_stp.get_vlan_bitmap()
+        if from_vlans and from_vlans != self._vlans[0]:
             from_reason = from_stp.get_vlans_reason()
-            self._vlans = (from_vlans, trans_reason(from_reason))
+            self._vlans = (from_vlans,
+                           Schema.transfer_reason_if_config(from_reason))
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
 
 # vim:filetype=python:expandtab:shiftwidth=4:tabstop=4
@@ -0,0 +1,198 @@
+# CDDL HEADER START
+#
+# The contents of this file are subject to the terms
+# of the Common Development and Distribution License
+# (the "License").  You may not use this file except
+# in compliance with the License.
+#
+# You can obtain a copy of the license at
+# LICENSE.txt or http://opensource.org/licenses/CDDL-1.0.
+# See the License for the specific language governing
+# permissions and limitations under the License.
+#
+# When distributing Covered Code, include this CDDL
+# HEADER in each file and include the License file at
+# LICENSE.txt  If applicable,
+# add the following below this CDDL HEADER, with the
+# fields enclosed by brackets "[]" replaced with your
+# own identifying information: Portions Copyright [yyyy]
+# [name of copyright owner]
+#
+# CDDL HEADER END
+
+# Copyright 2014-2017 Extreme Networks, Inc.  All rights reserved.
+# Use is subject to license terms.
+
+# This file is part of e2x (translate EOS switch configuration to ExtremeXOS)
+
+"""Declarative schema of the configurable attributes of model classes.
+
+Model classes store a configurable attribute NAME as a (value, reason)
+tuple in the attribute _NAME, and provide the getters get_NAME() and
+get_NAME_reason(). A Schema lists these attributes once, so generic code
+can handle all of them in a single loop over a precomputed list instead
+of one hand-written block per attribute. Adding an attribute to the
+schema of a model class is all that is needed to transfer it.
+
+Classes:
+Attribute describes one configurable attribute of a model class.
+Schema is the list of configurable attributes of a model class.
+Tracked is a mixin tracking attributes with transferred, unwritten values.
+
+Functions:
+transfer_reason(reason) returns the transfer reason for a source reason,
+'transfer_def' for defaults and 'transfer_conf' otherwise.
+transfer_reason_if_config(reason) returns the transfer reason for a source
+reason, 'transfer_conf' for configured values and 'transfer_def' otherwise.
+"""
+
+import collections
+import operator
+
+from Utils import conf_value
+
+# name is the attribute name, skip_none prevents transferring None values,
+# feature is the feature module writing the attribute
+Attribute = collections.namedtuple('Attribute',
+                                   ['name', 'skip_none', 'feature'])
+Attribute.__new__.__defaults__ = (True, None)
+
+
+def transfer_reason(reason):
+    """Return 'transfer_def' for 'default', 'transfer_conf' otherwise.
+
+    >>> transfer_reason('default'), transfer_reason('config')
+    ('transfer_def', 'transfer_conf')
+    """
+    return 'transfer_def' if reason == 'default' else 'transfer_conf'
+
+
+def transfer_reason_if_config(reason):
+    """Return 'transfer_conf' for 'config', 'transfer_def' otherwise.
+
+    >>> transfer_reason_if_config('config'), transfer_reason_if_config(None)
+    ('transfer_conf', 'transfer_def')
+    """
+    return 'transfer_conf' if reason == 'config' else 'transfer_def'
+
+
+class Schema:
+
+    """The configurable attributes of a model class.
+
+    A schema is assigned to the model class attribute SCHEMA. Getters of
+    the model class must return the elements of the (value, reason) tuple
+    of an attribute, so instances of the model class can be handled by
+    accessing the tuples directly, as transfer() is run for every port of
+    every translated configuration.
+
+    Methods:
+    names() returns the names of the attributes.
+    transfer(target, source) transfers all attributes from source to target.
+    """
+
+    def __init__(self, attributes, reason=transfer_reason):
+        self.attributes = tuple(attributes)
+        self._reason = reason
+        self._owner = None
+        # attribute by slot name, used by Tracked
+        self.tracked = {'_' + a.name: a for a in self.attributes}
+        # (slot, value getter, reason getter, skip None) per attribute
+        self._plan = tuple(
+            ('_' + a.name, operator.methodcaller('get_' + a.name),
+             operator.methodcaller('get_' + a.name + '_reason'), a.skip_none)
+            for a in self.attributes)
+
+    def __set_name__(self, owner, name):
+        # called with Python 3.6 or newer only, without an owner transfer()
+        # uses the getters of the source
+        self._owner = owner
+
+    def names(self):
+        return [a.name for a in self.attributes]
+
+    def transfer(self, target, source):
+        """Transfer the attributes of source to target.
+
+        An attribute is transferred if its value differs from the value
+        of the target. Source need not be an instance of the model class,
+        its getters are used in this case. The reason of a transferred
+        attribute is derived from the reason of the source attribute.
+        Return the names of the transferred attributes.
+        """
+        # type() instead of isinstance(), as mocks may claim to be instances
+        tuples = self._owner is not None and issubclass(type(source),
+                                                        self._owner)
+        reason = self._reason
+        transferred = []
+        for slot, get_value, get_reason, skip_none in self._plan:
+            if tuples:
+                value, source_reason = getattr(source, slot)
+            else:
+                value, source_reason = get_value(source), None
+            if value is None and skip_none:
+                continue
+            if getattr(target, slot)[0] != value:
+                if not tuples:
+                    source_reason = get_reason(source)
+                setattr(target, slot, conf_value(value,
+                                                 reason(source_reason)))
+                transferred.append(slot[1:])
+        return transferred
+
+
+class Tracked:
+
+    """Track the attributes of SCHEMA with transferred, unwritten values.
+
+    An attribute set with a reason starting with 'transfer' is dirty until
+    it is set with a different reason, e.g. 'written' by a ConfigWriter.
+    Writers and ConfigWriter.check_unwritten() use this to skip objects
+    without transferred settings. The subclass must provide the attribute
+    _dirty, initialized to an empty dictionary before the attributes of
+    SCHEMA are set.
+
+    Methods:
+    is_dirty(feature) returns if any attribute of feature is dirty.
+    get_dirty(feature) returns the names of the dirty attributes of feature.
+    """
+
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        attribute = self.SCHEMA.tracked.get(name)
+        if attribute is not None:
+            reason = value[1]
+            if reason is not None and reason.startswith('transfer'):
+                self._dirty[attribute.name] = attribute.feature
+            else:
+                self._dirty.pop(attribute.name, None)
+
+    def __setstate__(self, state):
+        # unpickling restores the saved _dirty, do not track the attributes
+        if isinstance(state, tuple):
+            dict_state, slot_state = state
+        else:
+            dict_state, slot_state = state, None
+        for part in (dict_state, slot_state):
+            for name, value in (part or {}).items():
+                object.__setattr__(self, name, value)
+
+    def is_dirty(self, feature=None):
+        """Return if an attribute of feature, or any feature, is dirty."""
+        if feature is None:
+            return bool(self._dirty)
+        return feature in self._dirty.values()
+
+    def get_dirty(self, feature=None):
+        """Return the names of the dirty attributes of feature, or all."""
+        return {name for name, f in self._dirty.items()
+                if feature is None or f == feature}
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
+
+# vim:filetype=python:expandtab:shiftwidth=4:tabstop=4
@@ -30,12 +30,16 @@
 Classes:
 Switch represents a generic switch. Usually subclassed for vendors.
 CmdInterpreter applies a given configuration. Needs to be subclassed.
+ParseStats collects statistics of parsing configuration lines.
 ConfigWriter writes configuration commands. Needs to be subclassed.
 """
 
 import cmd
+import copy
 import ipaddress
 import json
+import threading
+import time
 
 import ACL
 import Account
@@ -45,12 +49,13 @@ import RadiusServer
 import SnmpTargetAddr
 import SnmpTargetParams
 import SntpServer
+import Schema
 import SyslogServer
 import TacacsServer
 import VLAN
 
 
-class Switch:
+class Switch(Schema.Tracked):
 
     """Model of a generic switch, usually subclassed.
 
@@ -61,6 +66,48 @@ class Switch:
 
     DEFAULT_PORT_NAME = 'nn'
 
+    # attributes not part of a configuration snapshot
+    _NO_SNAPSHOT_ATTRIBUTES = {'_cmd', '_writer'}
+
+    # configurable attributes transferred by transfer_config()
+    SCHEMA = Schema.Schema([
+        Schema.Attribute('lacp_support', skip_none=False, feature='lag'),
+        Schema.Attribute('max_lag', skip_none=False, feature='lag'),
+        Schema.Attribute('single_port_lag', skip_none=False, feature='lag'),
+        Schema.Attribute('prompt', feature='mgmt'),
+        Schema.Attribute('snmp_sys_name', feature='mgmt'),
+        Schema.Attribute('snmp_sys_contact', feature='mgmt'),
+        Schema.Attribute('snmp_sys_location', feature='mgmt'),
+        Schema.Attribute('banner_login_ack', feature='mgmt'),
+        Schema.Attribute('banner_login', feature='mgmt'),
+        Schema.Attribute('banner_motd', feature='mgmt'),
+        Schema.Attribute('telnet_inbound', feature='mgmt'),
+        Schema.Attribute('telnet_outbound', feature='mgmt'),
+        Schema.Attribute('ssh_inbound', feature='mgmt'),
+        Schema.Attribute('ssh_outbound', feature='mgmt'),
+        Schema.Attribute('ssl', feature='mgmt'),
+        Schema.Attribute('http', feature='mgmt'),
+        Schema.Attribute('http_secure', feature='mgmt'),
+        Schema.Attribute('mgmt_ip', feature='mgmt'),
+        Schema.Attribute('mgmt_mask', feature='mgmt'),
+        Schema.Attribute('mgmt_vlan', feature='mgmt'),
+        Schema.Attribute('mgmt_gw', feature='mgmt'),
+        Schema.Attribute('mgmt_protocol', feature='mgmt'),
+        Schema.Attribute('idle_timer', feature='mgmt'),
+        Schema.Attribute('sntp_client', feature='mgmt'),
+        Schema.Attribute('ipv4_routing', feature='basic_layer_3'),
+        Schema.Attribute('tz_name', feature='mgmt'),
+        Schema.Attribute('tz_off_min', feature='mgmt'),
+        Schema.Attribute('tz_dst_state', feature='mgmt'),
+        Schema.Attribute('tz_dst_name', feature='mgmt'),
+        Schema.Attribute('tz_dst_start', feature='mgmt'),
+        Schema.Attribute('tz_dst_end', feature='mgmt'),
+        Schema.Attribute('tz_dst_off_min', feature='mgmt'),
+        Schema.Attribute('radius_mgmt_acc_enabled', feature='mgmt'),
+        Schema.Attribute('tacacs_enabled', feature='mgmt'),
+        Schema.Attribute('radius_interface', feature='mgmt'),
+        Schema.Attribute('tacacs_interface', feature='mgmt')])
+
     def __init__(self):
         self._model = None
         self._os = None
@@ -70,10 +117,25 @@ class Switch:
         self._writer = ConfigWriter(self)
         self._stack = False
         self._vlans = []
+        # VLAN index by tag, see _index_vlans()
+        self._vlans_by_tag = {}
+        self._vlan_index_state = None
         self._loopbacks = []
         self._lags = []
+        # LAG of each LAG member port name, see LAG.set_member_index()
+        self._lag_of_port = {}
+        # port and LAG indexes by name, see _index_port_names()
+        self._ports_by_name = {}
+        self._lags_by_name = {}
+        self._port_index_state = None
         self._stps = []
+        # STP index by MST instance, see _index_stps()
+        self._stps_by_mst_instance = {}
+        self._stp_index_state = None
         self._acls = []
+        # ACL indexes by number and name, see _index_acls()
+        self._acls_by_number = {}
+        self._acls_by_name = {}
         self._syslog_servers = {}
         self._sntp_servers = []
         self._radius_servers = {}
@@ -86,6 +148,7 @@ class Switch:
         self._init_configurable_attributes()
 
     def _init_configurable_attributes(self):
+        self._dirty = {}
         self._lacp_support = (None, None)
         self._max_lag = (None, None)
         self._single_port_lag = (None, None)
@@ -228,6 +291,7 @@ class Switch:
             default_vlan.add_ingress_port(l.get_name(), 'untagged')
             default_vlan.add_egress_port(l.get_name(), 'untagged')
         self._vlans = [default_vlan]
+        self._vlan_index_state = None
 
     def apply_default_settings(self):
         self._applied_defaults = True
@@ -238,6 +302,38 @@ class Switch:
     def defaults_were_applied(self):
         return self._applied_defaults
 
+    def snapshot(self):
+        """Return a copy of the current configuration state of the switch.
+
+        The snapshot can be used to reset the switch to this state with
+        restore(), e.g. to start every translation with the switch in the
+        state after applying the default settings.
+        """
+        state = {attr: value for attr, value in self.__dict__.items()
+                 if attr not in self._NO_SNAPSHOT_ATTRIBUTES}
+        return copy.deepcopy(state, {id(self): self})
+
+    def restore(self, snapshot):
+        """Reset the switch to a state saved with snapshot().
+
+        The snapshot itself is not changed and can be restored again.
+        Pending command interpreter state (e.g. router mode) is reset.
+        """
+        state = copy.deepcopy(snapshot, {id(self): self})
+        for attr in list(self.__dict__):
+            if (attr not in state and
+                    attr not in self._NO_SNAPSHOT_ATTRIBUTES):
+                delattr(self, attr)
+        self.__dict__.update(state)
+        self._cmd.reset_state()
+
+    def reset_indexes(self):
+        """Rebuild the indexes after replacing the indexed attributes."""
+        self._vlan_index_state = None
+        self._port_index_state = None
+        self._stp_index_state = None
+        self._index_acls()
+
     def get_model(self):
         return self._model
 
@@ -298,6 +394,7 @@ class Switch:
                             '", actor admin key "' +
                             str(lag._lacp_aadminkey[0]) +
                             '", already exists, cannot add it to switch again')
+            lag.set_member_index(self._lag_of_port)
             self._lags.append(lag)
             return ''
         else:
@@ -319,31 +416,55 @@ class Switch:
                 data = json.loads(l)
                 self._add_ports(data['ports'], slot)
 
-    def _port_name_matches_description(self, name, description):
-        if name == description:
-            return True
-        return False
+    def _exact_port_name(self, description):
+        """Return the port name if description matches this name only.
+
+        Return None if description may match several port names, then
+        _port_name_matcher() is used.
+        """
+        return description
+
+    def _port_name_matcher(self, description):
+        """Return a function matching port names against description."""
+        return description.__eq__
+
+    def _index_port_names(self):
+        """(Re-)build the port and LAG indexes by name if they are outdated.
+
+        The indexes are outdated if the list of ports or LAGs was replaced
+        or changed in size. The name of a port or LAG never changes.
+        """
+        state = (self._ports, len(self._ports), self._lags, len(self._lags))
+        if state == self._port_index_state:
+            return
+        self._ports_by_name = {}
+        for p in self._ports:
+            self._ports_by_name.setdefault(p.get_name(), []).append(p)
+        self._lags_by_name = {}
+        for l in self._lags:
+            self._lags_by_name.setdefault(l.get_name(), []).append(l)
+        self._port_index_state = state
+
+    def _find_ports(self, description, physical, lags):
+        """Return the physical ports and/or LAGs matching description."""
+        name = self._exact_port_name(description)
+        if name is not None:
+            self._index_port_names()
+            return ((self._ports_by_name.get(name, []) if physical else []) +
+                    (self._lags_by_name.get(name, []) if lags else []))
+        matches = self._port_name_matcher(description)
+        return [p for p in ((self._ports if physical else []) +
+                            (self._lags if lags else []))
+                if matches(p.get_name())]
 
     def get_ports_by_name(self, name):
-        pl = []
-        for p in self._ports + self._lags:
-            if self._port_name_matches_description(p.get_name(), name):
-                pl.append(p)
-        return pl
+        return self._find_ports(name, physical=True, lags=True)
 
     def get_physical_ports_by_name(self, name):
-        pl = []
-        for p in self._ports:
-            if self._port_name_matches_description(p.get_name(), name):
-                pl.append(p)
-        return pl
+        return self._find_ports(name, physical=True, lags=False)
 
     def get_lags_by_name(self, name):
-        ll = []
-        for l in self._lags:
-            if self._port_name_matches_description(l.get_name(), name):
-                ll.append(l)
-        return ll
+        return self._find_ports(name, physical=False, lags=True)
 
     def normalize_config(self, config):
         return config, []
@@ -358,22 +479,44 @@ class Switch:
         self._use_oob_mgmt = use_oob_mgmt
         return self._writer.generate()
 
+    def create_config_diff(self, old):
+        """Return the commands changing the configuration of old to self.
+
+        Both switches must have created their configuration before.
+        """
+        return self._writer.generate_diff(old._writer)
+
+    def get_written_config(self, feature):
+        return self._writer.get_written_config(feature)
+
     def get_cmd(self):
         return self._cmd
 
+    def _index_vlans(self):
+        """(Re-)build the VLAN index by tag if it is outdated.
+
+        The index is outdated if VLANs were added to the list of VLANs
+        without add_vlan(). Change the tag of a VLAN of this switch with
+        set_vlan_tag() to keep the index up to date.
+        """
+        state = len(self._vlans)
+        if state == self._vlan_index_state:
+            return
+        self._vlans_by_tag = {}
+        for vlan in self._vlans:
+            self._vlans_by_tag.setdefault(vlan.get_tag(), []).append(vlan)
+        self._vlan_index_state = state
+
     def get_vlan(self, name=None, tag=None):
         if name is None and tag is None:
             return None
-        elif name is None:
-            def pred(v, n, t):
-                return v.get_tag() == t
         elif tag is None:
-            def pred(v, n, t):
-                return v.get_name() == n
+            vl = [vlan for vlan in self._vlans if vlan.get_name() == name]
         else:
-            def pred(v, n, t):
-                return v.get_name() == n and v.get_tag() == t
-        vl = [vlan for vlan in self._vlans if pred(vlan, name, tag)]
+            self._index_vlans()
+            vl = self._vlans_by_tag.get(tag, [])
+            if name is not None:
+                vl = [vlan for vlan in vl if vlan.get_name() == name]
         if len(vl) == 1:
             return vl[0]
         else:
@@ -386,6 +529,24 @@ class Switch:
         exists = self.get_vlan(vlan.get_name(), vlan.get_tag())
         if not exists:
             self._vlans.append(vlan)
+            if self._vlan_index_state == len(self._vlans) - 1:
+                self._vlans_by_tag.setdefault(vlan.get_tag(),
+                                              []).append(vlan)
+                self._vlan_index_state = len(self._vlans)
+
+    def set_vlan_tag(self, vlan, tag):
+        """Set the tag of a VLAN of this switch, updating the VLAN index."""
+        old_tag = vlan.get_tag()
+        if not vlan.set_tag(tag):
+            return False
+        if (self._vlan_index_state == len(self._vlans) and
+                vlan.get_tag() != old_tag):
+            vlans = self._vlans_by_tag[old_tag]
+            vlans.remove(vlan)
+            if not vlans:
+                del self._vlans_by_tag[old_tag]
+            self._vlans_by_tag.setdefault(vlan.get_tag(), []).append(vlan)
+        return True
 
     def is_port_in_non_default_vlan(self, portname):
         for vlan in self._vlans:
@@ -418,14 +579,19 @@ class Switch:
         a seperatly configured logical port (e.g. lag.0.1), or the master
         port of the LAG (used by XOS)
         """
-        member_ports = []
-        for lag in self._lags:
-            members = lag.get_members()
-            member_ports.extend(members)
         logical_ports = [p for p in self._ports
-                         if p.get_name() not in member_ports]
+                         if p.get_name() not in self._lag_of_port]
         return logical_ports + self._lags
 
+    def get_lag_of_port(self, port_name):
+        """Return the LAG with member port port_name, or None."""
+        return self._lag_of_port.get(port_name)
+
+    def get_non_master_lag_ports(self):
+        """Return the names of the LAG member ports but the master ports."""
+        return [port_name for port_name, lag in self._lag_of_port.items()
+                if not lag.is_master_port(port_name)]
+
     def get_lag_by_number(self, number):
         if number < 1 or number > len(self._lags):
             return None
@@ -466,20 +632,45 @@ class Switch:
     def get_stps(self):
         return self._stps
 
-    def get_stp_by_mst_instance(self, sid):
+    def _index_stps(self):
+        """(Re-)build the STP index by MST instance if it is outdated.
+
+        The index is outdated if STPs were added to the list of STPs
+        without add_stp() or removed from it, or if the MST instance of an
+        indexed STP changed, which get_stp_by_mst_instance() detects.
+        """
+        state = len(self._stps)
+        if state == self._stp_index_state:
+            return
+        self._stps_by_mst_instance = {}
         for stp in self._stps:
-            if (stp.get_mst_instance() is not None and
-                    stp.get_mst_instance() == sid):
-                return stp
-        return None
+            self._stps_by_mst_instance.setdefault(stp.get_mst_instance(),
+                                                  []).append(stp)
+        self._stp_index_state = state
+
+    def get_stp_by_mst_instance(self, sid):
+        if sid is None:
+            return None
+        self._index_stps()
+        stps = self._stps_by_mst_instance.get(sid)
+        if stps and stps[0].get_mst_instance() != sid:
+            self._stp_index_state = None
+            self._index_stps()
+            stps = self._stps_by_mst_instance.get(sid)
+        return stps[0] if stps else None
 
     def add_stp(self, stp):
-        if stp not in self._stps:
+        self._index_stps()
+        sid = stp.get_mst_instance()
+        if stp not in self._stps_by_mst_instance.get(sid, ()):
             self._stps.append(stp)
+            self._stps_by_mst_instance.setdefault(sid, []).append(stp)
+            self._stp_index_state = len(self._stps)
         return self._stps
 
     def delete_last_n_stps(self, number):
         self._stps = self._stps[:-number]
+        self._stp_index_state = None
 
     def delete_stp_by_instance_id(self, sid):
         err = ''
@@ -498,6 +689,7 @@ class Switch:
         index_list.reverse()
         for i in index_list:
             self._stps.pop(i)
+        self._stp_index_state = None
         return err
 
     def set_prompt(self, name, reason):
@@ -952,188 +1144,7 @@ class Switch:
         return self._user_accounts.pop(name, None)
 
     def transfer_config(self, from_switch):
-        reason_def = 'transfer_def'
-        reason_conf = 'transfer_conf'
-
-        t_lacp_support = from_switch.get_lacp_support()
-        if self._lacp_support[0] != t_lacp_support:
-            if from_switch.get_lacp_support_reason() == 'default':
-                self._lacp_support = (t_lacp_support, reason_def)
-            else:
-                self._lacp_support = (t_lacp_support, reason_conf)
-
-        t_max_lag = from_switch.get_max_lag()
-        if self._max_lag[0] != t_max_lag:
-            if from_switch.get_max_lag_reason() == 'default':
-                self._max_lag = (t_max_lag, reason_def)
-            else:
-                self._max_lag = (t_max_lag, reason_conf)
-
-        t_single_port_lag = from_switch.get_single_port_lag()
-        if self._single_port_lag[0] != t_single_port_lag:
-            if from_switch.get_single_port_lag_reason() == 'default':
-                self._single_port_lag = (t_single_port_lag, reason_def)
-            else:
-                self._single_port_lag = (t_single_port_lag, reason_conf)
-
-        t_prompt = from_switch.get_prompt()
-        if t_prompt is not None and self._prompt[0] != t_prompt:
-            if from_switch.get_prompt_reason() == 'default':
-                self._prompt = (t_prompt, reason_def)
-            else:
-                self._prompt = (t_prompt, reason_conf)
-
-        t_snmp_sys_name = from_switch.get_snmp_sys_name()
-        if (t_snmp_sys_name is not None and
-           self._snmp_sys_name[0] != t_snmp_sys_name):
-            if from_switch.get_snmp_sys_name_reason() == 'default':
-                self._snmp_sys_name = (t_snmp_sys_name, reason_def)
-            else:
-                self._snmp_sys_name = (t_snmp_sys_name, reason_conf)
-
-        t_snmp_sys_contact = from_switch.get_snmp_sys_contact()
-        if (t_snmp_sys_contact is not None and
-           self._snmp_sys_contact[0] != t_snmp_sys_contact):
-            if from_switch.get_snmp_sys_contact_reason() == 'default':
-                self._snmp_sys_contact = (t_snmp_sys_contact, reason_def)
-            else:
-                self._snmp_sys_contact = (t_snmp_sys_contact, reason_conf)
-
-        t_snmp_sys_location = from_switch.get_snmp_sys_location()
-        if (t_snmp_sys_location is not None and
-           self._snmp_sys_location[0] != t_snmp_sys_location):
-            if from_switch.get_snmp_sys_location_reason() == 'default':
-                self._snmp_sys_location = (t_snmp_sys_location, reason_def)
-            else:
-                self._snmp_sys_location = (t_snmp_sys_location, reason_conf)
-
-        t_banner_login_ack = from_switch.get_banner_login_ack()
-        if (t_banner_login_ack is not None and
-           self._banner_login_ack[0] != t_banner_login_ack):
-            if from_switch.get_banner_login_ack_reason() == 'default':
-                self._banner_login_ack = (t_banner_login_ack, reason_def)
-            else:
-                self._banner_login_ack = (t_banner_login_ack, reason_conf)
-
-        t_banner_login = from_switch.get_banner_login()
-        if (t_banner_login is not None and
-           self._banner_login[0] != t_banner_login):
-            if from_switch.get_banner_login_reason() == 'default':
-                self._banner_login = (t_banner_login, reason_def)
-            else:
-                self._banner_login = (t_banner_login, reason_conf)
-
-        t_banner_motd = from_switch.get_banner_motd()
-        if (t_banner_motd is not None and
-           self._banner_motd[0] != t_banner_motd):
-            if from_switch.get_banner_motd_reason() == 'default':
-                self._banner_motd = (t_banner_motd, reason_def)
-            else:
-                self._banner_motd = (t_banner_motd, reason_conf)
-
-        t_telnet_inbound = from_switch.get_telnet_inbound()
-        if (t_telnet_inbound is not None and
-           self._telnet_inbound[0] != t_telnet_inbound):
-            if from_switch.get_telnet_inbound_reason() == 'default':
-                self._telnet_inbound = (t_telnet_inbound, reason_def)
-            else:
-                self._telnet_inbound = (t_telnet_inbound, reason_conf)
-
-        t_telnet_outbound = from_switch.get_telnet_outbound()
-        if (t_telnet_outbound is not None and
-           self._telnet_outbound[0] != t_telnet_outbound):
-            if from_switch.get_telnet_outbound_reason() == 'default':
-                self._telnet_outbound = (t_telnet_outbound, reason_def)
-            else:
-                self._telnet_outbound = (t_telnet_outbound, reason_conf)
-
-        t_ssh_inbound = from_switch.get_ssh_inbound()
-        if (t_ssh_inbound is not None and
-           self._ssh_inbound[0] != t_ssh_inbound):
-            if from_switch.get_ssh_inbound_reason() == 'default':
-                self._ssh_inbound = (t_ssh_inbound, reason_def)
-            else:
-                self._ssh_inbound = (t_ssh_inbound, reason_conf)
-
-        t_ssh_outbound = from_switch.get_ssh_outbound()
-        if (t_ssh_outbound is not None and
-           self._ssh_outbound[0] != t_ssh_outbound):
-            if from_switch.get_ssh_outbound_reason() == 'default':
-                self._ssh_outbound = (t_ssh_outbound, reason_def)
-            else:
-                self._ssh_outbound = (t_ssh_outbound, reason_conf)
-
-        t_ssl = from_switch.get_ssl()
-        if (t_ssl is not None and
-           self._ssl[0] != t_ssl):
-            if from_switch.get_ssl_reason() == 'default':
-                self._ssl = (t_ssl, reason_def)
-            else:
-                self._ssl = (t_ssl, reason_conf)
-
-        t_http = from_switch.get_http()
-        if (t_http is not None and
-           self._http[0] != t_http):
-            if from_switch.get_http_reason() == 'default':
-                self._http = (t_http, reason_def)
-            else:
-                self._http = (t_http, reason_conf)
-
-        t_http_secure = from_switch.get_http_secure()
-        if (t_http_secure is not None and
-           self._http_secure[0] != t_http_secure):
-            if from_switch.get_http_secure_reason() == 'default':
-                self._http_secure = (t_http_secure, reason_def)
-            else:
-                self._http_secure = (t_http_secure, reason_conf)
-
-        t_mgmt_ip = from_switch.get_mgmt_ip()
-        if (t_mgmt_ip is not None and
-           self._mgmt_ip[0] != t_mgmt_ip):
-            if from_switch.get_mgmt_ip_reason() == 'default':
-                self._mgmt_ip = (t_mgmt_ip, reason_def)
-            else:
-                self._mgmt_ip = (t_mgmt_ip, reason_conf)
-
-        t_mgmt_mask = from_switch.get_mgmt_mask()
-        if (t_mgmt_mask is not None and
-           self._mgmt_mask[0] != t_mgmt_mask):
-            if from_switch.get_mgmt_mask_reason() == 'default':
-                self._mgmt_mask = (t_mgmt_mask, reason_def)
-            else:
-                self._mgmt_mask = (t_mgmt_mask, reason_conf)
-
-        t_mgmt_vlan = from_switch.get_mgmt_vlan()
-        if (t_mgmt_vlan is not None and
-           self._mgmt_vlan[0] != t_mgmt_vlan):
-            if from_switch.get_mgmt_vlan_reason() == 'default':
-                self._mgmt_vlan = (t_mgmt_vlan, reason_def)
-            else:
-                self._mgmt_vlan = (t_mgmt_vlan, reason_conf)
-
-        t_mgmt_gw = from_switch.get_mgmt_gw()
-        if (t_mgmt_gw is not None and
-           self._mgmt_gw[0] != t_mgmt_gw):
-            if from_switch.get_mgmt_gw_reason() == 'default':
-                self._mgmt_gw = (t_mgmt_gw, reason_def)
-            else:
-                self._mgmt_gw = (t_mgmt_gw, reason_conf)
-
-        t_mgmt_protocol = from_switch.get_mgmt_protocol()
-        if (t_mgmt_protocol is not None and
-           self._mgmt_protocol[0] != t_mgmt_protocol):
-            if from_switch.get_mgmt_protocol_reason() == 'default':
-                self._mgmt_protocol = (t_mgmt_protocol, reason_def)
-            else:
-                self._mgmt_protocol = (t_mgmt_protocol, reason_conf)
-
-        t_idle_timer = from_switch.get_idle_timer()
-        if (t_idle_timer is not None and
-           self._idle_timer[0] != t_idle_timer):
-            if from_switch.get_idle_timer_reason() == 'default':
-                self._idle_timer = (t_idle_timer, reason_def)
-            else:
-                self._idle_timer = (t_idle_timer, reason_conf)
+        self.SCHEMA.transfer(self, from_switch)
 
         for sys_srv_idx in from_switch.get_all_syslog_servers():
             t_sys_srv = self.get_syslog_server(sys_srv_idx)
@@ -1151,115 +1162,9 @@ class Switch:
             t_tac_srv = self.get_tacacs_server(tac_srv_idx)
             t_tac_srv.transfer_config(from_switch._tacacs_servers[tac_srv_idx])
 
-        t_sntp_client = from_switch.get_sntp_client()
-        if (t_sntp_client is not None and
-           self._sntp_client[0] != t_sntp_client):
-            if from_switch.get_sntp_client_reason() == 'default':
-                self._sntp_client = (t_sntp_client, reason_def)
-            else:
-                self._sntp_client = (t_sntp_client, reason_conf)
-
-        t_ipv4_routing = from_switch.get_ipv4_routing()
-        if (t_ipv4_routing is not None and
-           self._ipv4_routing[0] != t_ipv4_routing):
-            if from_switch.get_ipv4_routing_reason() == 'default':
-                self._ipv4_routing = (t_ipv4_routing, reason_def)
-            else:
-                self._ipv4_routing = (t_ipv4_routing, reason_conf)
-
         self.set_all_ipv4_static_routes(
             from_switch.get_all_ipv4_static_routes())
 
-        t_tz_name = from_switch.get_tz_name()
-        if (t_tz_name is not None and
-           self._tz_name[0] != t_tz_name):
-            if from_switch.get_tz_name_reason() == 'default':
-                self._tz_name = (t_tz_name, reason_def)
-            else:
-                self._tz_name = (t_tz_name, reason_conf)
-
-        t_tz_off_min = from_switch.get_tz_off_min()
-        if (t_tz_off_min is not None and
-           self._tz_off_min[0] != t_tz_off_min):
-            if from_switch.get_tz_off_min_reason() == 'default':
-                self._tz_off_min = (t_tz_off_min, reason_def)
-            else:
-                self._tz_off_min = (t_tz_off_min, reason_conf)
-
-        t_tz_dst_state = from_switch.get_tz_dst_state()
-        if (t_tz_dst_state is not None and
-           self._tz_dst_state[0] != t_tz_dst_state):
-            if from_switch.get_tz_dst_state_reason() == 'default':
-                self._tz_dst_state = (t_tz_dst_state, reason_def)
-            else:
-                self._tz_dst_state = (t_tz_dst_state, reason_conf)
-
-        t_tz_dst_name = from_switch.get_tz_dst_name()
-        if (t_tz_dst_name is not None and
-           self._tz_dst_name[0] != t_tz_dst_name):
-            if from_switch.get_tz_dst_name_reason() == 'default':
-                self._tz_dst_name = (t_tz_dst_name, reason_def)
-            else:
-                self._tz_dst_name = (t_tz_dst_name, reason_conf)
-
-        t_tz_dst_start = from_switch.get_tz_dst_start()
-        if (t_tz_dst_start is not None and
-           self._tz_dst_start[0] != t_tz_dst_start):
-            if from_switch.get_tz_dst_start_reason() == 'default':
-                self._tz_dst_start = (t_tz_dst_start, reason_def)
-            else:
-                self._tz_dst_start = (t_tz_dst_start, reason_conf)
-
-        t_tz_dst_end = from_switch.get_tz_dst_end()
-        if (t_tz_dst_end is not None and
-           self._tz_dst_end[0] != t_tz_dst_end):
-            if from_switch.get_tz_dst_end_reason() == 'default':
-                self._tz_dst_end = (t_tz_dst_end, reason_def)
-            else:
-                self._tz_dst_end = (t_tz_dst_end, reason_conf)
-
-        t_tz_dst_off_min = from_switch.get_tz_dst_off_min()
-        if (t_tz_dst_off_min is not None and
-           self._tz_dst_off_min[0] != t_tz_dst_off_min):
-            if from_switch.get_tz_dst_off_min_reason() == 'default':
-                self._tz_dst_off_min = (t_tz_dst_off_min, reason_def)
-            else:
-                self._tz_dst_off_min = (t_tz_dst_off_min, reason_conf)
-
-        t_radius_mgmt_acc_enabled = from_switch.get_radius_mgmt_acc_enabled()
-        if (t_radius_mgmt_acc_enabled is not None and
-           self._radius_mgmt_acc_enabled[0] != t_radius_mgmt_acc_enabled):
-            if from_switch.get_radius_mgmt_acc_enabled_reason() == 'default':
-                self._radius_mgmt_acc_enabled = (t_radius_mgmt_acc_enabled,
-                                                 reason_def)
-            else:
-                self._radius_mgmt_acc_enabled = (t_radius_mgmt_acc_enabled,
-                                                 reason_conf)
-
-        t_tacacs_enabled = from_switch.get_tacacs_enabled()
-        if (t_tacacs_enabled is not None and
-           self._tacacs_enabled[0] != t_tacacs_enabled):
-            if from_switch.get_tacacs_enabled_reason() == 'default':
-                self._tacacs_enabled = (t_tacacs_enabled, reason_def)
-            else:
-                self._tacacs_enabled = (t_tacacs_enabled, reason_conf)
-
-        t_radius_interface = from_switch.get_radius_interface()
-        if (t_radius_interface is not None and
-           self._radius_interface[0] != t_radius_interface):
-            if from_switch.get_radius_interface_reason() == 'default':
-                self._radius_interface = (t_radius_interface, reason_def)
-            else:
-                self._radius_interface = (t_radius_interface, reason_conf)
-
-        t_tacacs_interface = from_switch.get_tacacs_interface()
-        if (t_tacacs_interface is not None and
-           self._tacacs_interface[0] != t_tacacs_interface):
-            if from_switch.get_tacacs_interface_reason() == 'default':
-                self._tacacs_interface = (t_tacacs_interface, reason_def)
-            else:
-                self._tacacs_interface = (t_tacacs_interface, reason_conf)
-
         for snmp_tgt_prm_name in from_switch.get_all_snmp_target_params():
             t_snmp_tgt_prm = self.get_snmp_target_params(snmp_tgt_prm_name)
             t_snmp_tgt_prm.transfer_config(
@@ -1278,21 +1183,54 @@ class Switch:
     def get_acls(self):
         return self._acls
 
+    def _index_acls(self):
+        """(Re-)build the ACL indexes, the first ACL of a number or name wins.
+
+        Change the number or name of an ACL added to the switch with
+        set_acl_number() or set_acl_name() to keep the indexes up to date.
+        """
+        self._acls_by_number = {}
+        self._acls_by_name = {}
+        for acl in self._acls:
+            self._add_acl_to_index(acl)
+
+    def _add_acl_to_index(self, acl):
+        number, name = acl.get_number(), acl.get_name()
+        if number:
+            self._acls_by_number.setdefault(number, acl)
+        if name:
+            self._acls_by_name.setdefault(name, acl)
+
+    def _remove_acl_from_index(self, acl):
+        number, name = acl.get_number(), acl.get_name()
+        if self._acls_by_number.get(number) is acl:
+            del self._acls_by_number[number]
+        if self._acls_by_name.get(name) is acl:
+            del self._acls_by_name[name]
+
     def get_acl_by_name(self, name):
         if not name:
             return None
-        for acl in self._acls:
-            if acl.get_name() == name:
-                return acl
-        return None
+        return self._acls_by_name.get(name)
 
     def get_acl_by_number(self, number):
         if not number:
             return None
-        for acl in self._acls:
-            if acl.get_number() == number:
-                return acl
-        return None
+        return self._acls_by_number.get(number)
+
+    def set_acl_name(self, acl, name):
+        """Set the name of an ACL of this switch, updating the ACL index."""
+        self._remove_acl_from_index(acl)
+        ret = acl.set_name(name)
+        self._add_acl_to_index(acl)
+        return ret
+
+    def set_acl_number(self, acl, number):
+        """Set the number of an ACL of this switch, updating the ACL index."""
+        self._remove_acl_from_index(acl)
+        ret = acl.set_number(number)
+        self._add_acl_to_index(acl)
+        return ret
 
     def add_acl(self, number=None, name=None):
         if number is None and not name:
@@ -1308,10 +1246,12 @@ class Switch:
             return 'ERROR: ACL "' + str(name) + '" already exists'
         acl = ACL.ACL(number=number, name=name)
         self._acls.append(acl)
+        self._add_acl_to_index(acl)
         return ''
 
     def add_complete_acl(self, new_acl):
         self._acls.append(new_acl)
+        self._add_acl_to_index(new_acl)
 
 
 class CmdInterpreter(cmd.Cmd):
@@ -1329,6 +1269,16 @@ class CmdInterpreter(cmd.Cmd):
                 return True
         return False
 
+    def reset_state(self):
+        """Forget the state, e.g. router mode, of previous commands."""
+        del self._state[:]
+
+    def onecmd(self, line):
+        stats = getattr(_parse_stats, 'active', None)
+        if stats is not None:
+            stats.enter(line)
+        return super().onecmd(line)
+
     def emptyline(self):
         return ''
 
@@ -1354,6 +1304,86 @@ class CmdInterpreter(cmd.Cmd):
         return err
 
 
+# statistics of the line parsed by ParseStats.configure() in this thread
+_parse_stats = threading.local()
+
+
+class ParseStats:
+
+    """Number of lines and parse time per command path.
+
+    The command path of a line consists of the first words of the line
+    dispatched by each of the nested command interpreters, e.g.
+    'set vlan egress'. Comments and lines of unknown or ignored commands
+    are counted separately, their parse time is added to the pseudo
+    command paths '(comment)', '(unknown)', and '(ignored)'. Lines
+    parsed concurrently in other threads are not counted.
+
+    Methods:
+    configure(switch, line) configures switch with line, collecting stats.
+    report() returns the statistics as lines of text, slowest paths first.
+    reset() forgets all statistics.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.lines = {}
+        self.seconds = {}
+        self.unknown = 0
+        self.ignored = 0
+        self.comments = 0
+        self._words = []
+
+    def enter(self, line):
+        """Add the first word of line to the command path of the line."""
+        words = line.split(None, 1)
+        if words:
+            self._words.append(words[0])
+
+    def configure(self, switch, line):
+        self._words = []
+        _parse_stats.active = self
+        start = time.perf_counter()
+        try:
+            result = switch.configure(line)
+        finally:
+            seconds = time.perf_counter() - start
+            _parse_stats.active = None
+        message = str(result or '')
+        if message.startswith('INFO: Ignoring comment'):
+            path = '(comment)'
+            self.comments += 1
+        elif 'unknown command' in message:
+            path = '(unknown)'
+            self.unknown += 1
+        elif message.startswith(('INFO: Ignoring', 'NOTICE: Ignoring',
+                                 'WARN: Ignoring')):
+            path = '(ignored)'
+            self.ignored += 1
+        else:
+            path = ' '.join(self._words)
+        self.lines[path] = self.lines.get(path, 0) + 1
+        self.seconds[path] = self.seconds.get(path, 0.0) + seconds
+        return result
+
+    def report(self):
+        total = sum(self.seconds.values())
+        report = ['Parse statistics: {} lines in {:.1f} ms'.format(
+            sum(self.lines.values()), total * 1e3)]
+        report.append('{:>10} {:>6} {:>8}  {}'.format('time/ms', 'time%',
+                                                      'lines', 'command'))
+        for path in sorted(self.seconds, key=lambda p: (-self.seconds[p], p)):
+            report.append('{:10.3f} {:6.1f} {:8d}  {}'.format(
+                self.seconds[path] * 1e3,
+                100 * self.seconds[path] / total if total else 0.0,
+                self.lines[path], path))
+        report.append('Unknown lines: {}, ignored lines: {}, comments: '
+                      '{}'.format(self.unknown, self.ignored, self.comments))
+        return report
+
+
 class ConfigWriter:
 
     """Interface definition of a configuration writer.
@@ -1369,6 +1399,14 @@ class ConfigWriter:
         self._feature_modules = ['port', 'lag', 'vlan', 'stp', 'acl',
                                  'basic_layer_3', 'mgmt']
         self._switch = switch
+        self._written = {}
+
+    def get_switch(self):
+        return self._switch
+
+    def get_written_config(self, feature):
+        """Return the configuration generated for feature module feature."""
+        return self._written.get(feature, [])
 
     def check_unwritten(self):
         """Check if some configuration has not been considered.
@@ -1380,6 +1418,9 @@ class ConfigWriter:
         unwritten = []
         # feature module ports
         for p in self._switch.get_ports():
+            # only ports with transferred settings may have unwritten ones
+            if not p.is_dirty():
+                continue
             if p.get_speed_reason() == 'transfer_conf':
                 msg = 'WARN: Speed of port "{}" set to "{}"'.format(
                     p.get_name(), p.get_speed())
@@ -1444,22 +1485,25 @@ class ConfigWriter:
                 unwritten.append(msg)
         # TODO: implement "unwritten" check for feature module VLAN
         # feature module lacp
-        if self._switch.get_lacp_support_reason() == 'transfer_conf':
-            msg = 'WARN: '
-            msg += 'Enabled' if self._switch.get_lacp_support() else 'Disabled'
-            msg += ' global LACP support omitted from configuration file'
-            unwritten.append(msg)
-        if self._switch.get_max_lag_reason() == 'transfer_conf':
-            msg = 'WARN: Maximum number of LAGs set to "{}"'.format(
-                  self._switch.get_max_lag())
-            msg += ' omitted from configuration file'
-            unwritten.append(msg)
-        if self._switch.get_single_port_lag_reason() == 'transfer_conf':
-            msg = 'WARN: '
-            msg += ('Enabled' if self._switch.get_single_port_lag()
-                    else 'Disabled')
-            msg += ' single port LAG support omitted from configuration file'
-            unwritten.append(msg)
+        if self._switch.is_dirty('lag'):
+            if self._switch.get_lacp_support_reason() == 'transfer_conf':
+                msg = 'WARN: '
+                msg += ('Enabled' if self._switch.get_lacp_support()
+                        else 'Disabled')
+                msg += ' global LACP support omitted from configuration file'
+                unwritten.append(msg)
+            if self._switch.get_max_lag_reason() == 'transfer_conf':
+                msg = 'WARN: Maximum number of LAGs set to "{}"'.format(
+                      self._switch.get_max_lag())
+                msg += ' omitted from configuration file'
+                unwritten.append(msg)
+            if self._switch.get_single_port_lag_reason() == 'transfer_conf':
+                msg = 'WARN: '
+                msg += ('Enabled' if self._switch.get_single_port_lag()
+                        else 'Disabled')
+                msg += (' single port LAG support omitted from configuration'
+                        ' file')
+                unwritten.append(msg)
         # feature module STP
         for stp in self._switch.get_stps():
             if stp.get_name_reason() == 'transfer_conf':
@@ -1496,91 +1540,95 @@ class ConfigWriter:
                                  ' VLANs configured, but omitted from'
                                  ' configuration file')
         # feature module management
-        if self._switch.get_prompt_reason() == 'transfer_conf':
-            unwritten.append('WARN: CLI prompt "' +
-                             str(self._switch.get_prompt()) + '" configured,'
-                             ' but omitted from configuration file')
-        if self._switch.get_snmp_sys_name_reason() == 'transfer_conf':
-            unwritten.append('WARN: SNMP system name "' +
-                             str(self._switch.get_snmp_sys_name()) +
-                             '" configured, but omitted from configuration'
-                             ' file')
-        if self._switch.get_snmp_sys_contact_reason() == 'transfer_conf':
-            unwritten.append('WARN: SNMP system contact "' +
-                             str(self._switch.get_snmp_sys_contact()) +
-                             '" configured, but omitted from configuration'
-                             ' file')
-        if self._switch.get_snmp_sys_location_reason() == 'transfer_conf':
-            unwritten.append('WARN: SNMP system location "' +
-                             str(self._switch.get_snmp_sys_location()) +
-                             '" configured, but omitted from configuration'
-                             ' file')
-        if self._switch.get_banner_login_reason() == 'transfer_conf':
-            unwritten.append('WARN: Login banner "' +
-                             str(self._switch.get_banner_login()) +
-                             '" configured, but omitted from configuration'
-                             ' file')
-        if self._switch.get_banner_login_ack_reason() == 'transfer_conf':
-            unwritten.append('WARN: Login banner acknowledgement'
-                             ' configured, but omitted from configuration'
-                             ' file')
-        if self._switch.get_banner_motd_reason() == 'transfer_conf':
-            unwritten.append('WARN: Message of the day banner "' +
-                             str(self._switch.get_banner_motd()) +
-                             '" configured, but omitted from configuration'
-                             ' file')
-        if self._switch.get_telnet_inbound_reason() == 'transfer_conf':
-            unwritten.append('WARN: Inbound Telnet is ' + 'en' if
-                             self._switch.get_telnet_inbound() else 'dis' +
-                             'abled, but omitted from configuration file')
-        if self._switch.get_telnet_outbound_reason() == 'transfer_conf':
-            unwritten.append('WARN: Outbound Telnet is ' + 'en' if
-                             self._switch.get_telnet_outbound() else 'dis' +
-                             'abled, but omitted from configuration file')
-        if self._switch.get_ssh_inbound_reason() == 'transfer_conf':
-            unwritten.append('WARN: Inbound SSH is ' + 'en' if
-                             self._switch.get_ssh_inbound() else 'dis' +
-                             'abled, but omitted from configuration file')
-        if self._switch.get_ssh_outbound_reason() == 'transfer_conf':
-            unwritten.append('WARN: Outbound SSH is ' + 'en' if
-                             self._switch.get_ssh_outbound() else 'dis' +
-                             'abled, but omitted from configuration file')
-        if self._switch.get_ssl_reason() == 'transfer_conf':
-            unwritten.append('WARN: SSL is ' + 'en' if
-                             self._switch.get_ssl() else 'dis' +
-                             'abled, but omitted from configuration file')
-        if self._switch.get_http_reason() == 'transfer_conf':
-            unwritten.append('WARN: HTTP is ' + 'en' if
-                             self._switch.get_http() else 'dis' +
-                             'abled, but omitted from configuration file')
-        if self._switch.get_http_secure_reason() == 'transfer_conf':
-            unwritten.append('WARN: HTTPS is ' + 'en' if
-                             self._switch.get_http_secure() else 'dis' +
-                             'abled, but omitted from configuration file')
-        if self._switch.get_mgmt_ip_reason() == 'transfer_conf':
-            unwritten.append('WARN: Management IP address "' +
-                             str(self._switch.get_mgmt_ip()) +
-                             '" omitted from translation')
-        if self._switch.get_mgmt_mask_reason() == 'transfer_conf':
-            unwritten.append('WARN: Management Netmask "' +
-                             str(self._switch.get_mgmt_mask()) +
-                             '" omitted from translation')
-        if self._switch.get_mgmt_vlan_reason() == 'transfer_conf':
-            unwritten.append('WARN: Management VLAN "' +
-                             str(self._switch.get_mgmt_vlan()) +
-                             '" omitted from translation')
-        if self._switch.get_mgmt_gw_reason() == 'transfer_conf':
-            unwritten.append('WARN: Management gateway IP "' +
-                             str(self._switch.get_mgmt_gw()) +
-                             '" omitted from translation')
-        if self._switch.get_mgmt_protocol_reason() == 'transfer_conf':
-            unwritten.append('WARN: Management IP protocol "' +
-                             str(self._switch.get_mgmt_protocol()) +
-                             '" omitted from translation')
-        if self._switch.get_idle_timer_reason() == 'transfer_conf':
-            unwritten.append('WARN: Idle Timeout "' +
-                             str(self._switch.get_idle_timer()) +
-                             '" omitted from translation')
+        mgmt_dirty = self._switch.is_dirty('mgmt')
+        if mgmt_dirty:
+            if self._switch.get_prompt_reason() == 'transfer_conf':
+                unwritten.append('WARN: CLI prompt "' +
+                                 str(self._switch.get_prompt()) +
+                                 '" configured, but omitted from'
+                                 ' configuration file')
+            if self._switch.get_snmp_sys_name_reason() == 'transfer_conf':
+                unwritten.append('WARN: SNMP system name "' +
+                                 str(self._switch.get_snmp_sys_name()) +
+                                 '" configured, but omitted from configuration'
+                                 ' file')
+            if self._switch.get_snmp_sys_contact_reason() == 'transfer_conf':
+                unwritten.append('WARN: SNMP system contact "' +
+                                 str(self._switch.get_snmp_sys_contact()) +
+                                 '" configured, but omitted from configuration'
+                                 ' file')
+            if self._switch.get_snmp_sys_location_reason() == 'transfer_conf':
+                unwritten.append('WARN: SNMP system location "' +
+                                 str(self._switch.get_snmp_sys_location()) +
+                                 '" configured, but omitted from configuration'
+                                 ' file')
+            if self._switch.get_banner_login_reason() == 'transfer_conf':
+                unwritten.append('WARN: Login banner "' +
+                                 str(self._switch.get_banner_login()) +
+                                 '" configured, but omitted from configuration'
+                                 ' file')
+            if self._switch.get_banner_login_ack_reason() == 'transfer_conf':
+                unwritten.append('WARN: Login banner acknowledgement'
+                                 ' configured, but omitted from configuration'
+                                 ' file')
+            if self._switch.get_banner_motd_reason() == 'transfer_conf':
+                unwritten.append('WARN: Message of the day banner "' +
+                                 str(self._switch.get_banner_motd()) +
+                                 '" configured, but omitted from configuration'
+                                 ' file')
+            if self._switch.get_telnet_inbound_reason() == 'transfer_conf':
+                unwritten.append('WARN: Inbound Telnet is ' + 'en' if
+                                 self._switch.get_telnet_inbound() else 'dis' +
+                                 'abled, but omitted from configuration file')
+            if self._switch.get_telnet_outbound_reason() == 'transfer_conf':
+                unwritten.append('WARN: Outbound Telnet is ' + 'en' if
+                                 self._switch.get_telnet_outbound() else
+                                 'dis' + 'abled, but omitted from'
+                                 ' configuration file')
+            if self._switch.get_ssh_inbound_reason() == 'transfer_conf':
+                unwritten.append('WARN: Inbound SSH is ' + 'en' if
+                                 self._switch.get_ssh_inbound() else 'dis' +
+                                 'abled, but omitted from configuration file')
+            if self._switch.get_ssh_outbound_reason() == 'transfer_conf':
+                unwritten.append('WARN: Outbound SSH is ' + 'en' if
+                                 self._switch.get_ssh_outbound() else 'dis' +
+                                 'abled, but omitted from configuration file')
+            if self._switch.get_ssl_reason() == 'transfer_conf':
+                unwritten.append('WARN: SSL is ' + 'en' if
+                                 self._switch.get_ssl() else 'dis' +
+                                 'abled, but omitted from configuration file')
+            if self._switch.get_http_reason() == 'transfer_conf':
+                unwritten.append('WARN: HTTP is ' + 'en' if
+                                 self._switch.get_http() else 'dis' +
+                                 'abled, but omitted from configuration file')
+            if self._switch.get_http_secure_reason() == 'transfer_conf':
+                unwritten.append('WARN: HTTPS is ' + 'en' if
+                                 self._switch.get_http_secure() else 'dis' +
+                                 'abled, but omitted from configuration file')
+            if self._switch.get_mgmt_ip_reason() == 'transfer_conf':
+                unwritten.append('WARN: Management IP address "' +
+                                 str(self._switch.get_mgmt_ip()) +
+                                 '" omitted from translation')
+            if self._switch.get_mgmt_mask_reason() == 'transfer_conf':
+                unwritten.append('WARN: Management Netmask "' +
+                                 str(self._switch.get_mgmt_mask()) +
+                                 '" omitted from translation')
+            if self._switch.get_mgmt_vlan_reason() == 'transfer_conf':
+                unwritten.append('WARN: Management VLAN "' +
+                                 str(self._switch.get_mgmt_vlan()) +
+                                 '" omitted from translation')
+            if self._switch.get_mgmt_gw_reason() == 'transfer_conf':
+                unwritten.append('WARN: Management gateway IP "' +
+                                 str(self._switch.get_mgmt_gw()) +
+                                 '" omitted from translation')
+            if self._switch.get_mgmt_protocol_reason() == 'transfer_conf':
+                unwritten.append('WARN: Management IP protocol "' +
+                                 str(self._switch.get_mgmt_protocol()) +
+                                 '" omitted from translation')
+            if self._switch.get_idle_timer_reason() == 'transfer_conf':
+                unwritten.append('WARN: Idle Timeout "' +
+                                 str(self._switch.get_idle_timer()) +
+                                 '" omitted from translation')
         for idx in self._switch.get_all_syslog_servers():
             if (self._switch._syslog_servers[idx].get_is_configured() and
                     not self._switch._syslog_servers[idx].get_is_written()):
@@ -1600,59 +1648,61 @@ class ConfigWriter:
                     not self._switch._tacacs_servers[idx].get_is_written()):
                 unwritten.append('WARN: TACACS+ server ' + str(idx) +
                                  ' configured, but omitted from translation')
-        if self._switch.get_sntp_client_reason() == 'transfer_conf':
-            unwritten.append('WARN: SNTP client mode "' +
-                             str(self._switch.get_sntp_client()) +
-                             '" omitted from translation')
-        if self._switch.get_tz_name_reason() == 'transfer_conf':
-            unwritten.append('WARN: Timezone name "' +
-                             str(self._switch.get_tz_name()) +
-                             '" omitted from translation')
-        if self._switch.get_tz_off_min_reason() == 'transfer_conf':
-            unwritten.append('WARN: Timezone offset "' +
-                             str(self._switch.get_tz_off_min()) +
-                             '" (minutes) omitted from translation')
-        if self._switch.get_tz_dst_state_reason() == 'transfer_conf':
-            unwritten.append('WARN: Timezone DST state "' +
-                             str(self._switch.get_tz_dst_state()) +
-                             '" omitted from translation')
-        if self._switch.get_tz_dst_name_reason() == 'transfer_conf':
-            unwritten.append('WARN: Timezone DST name "' +
-                             str(self._switch.get_tz_dst_name()) +
-                             '" omitted from translation')
-        if self._switch.get_tz_dst_start_reason() == 'transfer_conf':
-            unwritten.append('WARN: Timezone DST start "' +
-                             str(self._switch.get_tz_dst_start()) +
-                             '" omitted from translation')
-        if self._switch.get_tz_dst_end_reason() == 'transfer_conf':
-            unwritten.append('WARN: Timezone DST end "' +
-                             str(self._switch.get_tz_dst_end()) +
-                             '" omitted from translation')
-        if self._switch.get_tz_dst_off_min_reason() == 'transfer_conf':
-            unwritten.append('WARN: Timezone DST offset "' +
-                             str(self._switch.get_tz_dst_off_min()) +
-                             '" (minutes) omitted from translation')
-        _tc = 'transfer_conf'
-        if self._switch.get_radius_mgmt_acc_enabled_reason() == _tc:
-            unwritten.append('WARN: RADIUS for management access "' +
-                             str(self._switch.get_radius_mgmt_acc_enabled()) +
-                             '" omitted from translation')
-        if self._switch.get_radius_interface_reason() == 'transfer_conf':
-            unwritten.append('WARN: RADIUS interface "' +
-                             str(self._switch.get_radius_interface_type()) +
-                             ' ' +
-                             str(self._switch.get_radius_interface_number()) +
-                             '" omitted from translation')
-        if self._switch.get_tacacs_enabled_reason() == 'transfer_conf':
-            unwritten.append('WARN: TACACS+ for management access "' +
-                             str(self._switch.get_tacacs_enabled()) +
-                             '" omitted from translation')
-        if self._switch.get_tacacs_interface_reason() == 'transfer_conf':
-            unwritten.append('WARN: TACACS+ interface "' +
-                             str(self._switch.get_tacacs_interface_type()) +
-                             ' ' +
-                             str(self._switch.get_tacacs_interface_number()) +
-                             '" omitted from translation')
+        if mgmt_dirty:
+            if self._switch.get_sntp_client_reason() == 'transfer_conf':
+                unwritten.append('WARN: SNTP client mode "' +
+                                 str(self._switch.get_sntp_client()) +
+                                 '" omitted from translation')
+            if self._switch.get_tz_name_reason() == 'transfer_conf':
+                unwritten.append('WARN: Timezone name "' +
+                                 str(self._switch.get_tz_name()) +
+                                 '" omitted from translation')
+            if self._switch.get_tz_off_min_reason() == 'transfer_conf':
+                unwritten.append('WARN: Timezone offset "' +
+                                 str(self._switch.get_tz_off_min()) +
+                                 '" (minutes) omitted from translation')
+            if self._switch.get_tz_dst_state_reason() == 'transfer_conf':
+                unwritten.append('WARN: Timezone DST state "' +
+                                 str(self._switch.get_tz_dst_state()) +
+                                 '" omitted from translation')
+            if self._switch.get_tz_dst_name_reason() == 'transfer_conf':
+                unwritten.append('WARN: Timezone DST name "' +
+                                 str(self._switch.get_tz_dst_name()) +
+                                 '" omitted from translation')
+            if self._switch.get_tz_dst_start_reason() == 'transfer_conf':
+                unwritten.append('WARN: Timezone DST start "' +
+                                 str(self._switch.get_tz_dst_start()) +
+                                 '" omitted from translation')
+            if self._switch.get_tz_dst_end_reason() == 'transfer_conf':
+                unwritten.append('WARN: Timezone DST end "' +
+                                 str(self._switch.get_tz_dst_end()) +
+                                 '" omitted from translation')
+            if self._switch.get_tz_dst_off_min_reason() == 'transfer_conf':
+                unwritten.append('WARN: Timezone DST offset "' +
+                                 str(self._switch.get_tz_dst_off_min()) +
+                                 '" (minutes) omitted from translation')
+            _tc = 'transfer_conf'
+            if self._switch.get_radius_mgmt_acc_enabled_reason() == _tc:
+                unwritten.append(
+                    'WARN: RADIUS for management access "' +
+                    str(self._switch.get_radius_mgmt_acc_enabled()) +
+                    '" omitted from translation')
+            if self._switch.get_radius_interface_reason() == 'transfer_conf':
+                unwritten.append(
+                    'WARN: RADIUS interface "' +
+                    str(self._switch.get_radius_interface_type()) + ' ' +
+                    str(self._switch.get_radius_interface_number()) +
+                    '" omitted from translation')
+            if self._switch.get_tacacs_enabled_reason() == 'transfer_conf':
+                unwritten.append('WARN: TACACS+ for management access "' +
+                                 str(self._switch.get_tacacs_enabled()) +
+                                 '" omitted from translation')
+            if self._switch.get_tacacs_interface_reason() == 'transfer_conf':
+                unwritten.append(
+                    'WARN: TACACS+ interface "' +
+                    str(self._switch.get_tacacs_interface_type()) + ' ' +
+                    str(self._switch.get_tacacs_interface_number()) +
+                    '" omitted from translation')
         for name in self._switch.get_all_snmp_target_params():
             if (self._switch._snmp_target_params[name].is_configured() and not
                     self._switch._snmp_target_params[name].get_is_written()):
@@ -1669,10 +1719,12 @@ class ConfigWriter:
                 unwritten.append('WARN: User account ' + str(name) +
                                  ' configured, but omitted from translation')
         # feature module Basic Layer 3
-        if self._switch.get_ipv4_routing_reason() == 'transfer_conf':
-            state = 'enabl' if self._switch.get_ipv4_routing() else 'disabl'
-            unwritten.append('WARN: global IPv4 routing is ' + state +
-                             'ed, but omitted from translation')
+        if self._switch.is_dirty('basic_layer_3'):
+            if self._switch.get_ipv4_routing_reason() == 'transfer_conf':
+                state = ('enabl' if self._switch.get_ipv4_routing()
+                         else 'disabl')
+                unwritten.append('WARN: global IPv4 routing is ' + state +
+                                 'ed, but omitted from translation')
         return unwritten
 
     def port(self):
@@ -1698,11 +1750,22 @@ class ConfigWriter:
         return [], ['ERROR: Generic switch cannot generate basic layer 3'
                     ' configuration']
 
+    def generate_diff(self, old):
+        """Generate commands changing the configuration of old to this one.
+
+        The configuration writer old must have generated the configuration
+        of a switch of the same model before.
+        """
+        return [], ['ERROR: Configuration changes cannot be generated for ' +
+                    str(self._switch.get_os())]
+
     def generate(self):
         config = []
         errors = []
+        self._written = {}
         for fm in self._feature_modules:
             fm_config, fm_errors = getattr(self, fm)()
+            self._written[fm] = fm_config
             config.extend(fm_config)
             errors.extend(fm_errors)
         errors.extend(self.check_unwritten())
@@ -0,0 +1,411 @@
+# CDDL HEADER START
+#
+# The contents of this file are subject to the terms
+# of the Common Development and Distribution License
+# (the "License").  You may not use this file except
+# in compliance with the License.
+#
+# You can obtain a copy of the license at
+# LICENSE.txt or http://opensource.org/licenses/CDDL-1.0.
+# See the License for the specific language governing
+# permissions and limitations under the License.
+#
+# When distributing Covered Code, include this CDDL
+# HEADER in each file and include the License file at
+# LICENSE.txt  If applicable,
+# add the following below this CDDL HEADER, with the
+# fields enclosed by brackets "[]" replaced with your
+# own identifying information: Portions Copyright [yyyy]
+# [name of copyright owner]
+#
+# CDDL HEADER END
+
+# Copyright 2014-2017 Extreme Networks, Inc.  All rights reserved.
+# Use is subject to license terms.
+
+# This file is part of e2x (translate EOS switch configuration to ExtremeXOS)
+
+"""Translation service for E2X.
+
+The translation service keeps initialized source and target switch models
+in memory and translates configurations sent as JSON via HTTP, either
+using a TCP port or a Unix domain socket. This avoids starting E2X for
+every configuration to translate.
+
+A translation request is sent to the path /translate using POST. The
+request is a JSON object with the following members:
+
+config   configuration to translate, as a string or a list of lines
+source   source switch model (optional)
+target   target switch model (optional)
+options  object with command line options (optional), see OPTIONS
+
+The response is a JSON object with the translated configuration as a
+string ('config'), the ACL policy files as an object mapping file names to
+file contents ('acls'), the list of messages ('messages'), and a boolean
+indicating if an error occurred ('error').
+
+A GET request to the path /models returns the supported source and target
+switch models.
+
+Classes:
+TranslationService translates requests given as dictionaries.
+TranslationRequestHandler handles HTTP requests to a translation service.
+TranslationClient sends requests to a running translation service.
+
+Functions:
+create_server(address, service) creates a server for the service.
+serve(address, service) runs the translation service until interrupted.
+
+Variables:
+OPTIONS contains the names of the supported translation options.
+MAX_IDLE_PER_KEY is the number of idle core modules kept per switch models
+and options.
+MAX_KEYS is the number of switch models and options combinations with idle
+core modules kept.
+"""
+
+import collections
+import http.client
+import http.server
+import json
+import os
+import socket
+import socketserver
+import stat
+import sys
+import threading
+
+import CM
+import Messages
+import cli
+from Messages import Message
+
+OPTIONS = ('ignore_defaults', 'keep_unknown_lines', 'comment_unknown_lines',
+           'disable_unused_ports', 'optimize_acls', 'mgmt_port', 'sfp_list',
+           'err_unknown_lines', 'err_warnings', 'abort_on_error',
+           'log_level')
+
+# options that affect the core module, the others affect messages only
+_CORE_OPTIONS = ('ignore_defaults', 'keep_unknown_lines',
+                 'comment_unknown_lines', 'disable_unused_ports',
+                 'optimize_acls', 'mgmt_port', 'sfp_list')
+
+MAX_IDLE_PER_KEY = 4
+MAX_KEYS = 16
+
+_DEFAULT_OPTIONS = {opt: False for opt in OPTIONS}
+_DEFAULT_OPTIONS['sfp_list'] = None
+_DEFAULT_OPTIONS['log_level'] = 'NOTICE'
+
+
+class TranslationService:
+
+    """Translate configurations using a pool of prepared core modules.
+
+    Every request uses a core module of its own, thus requests can be
+    translated concurrently. Core modules are kept for later requests
+    with the same switch models and options, so switch initialization and
+    default settings are computed only once. At most max_idle core
+    modules are kept per switch models and options, and those of at most
+    max_keys combinations, dropping the least recently used ones.
+
+    Methods:
+    warm_up() prepares a core module for the default switch models.
+    get_models() returns the supported source and target switch models.
+    translate(request) translates a request and returns the response.
+    """
+
+    def __init__(self, source, target, options=None,
+                 max_idle=MAX_IDLE_PER_KEY, max_keys=MAX_KEYS):
+        self._source = source
+        self._target = target
+        self._options = dict(_DEFAULT_OPTIONS)
+        if options:
+            self._options.update(options)
+        self._max_idle = max_idle
+        self._max_keys = max_keys
+        self._lock = threading.Lock()
+        # idle core modules per key, least recently used key first
+        self._idle = collections.OrderedDict()
+
+    def warm_up(self):
+        """Prepare a core module for the default switch models."""
+        return self.translate({'config': []})
+
+    def get_models(self):
+        c = CM.CoreModule()
+        return {'source': sorted(c.get_source_switches()),
+                'target': sorted(c.get_target_switches())}
+
+    def _acquire(self, key, source, target, options):
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                self._idle.move_to_end(key)
+                return idle.pop(), []
+        return CM.create_core_module(source, target, options)
+
+    def _release(self, key, core_module):
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle is None:
+                idle = self._idle[key] = []
+                while len(self._idle) > self._max_keys:
+                    self._idle.popitem(last=False)
+            else:
+                self._idle.move_to_end(key)
+            if len(idle) < self._max_idle:
+                idle.append(core_module)
+
+    def _check_request(self, request):
+        """Return switch models, options, config, and errors of a request."""
+        if not isinstance(request, dict):
+            return None, None, None, ['ERROR: Translation request must be '
+                                      'a JSON object']
+        err = []
+        source = request.get('source') or self._source
+        target = request.get('target') or self._target
+        config = request.get('config', [])
+        if isinstance(config, str):
+            config = config.splitlines()
+        elif (not isinstance(config, list) or
+              not all(isinstance(l, str) for l in config)):
+            err.append('ERROR: "config" must be a string or a list of '
+                       'strings')
+        options = dict(self._options)
+        req_options = request.get('options', {})
+        if not isinstance(req_options, dict):
+            err.append('ERROR: "options" must be a JSON object')
+            req_options = {}
+        for opt in req_options:
+            if opt not in options:
+                err.append('ERROR: Unknown option "' + str(opt) + '"')
+        options.update(req_options)
+        if isinstance(options['sfp_list'], str):
+            options['sfp_list'] = options['sfp_list'].split(',')
+        if options['log_level'] not in Messages.LEVELS:
+            err.append('ERROR: Unknown log level "' +
+                       str(options['log_level']) + '"')
+        return (source, target), options, config, err
+
+    def translate(self, request):
+        """Translate the request and return the response."""
+        models, options, config, err = self._check_request(request)
+        if err:
+            return _error_response(err)
+        source, target = models
+        key = (source, target,
+               tuple(str(options[opt]) for opt in _CORE_OPTIONS))
+        c, err = self._acquire(key, source, target, options)
+        if c is None:
+            return _error_response(err)
+        c.set_log_level(cli.translation_log_level(
+            options['log_level'], err_warnings=options['err_warnings'],
+            err_unknown_lines=options['err_unknown_lines']))
+        try:
+            t_conf, messages = c.translate([l.rstrip() for l in config])
+        except Exception as e:
+            return _error_response(['ERROR: Translation failed (' +
+                                    str(e) + ')'])
+        self._release(key, c)
+
+        messages = cli.normalize_messages(messages)
+        if options['err_unknown_lines']:
+            messages = cli.unknown_to_error(messages)
+        if options['err_warnings']:
+            messages = cli.warn_to_error(messages)
+        conf_lines, acl_list, errors = cli.split_translation(t_conf)
+        messages.extend(cli.normalize_messages(errors))
+        error = any(m.level == 'ERROR' for m in messages)
+        if options['abort_on_error'] and error:
+            conf_lines, acl_list = [], []
+            messages.append(Message('ERROR', 'Error translating '
+                                    'configuration, no translation created'))
+        filtered = []
+        for m in cli.filter_messages(messages, options['log_level']):
+            if str(m) not in filtered:
+                filtered.append(str(m))
+        return {'config': ''.join(l + '\n' for l in conf_lines),
+                'acls': {name: entries + '\n' for name, entries in acl_list},
+                'messages': filtered,
+                'error': error}
+
+
+def _error_response(messages):
+    return {'config': '', 'acls': {}, 'messages': messages, 'error': True}
+
+
+class TranslationRequestHandler(http.server.BaseHTTPRequestHandler):
+
+    """Handle HTTP requests to the translation service of the server."""
+
+    server_version = cli.progname + '/' + cli.progver
+
+    def _send(self, status, response):
+        body = json.dumps(response).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/models':
+            self._send(200, self.server.service.get_models())
+        else:
+            self._send(404, _error_response(['ERROR: Unknown resource "' +
+                                             self.path + '"']))
+
+    def do_POST(self):
+        if self.path != '/translate':
+            self._send(404, _error_response(['ERROR: Unknown resource "' +
+                                             self.path + '"']))
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length).decode('utf-8'))
+        except ValueError:
+            self._send(400, _error_response(['ERROR: Translation request '
+                                             'is not valid JSON']))
+            return
+        self._send(200, self.server.service.translate(request))
+
+    def address_string(self):
+        if isinstance(self.client_address, tuple):
+            return super().address_string()
+        return str(self.server.server_address)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class _TcpServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+
+
+if hasattr(socketserver, 'UnixStreamServer'):
+    class _UnixServer(socketserver.ThreadingMixIn,
+                      socketserver.UnixStreamServer):
+        daemon_threads = True
+
+
+def _is_unix_socket_address(address):
+    return '/' in address or os.sep in address
+
+
+def _parse_tcp_address(address):
+    host, _, port = address.rpartition(':')
+    return (host or 'localhost', int(port))
+
+
+def create_server(address, service, verbose=False):
+    """Create a server for the service listening on address.
+
+    The address is either HOST:PORT, just a PORT on localhost, or the
+    path of a Unix domain socket. Port 0 selects a free port, the server
+    attribute server_address contains the address actually used.
+    """
+    if _is_unix_socket_address(address):
+        if not hasattr(socketserver, 'UnixStreamServer'):
+            raise ValueError('Unix domain sockets are not supported')
+        # remove a socket left over from a previous run
+        try:
+            if stat.S_ISSOCK(os.stat(address).st_mode):
+                os.unlink(address)
+        except OSError:
+            pass
+        server = _UnixServer(address, TranslationRequestHandler)
+    else:
+        server = _TcpServer(_parse_tcp_address(address),
+                            TranslationRequestHandler)
+    server.service = service
+    server.verbose = verbose
+    return server
+
+
+def serve(address, service, verbose=False):
+    """Run the translation service until interrupted."""
+    try:
+        server = create_server(address, service, verbose)
+    except (OSError, ValueError) as e:
+        print('ERROR: Cannot start translation service on "' + address +
+              '" (' + str(e) + ')', file=sys.stderr)
+        return 1
+    service.warm_up()
+    print('NOTICE: Translation service listening on',
+          server.server_address, file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if _is_unix_socket_address(address):
+            try:
+                os.unlink(address)
+            except OSError:
+                pass
+    return 0
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+
+    def __init__(self, path, **kwargs):
+        super().__init__('localhost', **kwargs)
+        self._path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not socket._GLOBAL_DEFAULT_TIMEOUT:
+            self.sock.settimeout(self.timeout)
+        self.sock.connect(self._path)
+
+
+class TranslationClient:
+
+    """Send requests to a translation service.
+
+    Methods:
+    get_models() returns the supported source and target switch models.
+    translate(config, source, target, **options) returns the translation.
+    """
+
+    def __init__(self, address, timeout=None):
+        self._address = address
+        self._timeout = timeout
+
+    def _connect(self):
+        kwargs = {}
+        if self._timeout is not None:
+            kwargs['timeout'] = self._timeout
+        if _is_unix_socket_address(self._address):
+            return _UnixHTTPConnection(self._address, **kwargs)
+        host, port = _parse_tcp_address(self._address)
+        return http.client.HTTPConnection(host, port, **kwargs)
+
+    def _request(self, method, path, request=None):
+        conn = self._connect()
+        try:
+            headers, body = {}, None
+            if request is not None:
+                body = json.dumps(request).encode('utf-8')
+                headers['Content-Type'] = 'application/json'
+            conn.request(method, path, body, headers)
+            return json.loads(conn.getresponse().read().decode('utf-8'))
+        finally:
+            conn.close()
+
+    def get_models(self):
+        return self._request('GET', '/models')
+
+    def translate(self, config, source=None, target=None, **options):
+        request = {'config': config, 'options': options}
+        if source:
+            request['source'] = source
+        if target:
+            request['target'] = target
+        return self._request('POST', '/translate', request)
+
+# vim:filetype=python:expandtab:shiftwidth=4:tabstop=4
@@ -25,10 +25,56 @@
 
 # This file is part of e2x (translate EOS switch configuration to ExtremeXOS)
 
-"""This file handles translation of command lines in interactive mode."""
+"""This file handles translation of command lines in interactive mode.
+
+Every pattern is compiled once. Patterns are indexed by the first word of
+their literal prefix, i.e. the leading part of the pattern without regular
+expression syntax. A command line is matched against the patterns whose
+literal prefix occurs in it only, in the order of the pattern table.
+"""
 
 import re
 
+# characters starting regular expression syntax in a pattern
+_SPECIAL = frozenset('\\.^$*+?{}[]|()')
+# quantifiers that make the preceding character optional
+_OPTIONAL = frozenset('*?{')
+
+
+def literal_prefix(pattern):
+    """Return the leading literal text every match of pattern starts with.
+
+    >>> literal_prefix(r'show switch (\\d+)')
+    'show switch '
+    >>> literal_prefix('show (ip )?arp')
+    'show '
+    >>> literal_prefix('show ip interface vlan *(\\d+)')
+    'show ip interface vlan'
+    >>> literal_prefix('show|set')
+    ''
+    """
+    # a top level alternative does not start with the prefix
+    depth, escaped = 0, False
+    for c in pattern:
+        if escaped:
+            escaped = False
+        elif c == '\\':
+            escaped = True
+        elif c == '(':
+            depth += 1
+        elif c == ')':
+            depth -= 1
+        elif c == '|' and depth == 0:
+            return ''
+    prefix = ''
+    for c in pattern:
+        if c in _SPECIAL:
+            if c in _OPTIONAL:
+                prefix = prefix[:-1]
+            break
+        prefix += c
+    return prefix
+
 
 class Translation:
 
@@ -58,11 +104,14 @@ class PatternReplacement:
         self.pattern = pattern
         self.replacement = replacement
         self.hint = hint
+        self.regex = re.compile(pattern + r'\s*$', re.IGNORECASE)
+        self.prefix = literal_prefix(pattern).casefold()
 
 
 class Translator:
 
     PATTERN_IPV4 = r'\d{1,3}.\d{1,3}.\d{1,3}.\d{1,3}'
+    NOT_SUPPORTED = 'Config line not supported for translation (yet)!'
 
     def __init__(self, pattern_replacements=None):
         if pattern_replacements:
@@ -335,13 +384,35 @@ class Translator:
                 )
             self.pattern_replacements = list(PatternReplacement(p, r, h) for
                                              p, r, h in pat_repl_lst)
+        self._index = self._create_index(self.pattern_replacements)
 
-    def convert_line(self, pattern, replacement, line):
-        t, n = re.subn(pattern + '\s*$', replacement, line,
-                       flags=re.IGNORECASE)
-        if n:
-            return t
-        return None
+    @staticmethod
+    def _create_index(pattern_replacements):
+        """Index the patterns by the first word of their literal prefix.
+
+        Return a dictionary mapping the first word to a dictionary of the
+        literal prefixes starting with it, each mapped to the list of the
+        positions of its patterns in the pattern table. Patterns without
+        literal prefix are stored with the empty word and prefix.
+        """
+        index = {}
+        for pos, pr in enumerate(pattern_replacements):
+            words = pr.prefix.split(' ', 1)
+            prefixes = index.setdefault(words[0], {})
+            prefixes.setdefault(pr.prefix, []).append(pos)
+        return index
+
+    def _candidates(self, line):
+        """Return the patterns that may match line, in table order."""
+        line = line.casefold()
+        positions = []
+        for word, prefixes in self._index.items():
+            if word in line:
+                for prefix, pos_lst in prefixes.items():
+                    if prefix in line:
+                        positions.extend(pos_lst)
+        positions.sort()
+        return [self.pattern_replacements[pos] for pos in positions]
 
     def translate(self, configline):
         configline_list = configline.strip().split()
@@ -351,13 +422,18 @@ class Translator:
             return transl
         if configline.startswith('#') or configline.startswith('!'):
             return transl
-        for pr in self.pattern_replacements:
-            tl = self.convert_line(pr.pattern, pr.replacement, configline)
-            if tl is not None:
+        transl.set_hint(self.NOT_SUPPORTED)
+        for pr in self._candidates(configline):
+            tl, n = pr.regex.subn(pr.replacement, configline)
+            if n:
                 transl.set_hint(pr.hint)
                 transl.set_xos(tl)
                 break
-            transl.set_hint('Config line not supported for translation (yet)!')
         return transl
 
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
+
 # vim:filetype=python:expandtab:shiftwidth=4:tabstop=4
@@ -38,9 +38,16 @@ create_compact_sequence(lst) creates a sequence string from a list of integers.
 create_sequence(lst) creates a sequence string from a list.
 words_to_lower(lines, words, comments) converts every instance of words found
 in lines to lower case.
+conf_value(value, reason) returns a shared (value, reason) tuple for a
+configurable attribute.
 """
 
 import re
+import sys
+
+# shared (value, reason) tuples of configurable attributes
+_conf_values = {}
+_SHAREABLE_TYPES = {type(None), bool, int}
 
 
 def expand_sequence(sequence):
@@ -384,6 +391,37 @@ def words_to_lower(lines, words, comments):
         result.append(' '.join(normalized_lst))
     return result
 
+
+def conf_value(value, reason):
+    """Return a (value, reason) tuple for a configurable attribute.
+
+    Model objects store every configurable attribute as a tuple of the
+    value and the reason for this value. Most of these tuples have a
+    simple value like None, a boolean, or a number, and one of a handful
+    of reasons, so they are taken from a shared table instead of creating
+    a new tuple for every port. Reason strings are interned. Other values,
+    e.g. lists, always get a new tuple.
+
+    >>> conf_value(True, 'config') is conf_value(True, 'config')
+    True
+    >>> conf_value(1, 'config')
+    (1, 'config')
+    >>> conf_value(True, 'config')
+    (True, 'config')
+    >>> lst = []
+    >>> conf_value(lst, 'config')[0] is lst
+    True
+    """
+    if type(reason) is str:
+        reason = sys.intern(reason)
+    if type(value) not in _SHAREABLE_TYPES:
+        return (value, reason)
+    key = (type(value), value, reason)
+    ret = _conf_values.get(key)
+    if ret is None:
+        ret = _conf_values.setdefault(key, (value, reason))
+    return ret
+
 # hook for the doctest Python module
 if __name__ == "__main__":
     import doctest
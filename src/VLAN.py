@@ -27,6 +27,8 @@
 
 """Model of a VLAN."""
 
+from Messages import Message
+
 
 def is_valid_tag(tag):
     try:
@@ -46,6 +48,10 @@ class VLAN():
     VLAN configuration.
     """
 
+    __slots__ = ('_name', '_name_is_default', '_tag', '_egress_ports',
+                 '_ingress_ports', '_switch', '_ipv4_acl_in',
+                 '_ipv4_addresses', '_ipv4_helper_addresses', '_svi_shutdown')
+
     def __init__(self, name=None, tag=None, switch=None):
         self._name = name
         self._name_is_default = False
@@ -70,6 +76,26 @@ class VLAN():
         description += 'SVI shutdown: ' + str(self._svi_shutdown)
         return description
 
+    def __deepcopy__(self, memo):
+        """Copy the VLAN, sharing the immutable attribute values.
+
+        The copy is associated with the copy of the switch, if the switch
+        is copied as well, with the original switch otherwise.
+        """
+        vlan = object.__new__(type(self))
+        memo[id(self)] = vlan
+        vlan._name = self._name
+        vlan._name_is_default = self._name_is_default
+        vlan._tag = self._tag
+        vlan._egress_ports = list(self._egress_ports)
+        vlan._ingress_ports = list(self._ingress_ports)
+        vlan._switch = memo.get(id(self._switch), self._switch)
+        vlan._ipv4_acl_in = list(self._ipv4_acl_in)
+        vlan._ipv4_addresses = list(self._ipv4_addresses)
+        vlan._ipv4_helper_addresses = list(self._ipv4_helper_addresses)
+        vlan._svi_shutdown = self._svi_shutdown
+        return vlan
+
     def get_name(self):
         return self._name
 
@@ -161,6 +187,13 @@ class VLAN():
         ri = self.del_ingress_port(name, tagged='all')
         return re and ri
 
+    def del_ports(self, names):
+        """Delete the ports in the set names from the VLAN."""
+        self._egress_ports = [p for p in self._egress_ports
+                              if p[0] not in names]
+        self._ingress_ports = [p for p in self._ingress_ports
+                               if p[0] not in names]
+
     def del_all_ports(self):
         self._egress_ports = []
         self._ingress_ports = []
@@ -170,10 +203,10 @@ class VLAN():
         mapped_list, ret = [], []
         for name in from_list:
             if name in shadowed:
-                err = 'INFO: Port "' + name + '" in VLAN "' + str(self._tag)
-                err += '" (' + tagging + ', ' + direction + ') omitted because'
-                err += ' of LAG with same target port name'
-                ret.append(err)
+                ret.append(Message('INFO', 'Port "{}" in VLAN "{}" ({}, {}) '
+                                   'omitted because of LAG with same target'
+                                   ' port name', name, self._tag, tagging,
+                                   direction))
             elif name in port_mapping:
                 if (port_mapping[name], tagging) not in mapped_list:
                     mapped_list.append((port_mapping[name], tagging))
@@ -289,7 +322,7 @@ class VLAN():
                 err = ('NOTICE: VLAN configuration of port ' + port_name +
                        ' shadowed by LAG configuration')
                 ret.append(err)
-        ret.append('DEBUG: Ports shadowed by LAGs: ' + str(shadowed))
+        ret.append(Message('DEBUG', 'Ports shadowed by LAGs: {}', shadowed))
         egr_tag, err = self._add_mapped_ports(
             from_vlan.get_egress_ports('tagged'), port_mapping, lag_mapping,
             shadowed, 'tagged', 'egress'
@@ -301,8 +334,8 @@ class VLAN():
         )
         ret.extend(err)
         self._egress_ports = egr_tag + egr_un
-        ret.append('DEBUG: Egress ports VLAN "' + str(self._tag) + '": ' +
-                   str(self._egress_ports))
+        ret.append(Message('DEBUG', 'Egress ports VLAN "{}": {}', self._tag,
+                           list(self._egress_ports)))
         ing_tag, err = self._add_mapped_ports(
             from_vlan.get_ingress_ports('tagged'), port_mapping, lag_mapping,
             shadowed, 'tagged', 'ingress'
@@ -314,8 +347,8 @@ class VLAN():
         )
         ret.extend(err)
         self._ingress_ports = ing_tag + ing_un
-        ret.append('DEBUG: Ingress ports VLAN "' + str(self._tag) + '": ' +
-                   str(self._ingress_ports))
+        ret.append(Message('DEBUG', 'Ingress ports VLAN "{}": {}', self._tag,
+                           list(self._ingress_ports)))
         # re-add unmapped ports to default VLAN 1
         if self._tag == 1:
             for name in unmapped_ports:
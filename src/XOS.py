@@ -47,6 +47,7 @@ devices defines the switch models supported by this module.
 
 import json
 
+import Devices
 import STP
 import Switch
 import SyslogServer
@@ -303,43 +304,6 @@ class XosSwitchHardware(XosSwitch):
             self._hw_desc.append(sw_hw)
         self._setup_hw()
 
-devices = {
-    'SummitX460-48t': {'use_as': 'target', 'os': 'XOS'},
-    'SummitX460-48t+2xf': {'use_as': 'target', 'os': 'XOS'},
-    'SummitX460-48t+2sf': {'use_as': 'target', 'os': 'XOS'},
-    'SummitX460-48t+4sf': {'use_as': 'target', 'os': 'XOS'},
-    'SummitX460-48t+2xf+4sf': {'use_as': 'target', 'os': 'XOS'},
-    'SummitX460-48t+2sf+4sf': {'use_as': 'target', 'os': 'XOS'},
-    'SummitX460-48p': {'use_as': 'target', 'os': 'XOS'},
-    'SummitX460-48p+2xf': {'use_as': 'target', 'os': 'XOS'},
-    'SummitX460-48p+2sf': {'use_as': 'target', 'os': 'XOS'},
-    'SummitX460-48p+4sf': {'use_as': 'target', 'os': 'XOS'},
-    'SummitX460-48p+2xf+4sf': {'use_as': 'target', 'os': 'XOS'},
-    'SummitX460-48p+2sf+4sf': {'use_as': 'target', 'os': 'XOS'},
-    'SummitX460-24t': {'use_as': 'target', 'os': 'XOS'},
-    'SummitX460-24t+2xf': {'use_as': 'target', 'os': 'XOS'},
-    'SummitX460-24t+2sf': {'use_as': 'target', 'os': 'XOS'},
-    'SummitX460-24t+4sf': {'use_as': 'target', 'os': 'XOS'},
-    'SummitX460-24t+2xf+4sf': {'use_as': 'target', 'os': 'XOS'},
-    'SummitX460-24t+2sf+4sf': {'use_as': 'target', 'os': 'XOS'},
-    'SummitX460-24p': {'use_as': 'target', 'os': 'XOS'},
-    'SummitX460-24p+2xf': {'use_as': 'target', 'os': 'XOS'},
-    'SummitX460-24p+2sf': {'use_as': 'target', 'os': 'XOS'},
-    'SummitX460-24p+4sf': {'use_as': 'target', 'os': 'XOS'},
-    'SummitX460-24p+2xf+4sf': {'use_as': 'target', 'os': 'XOS'},
-    'SummitX460-24p+2sf+4sf': {'use_as': 'target', 'os': 'XOS'},
-    'SummitX460-24x': {'use_as': 'target', 'os': 'XOS'},
-    'SummitX460-24x+2xf': {'use_as': 'target', 'os': 'XOS'},
-    'SummitX460-24x+2sf': {'use_as': 'target', 'os': 'XOS'},
-    'SummitX460-24x+4sf': {'use_as': 'target', 'os': 'XOS'},
-    'SummitX460-24x+2xf+4sf': {'use_as': 'target', 'os': 'XOS'},
-    'SummitX460-24x+2sf+4sf': {'use_as': 'target', 'os': 'XOS'},
-    'SummitX460-48x': {'use_as': 'target', 'os': 'XOS'},
-    'SummitX460-48x+2xf': {'use_as': 'target', 'os': 'XOS'},
-    'SummitX460-48x+2sf': {'use_as': 'target', 'os': 'XOS'},
-    'SummitX460-48x+4sf': {'use_as': 'target', 'os': 'XOS'},
-    'SummitX460-48x+2xf+4sf': {'use_as': 'target', 'os': 'XOS'},
-    'SummitX460-48x+2sf+4sf': {'use_as': 'target', 'os': 'XOS'},
-    }
+devices = Devices.xos_devices
 
 # vim:filetype=python:expandtab:shiftwidth=4:tabstop=4
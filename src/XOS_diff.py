@@ -0,0 +1,459 @@
+# CDDL HEADER START
+#
+# The contents of this file are subject to the terms
+# of the Common Development and Distribution License
+# (the "License").  You may not use this file except
+# in compliance with the License.
+#
+# You can obtain a copy of the license at
+# LICENSE.txt or http://opensource.org/licenses/CDDL-1.0.
+# See the License for the specific language governing
+# permissions and limitations under the License.
+#
+# When distributing Covered Code, include this CDDL
+# HEADER in each file and include the License file at
+# LICENSE.txt  If applicable,
+# add the following below this CDDL HEADER, with the
+# fields enclosed by brackets "[]" replaced with your
+# own identifying information: Portions Copyright [yyyy]
+# [name of copyright owner]
+#
+# CDDL HEADER END
+
+# Copyright 2014-2017 Extreme Networks, Inc.  All rights reserved.
+# Use is subject to license terms.
+
+# This file is part of e2x (translate EOS switch configuration to ExtremeXOS)
+
+"""Create XOS commands changing one translated configuration to another.
+
+Both configurations are translated to the same target switch model. The
+port, LAG, and VLAN settings are compared using the switch models after
+writing the configuration, thus including every normalization done by
+XosConfigWriter. Spanning tree, ACL policies, and management servers are
+configured globally on XOS, they are compared per family of settings
+using the generated commands. A changed family is removed and configured
+again, except for VLANs added to or removed from a spanning tree.
+
+Functions:
+diff(old_writer, new_writer) returns commands to change the configuration
+written by old_writer to the one written by new_writer.
+"""
+
+import Utils
+
+_MGMT_FAMILIES = [
+    ('syslog', ('configure syslog ', 'configure log target syslog ',
+                'enable log target syslog ')),
+    ('sntp', ('configure sntp-client ', 'enable sntp-client',
+              'disable sntp-client')),
+    ('radius', ('configure radius ', 'enable radius ', 'disable radius ')),
+    ('tacacs', ('configure tacacs ', 'enable tacacs', 'disable tacacs')),
+    ('snmp_trap', ('configure snmp add trapreceiver ',)),
+]
+_MGMT_SERVICES = {'enable sntp-client', 'enable radius mgmt-access',
+                  'enable tacacs'}
+
+
+def _sequence(ports):
+    seq = Utils.create_compact_sequence(ports)
+    if not seq:
+        seq = Utils.create_sequence(ports)
+    return seq
+
+
+def _port_settings(switch):
+    return {p.get_name(): p for p in switch.get_ports()}
+
+
+def _single_acl(acl_lst, always_prefix=False):
+    """Return the policy name of the only ACL in acl_lst, or None."""
+    if len(acl_lst) != 1:
+        return None
+    acl = acl_lst[0]
+    if always_prefix or isinstance(acl, int):
+        return 'acl_' + str(acl)
+    return acl
+
+
+def _diff_ports(old_switch, new_switch):
+    conf = []
+    old_ports = _port_settings(old_switch)
+    for p in new_switch.get_ports():
+        name = p.get_name()
+        op = old_ports.get(name)
+        if op is None:
+            continue
+        # enable / disable port
+        state = p.get_admin_state()
+        if state is not None and state != op.get_admin_state():
+            conf.append(('enable' if state else 'disable') + ' ports ' + name)
+        # port speed, duplex, and auto-negotiation
+        auto_neg, speed, duplex = (p.get_auto_neg(), p.get_speed(),
+                                   p.get_duplex())
+        if (auto_neg is not None and
+                (auto_neg, speed, duplex) !=
+                (op.get_auto_neg(), op.get_speed(), op.get_duplex())):
+            if auto_neg:
+                conf.append('configure ports ' + name + ' auto on')
+            elif speed is not None and duplex is not None:
+                conf.append('configure ports ' + name + ' auto off speed ' +
+                            str(speed) + ' duplex ' + str(duplex))
+        # port descriptions
+        desc = p.get_short_description()
+        if desc != op.get_short_description():
+            if desc:
+                conf.append('configure ports ' + name + ' display-string ' +
+                            desc)
+            else:
+                conf.append('unconfigure ports ' + name + ' display-string')
+        desc = p.get_description()
+        if desc != op.get_description():
+            if desc:
+                conf.append('configure ports ' + name +
+                            ' description-string "' + desc + '"')
+            else:
+                conf.append('unconfigure ports ' + name +
+                            ' description-string')
+        # jumbo frames
+        jumbo = p.get_jumbo()
+        if jumbo is not None and jumbo != op.get_jumbo():
+            conf.append(('enable' if jumbo else 'disable') +
+                        ' jumbo-frame ports ' + name)
+        # inbound ACL
+        acl = _single_acl(p.get_ipv4_acl_in(), True)
+        old_acl = _single_acl(op.get_ipv4_acl_in(), True)
+        if acl != old_acl:
+            if old_acl:
+                conf.append('unconfigure access-list ' + old_acl +
+                            ' ports ' + name + ' ingress')
+            if acl:
+                conf.append('configure access-list ' + acl + ' ports ' +
+                            name + ' ingress')
+    return conf, []
+
+
+def _lag_settings(switch):
+    lags = {}
+    for l in switch.get_lags():
+        master_port = l.get_master_port()
+        if master_port:
+            lags[master_port] = l
+    return lags
+
+
+def _diff_lags(old_switch, new_switch):
+    conf = []
+    old_lags = _lag_settings(old_switch)
+    new_lags = _lag_settings(new_switch)
+    changed = []
+    for master_port, old_lag in old_lags.items():
+        new_lag = new_lags.get(master_port)
+        if (new_lag is None or
+                new_lag.get_members() != old_lag.get_members() or
+                new_lag.get_lacp_enabled() != old_lag.get_lacp_enabled()):
+            conf.append('disable sharing ' + master_port)
+    for master_port, new_lag in new_lags.items():
+        old_lag = old_lags.get(master_port)
+        members = new_lag.get_members()
+        if (old_lag is None or members != old_lag.get_members() or
+                new_lag.get_lacp_enabled() != old_lag.get_lacp_enabled()):
+            cmd = 'enable sharing ' + master_port + ' grouping '
+            cmd += _sequence(members) + ' algorithm address-based L3'
+            if new_lag.get_lacp_enabled():
+                cmd += ' lacp'
+            conf.append(cmd)
+            changed.append(master_port)
+        for get_desc, keyword, fmt in (
+                ('get_short_description', 'display-string', '{}'),
+                ('get_description', 'description-string', '"{}"')):
+            desc = getattr(new_lag, get_desc)()
+            old_desc = getattr(old_lag, get_desc)() if old_lag else None
+            if desc == old_desc and master_port not in changed:
+                continue
+            if desc:
+                conf.extend('configure ports ' + p + ' ' + keyword + ' ' +
+                            fmt.format(desc) for p in members)
+            elif old_desc:
+                conf.extend('unconfigure ports ' + p + ' ' + keyword
+                            for p in members)
+    return conf, []
+
+
+def _vlan_key(vlan):
+    return vlan.get_tag() if vlan.get_tag() else vlan.get_name()
+
+
+def _vlan_ports(vlan):
+    ports = {p: 'tagged' for p in vlan.get_egress_ports('tagged')}
+    ports.update((p, 'untagged') for p in vlan.get_egress_ports('untagged'))
+    return ports
+
+
+def _helper_addresses(vlans):
+    addresses = []
+    for vlan in vlans:
+        for address in vlan.get_ipv4_helper_addresses():
+            if address not in addresses:
+                addresses.append(address)
+    return addresses
+
+
+def _diff_vlans(old_switch, new_switch):
+    conf, err = [], []
+    old_vlans = {_vlan_key(v): v for v in old_switch.get_all_vlans()}
+    new_vlans = {_vlan_key(v): v for v in new_switch.get_all_vlans()}
+    # remove VLANs first, their names may be used by renamed VLANs
+    for key, vlan in old_vlans.items():
+        if key not in new_vlans and vlan.get_tag() != 1:
+            conf.append('delete vlan ' + vlan.get_name())
+    kept = [(old_vlans[key], vlan) for key, vlan in new_vlans.items()
+            if key in old_vlans]
+    for old_vlan, vlan in kept:
+        if old_vlan.get_name() != vlan.get_name():
+            conf.append('configure vlan ' + old_vlan.get_name() + ' name ' +
+                        vlan.get_name())
+    # a port can be untagged in one VLAN only, remove ports before adding
+    for old_vlan, vlan in kept:
+        ports = _vlan_ports(vlan)
+        removed = [p for p, t in _vlan_ports(old_vlan).items()
+                   if ports.get(p) != t]
+        if removed:
+            conf.append('configure vlan ' + vlan.get_name() +
+                        ' delete ports ' + _sequence(removed))
+    for key, vlan in new_vlans.items():
+        if key not in old_vlans:
+            cmd = 'create vlan ' + vlan.get_name()
+            if vlan.get_tag():
+                cmd += ' tag ' + str(vlan.get_tag())
+            conf.append(cmd)
+    old_routing = old_switch.get_ipv4_routing()
+    routing = new_switch.get_ipv4_routing()
+    for key, vlan in new_vlans.items():
+        old_vlan = old_vlans.get(key)
+        name = vlan.get_name()
+        old_ports = _vlan_ports(old_vlan) if old_vlan else {}
+        ports = _vlan_ports(vlan)
+        for tagged in ('untagged', 'tagged'):
+            added = [p for p, t in ports.items()
+                     if t == tagged and old_ports.get(p) != t]
+            if added:
+                conf.append('configure vlan ' + name + ' add ports ' +
+                            _sequence(added) + ' ' + tagged)
+        # IPv4 addresses
+        old_addresses = old_vlan.get_ipv4_addresses() if old_vlan else []
+        addresses = vlan.get_ipv4_addresses()
+        old_primary = old_addresses[0] if old_addresses else None
+        primary = addresses[0] if addresses else None
+        old_fwd = bool(old_addresses) and old_routing
+        fwd = bool(addresses) and routing
+        if primary != old_primary:
+            for addr in old_addresses[1:]:
+                conf.append('configure vlan ' + name + ' delete '
+                            'secondary-ipaddress ' + addr[0] + ' ' + addr[1])
+            if old_primary:
+                conf.append('unconfigure vlan ' + name + ' ipaddress')
+            if primary:
+                conf.append('configure vlan ' + name + ' ipaddress ' +
+                            primary[0] + ' ' + primary[1])
+            old_addresses = addresses[:1]
+        for addr in old_addresses[1:]:
+            if addr not in addresses:
+                conf.append('configure vlan ' + name + ' delete '
+                            'secondary-ipaddress ' + addr[0] + ' ' + addr[1])
+        for addr in addresses[1:]:
+            if addr not in old_addresses:
+                conf.append('configure vlan ' + name + ' add '
+                            'secondary-ipaddress ' + addr[0] + ' ' + addr[1])
+        if fwd and (not old_fwd or primary != old_primary):
+            conf.append('enable ipforwarding vlan ' + name)
+        elif old_fwd and not fwd and addresses:
+            conf.append('disable ipforwarding vlan ' + name)
+        # inbound ACL
+        old_acl = _single_acl(old_vlan.get_ipv4_acl_in()) if old_vlan else None
+        acl = _single_acl(vlan.get_ipv4_acl_in())
+        if acl != old_acl:
+            if old_acl:
+                conf.append('unconfigure access-list ' + old_acl + ' vlan ' +
+                            name + ' ingress')
+            if acl:
+                conf.append('configure access-list ' + acl + ' vlan ' +
+                            name + ' ingress')
+    # BOOTP / DHCP relay uses a global list of servers
+    old_helpers = _helper_addresses(old_vlans.values())
+    helpers = _helper_addresses(new_vlans.values())
+    for address in old_helpers:
+        if address not in helpers:
+            conf.append('configure bootprelay delete ' + address)
+    for address in helpers:
+        if address not in old_helpers:
+            conf.append('configure bootprelay add ' + address)
+    if helpers and not old_helpers:
+        conf.append('enable bootprelay all')
+    elif old_helpers and not helpers:
+        conf.append('disable bootprelay all')
+    return conf, err
+
+
+def _auto_bind_vlan(line):
+    """Return the VLAN name if line binds a VLAN to an STP, else None."""
+    words = line.split()
+    if (len(words) == 6 and words[0] == 'enable' and
+            words[3:5] == ['auto-bind', 'vlan']):
+        return words[5]
+    return None
+
+
+def _diff_stp(old_writer, new_writer):
+    new_conf = new_writer.get_written_config('stp')
+    # VLAN bindings of renamed VLANs are kept, those of deleted VLANs
+    # are removed with the VLAN
+    new_vlans = {_vlan_key(v): v.get_name()
+                 for v in new_writer.get_switch().get_all_vlans()}
+    names = {v.get_name(): new_vlans.get(_vlan_key(v))
+             for v in old_writer.get_switch().get_all_vlans()}
+    old_conf = []
+    for line in old_writer.get_written_config('stp'):
+        vlan = _auto_bind_vlan(line)
+        if vlan is None:
+            old_conf.append(line)
+        elif names.get(vlan, vlan):
+            old_conf.append(line[:-len(vlan)] + names.get(vlan, vlan))
+    if old_conf == new_conf:
+        return [], []
+    if ([l for l in old_conf if _auto_bind_vlan(l) is None] ==
+            [l for l in new_conf if _auto_bind_vlan(l) is None]):
+        conf = []
+        for line in old_conf:
+            if _auto_bind_vlan(line) and line not in new_conf:
+                stpd, vlan = line.split()[2], _auto_bind_vlan(line)
+                conf.append('configure stpd ' + stpd + ' delete vlan ' +
+                            vlan + ' ports all')
+                conf.append('disable stpd ' + stpd + ' auto-bind vlan ' +
+                            vlan)
+        conf.extend(l for l in new_conf
+                    if _auto_bind_vlan(l) and l not in old_conf)
+        return conf, []
+    conf = []
+    for line in old_writer.get_written_config('stp'):
+        if line.startswith('create stpd '):
+            conf.append('delete stpd ' + line.split()[2])
+        elif line.startswith('configure mstp region '):
+            conf.append('unconfigure mstp region')
+    conf.append('unconfigure stpd s0')
+    conf.extend(new_conf)
+    return conf, ['NOTICE: Spanning tree configuration changed, replacing it'
+                  ' completely']
+
+
+def _policies(writer):
+    return {p[0]: p for p in writer.get_written_config('acl')}
+
+
+def _diff_acls(old_writer, new_writer):
+    conf = []
+    old_policies = _policies(old_writer)
+    refresh = []
+    for name, policy in _policies(new_writer).items():
+        if policy != old_policies.get(name):
+            conf.append(policy)
+            if name in old_policies:
+                refresh.append('refresh policy ' + name)
+    conf.extend(refresh)
+    new_policies = _policies(new_writer)
+    for name in old_policies:
+        if name not in new_policies:
+            conf.append('rm ' + name + '.pol')
+    return conf, []
+
+
+def _undo_mgmt_line(line):
+    """Return the command removing the setting of line, or None."""
+    words = line.split()
+    if line.startswith('configure syslog add '):
+        return 'configure syslog delete ' + ' '.join(words[3:])
+    if line.startswith('configure sntp-client '):
+        return 'unconfigure sntp-client ' + words[2]
+    if line.startswith('configure radius mgmt-access '):
+        return 'unconfigure radius mgmt-access server ' + words[3]
+    if (line.startswith('configure tacacs ') and
+            words[2:4] in (['primary', 'server'], ['secondary', 'server'])):
+        return 'unconfigure tacacs server ' + words[2]
+    if line.startswith('configure snmp add trapreceiver '):
+        return 'configure snmp delete trapreceiver ' + words[4]
+    if line in _MGMT_SERVICES:
+        return 'disable ' + line[len('enable '):]
+    return None
+
+
+def _split_mgmt(lines):
+    families = {name: [] for name, _ in _MGMT_FAMILIES}
+    other = []
+    for line in lines:
+        for name, prefixes in _MGMT_FAMILIES:
+            if line.startswith(prefixes):
+                families[name].append(line)
+                break
+        else:
+            other.append(line)
+    return families, other
+
+
+def _diff_mgmt(old_writer, new_writer):
+    conf, err = [], []
+    old_families, old_other = _split_mgmt(
+        old_writer.get_written_config('mgmt'))
+    new_families, new_other = _split_mgmt(
+        new_writer.get_written_config('mgmt'))
+    for name, _ in _MGMT_FAMILIES:
+        old_lines, new_lines = old_families[name], new_families[name]
+        if old_lines == new_lines:
+            continue
+        for line in old_lines:
+            undo = _undo_mgmt_line(line)
+            # services enabled again need not be disabled before
+            if undo and (line not in _MGMT_SERVICES or
+                         line not in new_lines):
+                conf.append(undo)
+        conf.extend(new_lines)
+    old_other.extend(old_writer.get_written_config('basic_layer_3'))
+    new_other.extend(new_writer.get_written_config('basic_layer_3'))
+    for line in old_other:
+        if line in new_other:
+            continue
+        if line.startswith('configure iproute add '):
+            conf.append('configure iproute delete ' +
+                        line[len('configure iproute add '):])
+        else:
+            err.append('WARN: Removal of "' + line + '" not included in '
+                       'configuration changes')
+    conf.extend(line for line in new_other if line not in old_other)
+    return conf, err
+
+
+def diff(old_writer, new_writer):
+    """Return commands changing the configuration of old to new_writer.
+
+    Both writers must have generated the configuration of a switch of the
+    same model. Return a list of configuration lines and ACL policies, as
+    returned by XosConfigWriter.generate(), and a list of messages.
+    """
+    old_switch, new_switch = old_writer.get_switch(), new_writer.get_switch()
+    if old_switch.get_model() != new_switch.get_model():
+        return [], ['ERROR: Cannot create configuration changes from switch '
+                    'model "' + str(old_switch.get_model()) + '" to "' +
+                    str(new_switch.get_model()) + '"']
+    conf, err = [], []
+    for diff_models in (_diff_ports, _diff_lags, _diff_vlans):
+        c, e = diff_models(old_switch, new_switch)
+        conf.extend(c)
+        err.extend(e)
+    for diff_written in (_diff_stp, _diff_acls, _diff_mgmt):
+        c, e = diff_written(old_writer, new_writer)
+        conf.extend(c)
+        err.extend(e)
+    if not conf:
+        err.append('INFO: No configuration changes')
+    return conf, err
+
+# vim:filetype=python:expandtab:shiftwidth=4:tabstop=4
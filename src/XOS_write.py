@@ -30,10 +30,66 @@
 Classes:
 XosConfigWriter, a specialization (subclass) of ConfigWriter, implements
 XOS specific methods for feature modules.
+
+Functions:
+acl_policy(acl, comment) returns the XOS policy of an ACL.
 """
 
+import ACL
+import STP
 import Switch
 import Utils
+from Messages import Message
+
+# characters not allowed in names and descriptions are replaced by '_'
+_SPECIAL_CHARACTERS_TRANSLATION = str.maketrans('"<>: &*', '_______')
+_SPACE_ALLOWED_TRANSLATION = str.maketrans('"<>:&*', '______')
+
+# reserved keywords taken from XOS 16.1 User Guide
+_RESERVED_KEYWORDS = frozenset({
+    'aaa', 'access-list', 'account', 'accounts', 'all', 'bandwidth',
+    'banner', 'bfd', 'bgp', 'bootp', 'bootprelay', 'brm', 'bvlan',
+    'cancel', 'cfgmgr', 'cfm', 'checkpoint-data', 'clear-flow', 'cli',
+    'cli-config-logging', 'clipaging', 'configuration', 'configure',
+    'continuous', 'count', 'counters', 'cpu-monitoring', 'cvlan',
+    'debug', 'debug-mode', 'devmgr', 'dhcp', 'dhcp-client',
+    'dhcp-server', 'diagnostics', 'diffserv', 'dns-client',
+    'dont-fragment', 'dos-protect', 'dot1ag', 'dot1p', 'dot1q', 'ds',
+    'eaps', 'edp', 'egress', 'elrp', 'elrp-client', 'elsm', 'ems',
+    'epm', 'esrp', 'fabric', 'failover', 'failsafe-account', 'fans',
+    'fdb', 'fdbentry', 'firmware', 'flood-group', 'flooding',
+    'flow-control', 'flow-redirect', 'forwarding', 'from', 'get',
+    'hal', 'hclag', 'heartbeat', 'icmp', 'identity-management',
+    'idletimeout', 'idmgr', 'igmp', 'image', 'ingress', 'inline-power',
+    'internal-memory', 'interval', 'iob-debug-level', 'iparp',
+    'ipconfig', 'ipforwarding', 'ipmc', 'ipmcforwarding', 'ipmroute',
+    'ip-mtu', 'ip-option', 'iproute', 'ip-security', 'ipstats', 'ipv4',
+    'IPv4', 'ipv6', 'IPv6', 'ipv6acl', 'irdp', 'isid', 'isis',
+    'jumbo-frame', 'jumbo-frame-size', 'l2stats', 'l2vpn', 'lacp',
+    'learning', 'learning-domain', 'license', 'license-info',
+    'licenses', 'lldp', 'log', 'loopback-mode', 'mac', 'mac-binding',
+    'mac-lockdown-timeout', 'management', 'mcast', 'memory',
+    'memorycard', 'meter', 'mirroring', 'mld', 'mpls', 'mrinfo',
+    'msdp', 'msgsrv', 'msm', 'msm-failover', 'mstp', 'mtrace',
+    'multiple-response-timeout', 'mvr', 'neighbor-discovery',
+    'netlogin', 'nettools', 'node', 'nodemgr', 'odometers', 'ospf',
+    'ospfv3', 'pim', 'policy', 'ports', 'power', 'primary',
+    'private-vlan', 'process', 'protocol', 'put', 'qosprofile',
+    'qosscheduler', 'radius', 'radius-accounting', 'rip', 'ripng',
+    'rmon', 'router-discovery', 'rtmgr', 'safe-default-script',
+    'script', 'secondary', 'session', 'sflow', 'sharing', 'show',
+    'slot', 'slot-poll-interval', 'smartredundancy', 'snmp', 'snmpv3',
+    'sntp-client', 'source', 'ssl', 'stacking', 'stacking-support',
+    'stack-topology', 'start-size', 'stp', 'stpd', 'subvlan-proxy-arp',
+    'svlan', 'switch', 'switch-mode', 'sys-health-check', 'syslog',
+    'sys-recovery-level', 'tacacs', 'tacacs-accounting',
+    'tacacs-authorization', 'tech', 'telnet', 'telnetd', 'temperature',
+    'tftpd', 'thttpd', 'time', 'timeout', 'timezone', 'tos', 'traffic',
+    'trusted-ports', 'trusted-servers', 'ttl', 'tunnel', 'udp',
+    'udp-echo-server', 'udp-profile', 'update', 'upm', 'var',
+    'version', 'virtual-router', 'vlan', 'vman', 'vpls', 'vr', 'vrrp',
+    'watchdog', 'web', 'xmlc', 'xmld', 'xml-mode', 'xml-notification',
+})
 
 
 class XosConfigWriter(Switch.ConfigWriter):
@@ -52,65 +108,23 @@ class XosConfigWriter(Switch.ConfigWriter):
     stp() implements spanning tree configuration (feature module "STP").
     acl() implements IPv4 access control lists (feature module "ACL").
     mgmt() implements switch management specifics (FM "Management").
+    generate_diff(old) creates commands to change old's configuration.
     """
 
     def __init__(self, switch):
         super().__init__(switch)
 
+    def generate_diff(self, old):
+        import XOS_diff
+        return XOS_diff.diff(old, self)
+
     def _replace_special_characters(self, name, allow_space=False):
-        trans_dict = (str.maketrans('"<>: &*', '_______') if not allow_space
-                      else str.maketrans('"<>:&*', '______'))
-        return name.translate(trans_dict)
+        return name.translate(_SPACE_ALLOWED_TRANSLATION if allow_space
+                              else _SPECIAL_CHARACTERS_TRANSLATION)
 
     def _is_exos_keyword(self, word):
         """Replace reserved keywords by prepending a prefix."""
-
-        # reserved keywords taken from XOS 16.1 User Guide
-        reserved_keywords = {
-            'aaa', 'access-list', 'account', 'accounts', 'all', 'bandwidth',
-            'banner', 'bfd', 'bgp', 'bootp', 'bootprelay', 'brm', 'bvlan',
-            'cancel', 'cfgmgr', 'cfm', 'checkpoint-data', 'clear-flow', 'cli',
-            'cli-config-logging', 'clipaging', 'configuration', 'configure',
-            'continuous', 'count', 'counters', 'cpu-monitoring', 'cvlan',
-            'debug', 'debug-mode', 'devmgr', 'dhcp', 'dhcp-client',
-            'dhcp-server', 'diagnostics', 'diffserv', 'dns-client',
-            'dont-fragment', 'dos-protect', 'dot1ag', 'dot1p', 'dot1q', 'ds',
-            'eaps', 'edp', 'egress', 'elrp', 'elrp-client', 'elsm', 'ems',
-            'epm', 'esrp', 'fabric', 'failover', 'failsafe-account', 'fans',
-            'fdb', 'fdbentry', 'firmware', 'flood-group', 'flooding',
-            'flow-control', 'flow-redirect', 'forwarding', 'from', 'get',
-            'hal', 'hclag', 'heartbeat', 'icmp', 'identity-management',
-            'idletimeout', 'idmgr', 'igmp', 'image', 'ingress', 'inline-power',
-            'internal-memory', 'interval', 'iob-debug-level', 'iparp',
-            'ipconfig', 'ipforwarding', 'ipmc', 'ipmcforwarding', 'ipmroute',
-            'ip-mtu', 'ip-option', 'iproute', 'ip-security', 'ipstats', 'ipv4',
-            'IPv4', 'ipv6', 'IPv6', 'ipv6acl', 'irdp', 'isid', 'isis',
-            'jumbo-frame', 'jumbo-frame-size', 'l2stats', 'l2vpn', 'lacp',
-            'learning', 'learning-domain', 'license', 'license-info',
-            'licenses', 'lldp', 'log', 'loopback-mode', 'mac', 'mac-binding',
-            'mac-lockdown-timeout', 'management', 'mcast', 'memory',
-            'memorycard', 'meter', 'mirroring', 'mld', 'mpls', 'mrinfo',
-            'msdp', 'msgsrv', 'msm', 'msm-failover', 'mstp', 'mtrace',
-            'multiple-response-timeout', 'mvr', 'neighbor-discovery',
-            'netlogin', 'nettools', 'node', 'nodemgr', 'odometers', 'ospf',
-            'ospfv3', 'pim', 'policy', 'ports', 'power', 'primary',
-            'private-vlan', 'process', 'protocol', 'put', 'qosprofile',
-            'qosscheduler', 'radius', 'radius-accounting', 'rip', 'ripng',
-            'rmon', 'router-discovery', 'rtmgr', 'safe-default-script',
-            'script', 'secondary', 'session', 'sflow', 'sharing', 'show',
-            'slot', 'slot-poll-interval', 'smartredundancy', 'snmp', 'snmpv3',
-            'sntp-client', 'source', 'ssl', 'stacking', 'stacking-support',
-            'stack-topology', 'start-size', 'stp', 'stpd', 'subvlan-proxy-arp',
-            'svlan', 'switch', 'switch-mode', 'sys-health-check', 'syslog',
-            'sys-recovery-level', 'tacacs', 'tacacs-accounting',
-            'tacacs-authorization', 'tech', 'telnet', 'telnetd', 'temperature',
-            'tftpd', 'thttpd', 'time', 'timeout', 'timezone', 'tos', 'traffic',
-            'trusted-ports', 'trusted-servers', 'ttl', 'tunnel', 'udp',
-            'udp-echo-server', 'udp-profile', 'update', 'upm', 'var',
-            'version', 'virtual-router', 'vlan', 'vman', 'vpls', 'vr', 'vrrp',
-            'watchdog', 'web', 'xmlc', 'xmld', 'xml-mode', 'xml-notification',
-        }
-        return word in reserved_keywords
+        return word in _RESERVED_KEYWORDS
 
     def port(self):
         conf, err = [], []
@@ -125,6 +139,9 @@ class XosConfigWriter(Switch.ConfigWriter):
             err.append('NOTICE: See the ExtremeXOS Configuration Guide on how'
                        ' to configure stacking')
         for p in self._switch.get_ports():
+            # only ports with transferred port settings need configuration
+            if not p.is_dirty('port'):
+                continue
             # enable / disable port
             if (p.get_admin_state_reason() and
                     p.get_admin_state_reason().startswith('transfer')):
@@ -409,11 +426,11 @@ class XosConfigWriter(Switch.ConfigWriter):
         need_bootprelay_enable = False
         ipv4_routing = self._switch.get_ipv4_routing()
         self._switch.set_ipv4_routing(ipv4_routing, 'written')
-        non_master_lag_ports = self._get_all_non_master_lag_ports()
+        non_master_lag_ports = set(self._get_all_non_master_lag_ports())
         vlan_list = self._switch.get_all_vlans()
         for vlan in vlan_list:
-            for member in non_master_lag_ports:
-                vlan.del_port(member, 'all')
+            if non_master_lag_ports:
+                vlan.del_ports(non_master_lag_ports)
             if vlan.get_tag() == 1:
                 e = self._normalize_default_vlan(vlan)
                 err.extend(e)
@@ -506,10 +523,7 @@ class XosConfigWriter(Switch.ConfigWriter):
         return err
 
     def _get_all_non_master_lag_ports(self):
-        non_master_lag_ports = []
-        for l in self._switch.get_lags():
-            non_master_lag_ports.extend(l.get_members()[1:])
-        return non_master_lag_ports
+        return self._switch.get_non_master_lag_ports()
 
     def lag(self):
         conf, err = [], []
@@ -548,6 +562,9 @@ class XosConfigWriter(Switch.ConfigWriter):
                     err.append('ERROR: LAG consisting of one port ("' +
                                member_ports[0] + '") only, but'
                                ' single port LAG not enabled on source switch')
+                # only LAGs with transferred settings have descriptions
+                if not l.is_dirty('port'):
+                    continue
                 # port description (short)
                 short_desc_reas = l.get_short_description_reason()
                 if (short_desc_reas and
@@ -577,19 +594,29 @@ class XosConfigWriter(Switch.ConfigWriter):
                     l.set_description(desc, 'written')
         return conf, err
 
-    def _get_stp_processes_for_port(self, port_name):
-        stp_list = []
-        port_vlans = []
+    def _get_egress_vlans_of_ports(self):
+        """Return a dict of the egress VLAN tags of each port name."""
+        port_vlans = {}
         for vlan in self._switch.get_all_vlans():
-            if port_name in vlan.get_egress_ports():
-                port_vlans.append(vlan.get_tag())
+            tag = vlan.get_tag()
+            for port_name in vlan.get_egress_ports():
+                tags = port_vlans.setdefault(port_name, [])
+                if not tags or tags[-1] != tag:
+                    tags.append(tag)
+        return port_vlans
+
+    def _get_stp_processes_for_port(self, port_name, port_vlans=None):
+        stp_list = []
+        if port_vlans is None:
+            port_vlans = self._get_egress_vlans_of_ports()
+        port_vlans = port_vlans.get(port_name, [])
         mst = False
         for stp in self._switch.get_stps():
             stp_name = stp.get_name()
             if stp.get_version() == 'mstp':
                 mst = True
             for vlan in port_vlans:
-                if vlan in stp.get_vlans():
+                if stp.has_vlan(vlan):
                     if stp_name not in stp_list:
                         stp_list.append(stp_name)
         if mst and stp_list:
@@ -655,6 +682,10 @@ class XosConfigWriter(Switch.ConfigWriter):
                 stp.set_enabled(stp.is_enabled(), reason)
         # Try to translate a more complex STP config to XOS
         if not use_basic_stp_config:
+            # index of configured VLANs, intersected with STP VLAN bitmaps
+            switch_vlans = self._switch.get_all_vlans()
+            switch_vlan_bitmap = STP.vlan_bitmap(
+                v.get_tag() for v in switch_vlans if v.get_tag() is not None)
             instance_with_vlans = False
             no_instance_has_default_vlan = True
             for stp in stp_list:
@@ -664,9 +695,9 @@ class XosConfigWriter(Switch.ConfigWriter):
                             stp.get_mst_instance() is not None):
                         stp_name = 's' + str(stp.get_mst_instance())
                         stp.set_name(stp_name, 'generated')
-                        err.append('INFO: Generated name "' + stp_name +
-                                   '" for MST instance ' +
-                                   str(stp.get_mst_instance()))
+                        err.append(Message('INFO', 'Generated name "{}" for'
+                                           ' MST instance {}', stp_name,
+                                           stp.get_mst_instance()))
                     else:
                         err.append('ERROR: XOS STP processes need a name')
                         continue
@@ -718,12 +749,13 @@ class XosConfigWriter(Switch.ConfigWriter):
                         conf.append('disable stpd s0 auto-bind vlan'
                                     ' Default')
                         conf.append('configure stpd s0 mode mstp cist')
-                        for v_tag in stp.get_vlans():
-                            if self._switch.get_vlan(tag=v_tag) is not None:
-                                err.append('ERROR: Existing VLAN ' +
-                                           str(v_tag) + ' mapped to MST '
-                                           'instance 0 (CIST), but XOS cannot'
-                                           ' map any VLANs to the CIST')
+                        cist_vlans = (stp.get_vlan_bitmap() &
+                                      switch_vlan_bitmap)
+                        for v_tag in STP.vlan_tags(cist_vlans):
+                            err.append('ERROR: Existing VLAN ' +
+                                       str(v_tag) + ' mapped to MST '
+                                       'instance 0 (CIST), but XOS cannot'
+                                       ' map any VLANs to the CIST')
                         stp.set_vlans_reason(reason)
                     else:
                         sid = stp.get_mst_instance()
@@ -733,19 +765,17 @@ class XosConfigWriter(Switch.ConfigWriter):
                             stp.set_mst_instance(sid, reason)
                         else:
                             err.append('ERROR: E2X expects "s0" as CIST')
-                        for v in self._switch.get_all_vlans():
+                        for v in switch_vlans:
                             v_name = v.get_name()
                             v_tag = v.get_tag()
-                            if v_tag in stp.get_vlans():
+                            if v_tag is not None and stp.has_vlan(v_tag):
                                 conf.append('enable stpd ' + stp_name +
                                             ' auto-bind vlan ' + v_name)
                                 instance_with_vlans = True
                                 if v_tag == 1:
                                     no_instance_has_default_vlan = False
-                        omitted_vlans = []
-                        for v_tag in stp.get_vlans():
-                            if self._switch.get_vlan(tag=v_tag) is None:
-                                omitted_vlans.append(v_tag)
+                        omitted_vlans = STP.vlan_tags(
+                            stp.get_vlan_bitmap() & ~switch_vlan_bitmap)
                         if omitted_vlans:
                             err.append('WARN: XOS can only map configured '
                                        'VLANs to MST instances, the following '
@@ -777,6 +807,7 @@ class XosConfigWriter(Switch.ConfigWriter):
                            ' any MST instance')
         # write per port STP configuration
         port_list = self._switch.get_logical_ports()
+        vlans_of_ports = self._get_egress_vlans_of_ports()
         info_auto_edge = False
         warn_auto_edge = False
         warn_edge_no_guard = False
@@ -789,7 +820,8 @@ class XosConfigWriter(Switch.ConfigWriter):
             has_bpdu_guard = port.get_stp_bpdu_guard()
             recovery = port.get_stp_bpdu_guard_recovery_time()
             recovery_reason = port.get_stp_bpdu_guard_recovery_time_reason()
-            stp_list = self._get_stp_processes_for_port(p_name)
+            stp_list = self._get_stp_processes_for_port(p_name,
+                                                        vlans_of_ports)
             if stp_list:
                 for stp_name in stp_list:
                     # STP disabled
@@ -834,89 +866,21 @@ class XosConfigWriter(Switch.ConfigWriter):
 
     def acl(self):
         conf, err = [], []
-        acl_nr = 0
-        for acl in self._switch.get_acls():
-            acl_lst = []
+        acls = self._switch.get_acls()
+        for acl_nr, acl in enumerate(acls, 1):
             # generate a name for the ACL
-            acl_nr += 1
-            acl_name = ''
             if not acl.get_name() and not acl.get_number():
                 acl_name = 'acl_nr' + str(acl_nr)
             elif acl.get_number():
                 acl_name = 'acl_' + str(acl.get_number())
             else:
                 acl_name = 'acl_' + str(acl.get_name())
-            acl.set_name(acl_name)
-            acl_lst.append(acl_name)
-            ace_nr = 0
-            ace_name = None
-            for ace in acl.get_entries():
-                # generate a name for the entry
-                ace_nr += 10
-                ace_name = ace.get_number()
-                if not ace_name:
-                    ace_name = str(ace_nr)
-                else:
-                    ace_name = str(ace_name)
-                # generate the match statements
-                match_lst = []
-                match_proto = ace.get_protocol()
-                if match_proto and match_proto != 'ip':
-                    match_lst.append('protocol ' + match_proto)
-                match_source = ace.get_source()
-                match_source_mask = ace.get_source_mask_inverted()
-                if match_source and match_source_mask:
-                    if str(match_source_mask) == '0.0.0.0':
-                        match_source_mask = '0'
-                    match_lst.append('source-address ' + str(match_source) +
-                                     '/' + str(match_source_mask))
-                match_source_op = ace.get_source_op()
-                match_source_port = ace.get_source_port()
-                if match_source_op and match_source_port:
-                    if match_source_op == 'eq':
-                        match_lst.append('source-port ' +
-                                         str(match_source_port))
-                    else:
-                        err.append('ERROR: ACL source operator "' +
-                                   match_source_op + '" not supported')
-
-                match_dest = ace.get_dest()
-                match_dest_mask = ace.get_dest_mask_inverted()
-                if match_dest and match_dest_mask:
-                    if str(match_dest_mask) == '0.0.0.0':
-                        match_dest_mask = '0'
-                    match_lst.append('destination-address ' + str(match_dest) +
-                                     '/' + str(match_dest_mask))
-                match_dest_op = ace.get_dest_op()
-                match_dest_port = ace.get_dest_port()
-                if match_dest_op and match_dest_port:
-                    if match_dest_op == 'eq':
-                        match_lst.append('destination-port ' +
-                                         str(match_dest_port))
-                    else:
-                        err.append('ERROR: ACL destination operator "' +
-                                   match_dest_op + '" not supported')
-                # generate the action statement
-                action = ace.get_action()
-                # create a string describing this ACE
-                ace_str = 'entry ' + ace_name + ' {\n  if {\n'
-                for match in match_lst:
-                    ace_str += '    ' + match + ';\n'
-                ace_str += '  } then {\n'
-                ace_str += '    ' + str(action) + ';\n  }\n}\n'
-                acl_lst.append(ace_str)
-            # append explicit deny any [any] to match EOS ACLs
-            ace_nr += 10
-            if ace_name is not None:
-                if (int(ace_name) >= ace_nr):
-                    ace_nr = (int(ace_name) + 10) // 10 * 10
-                ace_str = self._switch.get_cmd().get_comment()[0]
-                ace_str += ' next entry added to match EOS ACL implicit deny\n'
-                ace_str += ('entry ' + str(ace_nr) +
-                            ' {\n  if {\n    source-address 0.0.0.0/0;\n'
-                            '  } then {\n    deny;\n  }\n}\n')
-                acl_lst.append(ace_str)
+            self._switch.set_acl_name(acl, acl_name)
+        comment = self._switch.get_cmd().get_comment()
+        for acl in acls:
+            acl_lst, acl_err = acl_policy(acl, comment)
             conf.append(acl_lst)
+            err.extend(acl_err)
         return conf, err
 
     def mgmt(self):
@@ -1598,4 +1562,88 @@ class XosConfigWriter(Switch.ConfigWriter):
                             route[1] + ' ' + route[2])
         return conf, err
 
+
+def _acl_address(address, wildcard):
+    """Return 'ADDRESS/MASK' for an ACE address given as integers."""
+    if address is None or wildcard is None:
+        return None
+    mask = wildcard ^ 0xffffffff
+    return (ACL.format_ipv4(address) + '/' +
+            (ACL.format_ipv4(mask) if mask else '0'))
+
+
+def acl_policy(acl, comment):
+    """Return the XOS policy of a named ACL and a list of messages.
+
+    The policy is a list of the policy name followed by one string per
+    entry, including an explicit deny entry matching the implicit deny of
+    EOS ACLs. Comment is the comment string of the XOS configuration.
+    This function depends on its arguments only, thus it can be used in a
+    worker process.
+    """
+    acl_lst, err = [acl.get_name()], []
+    ace_nr = 0
+    ace_name = None
+    for ace in acl.get_entries():
+        # generate a name for the entry
+        ace_nr += 10
+        ace_name = ace.get_number()
+        if not ace_name:
+            ace_name = str(ace_nr)
+        else:
+            ace_name = str(ace_name)
+        # generate the match statements
+        match_lst = []
+        match_proto = ace.get_protocol()
+        if match_proto and match_proto != 'ip':
+            match_lst.append('protocol ' + match_proto)
+        match_source = _acl_address(ace.get_source_int(),
+                                    ace.get_source_mask_int())
+        if match_source:
+            match_lst.append('source-address ' + match_source)
+        match_source_op = ace.get_source_op()
+        match_source_port = ace.get_source_port()
+        if match_source_op and match_source_port:
+            if match_source_op == 'eq':
+                match_lst.append('source-port ' +
+                                 str(match_source_port))
+            else:
+                err.append('ERROR: ACL source operator "' +
+                           match_source_op + '" not supported')
+
+        match_dest = _acl_address(ace.get_dest_int(),
+                                  ace.get_dest_mask_int())
+        if match_dest:
+            match_lst.append('destination-address ' + match_dest)
+        match_dest_op = ace.get_dest_op()
+        match_dest_port = ace.get_dest_port()
+        if match_dest_op and match_dest_port:
+            if match_dest_op == 'eq':
+                match_lst.append('destination-port ' +
+                                 str(match_dest_port))
+            else:
+                err.append('ERROR: ACL destination operator "' +
+                           match_dest_op + '" not supported')
+        # generate the action statement
+        action = ace.get_action()
+        # create a string describing this ACE
+        ace_str = 'entry ' + ace_name + ' {\n  if {\n'
+        for match in match_lst:
+            ace_str += '    ' + match + ';\n'
+        ace_str += '  } then {\n'
+        ace_str += '    ' + str(action) + ';\n  }\n}\n'
+        acl_lst.append(ace_str)
+    # append explicit deny any [any] to match EOS ACLs
+    ace_nr += 10
+    if ace_name is not None:
+        if (int(ace_name) >= ace_nr):
+            ace_nr = (int(ace_name) + 10) // 10 * 10
+        ace_str = comment[0]
+        ace_str += ' next entry added to match EOS ACL implicit deny\n'
+        ace_str += ('entry ' + str(ace_nr) +
+                    ' {\n  if {\n    source-address 0.0.0.0/0;\n'
+                    '  } then {\n    deny;\n  }\n}\n')
+        acl_lst.append(ace_str)
+    return acl_lst, err
+
 # vim:filetype=python:expandtab:shiftwidth=4:tabstop=4
@@ -31,18 +31,27 @@
 
 Use the option -h resp. --help to print usage information.
 The command line interface of E2X can be used as a filter program.
+
+The function run() runs E2X in-process, reading input from and writing
+output to memory, e.g. to translate many configurations in one process.
 """
 
 import argparse
-import fileinput
+import collections
+import errno
+import io
+import itertools
 import os
 import sys
 
 import CM
-from InteractiveModeHandler import InteractiveModeHandler
+import Messages
+from Messages import Message
 
 progname = 'e2x'
 progver = '1.0.3'
+default_source = 'C5K125-48P2'
+default_target = 'SummitX460-48p+2sf'
 progdesc = """\
 Translate ExtremeEOS switch configuration commands to ExtremeXOS. If no
 FILEs are specified, input is read from STDIN and written to STDOUT, and
@@ -57,6 +66,76 @@ input lines that are not yet supported will be ignored.
 """
 
 
+class LocalFS:
+
+    """Access the local file system, used by the command line.
+
+    Files are opened for reading or writing with open(). The paths of
+    files opened for writing are appended to the list written.
+    """
+
+    def __init__(self):
+        self.written = []
+
+    def open(self, path, mode='r'):
+        f = open(path, mode)
+        if 'r' not in mode:
+            self.written.append(path)
+        return f
+
+    def read(self, path):
+        with open(path) as f:
+            return f.read()
+
+    def makedirs(self, path):
+        os.makedirs(path, exist_ok=True)
+
+
+class MemoryFile(io.StringIO):
+
+    """A text file of a MemoryFS, saved to the MemoryFS on close()."""
+
+    def __init__(self, fs, path):
+        super().__init__()
+        self._fs = fs
+        self._path = path
+
+    def close(self):
+        if not self.closed:
+            self._fs.files[self._path] = self.getvalue()
+        super().close()
+
+
+class MemoryFS(LocalFS):
+
+    """Keep text files in memory instead of the local file system.
+
+    The dictionary files maps the normalized path of each file to its
+    contents. Directories are created implicitly.
+    """
+
+    def __init__(self, files=None):
+        super().__init__()
+        self.files = {os.path.normpath(path): text
+                      for path, text in (files or {}).items()}
+
+    def open(self, path, mode='r'):
+        path = os.path.normpath(path)
+        if 'r' in mode:
+            if path not in self.files:
+                raise FileNotFoundError(errno.ENOENT, os.strerror(
+                    errno.ENOENT), path)
+            return io.StringIO(self.files[path])
+        self.written.append(path)
+        return MemoryFile(self, path)
+
+    def read(self, path):
+        return self.files[os.path.normpath(path)]
+
+    def makedirs(self, path):
+        pass
+
+
 class CommandLineParser:
 
     def __init__(self, switch_models_help):
@@ -79,12 +158,13 @@ class CommandLineParser:
                                   default='NOTICE',
                                   help=('print messages with log level equal'
                                         ' or higher than LOG_LEVEL'))
-        self._parser.add_argument('--source', default='C5K125-48P2',
+        self._parser.add_argument('--source', default=default_source,
                                   help='source switch model (default '
                                        '%(default)s)')
-        self._parser.add_argument('--target', default='SummitX460-48p+2sf',
-                                  help='target switch model (default '
-                                       '%(default)s)')
+        self._parser.add_argument('--target', action='append',
+                                  help='target switch model (default ' +
+                                       default_target + '), repeat to '
+                                       'translate to several target switches')
         self._parser.add_argument('-o', '--outfile',
                                   help="specify non-default output file, '-' "
                                        "for STDOUT")
@@ -123,58 +203,476 @@ class CommandLineParser:
                                   action='store_true',
                                   help='disable additional, unused ports of '
                                        'target switch')
+        self._parser.add_argument('--optimize-acls', action='store_true',
+                                  help='remove shadowed and redundant ACL '
+                                       'entries, merge adjacent prefixes')
+        self._parser.add_argument('-j', '--jobs', type=int, default=1,
+                                  metavar='N',
+                                  help='write ACL policy files using N '
+                                       'threads, and translate to several '
+                                       'targets using N worker processes '
+                                       '(default %(default)s)')
+        self._parser.add_argument('--parse-stats', action='store_true',
+                                  help='print the number of lines and the '
+                                       'parse time per EOS command, slowest'
+                                       ' first')
+        self._parser.add_argument('--save-model', metavar='MODEL',
+                                  help='save the parsed source switch model'
+                                       ' to file MODEL for use with '
+                                       '--load-model')
+        self._parser.add_argument('--load-model', metavar='MODEL',
+                                  help='translate the source switch model '
+                                       'saved in file MODEL instead of '
+                                       'parsing a FILE')
+        self._parser.add_argument('--export-model', choices=['json'],
+                                  metavar='FORMAT',
+                                  help='export the translated target switch '
+                                       'model next to the output file '
+                                       '(FORMAT json)')
+        self._parser.add_argument('--diff-against', metavar='OLD_FILE',
+                                  help='translate OLD_FILE as well and '
+                                       'write the commands changing its '
+                                       'translation into that of FILE')
         self._parser.add_argument('FILE', nargs='*',
                                   help='EOS file to translate (default STDIN)')
         self._parser.add_argument('--interactive', action='store_true',
                                   help='enter interactive mode')
+        self._parser.add_argument('--translate-commands', action='store_true',
+                                  help='translate the operational EOS '
+                                       'commands in FILEs like the '
+                                       'interactive mode, without switch '
+                                       'models')
+        self._parser.add_argument('--serve', metavar='ADDRESS',
+                                  help='run as translation service accepting'
+                                       ' JSON requests via HTTP on ADDRESS '
+                                       '(HOST:PORT, PORT, or path of a Unix '
+                                       'domain socket)')
 
-    def parse(self):
-        return self._parser.parse_args()
+    def parse(self, args=None):
+        return self._parser.parse_args(args)
 
 
 def normalize_messages(messages):
-    """Split every message in the messages list on newlines.
+    """Convert the messages list to a list of Message records.
+
+    Message strings are split on newlines, records are kept.
     """
 
-    ret = []
-    for m in messages:
-        if isinstance(m, str):
-            ret.extend(m.splitlines())
-        else:
-            ret.append(m)
-    return ret
+    return Messages.to_records(messages)
 
 
 def filter_messages(messages, loglevel):
 
-    '''Return the messages with severity equal or higher to log level.
+    '''Return the message records with severity equal or higher to log level.
     '''
 
-    level_lst = ['DEBUG', 'INFO', 'NOTICE', 'WARN', 'ERROR']
-    severity = {level: sev for sev, level in enumerate(level_lst)}
-    min_level = severity[loglevel]
-    return (m for m in messages
-            if m and severity[m.split()[0].rstrip(':')] >= min_level)
+    min_level = Messages.severity(loglevel)
+    return (m for m in messages if Messages.severity(m.level) >= min_level)
 
 
 def unknown_to_error(messages):
-    return [m.replace('NOTICE', 'ERROR', 1) if 'Ignoring unknown command' in m
+    return [m.with_level('ERROR')
+            if m.level == 'NOTICE' and 'Ignoring unknown command' in m.text
             else m
             for m in messages]
 
 
 def warn_to_error(messages):
-    return [m.replace('WARN', 'ERROR', 1) if m.startswith('WARN') else m
+    return [m.with_level('ERROR') if m.level == 'WARN' else m
             for m in messages]
 
 
-def main(cmdlineArgs):
+def translation_log_level(log_level, messages_as_comments=False,
+                          debug=False, err_warnings=False,
+                          err_unknown_lines=False):
+    """Return the lowest message level needed for a translation.
+
+    Messages below log level are not printed, unless they are added to the
+    translation as comments, or are converted to errors.
+    """
+
+    levels = [log_level]
+    if messages_as_comments:
+        levels.append('DEBUG' if debug else 'INFO')
+    if err_warnings:
+        levels.append('WARN')
+    if err_unknown_lines:
+        levels.append('NOTICE')
+    return min(levels, key=Messages.severity)
+
+
+def split_translation(translation):
+    """Separate configuration lines and ACL policies of a translation.
+
+    Return a list of configuration lines, a list of (policy file name,
+    policy) tuples, and a list of error messages.
+    """
+
+    conf_lines, acls, err = [], [], []
+    for l in translation:
+        if isinstance(l, str):
+            conf_lines.append(l.rstrip())
+        elif isinstance(l, list):
+            acls.append((l[0] + '.pol', ''.join(l[1:]).rstrip()))
+        else:
+            err.append('ERROR: Unknown configuration line format: "' +
+                       str(l) + '"')
+    return conf_lines, acls, err
+
+
+def _write_file(path, text, fs):
+    with fs.open(path, 'w') as f:
+        f.write(text)
+
+
+def write_acl_files(acl_dir, acl_list, executor=None, fs=None):
+    """Write ACL policies to individual files in directory acl_dir.
+
+    The acl_list contains (policy file name, policy) tuples as returned by
+    split_translation(). The directory is created once if needed, and
+    every file is written with a single write call, using the
+    concurrent.futures executor if given. Files are written to the file
+    system fs, the local one by default. Return a list of messages in the
+    order of acl_list as Message records.
+    """
+    if not acl_list:
+        return []
+    fs = fs or LocalFS()
+    fs.makedirs(acl_dir)
+    paths = [acl_dir + '/' + acl_name for acl_name, _ in acl_list]
+    policies = [acl_entries + '\n' for _, acl_entries in acl_list]
+    if executor is None:
+        list(map(_write_file, paths, policies, itertools.repeat(fs)))
+    else:
+        list(executor.map(_write_file, paths, policies,
+                          itertools.repeat(fs)))
+    return [Message('NOTICE', 'Writing translated ACL file "{}"', path)
+            for path in paths]
+
+
+def output_name(infile, target, outfile=None, outdir='.',
+                multi_target=False):
+    """Return the name of the translation of infile for the target switch.
+
+    The name is '-' for STDOUT. With several target switches, the name of
+    the target switch model is added in front of the file name extension.
+    """
+    if outfile:
+        outname = outfile
+    elif infile != '-':
+        outname = os.path.basename(infile)
+        if target.get_os().lower() == 'xos':
+            if outname.lower().endswith('.cfg'):
+                outname = outname[:-4]
+            outname += '.xsf'
+        else:
+            outname += '.e2x'
+    else:
+        outname = '-'
+    if multi_target and outname != '-':
+        root, ext = os.path.splitext(outname)
+        outname = root + '.' + target.get_model().replace(',', '_') + ext
+    if outdir != '.':
+        outname = outdir + '/' + outname
+    return outname
+
+
+def format_command_translation(translation, comment='#'):
+    """Return the output lines for the Translation of one EOS command.
+
+    Commands without XOS equivalent are kept as comments, hints are added
+    as comments after the command.
+    """
+    eos = translation.get_eos()
+    if not eos:
+        return ['']
+    if eos[0] in '#!':
+        return [comment + eos[1:]]
+    lines = []
+    if translation.get_xos():
+        lines.extend(translation.get_xos().split('\n'))
+    else:
+        lines.append(comment + ' ' + eos)
+    if translation.get_hint():
+        lines.append(comment + ' ' + translation.get_hint())
+    return lines
+
+
+# translator of translate_commands(), created on first use per process
+_command_translator = None
+
+
+def translate_commands(infiles, outname, chunk_size=1024, fs=None):
+    """Translate the EOS commands in infiles to XOS commands in outname.
+
+    The output file is opened once, and the translations of all input
+    files are written to it in the order of infiles. The input is read
+    line by line, the output is written in chunks of chunk_size commands.
+    Any name may be '-' for STDIN or STDOUT, files are read from and
+    written to the file system fs, the local one by default. Return a
+    list of Message records and the number of commands that could not be
+    translated.
+    """
+    global _command_translator
+    if _command_translator is None:
+        # imported on demand, as the interactive mode does
+        import Translator
+        _command_translator = Translator.Translator()
+    translator = _command_translator
+    fs = fs or LocalFS()
+    messages, all_unsupported = [], 0
+    try:
+        out = sys.stdout if outname == '-' else fs.open(outname, 'w')
+    except OSError as e:
+        return [Message('ERROR', 'Cannot write translated commands to "{}":'
+                        ' {}', outname, e)], 0
+    try:
+        for infile in infiles:
+            total, unsupported = 0, 0
+            try:
+                inp = sys.stdin if infile == '-' else fs.open(infile)
+                try:
+                    chunk = []
+                    for line in inp:
+                        translation = translator.translate(line)
+                        hint = translation.get_hint()
+                        if hint == translator.NOT_SUPPORTED:
+                            unsupported += 1
+                        eos = translation.get_eos()
+                        if eos and eos[0] not in '#!':
+                            total += 1
+                        chunk.extend(format_command_translation(translation))
+                        if len(chunk) >= chunk_size:
+                            out.write('\n'.join(chunk) + '\n')
+                            chunk = []
+                    if chunk:
+                        out.write('\n'.join(chunk) + '\n')
+                finally:
+                    if inp is not sys.stdin:
+                        inp.close()
+            except OSError as e:
+                messages.append(Message('ERROR', 'Cannot translate commands'
+                                        ' of "{}": {}', infile, e))
+                continue
+            if unsupported:
+                messages.append(Message('WARN', '{} of {} commands in "{}" '
+                                        'not translated', unsupported, total,
+                                        infile))
+            all_unsupported += unsupported
+        out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    if outname != '-':
+        messages.insert(0, Message('NOTICE', 'Writing translated commands '
+                                   'to file "{}"', outname))
+    return messages, all_unsupported
+
+
+def translate_command_files(args, fs=None, report=None):
+    """Translate the EOS commands of every FILE given in args.
+
+    Files written to the same output file, e.g. the one given with
+    option -o, are appended to it in the order given. With more than one
+    job, output files of the local file system are written in parallel.
+    Messages are given to the function report, which prints
+    them by default. Return 1 if an error occurred, 0 otherwise.
+    """
+    fs = fs or LocalFS()
+    report = report or print_message
+    files = args.FILE or ['-']
+    outdir = args.outdir.rstrip('/\\')
+    infiles = collections.OrderedDict()
+    for f in files:
+        if args.outfile:
+            outname = args.outfile
+        elif f == '-':
+            outname = '-'
+        else:
+            outname = os.path.basename(f) + '.xsf'
+        if outdir != '.':
+            outname = outdir + '/' + outname
+        infiles.setdefault(outname, []).append(f)
+    if (args.jobs > 1 and len(infiles) > 1 and '-' not in infiles and
+            type(fs) is LocalFS):
+        import concurrent.futures
+        with concurrent.futures.ProcessPoolExecutor(
+                min(args.jobs, len(infiles))) as pool:
+            results = list(pool.map(translate_commands, infiles.values(),
+                                    infiles.keys()))
+    else:
+        results = [translate_commands(i, outname, fs=fs)
+                   for outname, i in infiles.items()]
+    return_value = 0
+    for messages, unsupported in results:
+        if args.err_unknown_lines and unsupported:
+            messages = [m.with_level('ERROR') if m.level == 'WARN' else m
+                        for m in messages]
+        for m in messages:
+            if m.level == 'ERROR':
+                return_value = 1
+        for m in filter_messages(messages, args.log_level):
+            report(m)
+    return return_value
+
+
+def print_message(message):
+    print(message, file=sys.stderr)
+
+
+def target_summary(model, messages):
+    """Summarize the messages of a translation to the target switch model.
+
+    Return a NOTICE Message record with the number of errors, warnings,
+    source ports and LAGs that could not be mapped, and unused target
+    ports.
+    """
+    errors = warnings = unmapped = unused = 0
+    for m in messages:
+        if m.level == 'ERROR':
+            errors += 1
+        elif m.level == 'WARN':
+            warnings += 1
+        if 'Could not map port' in m or 'mapped to target switch' in m:
+            unmapped += 1
+        elif 'of target switch is not used' in m:
+            unused += 1
+    return Message('NOTICE', 'Target "{}": {} errors, {} warnings, {} ports'
+                   ' or LAGs not mapped, {} target ports not used', model,
+                   errors, warnings, unmapped, unused)
+
+
+def write_translation(args, c, infile, outname, target, t_conf, err,
+                      multi_target=False, fs=None):
+    """Write the translation t_conf of infile for target to outname.
+
+    Files are written to the file system fs, the local one by default.
+    Return 1 if an error occurred, 0 otherwise, and the messages of the
+    translation as Message records.
+    """
+    return_value = 0
+    comment = target.get_cmd().get_comment()
+    # check for translation errors
+    err = normalize_messages(err)
+    if args.err_unknown_lines:
+        err = unknown_to_error(err)
+    if args.err_warnings:
+        err = warn_to_error(err)
+    error_occurred = False
+    for l in err:
+        if l.level == 'ERROR':
+            error_occurred = True
+            return_value = 1
+            break
+
+    if args.debug:
+        print('DEBUG: Configured source switch:', file=sys.stderr)
+        print(str(c.source), end='', file=sys.stderr)
+        print('DEBUG: Configured target switch:', file=sys.stderr)
+        print(str(target), end='', file=sys.stderr)
+        print('DEBUG: Translated configuration:', file=sys.stderr)
+        print(t_conf, file=sys.stderr)
+        print('DEBUG: Translation errors:', file=sys.stderr)
+        print([str(l) for l in err], file=sys.stderr)
+
+    # write translated configuration
+    if not (args.abort_on_error and error_occurred):
+        out = sys.stdout
+        if outname != '-':
+            out = (fs or LocalFS()).open(outname, 'w')
+            err.insert(0, Message('NOTICE', 'Writing translated '
+                                  'configuration to file "{}"', outname))
+        elif multi_target:
+            print(comment, 'Translation for target switch',
+                  target.get_model(), file=out)
+
+        # print configuration commands, defer ACLs
+        conf_lines, acl_list, errors = split_translation(t_conf)
+        for l in conf_lines:
+            print(l, file=out)
+        if errors:
+            err.extend(normalize_messages(errors))
+            return_value = 1
+
+        # print ACLs after any other configuration statements
+        if out == sys.stdout:
+            for acl_name, acl_entries in acl_list:
+                acl_str = acl_name + '\n' + acl_entries
+                print(comment, acl_str, file=out)
+        elif acl_list:
+            # create ACL files, XOS only!
+            acl_dir = outname[:-3] + 'acls'
+            if args.jobs > 1:
+                import concurrent.futures
+                with concurrent.futures.ThreadPoolExecutor(args.jobs) as pool:
+                    err.extend(write_acl_files(acl_dir, acl_list, pool, fs))
+            else:
+                err.extend(write_acl_files(acl_dir, acl_list, fs=fs))
+
+        # print messages as comments if requested
+        if args.messages_as_comments:
+            if err:
+                print('', file=out)
+            for l in err:
+                if l.level != 'DEBUG' or args.debug:
+                    print(comment, str(l).rstrip(), file=out)
+
+        # flush output to ensure that errors are printed after translation
+        out.flush()
+        if outname != '-':
+            out.close()
+    else:
+        err.append(Message('ERROR', 'Error translating input file "{}", '
+                           'no translation created', infile))
+    return return_value, err
+
+
+def write_model_export(c, outname, messages, fs=None):
+    """Export the target switch model translated to outname as JSON.
+
+    The name of the export file is derived from outname by replacing its
+    extension with '.json'. Files are written to the file system fs, the
+    local one by default. Return a list of messages as Message records.
+    """
+    if outname == '-':
+        return [Message('ERROR', 'Cannot export target switch model when '
+                        'writing the translation to STDOUT')]
+    path = os.path.splitext(outname)[0] + '.json'
+    with (fs or LocalFS()).open(path, 'w') as out:
+        c.export_target_model(out, messages)
+    return [Message('NOTICE', 'Writing target switch model to file "{}"',
+                    path)]
+
+
+def core_module_key(args, targets):
+    """Return a key identifying the core module configured by args."""
+    return (args.source, tuple(targets), args.sfp_list, args.debug,
+            args.ignore_defaults, args.keep_unknown_lines,
+            args.comment_unknown_lines, args.disable_unused_ports,
+            args.optimize_acls, args.jobs, args.parse_stats, args.log_level,
+            args.messages_as_comments, args.err_warnings,
+            args.err_unknown_lines, args.mgmt_port)
+
+
+def main(cmdlineArgs, fs=None, messages=None, core_modules=None):
+    """Run E2X with the command line arguments cmdlineArgs.
+
+    Files are read from and written to the file system fs, the local one
+    by default. Printed messages are appended to the list messages if
+    given. Core modules are reused from and added to the dictionary
+    core_modules if given, see core_module_key(). Return the exit status.
+    """
     return_value = 0
+    fs = fs or LocalFS()
+
+    def report(message):
+        if messages is not None:
+            messages.append(message)
+        print(message, file=sys.stderr)
     # get switch models available for translation from core module
     # to populate option parser help output
-    c = CM.CoreModule()
-    source_switches = sorted(c.get_source_switches())
-    target_switches = sorted(c.get_target_switches())
+    source_switches = sorted(CM.get_source_switches())
+    target_switches = sorted(CM.get_target_switches())
     source_switch_models_help = 'supported SOURCE switch models:'
     for sw in source_switches:
         source_switch_models_help += '\n    ' + sw
@@ -196,7 +694,7 @@ There must not be any whitespace in the list of switch models!
 
     # option and argument parsing
     cmdline_parser = CommandLineParser(switch_models_help)
-    args = cmdline_parser.parse()
+    args = cmdline_parser.parse(cmdlineArgs)
 
     if args.quiet:
         args.log_level = 'ERROR'
@@ -206,25 +704,22 @@ There must not be any whitespace in the list of switch models!
     if args.debug:
         print("DEBUG: Command line arguments: '" + ' '.join(cmdlineArgs) + "'",
               file=sys.stderr)
-        c.enable_debug()
         args.log_level = 'DEBUG'
     # Switch to interactive mode if selected
     if args.interactive:
+        # imported on demand, interactive mode needs curses et al.
+        from InteractiveModeHandler import InteractiveModeHandler
         interactiveModeHandler = InteractiveModeHandler(' '.join(cmdlineArgs),
                                                         progname=progname,
                                                         progver=progver)
         return interactiveModeHandler.run()
-    if args.ignore_defaults:
-        c.disable_defaults()
-    if args.keep_unknown_lines:
-        c.enable_copy_unknown()
-    if args.comment_unknown_lines:
-        c.enable_copy_unknown()
-        c.enable_comment_unknown()
-    if args.disable_unused_ports:
-        c.disable_unused_ports()
-    if args.mgmt_port:
-        c.use_oob_mgmt(True)
+    if args.jobs < 1:
+        print(progname + ':', 'the number of jobs must be at least 1',
+              file=sys.stderr)
+        return 1
+    # translate operational commands without switch models
+    if args.translate_commands:
+        return translate_command_files(args, fs, report)
 
     # check source switch description
     for sw in args.source.split(','):
@@ -236,8 +731,9 @@ There must not be any whitespace in the list of switch models!
             print('\n' + source_switch_models_help.rstrip())
             print('\n' + stack_switch_models_help.rstrip())
             return 1
-    # check target switch description
-    for sw in args.target.split(','):
+    # check target switch descriptions
+    targets = args.target or [default_target]
+    for sw in ','.join(targets).split(','):
         if not sw:
             continue
         if sw not in target_switches:
@@ -247,14 +743,93 @@ There must not be any whitespace in the list of switch models!
             print('\n' + stack_switch_models_help.rstrip())
             return 1
 
-    # initialize source and target switches
-    ret, trace = c.set_source_switch(args.source)
-    if not ret:
-        print('ERROR: Could not set source switch', file=sys.stderr)
-        if trace:
-            print(trace, file=sys.stderr)
+    # run translation service instead of translating files
+    if args.serve:
+        if len(targets) > 1:
+            print(progname + ':', 'the translation service supports one'
+                  ' target switch only', file=sys.stderr)
+            return 1
+        import TranslationServer
+        options = {opt: getattr(args, opt)
+                   for opt in TranslationServer.OPTIONS}
+        service = TranslationServer.TranslationService(args.source,
+                                                       targets[0], options)
+        return TranslationServer.serve(args.serve, service,
+                                       verbose=args.log_level == 'DEBUG')
+
+    if args.load_model and args.FILE:
+        print(progname + ':', 'no FILE can be translated with --load-model',
+              file=sys.stderr)
+        return 1
+    if args.save_model and len(args.FILE) > 1:
+        print(progname + ':', 'only one FILE can be translated with '
+              '--save-model', file=sys.stderr)
         return 1
-    if args.sfp_list:
+    if args.export_model and len(targets) > 1:
+        print(progname + ':', '--export-model needs one target switch',
+              file=sys.stderr)
+        return 1
+    old_conf = None
+    if args.diff_against:
+        if args.load_model or len(targets) > 1:
+            print(progname + ':', '--diff-against needs a FILE and one '
+                  'target switch', file=sys.stderr)
+            return 1
+        try:
+            old_conf = [l.rstrip() for l in
+                        fs.read(args.diff_against).splitlines()]
+        except OSError as e:
+            print(progname + ':', 'cannot read "' + args.diff_against +
+                  '": ' + str(e), file=sys.stderr)
+            return 1
+
+    # reuse a core module with initialized switches if possible, a core
+    # module with a loaded source switch model is never reused
+    key = core_module_key(args, targets)
+    c = None
+    if core_modules is not None and not args.load_model:
+        c = core_modules.get(key)
+    reused = c is not None
+    if not reused:
+        c = CM.CoreModule()
+        if args.debug:
+            c.enable_debug()
+        if args.ignore_defaults:
+            c.disable_defaults()
+        if args.keep_unknown_lines:
+            c.enable_copy_unknown()
+        if args.comment_unknown_lines:
+            c.enable_copy_unknown()
+            c.enable_comment_unknown()
+        if args.disable_unused_ports:
+            c.disable_unused_ports()
+        if args.optimize_acls:
+            c.enable_acl_optimization()
+        c.set_jobs(args.jobs)
+        if args.parse_stats:
+            c.enable_parse_stats()
+        c.set_log_level(translation_log_level(
+            args.log_level, args.messages_as_comments, args.debug,
+            args.err_warnings, args.err_unknown_lines))
+        if args.mgmt_port:
+            c.use_oob_mgmt(True)
+
+    # initialize source and target switches, a loaded source switch model
+    # replaces the source switch
+    if args.load_model:
+        ret, name = c.load_source_model(args.load_model)
+        if not ret:
+            print(name, file=sys.stderr)
+            return 1
+        args.FILE = [name]
+    elif not reused:
+        ret, trace = c.set_source_switch(args.source)
+        if not ret:
+            print('ERROR: Could not set source switch', file=sys.stderr)
+            if trace:
+                print(trace, file=sys.stderr)
+            return 1
+    if args.sfp_list and not args.load_model and not reused:
         ret = c.source.set_combo_using_sfp(args.sfp_list.split(','))
         if ret:
             return_value = 1
@@ -263,15 +838,20 @@ There must not be any whitespace in the list of switch models!
     if args.debug:
         print('DEBUG: Source switch:', file=sys.stderr)
         print(str(c.source), end='', file=sys.stderr)
-    ret, trace = c.set_target_switch(args.target)
-    if not ret:
-        print('ERROR: Could not set target switch', file=sys.stderr)
-        if trace:
-            print(trace, file=sys.stderr)
-        return 1
+    if not reused:
+        ret, trace = c.set_target_switches(targets)
+        if not ret:
+            print('ERROR: Could not set target switch', file=sys.stderr)
+            if trace:
+                print(trace, file=sys.stderr)
+            return 1
+        if (core_modules is not None and not args.load_model and
+                not return_value):
+            core_modules[key] = c
     if args.debug:
-        print('DEBUG: Target switch:', file=sys.stderr)
-        print(str(c.target), end='', file=sys.stderr)
+        for target in c.targets:
+            print('DEBUG: Target switch:', file=sys.stderr)
+            print(str(target), end='', file=sys.stderr)
 
     # provide contents of each input file to translation function
     if not args.FILE:
@@ -279,29 +859,14 @@ There must not be any whitespace in the list of switch models!
     outdir = args.outdir.rstrip('/\\')
     if args.debug:
         print("DEBUG: Output directory is '" + outdir + "'", file=sys.stderr)
+    multi_target = len(c.targets) > 1
     for f in args.FILE:
         if args.debug:
             print("DEBUG: Current input file is '" + f + "'", file=sys.stderr)
-        if args.outfile:
-            outname = args.outfile
-        elif f != '-':
-            outname = os.path.basename(f)
-            if c.target.get_os().lower() == 'xos':
-                if outname.lower().endswith('.cfg'):
-                    outname = outname[:-4]
-                outname += '.xsf'
-            else:
-                outname += '.e2x'
-        else:
-            outname = '-'
-        if outdir != '.':
-            outname = outdir + '/' + outname
-        if args.debug:
-            print("DEBUG: Current output file is '" + outname + "'",
-                  file=sys.stderr)
 
         # print a help message if reading from an interactive terminal
-        if f == '-' and sys.stdin is not None and sys.stdin.isatty():
+        if (f == '-' and not args.load_model and sys.stdin is not None and
+                sys.stdin.isatty()):
             comment = c.target.get_cmd().get_comment()
             if sys.platform.startswith('win'):
                 eof = 'Z on a line of its own'
@@ -313,109 +878,128 @@ There must not be any whitespace in the list of switch models!
             print(comment, 'End with CTRL+' + eof, '(sometimes needed twice)',
                   file=sys.stderr)
 
-        # read input configuration line-by-line
-        conf = []
-        for l in fileinput.input(f):
-            conf.append(l.rstrip())
+        # read input configuration line-by-line, a loaded source switch
+        # model (conf None) is translated without parsing
+        conf = None
+        if not args.load_model:
+            conf = []
+            inp = sys.stdin if f == '-' else fs.open(f)
+            try:
+                for l in inp:
+                    conf.append(l.rstrip())
+                    if args.debug:
+                        print("DEBUG: Read input config line '" + conf[-1] +
+                              "'", file=sys.stderr)
+            finally:
+                if inp is not sys.stdin:
+                    inp.close()
+
+        # translate complete input configuration, parsing it only once for
+        # several target switches
+        if multi_target:
+            results = c.translate_targets(conf, f)
+        elif old_conf is not None:
+            results = [c.translate_diff(old_conf, conf, args.diff_against,
+                                        f)]
+        else:
+            results = [c.translate(conf, f)]
+
+        summary = []
+        if args.save_model:
+            errors = c.save_source_model(args.save_model)
+            if errors:
+                return_value = 1
+                summary.extend(normalize_messages(errors))
+            else:
+                summary.append(Message('NOTICE', 'Saving source switch model'
+                                       ' to file "{}"', args.save_model))
+        for target, (t_conf, err) in zip(c.targets, results):
+            outname = output_name(f, target, args.outfile, outdir,
+                                  multi_target)
             if args.debug:
-                print("DEBUG: Read input config line '" + conf[-1] + "'",
+                print("DEBUG: Current output file is '" + outname + "'",
                       file=sys.stderr)
+            ret, err = write_translation(args, c, f, outname, target, t_conf,
+                                         err, multi_target, fs)
+            if ret:
+                return_value = ret
+            if args.export_model and t_conf:
+                errors = write_model_export(c, outname, err, fs)
+                if any(m.level == 'ERROR' for m in errors):
+                    return_value = 1
+                err.extend(errors)
+            if multi_target:
+                summary.append(target_summary(target.get_model(), err))
+            if args.debug:
+                print('DEBUG: Errors:', file=sys.stderr)
+            printed = set()
+            for l in filter_messages(err, args.log_level):
+                if l not in printed:
+                    report(l)
+                    printed.add(l)
+        for l in filter_messages(summary, args.log_level):
+            report(l)
+
+    # print the parse statistics of all input files, a reused core module
+    # starts with new statistics
+    if c.get_parse_stats() is not None:
+        for l in c.get_parse_stats().report():
+            print(l, file=sys.stderr)
+        c.get_parse_stats().reset()
+    return return_value
 
-        # translate complete input configuration
-        (t_conf, err) = c.translate(conf)
-
-        # check for translation errors
-        err = normalize_messages(err)
-        if args.err_unknown_lines:
-            err = unknown_to_error(err)
-        if args.err_warnings:
-            err = warn_to_error(err)
-        error_occurred = False
-        for l in err:
-            if (isinstance(l, str) and l.startswith('ERROR')):
-                error_occurred = True
-                return_value = 1
-                break
 
-        if args.debug:
-            print('DEBUG: Configured source switch:', file=sys.stderr)
-            print(str(c.source), end='', file=sys.stderr)
-            print('DEBUG: Configured target switch:', file=sys.stderr)
-            print(str(c.target), end='', file=sys.stderr)
-            print('DEBUG: Translated configuration:', file=sys.stderr)
-            print(t_conf, file=sys.stderr)
-            print('DEBUG: Translation errors:', file=sys.stderr)
-            print(err, file=sys.stderr)
-
-        # write translated configuration
-        if not (args.abort_on_error and error_occurred):
-            out = sys.stdout
-            if outname != '-':
-                out = open(outname, 'w')
-                msg = 'NOTICE: Writing translated configuration to file'
-                msg += ' "' + outname + '"'
-                err.insert(0, msg)
-
-            # print configuration commands, defer ACLs
-            acl_list = []
-            for l in t_conf:
-                if isinstance(l, str):
-                    print(l.rstrip(), file=out)
-                elif isinstance(l, list):
-                    acl_list.append(l)
-                else:
-                    err.append('ERROR: Unknown configuration line format: "' +
-                               str(l) + '"')
-                    return_value = 1
+RunResult = collections.namedtuple(
+    'RunResult', ['status', 'stdout', 'stderr', 'files', 'messages'])
+RunResult.__doc__ = """Result of an E2X run() inside the current process.
 
-            # print ACLs after any other configuration statements
-            for l in acl_list:
-                # create ACL file, XOS only!
-                acl_dir = ''
-                if outname != '-':
-                    acl_dir = outname[:-3] + 'acls'
-                    if not os.path.exists(acl_dir):
-                        os.mkdir(acl_dir)
-                acl_name = l.pop(0) + '.pol'
-                acl_entries = ''
-                for acl_entry in l:
-                    acl_entries += acl_entry
-                if out == sys.stdout:
-                    acl_str = acl_name + '\n' + acl_entries.rstrip()
-                    print(c.target.get_cmd().get_comment(), acl_str,
-                          file=out)
-                else:
-                    acl_out = open(acl_dir + '/' + acl_name, 'w')
-                    msg = ('NOTICE: Writing translated ACL file "' +
-                           acl_dir + '/' + acl_name + '"')
-                    err.append(msg)
-                    print(acl_entries.rstrip(), file=acl_out)
-                    acl_out.close()
-
-            # print messages as comments if requested
-            if args.messages_as_comments:
-                if err:
-                    print('', file=out)
-                for l in err:
-                    if (l and (not l.startswith('DEBUG') or args.debug)):
-                        print(c.target.get_cmd().get_comment(), l.rstrip(),
-                              file=out)
-
-            # flush output to ensure that errors are printed after translation
-            out.flush()
-            if outname != '-':
-                out.close()
-        else:
-            err.append('ERROR: Error translating input file "' + str(f) +
-                       '", no translation created')
-        if args.debug:
-            print('DEBUG: Errors:', file=sys.stderr)
-        printed = set()
-        for l in filter_messages(err, args.log_level):
-            if l not in printed:
-                print(l, file=sys.stderr)
-                printed.add(l)
+The exit status, the text printed to STDOUT and STDERR, a dictionary
+mapping the paths of the files written to their contents, and the list of
+printed messages as Message records.
+"""
 
-    return return_value
+_run_core_modules = {}
+
+
+def run(argv, stdin=None, fs=None):
+    """Run E2X with the command line arguments argv inside this process.
+
+    The input read from STDIN is taken from stdin, a string or a text file
+    object, other input files are read from the file system fs. Output
+    files including ACL policy files are written to fs. By default fs is
+    an empty MemoryFS, use LocalFS() to access the local file system.
+    Source switch model files (--save-model, --load-model) are always
+    on the local file system.
+
+    Core modules with initialized switches are kept between calls, thus
+    translating many configurations with the same options does not
+    repeat the switch setup. Return a RunResult. This function is not
+    thread-safe, because it temporarily replaces sys.stdin, sys.stdout
+    and sys.stderr.
+    """
+    import contextlib
+    fs = MemoryFS() if fs is None else fs
+    if stdin is None or isinstance(stdin, str):
+        stdin = io.StringIO(stdin or '')
+    out, err = io.StringIO(), io.StringIO()
+    messages = []
+    written = len(fs.written)
+    saved_stdin, sys.stdin = sys.stdin, stdin
+    try:
+        with contextlib.redirect_stdout(out), \
+                contextlib.redirect_stderr(err):
+            try:
+                status = main(list(argv), fs, messages, _run_core_modules)
+            except SystemExit as e:
+                if e.code is None or isinstance(e.code, int):
+                    status = e.code or 0
+                else:
+                    print(e.code, file=sys.stderr)
+                    status = 1
+    finally:
+        sys.stdin = saved_stdin
+    files = {path: fs.read(path) for path in fs.written[written:]}
+    return RunResult(status, out.getvalue(), err.getvalue(), files,
+                     messages)
 
 # vim:filetype=python:expandtab:shiftwidth=4:tabstop=4
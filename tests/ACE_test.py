@@ -32,7 +32,7 @@ sys.path.extend(['../src'])
 
 from ipaddress import IPv4Address
 
-from ACL import ACE, Standard_ACE
+from ACL import ACE, Standard_ACE, parse_ipv4, format_ipv4
 
 
 class ACE_test(unittest.TestCase):
@@ -227,6 +227,42 @@ class ACE_test(unittest.TestCase):
 
         self.assertIsNone(self.ace.get_dest_mask_inverted())
 
+    def test_addresses_are_stored_as_integers(self):
+        ace = ACE(source=IPv4Address('192.0.2.1'), source_mask='0.0.0.255')
+        ace.set_dest('198.51.100.7')
+        ace.set_dest_mask(0)
+
+        self.assertEqual(0xc0000201, ace.get_source_int())
+        self.assertEqual(0xff, ace.get_source_mask_int())
+        self.assertEqual(0xc6336407, ace.get_dest_int())
+        self.assertEqual(0, ace.get_dest_mask_int())
+        self.assertEqual(IPv4Address('192.0.2.1'), ace.get_source())
+        self.assertEqual(IPv4Address('0.0.0.255'), ace.get_source_mask())
+
+    def test_get_prefixlen(self):
+        self.ace.set_source_mask('0.0.0.255')
+        self.ace.set_dest_mask('0.255.0.255')
+
+        self.assertEqual(24, self.ace.get_source_prefixlen())
+        self.assertIsNone(self.ace.get_dest_prefixlen())
+
+    def test_get_prefixlen_maskNotSet(self):
+
+        self.assertIsNone(self.ace.get_source_prefixlen())
+        self.assertIsNone(self.ace.get_dest_prefixlen())
+
+    def test_parse_ipv4_invalidAddresses(self):
+        for address in ('', '1.2.3', '1.2.3.4.5', '1.2.3.256', '01.2.3.4',
+                        '1.2.3.-4', '1.2.3.x', ' 1.2.3.4', '::1', None,
+                        -1, 2 ** 32):
+            self.assertIsNone(parse_ipv4(address), address)
+
+    def test_format_ipv4(self):
+
+        self.assertEqual('0.0.0.0', format_ipv4(0))
+        self.assertEqual('255.255.255.255', format_ipv4(0xffffffff))
+        self.assertEqual('10.1.2.3', format_ipv4(parse_ipv4('10.1.2.3')))
+
     def test_is_valid_ip_shouldFail(self):
 
         self.assertFalse(ACE.is_valid_ip_address('::1'))
@@ -0,0 +1,277 @@
+# CDDL HEADER START
+#
+# The contents of this file are subject to the terms
+# of the Common Development and Distribution License
+# (the "License").  You may not use this file except
+# in compliance with the License.
+#
+# You can obtain a copy of the license at
+# LICENSE.txt or http://opensource.org/licenses/CDDL-1.0.
+# See the License for the specific language governing
+# permissions and limitations under the License.
+#
+# When distributing Covered Code, include this CDDL
+# HEADER in each file and include the License file at
+# LICENSE.txt  If applicable,
+# add the following below this CDDL HEADER, with the
+# fields enclosed by brackets "[]" replaced with your
+# own identifying information: Portions Copyright [yyyy]
+# [name of copyright owner]
+#
+# CDDL HEADER END
+
+# Copyright 2014-2017 Extreme Networks, Inc.  All rights reserved.
+# Use is subject to license terms.
+
+# This file is part of e2x (translate EOS switch configuration to ExtremeXOS)
+
+import itertools
+import random
+import sys
+import time
+import unittest
+
+sys.path.extend(['../src'])
+
+from ACL import ACL, ACE, parse_ipv4
+from ACLOptimizer import optimize_acl
+
+PROTOCOLS = {'ip': None, 'icmp': 1, 'igmp': 2, 'tcp': 6, 'udp': 17}
+
+
+def ace(action, protocol='ip', source='any', source_port=None, dest=None,
+        dest_port=None):
+    """Create an ACE, addresses are 'any', 'host A.B.C.D', or 'A.B.C.D W'."""
+    def address(desc):
+        if desc is None:
+            return None, None
+        if desc == 'any':
+            return '0.0.0.0', '255.255.255.255'
+        if desc.startswith('host '):
+            return desc[5:], '0.0.0.0'
+        return desc.split()
+    src, src_mask = address(source)
+    dst, dst_mask = address(dest)
+    return ACE(action=action, protocol=protocol, source=src,
+               source_mask=src_mask,
+               source_op='eq' if source_port else None,
+               source_port=source_port, dest=dst, dest_mask=dst_mask,
+               dest_op='eq' if dest_port else None, dest_port=dest_port)
+
+
+def create_acl(*aces):
+    acl = ACL(number=100)
+    for a in aces:
+        acl.add_ace(a)
+    return acl
+
+
+def ace_matches(a, packet):
+    """Return True if the XOS policy entry written for a matches packet.
+
+    This deliberately does not use the optimizer's own logic.
+    """
+    protocol, source, source_port, dest, dest_port = packet
+    ace_protocol = a.get_protocol()
+    if ace_protocol and ace_protocol != 'ip':
+        if int(PROTOCOLS.get(ace_protocol, ace_protocol)) != protocol:
+            return False
+    for addr, mask, value in ((a.get_source(), a.get_source_mask(), source),
+                              (a.get_dest(), a.get_dest_mask(), dest)):
+        if addr is not None and mask is not None:
+            care = ~int(mask) & 0xffffffff
+            if (int(addr) ^ value) & care:
+                return False
+    for op, port, value in ((a.get_source_op(), a.get_source_port(),
+                             source_port),
+                            (a.get_dest_op(), a.get_dest_port(), dest_port)):
+        if op and port is not None and int(port) != value:
+            return False
+    return True
+
+
+def acl_result(acl, packet):
+    for a in acl.get_entries():
+        if ace_matches(a, packet):
+            return a.get_action()
+    return 'deny'
+
+
+def sample_packets(acl, count=5000, seed=1):
+    """Return packets probing the borders of all ACEs plus random packets.
+
+    All combinations of the probed field values are returned if there are
+    at most count combinations, otherwise count random combinations.
+    """
+    rnd = random.Random(seed)
+    protocols, addresses, ports = {0, 1, 6, 17, 47}, set(), {0, 65535}
+    for a in acl.get_entries():
+        protocol = a.get_protocol()
+        if protocol and protocol != 'ip':
+            protocols.add(int(PROTOCOLS.get(protocol, protocol)))
+        for addr, mask in ((a.get_source_int(), a.get_source_mask_int()),
+                           (a.get_dest_int(), a.get_dest_mask_int())):
+            if addr is None or mask is None:
+                continue
+            base = addr & ~mask & 0xffffffff
+            addresses.update([base, base | mask, (base - 1) & 0xffffffff,
+                              ((base | mask) + 1) & 0xffffffff,
+                              base | (rnd.getrandbits(32) & mask)])
+        for port in (a.get_source_port(), a.get_dest_port()):
+            if port is not None:
+                ports.update([int(port), int(port) + 1])
+    addresses.update(rnd.getrandbits(32) for _ in range(8))
+    addresses, ports = sorted(addresses), sorted(ports)
+    combinations = len(protocols) * len(addresses) ** 2 * len(ports) ** 2
+    if combinations <= count:
+        return list(itertools.product(protocols, addresses, ports, addresses,
+                                      ports))
+    protocols = sorted(protocols)
+    return [(rnd.choice(protocols), rnd.choice(addresses), rnd.choice(ports),
+             rnd.choice(addresses), rnd.choice(ports))
+            for _ in range(count)]
+
+
+class ACLOptimizer_test(unittest.TestCase):
+
+    def assertOptimizedEquivalent(self, acl, expected_entries=None):
+        original = create_acl(*acl.get_entries())
+        packets = sample_packets(original)
+
+        messages = optimize_acl(acl)
+
+        for packet in packets:
+            self.assertEqual(acl_result(original, packet),
+                             acl_result(acl, packet), packet)
+        if expected_entries is not None:
+            self.assertEqual(expected_entries, len(acl.get_entries()),
+                             messages)
+        return messages
+
+    def test_shadowed_entry_is_removed(self):
+        acl = create_acl(ace('permit', source='10.0.0.0 0.0.0.255'),
+                         ace('deny', source='host 10.0.0.1'),
+                         ace('permit', source='host 10.0.1.1'))
+
+        messages = self.assertOptimizedEquivalent(acl, 2)
+
+        self.assertIn('INFO: ACL "100": Removed entry 2, shadowed by entry 1',
+                      messages)
+        self.assertIn('NOTICE: Optimized ACL "100" from 3 to 2 entries',
+                      messages)
+
+    def test_protocol_and_port_shadowing(self):
+        acl = create_acl(ace('deny', 'tcp', dest='any', dest_port='23'),
+                         ace('permit', 'tcp', 'host 10.0.0.1', dest='any',
+                             dest_port='23'),
+                         ace('permit', 'udp', 'host 10.0.0.1', dest='any',
+                             dest_port='23'),
+                         ace('permit', 'ip', 'host 10.0.0.2'))
+
+        self.assertOptimizedEquivalent(acl, 3)
+
+    def test_redundant_permit_is_removed(self):
+        acl = create_acl(ace('permit', source='host 10.0.0.1'),
+                         ace('permit', source='host 10.0.1.1'),
+                         ace('permit', source='10.0.0.0 0.0.0.255'))
+
+        messages = self.assertOptimizedEquivalent(acl, 2)
+
+        self.assertIn('INFO: ACL "100": Removed redundant entry 1, covered'
+                      ' by entry 3', messages)
+
+    def test_permit_before_conflicting_deny_is_kept(self):
+        acl = create_acl(ace('permit', source='host 10.0.0.1'),
+                         ace('deny', source='10.0.0.0 0.0.0.3'),
+                         ace('permit', source='10.0.0.0 0.0.0.255'))
+
+        self.assertOptimizedEquivalent(acl, 3)
+
+    def test_deny_covered_by_implicit_deny_is_removed(self):
+        acl = create_acl(ace('permit', source='host 10.0.0.1'),
+                         ace('deny', source='10.0.1.0 0.0.0.255'),
+                         ace('deny', source='any'))
+
+        messages = self.assertOptimizedEquivalent(acl, 1)
+
+        self.assertIn('INFO: ACL "100": Removed redundant entry 3, covered'
+                      ' by the implicit deny', messages)
+
+    def test_single_deny_is_kept(self):
+        acl = create_acl(ace('deny', source='any'))
+
+        self.assertEqual([], self.assertOptimizedEquivalent(acl, 1))
+
+    def test_adjacent_prefixes_are_merged(self):
+        acl = create_acl(*[ace('permit', 'tcp',
+                               '192.0.2.' + str(i * 64) + ' 0.0.0.63',
+                               dest='any', dest_port='80')
+                           for i in range(4)])
+
+        messages = self.assertOptimizedEquivalent(acl, 1)
+
+        merged = acl.get_entries()[0]
+        self.assertEqual(parse_ipv4('192.0.2.0'), merged.get_source_int())
+        self.assertEqual(24, merged.get_source_prefixlen())
+        self.assertIn('INFO: ACL "100": Merged entry 4 into entry 3',
+                      messages)
+
+    def test_non_adjacent_prefixes_are_not_merged(self):
+        acl = create_acl(ace('permit', source='192.0.2.64 0.0.0.63'),
+                         ace('permit', source='192.0.2.128 0.0.0.63'),
+                         ace('permit', source='10.0.0.0 0.0.0.254'),
+                         ace('permit', source='10.0.0.1 0.0.0.254'))
+
+        self.assertOptimizedEquivalent(acl, 4)
+
+    def test_optimized_acl_without_changes(self):
+        acl = create_acl(ace('permit', 'tcp', 'host 10.0.0.1'),
+                         ace('permit', 'udp', 'host 10.0.0.1'))
+
+        self.assertEqual([], self.assertOptimizedEquivalent(acl, 2))
+
+    def test_random_acls_are_equivalent(self):
+        rnd = random.Random(42)
+        networks = ['10.0.0.0', '10.0.0.64', '10.0.0.128', '10.0.1.0',
+                    '10.0.0.1', '10.0.0.65', '192.0.2.0']
+        wildcards = ['0.0.0.0', '0.0.0.63', '0.0.0.255', '0.0.1.255',
+                     '255.255.255.255']
+        for _ in range(30):
+            aces = []
+            for _ in range(rnd.randint(1, 12)):
+                protocol = rnd.choice(['ip', 'ip', 'tcp', 'udp'])
+                port = None
+                if protocol != 'ip' and rnd.random() < 0.5:
+                    port = rnd.choice(['23', '80'])
+                aces.append(ace(rnd.choice(['permit', 'deny']), protocol,
+                                rnd.choice(networks) + ' ' +
+                                rnd.choice(wildcards),
+                                dest=rnd.choice(networks) + ' ' +
+                                rnd.choice(wildcards),
+                                dest_port=port))
+            acl = create_acl(*aces)
+
+            self.assertOptimizedEquivalent(acl)
+            self.assertLessEqual(len(acl.get_entries()), len(aces))
+
+    def test_large_acl(self):
+        aces = [ace('permit', 'tcp',
+                    '10.' + str(i // 250) + '.' + str(i % 250) + '.0 '
+                    '0.0.0.255', dest='host 192.0.2.' + str(i % 200),
+                    dest_port=str(1000 + i % 50))
+                for i in range(5000)]
+        aces.append(ace('deny', 'tcp', '10.0.0.0 0.0.255.255', dest='any'))
+        acl = create_acl(*aces)
+
+        start = time.perf_counter()
+        optimize_acl(acl)
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(5000, len(acl.get_entries()))
+        self.assertLess(elapsed, 2.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
+
+# vim:filetype=python:expandtab:shiftwidth=4:tabstop=4
@@ -151,6 +151,26 @@ class ACL_test(unittest.TestCase):
 
         self.assertEqual(nr_of_aces, len(self.acl.get_entries()))
 
+    def test_key_equalAcesHaveEqualKeys(self):
+        ace1 = ACE(number=10, action='permit', protocol='tcp',
+                   source='10.0.0.1', source_mask='0.0.0.255')
+        ace2 = ACE(number=10, action='permit', protocol='tcp',
+                   source='10.0.0.1', source_mask='0.0.0.255')
+        ace3 = ACE(number=10, action='deny', protocol='tcp',
+                   source='10.0.0.1', source_mask='0.0.0.255')
+
+        self.assertEqual(ace1.key(), ace2.key())
+        self.assertEqual(hash(ace1.key()), hash(ace2.key()))
+        self.assertNotEqual(ace1.key(), ace3.key())
+
+    def test_add_ace_equalAceShouldBeSilentlyDropped(self):
+        self.acl.add_ace(ACE(action='deny', source='10.0.0.1'))
+        self.acl.add_ace(ACE(action='permit', source='10.0.0.1'))
+        self.acl.add_ace(ACE(action='deny', source='10.0.0.1'))
+
+        self.assertEqual(['deny', 'permit'],
+                         [a.get_action() for a in self.acl.get_entries()])
+
     def test_is_supported_type_shouldFail(self):
 
         self.assertFalse(self.acl.is_supported_type('mac'))
@@ -0,0 +1,163 @@
+# CDDL HEADER START
+#
+# The contents of this file are subject to the terms
+# of the Common Development and Distribution License
+# (the "License").  You may not use this file except
+# in compliance with the License.
+#
+# You can obtain a copy of the license at
+# LICENSE.txt or http://opensource.org/licenses/CDDL-1.0.
+# See the License for the specific language governing
+# permissions and limitations under the License.
+#
+# When distributing Covered Code, include this CDDL
+# HEADER in each file and include the License file at
+# LICENSE.txt  If applicable,
+# add the following below this CDDL HEADER, with the
+# fields enclosed by brackets "[]" replaced with your
+# own identifying information: Portions Copyright [yyyy]
+# [name of copyright owner]
+#
+# CDDL HEADER END
+
+# Copyright 2014-2017 Extreme Networks, Inc.  All rights reserved.
+# Use is subject to license terms.
+
+# This file is part of e2x (translate EOS switch configuration to ExtremeXOS)
+import asyncio
+import concurrent.futures
+import sys
+import threading
+import unittest
+from unittest.mock import patch
+
+sys.path.extend(['../src'])
+
+import AsyncTranslator
+import CM
+
+SOURCE = 'C5K125-48P2'
+TARGET = 'SummitX460-48p+2xf'
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+async def collect(async_iterator):
+    return [result async for result in async_iterator]
+
+
+class CreateCoreModule_test(unittest.TestCase):
+
+    def test_create_core_module(self):
+        c, err = CM.create_core_module(SOURCE, TARGET,
+                                       {'ignore_defaults': True})
+
+        self.assertEqual([], err)
+        self.assertEqual(SOURCE, c.source.get_model())
+        self.assertEqual(TARGET, c.target.get_model())
+
+    def test_create_core_module_with_unknown_source(self):
+        c, err = CM.create_core_module('no-such-switch', TARGET)
+
+        self.assertIsNone(c)
+        self.assertTrue(err[0].startswith('ERROR'))
+
+
+class TranslateJob_test(unittest.TestCase):
+
+    def test_jobs_do_not_share_configuration(self):
+        job1 = CM.TranslationJob(['set port alias ge.1.1 first\n'],
+                                 SOURCE, TARGET)
+        job2 = CM.TranslationJob(['set port alias ge.1.2 second\n'],
+                                 SOURCE, TARGET)
+
+        translation1, _ = CM.translate_job(job1)
+        translation2, _ = CM.translate_job(job2)
+
+        self.assertTrue(any('first' in line for line in translation1))
+        self.assertFalse(any('first' in line for line in translation2))
+        self.assertTrue(any('second' in line for line in translation2))
+
+    def test_translate_job_with_unknown_target(self):
+        job = CM.TranslationJob([], SOURCE, 'no-such-switch')
+
+        translation, err = CM.translate_job(job)
+
+        self.assertEqual([], translation)
+        self.assertTrue(err[0].startswith('ERROR'))
+
+
+class AsyncTranslator_test(unittest.TestCase):
+
+    def setUp(self):
+        self.executor = concurrent.futures.ThreadPoolExecutor(4)
+        self.addCleanup(self.executor.shutdown)
+
+    def test_translate(self):
+        job = CM.TranslationJob(['set port alias ge.1.1 uplink\n'],
+                                SOURCE, TARGET, name='one')
+        translator = AsyncTranslator.AsyncTranslator(self.executor)
+
+        result = run(translator.translate(job))
+
+        self.assertIs(job, result.job)
+        self.assertTrue(any('uplink' in line for line in result.translation))
+
+    def test_translate_many(self):
+        jobs = [CM.TranslationJob(['set port alias ge.1.' + str(i) +
+                                   ' port' + str(i) + '\n'],
+                                  SOURCE, TARGET, name=i)
+                for i in range(1, 9)]
+
+        results = run(collect(AsyncTranslator.translate_many(jobs,
+                                                             self.executor)))
+
+        self.assertEqual(sorted(range(1, 9)),
+                         sorted(r.job.name for r in results))
+        for r in results:
+            aliases = [line for line in r.translation
+                       if 'display-string' in line]
+            self.assertEqual(1, len(aliases))
+            self.assertTrue(aliases[0].endswith(' port' + str(r.job.name)))
+
+    def test_translate_with_timeout(self):
+        started, release = threading.Event(), threading.Event()
+
+        def slow_translate_job(job):
+            started.set()
+            release.wait(5)
+            return [], []
+
+        job = CM.TranslationJob([], SOURCE, TARGET, name='slow',
+                                timeout=0.05)
+        translator = AsyncTranslator.AsyncTranslator(self.executor)
+        with patch('CM.translate_job', slow_translate_job):
+            result = run(translator.translate(job))
+        release.set()
+
+        self.assertTrue(started.is_set())
+        self.assertEqual([], result.translation)
+        self.assertEqual(1, len(result.messages))
+        self.assertTrue(result.messages[0].startswith('ERROR'))
+        self.assertIn('slow', result.messages[0])
+        self.assertIn('timed out', result.messages[0])
+
+    def test_translate_in_process_pool(self):
+        job = CM.TranslationJob(['set port alias ge.1.1 uplink\n'],
+                                SOURCE, TARGET)
+        with AsyncTranslator.AsyncTranslator(max_workers=1) as translator:
+            result = run(translator.translate(job))
+
+        self.assertTrue(any('uplink' in line for line in result.translation))
+
+
+if __name__ == '__main__':
+    unittest.main()
+
+# vim:filetype=python:expandtab:shiftwidth=4:tabstop=4
@@ -135,6 +135,25 @@ class ConfigWriter_test(unittest.TestCase):
 
         self.assertTrue(result[8].startswith(warnStr.format('Disabled')))
 
+    def test_check_unwritten_skips_written_ports(self):
+        data = {'type': 'rj45', 'speedrange': [10, 100], 'PoE': 'no'}
+        port = Port.Port('1', 'ge.1.1', data)
+        switch = MagicMock(spec=Switch.Switch)
+        switch.get_ports.return_value = [port]
+        switch.get_stps.return_value = []
+        switch.is_dirty.return_value = False
+        cw = Switch.ConfigWriter(switch)
+        port.set_speed(100, 'transfer_conf')
+
+        result = cw.check_unwritten()
+
+        self.assertEqual(1, len(result))
+        self.assertTrue(result[0].startswith(self.WarningStart + 'Speed of'))
+
+        port.set_speed(100, 'written')
+
+        self.assertEqual([], cw.check_unwritten())
+
     def _set_stp_attributes_with_reason(self, stp, reason):
         stp.set_name('a', reason)
         stp.set_enabled(True, reason)
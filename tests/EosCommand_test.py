@@ -28,6 +28,7 @@
 import unittest
 from unittest.mock import MagicMock
 import sys
+import time
 
 sys.path.extend(['../src'])
 
@@ -234,6 +235,21 @@ class EosCommand_test(unittest.TestCase):
         self.assertEqual('WARN: Ignoring "assign-queue 1" in "' +
                          params + '"', result)
 
+    def test_do_access_list_largeNumberedAcl(self):
+        cmd = self._setup_cmd_interpreter_configure_state()
+        lines = ['100 permit tcp host 10.0.' + str(i // 250) + '.' +
+                 str(i % 250) + ' any eq ' + str(1000 + i % 50)
+                 for i in range(5000)]
+
+        start = time.perf_counter()
+        for line in lines + lines[:1000]:
+            cmd._do_access_list(line.split())
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(5000,
+                         len(cmd._switch.get_acl_by_number(100).get_entries()))
+        self.assertLess(elapsed, 5.0)
+
     def test_do_access_list_shouldAddNonExistingAclToSwitch(self):
         cmd = self._setup_cmd_interpreter_configure_state()
         nr_of_acls = len(cmd._switch.get_acls())
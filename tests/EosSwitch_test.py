@@ -27,11 +27,13 @@
 
 import unittest
 import sys
+import threading
 sys.path.extend(['../src'])
 
 from unittest.mock import patch, call, Mock
 
 import EOS
+import Switch
 from Port import Port
 from VLAN import VLAN
 
@@ -161,6 +163,67 @@ class EosSwitch_test(unittest.TestCase):
             self.assertTrue(self.sw._port_name_matches_description(portName,
                                                                    d), d)
 
+    def test_get_ports_by_port_string(self):
+        data = {'type': 'rj45', 'speedrange': [1000], 'PoE': 'no'}
+        names = ['ge.1.1', 'ge.1.2', 'ge.2.1']
+        for label, name in enumerate(names, 1):
+            self.sw._ports.append(Port(str(label), name, data))
+
+        def ports_by_name(description):
+            return [p.get_name()
+                    for p in self.sw.get_physical_ports_by_name(description)]
+
+        self.assertEqual(['ge.1.2'], ports_by_name(' ge.1.2 '))
+        self.assertEqual(names, ports_by_name('*.*.*'))
+        self.assertEqual(['ge.1.1', 'ge.2.1'], ports_by_name('ge.*.1'))
+        self.assertEqual(['ge.1.2', 'ge.2.1'],
+                         ports_by_name('ge.2.1;ge.1.2-3'))
+        self.assertEqual([], ports_by_name('ge.1.1;'))
+        self.assertEqual(['lag.0.2'], [l.get_name() for l in
+                                       self.sw.get_ports_by_name('lag.0.2')])
+
+    def test_parse_stats_count_lines_per_command_path(self):
+        stats = Switch.ParseStats()
+        config = ['set vlan create 10', 'set vlan create 20',
+                  'set vlan name 10 data', '! comment', 'set foo bar',
+                  'set spantree mstcfgid cfgname r1 rev 2']
+
+        results = [stats.configure(self.sw, line) for line in config]
+
+        self.assertEqual('NOTICE: Ignoring unknown command "set foo bar"',
+                         results[4])
+        self.assertEqual({'set vlan create': 2, 'set vlan name': 1,
+                          '(comment)': 1, '(unknown)': 1,
+                          'set spantree mstcfgid cfgname': 1}, stats.lines)
+        self.assertEqual(set(stats.lines), set(stats.seconds))
+        self.assertEqual((1, 0, 1), (stats.unknown, stats.ignored,
+                                     stats.comments))
+        self.assertIsNone(Switch._parse_stats.active)
+
+    def test_parse_stats_of_concurrent_parses_are_separate(self):
+        def parse(switch, stats, lines):
+            barrier.wait()
+            for line in lines:
+                stats.configure(switch, line)
+
+        barrier = threading.Barrier(2)
+        vlan_stats, alias_stats = Switch.ParseStats(), Switch.ParseStats()
+        vlan_lines = ['set vlan create ' + str(t) for t in range(2, 502)]
+        alias_lines = ['set port alias ge.1.1 a' + str(i) for i in range(500)]
+        thread = threading.Thread(target=parse, args=(
+            EOS.EosSwitch(), alias_stats, alias_lines))
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            thread.start()
+            parse(self.sw, vlan_stats, vlan_lines)
+            thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+
+        self.assertEqual({'set vlan create': 500}, vlan_stats.lines)
+        self.assertEqual({'set port alias': 500}, alias_stats.lines)
+
     def test_expand_set_lacp_static_variant_1_ok(self):
         arg = 'set lacp static lag.0.5'
         expectedErrList = []
@@ -25,6 +25,7 @@
 
 # This file is part of e2x (translate EOS switch configuration to ExtremeXOS)
 
+import copy
 import unittest
 import sys
 
@@ -100,6 +101,48 @@ class LAG_test(unittest.TestCase):
 
         self.assertEqual(ports[0], self.lag.get_master_port())
 
+    def test_add_member_port_keeps_order_once(self):
+        for p in ['p2', 'p1', 'p2', 'p3']:
+            self.lag.add_member_port(p)
+
+        self.assertEqual(['p2', 'p1', 'p3'], self.lag.get_members())
+        self.assertTrue(self.lag.is_master_port('p2'))
+        self.assertFalse(self.lag.is_master_port('p1'))
+
+    def test_remove_member_port(self):
+        for p in ['p1', 'p2', 'p3']:
+            self.lag.add_member_port(p)
+
+        self.assertTrue(self.lag.remove_member_port('p1'))
+        self.assertFalse(self.lag.remove_member_port('p1'))
+        self.assertEqual(['p2', 'p3'], self.lag.get_members())
+        self.assertEqual('p2', self.lag.get_master_port())
+
+    def test_member_index(self):
+        index = {}
+        self.lag.add_member_port('p1')
+
+        self.lag.set_member_index(index)
+        self.lag.add_member_port('p2')
+
+        self.assertEqual({'p1': self.lag, 'p2': self.lag}, index)
+        self.lag.remove_member_port('p1')
+        self.assertEqual({'p2': self.lag}, index)
+
+    def test_deepcopy_copies_members_and_index(self):
+        index = {}
+        self.lag.set_member_index(index)
+        self.lag.add_member_port('p1')
+
+        lag_copy = copy.deepcopy(self.lag)
+        lag_copy.add_member_port('p2')
+
+        self.assertEqual(['p1'], self.lag.get_members())
+        self.assertEqual({'p1': self.lag}, index)
+        self.assertEqual(['p1', 'p2'], lag_copy.get_members())
+        self.assertIs(lag_copy, lag_copy._member_index['p1'])
+
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -0,0 +1,125 @@
+# CDDL HEADER START
+#
+# The contents of this file are subject to the terms
+# of the Common Development and Distribution License
+# (the "License").  You may not use this file except
+# in compliance with the License.
+#
+# You can obtain a copy of the license at
+# LICENSE.txt or http://opensource.org/licenses/CDDL-1.0.
+# See the License for the specific language governing
+# permissions and limitations under the License.
+#
+# When distributing Covered Code, include this CDDL
+# HEADER in each file and include the License file at
+# LICENSE.txt  If applicable,
+# add the following below this CDDL HEADER, with the
+# fields enclosed by brackets "[]" replaced with your
+# own identifying information: Portions Copyright [yyyy]
+# [name of copyright owner]
+#
+# CDDL HEADER END
+
+# Copyright 2014-2017 Extreme Networks, Inc.  All rights reserved.
+# Use is subject to license terms.
+
+# This file is part of e2x (translate EOS switch configuration to ExtremeXOS)
+
+import io
+import json
+import sys
+import unittest
+
+sys.path.extend(['../src'])
+
+import CM
+import ModelExport
+from Messages import Message
+
+CONFIG = [
+    'set port alias ge.1.1 uplink',
+    'set port disable ge.1.5',
+    'set vlan create 10',
+    'set vlan name 10 DATA',
+    'set port vlan ge.1.1-4 10 modify-egress',
+    'set vlan egress 10 ge.1.6 tagged',
+    'set lacp static lag.0.1 key 100 ge.1.11-12',
+    'set spantree version mstp',
+    'set spantree msti sid 1 create',
+    'set spantree mstmap 10 sid 1',
+    'router', 'enable', 'configure',
+    'access-list 1 permit host 10.0.0.1',
+    'interface vlan 10',
+    'ip address 10.0.0.1 255.255.255.0',
+    'ip access-group 1 in',
+    'exit', 'exit', 'exit', 'exit']
+
+
+class ModelExport_test(unittest.TestCase):
+
+    def setUp(self):
+        self.cm, errors = CM.create_core_module('C5K125-48P2',
+                                                'SummitX460-48p+2sf')
+        self.assertEqual([], errors)
+
+    def _export(self, messages):
+        out = io.StringIO()
+        self.cm.export_target_model(out, messages)
+        return out.getvalue()
+
+    def test_export_contains_translated_target_switch(self):
+        translation, messages = self.cm.translate(CONFIG)
+
+        model = json.loads(self._export(messages))
+
+        self.assertEqual(ModelExport.FORMAT_VERSION, model['format_version'])
+        self.assertEqual('SummitX460-48p+2sf', model['model'])
+        self.assertEqual('1', model['port_mapping']['s2t']['ge.1.1'])
+        self.assertEqual('ge.1.1', model['port_mapping']['t2s']['1'])
+        self.assertEqual('lag.0.1', model['lag_mapping']['t2s'][
+            model['lag_mapping']['s2t']['lag.0.1']])
+        ports = {p['name']: p for p in model['ports']}
+        self.assertEqual('uplink', ports['1']['description'])
+        self.assertEqual('ge.1.1', ports['1']['source'])
+        self.assertFalse(ports['5']['admin_state'])
+        self.assertEqual([['11', '12']],
+                         [l['members'] for l in model['lags']])
+        vlan = [v for v in model['vlans'] if v['tag'] == 10][0]
+        self.assertEqual('DATA', vlan['name'])
+        self.assertEqual(['1', '2', '3', '4'], vlan['untagged'])
+        self.assertEqual(['6'], vlan['tagged'])
+        self.assertEqual([['10.0.0.1', '255.255.255.0']],
+                         vlan['ipv4_addresses'])
+        self.assertEqual([1], vlan['ipv4_acl_in'])
+        self.assertIn(10, model['stps'][1]['vlans'])
+        acl = model['acls'][0]
+        self.assertEqual('acl_1', acl['name'])
+        self.assertIn('source-address 10.0.0.1/255.255.255.255;',
+                      acl['policy'])
+        self.assertEqual(len(messages), len(model['messages']))
+
+    def test_export_writes_structured_messages(self):
+        self.cm.translate(['set vlan create 10'])
+
+        model = json.loads(self._export(
+            ['WARN: first', Message('ERROR', 'Port "{}" missing', 'x')]))
+
+        self.assertEqual([{'level': 'WARN', 'text': 'first'},
+                          {'level': 'ERROR', 'text': 'Port "x" missing'}],
+                         model['messages'])
+
+    def test_export_writes_one_array_element_per_line(self):
+        self.cm.translate(CONFIG)
+
+        lines = self._export([]).splitlines()
+
+        start = lines.index('"ports": [') + 1
+        end = lines.index('],', start)
+        self.assertEqual([p.get_name() for p in self.cm.target.get_ports()],
+                         [json.loads(l.rstrip(','))['name']
+                          for l in lines[start:end]])
+
+if __name__ == '__main__':
+    unittest.main()
+
+# vim:filetype=python:expandtab:shiftwidth=4:tabstop=4
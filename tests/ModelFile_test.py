@@ -0,0 +1,216 @@
+# CDDL HEADER START
+#
+# The contents of this file are subject to the terms
+# of the Common Development and Distribution License
+# (the "License").  You may not use this file except
+# in compliance with the License.
+#
+# You can obtain a copy of the license at
+# LICENSE.txt or http://opensource.org/licenses/CDDL-1.0.
+# See the License for the specific language governing
+# permissions and limitations under the License.
+#
+# When distributing Covered Code, include this CDDL
+# HEADER in each file and include the License file at
+# LICENSE.txt  If applicable,
+# add the following below this CDDL HEADER, with the
+# fields enclosed by brackets "[]" replaced with your
+# own identifying information: Portions Copyright [yyyy]
+# [name of copyright owner]
+#
+# CDDL HEADER END
+
+# Copyright 2014-2017 Extreme Networks, Inc.  All rights reserved.
+# Use is subject to license terms.
+
+# This file is part of e2x (translate EOS switch configuration to ExtremeXOS)
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.extend(['../src'])
+
+import CM
+import ModelFile
+
+CONFIG = [
+    'set port jumbo disable *.*.*',
+    'set port alias ge.1.1 uplink',
+    'set port disable ge.1.5',
+    'set port speed ge.1.6 100',
+    'set port duplex ge.1.6 half',
+    'set vlan create 10,20',
+    'set vlan name 10 DATA',
+    'set port vlan ge.1.1-10 10 modify-egress',
+    'set vlan egress 20 ge.1.1-16 tagged',
+    'set lacp aadminkey lag.0.1 100',
+    'set port lacp port ge.1.11-12 aadminkey 100',
+    'set port lacp port ge.1.11-12 enable',
+    'set spantree version mstp',
+    'set spantree mstcfgid cfgname Region rev 1',
+    'set spantree msti sid 1 create',
+    'set spantree mstmap 10 sid 1',
+    'set system login foo super-user enable password bar',
+    'set logging server 1 ip-addr 10.1.1.1 state enable',
+    'set sntp client unicast',
+    'set sntp server 10.1.1.2',
+    'set tacacs server 1 10.1.1.4 49 secret',
+    'set tacacs enable',
+    'set snmp targetparams p1 user u1 security-model v1 '
+    'message-processing v1',
+    'set snmp targetaddr t1 10.1.1.5 param p1',
+    'set system name sw1',
+    'set banner motd hello',
+    'set unknown command',
+    'router', 'enable', 'configure',
+    'access-list 1 permit host 10.0.0.1',
+    'access-list 100 permit ip host 10.0.0.1 any',
+    'interface vlan 10',
+    'ip address 10.0.0.1 255.255.255.0',
+    'ip access-group 1 in',
+    'exit',
+    'ip route 0.0.0.0 0.0.0.0 10.0.0.254',
+    'exit', 'exit']
+
+
+class ModelFile_test(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'sw.e2xm')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def _core_module(self, source, target, options=None):
+        cm, errors = CM.create_core_module(source, target, options)
+        self.assertEqual([], errors)
+        return cm
+
+    def _save(self, source='C5K125-48P2', options=None):
+        cm = self._core_module(source, 'SummitX460-48p+2sf', options)
+        cm.translate(CONFIG, 'sw.cfg')
+        self.assertEqual([], cm.save_source_model(self.path))
+        return cm
+
+    def test_round_trip_restores_source_switch(self):
+        saved = self._save()
+        cm = self._core_module('C5G124-24', 'SummitX460-48p+2sf')
+
+        ret, name = cm.load_source_model(self.path)
+
+        self.assertTrue(ret)
+        self.assertEqual('sw.cfg', name)
+        self.assertEqual('C5K125-48P2', cm.source.get_model())
+        for getter in ['get_ports', 'get_lags', 'get_all_vlans',
+                       'get_stps', 'get_acls', 'get_all_syslog_servers',
+                       'get_all_sntp_servers', 'get_all_user_accounts',
+                       'get_all_snmp_target_addrs']:
+            self.assertEqual(
+                [str(o) for o in getattr(saved.source, getter)()],
+                [str(o) for o in getattr(cm.source, getter)()], getter)
+        self.assertEqual(len(saved.source.get_all_tacacs_servers()),
+                         len(cm.source.get_all_tacacs_servers()))
+        for vlan in cm.source.get_all_vlans():
+            self.assertIs(cm.source, vlan._switch)
+
+    def test_translate_loaded_model_equals_translate_config(self):
+        options = {'comment_unknown_lines': True}
+        for source in ['C5K125-48P2', 'C5K125-48P2,C5G124-24']:
+            for target in ['SummitX460-48p+2sf', 'SummitX460-24t']:
+                self._save(source)
+                expected = self._core_module(source, target, options)
+                cm = self._core_module(source, target, options)
+                cm.load_source_model(self.path)
+
+                result = cm.translate(None)
+                again = cm.translate(None)
+
+                self.assertEqual(expected.translate(CONFIG), result)
+                self.assertEqual(result, again)
+
+    def test_translate_targets_of_loaded_model(self):
+        targets = ['SummitX460-48p+2sf', 'SummitX460-24t']
+        self._save()
+        expected = self._core_module('C5K125-48P2', targets[0])
+        expected.set_target_switches(targets)
+        cm = self._core_module('C5K125-48P2', targets[0])
+        cm.set_target_switches(targets)
+        cm.load_source_model(self.path)
+
+        self.assertEqual(expected.translate_targets(CONFIG),
+                         cm.translate_targets(None))
+
+    def test_saved_model_keeps_unknown_lines(self):
+        self._save()
+        cm = self._core_module('C5K125-48P2', 'SummitX460-48p+2sf',
+                               {'keep_unknown_lines': True})
+        cm.load_source_model(self.path)
+
+        translation, _ = cm.translate(None)
+
+        self.assertEqual('set unknown command', translation[-1])
+
+    def test_translate_none_without_loaded_model_fails(self):
+        cm = self._core_module('C5K125-48P2', 'SummitX460-48p+2sf')
+
+        translation, messages = cm.translate(None)
+
+        self.assertEqual([], translation)
+        self.assertEqual(['ERROR: No source switch model loaded for '
+                          'translation'], [str(m) for m in messages])
+
+    def test_save_without_translation_fails(self):
+        cm = self._core_module('C5K125-48P2', 'SummitX460-48p+2sf')
+
+        errors = cm.save_source_model(self.path)
+
+        self.assertEqual(1, len(errors))
+        self.assertFalse(os.path.exists(self.path))
+
+    def _load_fails(self, text):
+        cm = self._core_module('C5K125-48P2', 'SummitX460-48p+2sf')
+
+        ret, error = cm.load_source_model(self.path)
+
+        self.assertFalse(ret)
+        self.assertIn(text, error)
+        self.assertEqual('C5K125-48P2', cm.source.get_model())
+
+    def test_load_missing_file_fails(self):
+        self._load_fails('No such file')
+
+    def test_load_no_model_file_fails(self):
+        with open(self.path, 'w') as f:
+            f.write('set vlan create 10\n')
+        self._load_fails('is not a model file')
+
+    def test_load_other_format_version_fails(self):
+        self._save()
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        with open(self.path, 'wb') as f:
+            f.write(data.replace(b' ' + str(ModelFile.FORMAT_VERSION).encode(),
+                                 b' 0', 1))
+        self._load_fails('uses format version 0')
+
+    def test_load_damaged_model_file_fails(self):
+        self._save()
+        with open(self.path, 'r+b') as f:
+            f.truncate(os.path.getsize(self.path) // 2)
+        self._load_fails('is damaged')
+
+    def test_load_unknown_switch_model_fails(self):
+        with open(self.path, 'wb') as f:
+            f.write(ModelFile.MAGIC + b' ' +
+                    str(ModelFile.FORMAT_VERSION).encode() + b' C5X\n')
+        self._load_fails('Cannot create switch "C5X"')
+
+
+if __name__ == '__main__':
+    unittest.main()
+
+# vim:filetype=python:expandtab:shiftwidth=4:tabstop=4
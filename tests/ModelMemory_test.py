@@ -0,0 +1,128 @@
+# CDDL HEADER START
+#
+# The contents of this file are subject to the terms
+# of the Common Development and Distribution License
+# (the "License").  You may not use this file except
+# in compliance with the License.
+#
+# You can obtain a copy of the license at
+# LICENSE.txt or http://opensource.org/licenses/CDDL-1.0.
+# See the License for the specific language governing
+# permissions and limitations under the License.
+#
+# When distributing Covered Code, include this CDDL
+# HEADER in each file and include the License file at
+# LICENSE.txt  If applicable,
+# add the following below this CDDL HEADER, with the
+# fields enclosed by brackets "[]" replaced with your
+# own identifying information: Portions Copyright [yyyy]
+# [name of copyright owner]
+#
+# CDDL HEADER END
+
+# Copyright 2014-2017 Extreme Networks, Inc.  All rights reserved.
+# Use is subject to license terms.
+# This file is part of e2x (translate EOS switch configuration to ExtremeXOS)
+
+"""Memory benchmark for the switch model classes.
+
+Running this file with the '-v' option prints the memory used per port
+and per VLAN. The tests fail if the memory footprint grows considerably.
+"""
+
+import gc
+import sys
+import tracemalloc
+import unittest
+
+sys.path.extend(['../src'])
+
+import Port
+import VLAN
+
+# the memory used per port or VLAN must stay below this ratio of the memory
+# used by an object keeping the same attribute values in its __dict__
+# (0.6 to 0.92 with __slots__, Python 3.6 to 3.13)
+MAX_RATIO_TO_DICT = 0.95
+
+
+def bytes_per_object(factory, count=1000):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        objects = [factory(i) for i in range(count)]
+        used, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del objects
+    return used / count
+
+
+class DictReference:
+
+    """Keep the attributes of a model object in an instance __dict__."""
+
+
+def dict_reference(factory):
+    """Return a factory of DictReference copies of factory objects.
+
+    The copy holds the same attribute values as the model object, its
+    memory use is the reference of the model object.
+    """
+    def create_reference(number):
+        obj = factory(number)
+        reference = DictReference()
+        for cls in type(obj).__mro__:
+            for attr in getattr(cls, '__slots__', ()):
+                setattr(reference, attr, getattr(obj, attr))
+        return reference
+    return create_reference
+
+
+def create_port(number):
+    data = {'type': 'rj45', 'speedrange': [10, 100, 1000], 'PoE': 'no'}
+    port = Port.Port(str(number), 'ge.1.' + str(number), data)
+    port.set_speed(1000, 'default')
+    port.set_duplex('full', 'default')
+    port.set_auto_neg(True, 'default')
+    port.set_admin_state(True, 'default')
+    port.set_jumbo(False, 'default')
+    port.set_lacp_enabled(False, 'default')
+    port.set_stp_enabled(True, 'default')
+    port.set_stp_auto_edge(True, 'default')
+    port.set_stp_edge(False, 'config')
+    return port
+
+
+def create_vlan(number):
+    vlan = VLAN.VLAN('VLAN_' + str(number), number % 4094 + 1)
+    vlan.add_egress_port('ge.1.1', 'tagged')
+    vlan.add_ingress_port('ge.1.1', 'tagged')
+    return vlan
+
+
+class ModelMemory_test(unittest.TestCase):
+
+    def check_bytes_per_object(self, what, factory):
+        used = bytes_per_object(factory)
+        reference = bytes_per_object(dict_reference(factory))
+        if '-v' in sys.argv:
+            print('\nbytes per {}: {} ({} with __dict__)'.format(
+                what, int(used), int(reference)))
+        self.assertLess(used, MAX_RATIO_TO_DICT * reference)
+
+    def test_bytes_per_port(self):
+        self.check_bytes_per_object('port', create_port)
+
+    def test_bytes_per_vlan(self):
+        self.check_bytes_per_object('VLAN', create_vlan)
+
+    def test_model_objects_have_no_instance_dict(self):
+        self.assertFalse(hasattr(create_port(1), '__dict__'))
+        self.assertFalse(hasattr(create_vlan(1), '__dict__'))
+
+
+if __name__ == '__main__':
+    unittest.main()
+
+# vim:filetype=python:expandtab:shiftwidth=4:tabstop=4
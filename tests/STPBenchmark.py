@@ -0,0 +1,64 @@
+# CDDL HEADER START
+#
+# The contents of this file are subject to the terms
+# of the Common Development and Distribution License
+# (the "License").  You may not use this file except
+# in compliance with the License.
+#
+# You can obtain a copy of the license at
+# LICENSE.txt or http://opensource.org/licenses/CDDL-1.0.
+# See the License for the specific language governing
+# permissions and limitations under the License.
+#
+# When distributing Covered Code, include this CDDL
+# HEADER in each file and include the License file at
+# LICENSE.txt  If applicable,
+# add the following below this CDDL HEADER, with the
+# fields enclosed by brackets "[]" replaced with your
+# own identifying information: Portions Copyright [yyyy]
+# [name of copyright owner]
+#
+# CDDL HEADER END
+
+# Copyright 2014-2017 Extreme Networks, Inc.  All rights reserved.
+# Use is subject to license terms.
+
+# This file is part of e2x (translate EOS switch configuration to ExtremeXOS)
+
+"""Microbenchmark of the VLAN mapping of spanning tree instances.
+
+All VLANs are mapped to a spanning tree instance and every other VLAN is
+removed again, as parsing 'set spantree mstmap 1-4094 sid 1' and
+'clear spantree mstmap' commands does. Run it from the tests directory,
+optionally giving the number of instances:
+
+    python3 STPBenchmark.py [INSTANCES]
+"""
+
+import sys
+sys.path.extend(['../src'])
+import STP
+from WriterBenchmark import best_of
+
+INSTANCES = 100
+ALL_VLANS = range(1, 4095)
+
+
+def map_all_vlans(instances):
+    for _ in range(instances):
+        stp = STP.STP()
+        stp.add_vlans(ALL_VLANS, 'config')
+        stp.del_vlans(ALL_VLANS[::2], 'config')
+
+
+def main(instances=INSTANCES):
+    elapsed = best_of(lambda: map_all_vlans(instances))
+    print('{} instances, {} VLANs each'.format(instances, len(ALL_VLANS)))
+    print('add and delete VLANs:  {:8.2f} ms/instance'.format(
+        elapsed / instances * 1e3))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:2]])
+
+# vim:filetype=python:expandtab:shiftwidth=4:tabstop=4
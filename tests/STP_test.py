@@ -342,6 +342,44 @@ class STP_test(unittest.TestCase):
         self.assertEqual(expectedVlans, vlans)
         self.assertEqual(expectedLen, len(vlans))
 
+    def test_del_vlans_not_present_keeps_reason(self):
+        self.stp.add_vlans([1, 2], 'config')
+
+        self.stp.del_vlans([3, 4], 'test')
+
+        self.assertEqual([1, 2], self.stp.get_vlans())
+        self.assertEqual('config', self.stp.get_vlans_reason())
+
+    def test_get_vlans_sorted(self):
+        self.stp.add_vlans([30, 10, 20], 'test')
+        self.stp.add_vlan(5, 'test')
+
+        self.assertEqual([5, 10, 20, 30], self.stp.get_vlans())
+
+    def test_has_vlan(self):
+        self.stp.add_vlans(range(100, 201), 'test')
+        self.stp.del_vlan(150, 'test')
+
+        self.assertTrue(self.stp.has_vlan(100))
+        self.assertTrue(self.stp.has_vlan(200))
+        self.assertFalse(self.stp.has_vlan(150))
+        self.assertFalse(self.stp.has_vlan(99))
+        self.assertFalse(self.stp.has_vlan(201))
+
+    def test_vlan_bitmap(self):
+        self.stp.add_vlans([1, 3, 4094], 'test')
+
+        bitmap = self.stp.get_vlan_bitmap()
+
+        self.assertEqual(STP.vlan_bitmap([1, 3, 4094]), bitmap)
+        self.assertEqual([1, 3, 4094], STP.vlan_tags(bitmap))
+
+    def test_add_and_del_all_vlans(self):
+        self.stp.add_vlans(range(1, 4095), 'test')
+        self.stp.del_vlans(range(1, 4095, 2), 'test')
+
+        self.assertEqual(list(range(2, 4095, 2)), self.stp.get_vlans())
+
     def _is_default_stp(self, stp):
         default_stp = STP.STP()
 
@@ -376,7 +414,7 @@ class STP_test(unittest.TestCase):
     def test_transfer_config_from_stp_which_is_configured(self):
         fromStp = STP.STP()
         self._set_stp_attributes_with_reason(fromStp, 'config')
-        attrLst = self.stp.__dict__.keys()
+        attrLst = self.stp.__slots__
 
         self.stp.transfer_config(fromStp)
 
@@ -388,7 +426,7 @@ class STP_test(unittest.TestCase):
     def test_transfer_config_from_stp_which_is_default(self):
         fromStp = STP.STP()
         self._set_stp_attributes_with_reason(fromStp, 'default')
-        attrLst = self.stp.__dict__.keys()
+        attrLst = self.stp.__slots__
 
         self.stp.transfer_config(fromStp)
 
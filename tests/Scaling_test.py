@@ -0,0 +1,227 @@
+# CDDL HEADER START
+#
+# The contents of this file are subject to the terms
+# of the Common Development and Distribution License
+# (the "License").  You may not use this file except
+# in compliance with the License.
+#
+# You can obtain a copy of the license at
+# LICENSE.txt or http://opensource.org/licenses/CDDL-1.0.
+# See the License for the specific language governing
+# permissions and limitations under the License.
+#
+# When distributing Covered Code, include this CDDL
+# HEADER in each file and include the License file at
+# LICENSE.txt  If applicable,
+# add the following below this CDDL HEADER, with the
+# fields enclosed by brackets "[]" replaced with your
+# own identifying information: Portions Copyright [yyyy]
+# [name of copyright owner]
+#
+# CDDL HEADER END
+
+# Copyright 2014-2017 Extreme Networks, Inc.  All rights reserved.
+# Use is subject to license terms.
+
+# This file is part of e2x (translate EOS switch configuration to ExtremeXOS)
+
+"""Scaling tests of the translation pipeline.
+
+Synthetic configurations with a growing number of ports, VLANs, ACL
+entries, LAG members, and MST instances are translated phase by phase.
+The work, counted as function calls, and the peak memory of every phase
+must grow near-linearly with the size of the configuration, a failing
+test names the phase. Counting calls instead of measuring the runtime
+keeps the tests independent of the speed and load of the computer.
+"""
+
+import sys
+import tracemalloc
+sys.path.extend(['../src'])
+import unittest
+import CM
+
+# the large configuration is SIZE_FACTOR times the small one
+SIZE_FACTOR = 4
+# allowed growth of calls and peak memory from the small to the large
+# configuration, linear growth is SIZE_FACTOR, quadratic SIZE_FACTOR ** 2
+MAX_GROWTH = 2 * SIZE_FACTOR
+# smaller measurements are dominated by constant overhead
+CALLS_FLOOR = 10000
+MEMORY_FLOOR = 64 * 1024
+
+SOURCE = 'C5K125-48'
+TARGET = 'SummitX460-48t'
+
+
+class Pipeline:
+
+    """Translate a configuration phase by phase like CM.translate()."""
+
+    PHASES = ('normalize', 'parse', 'map', 'transfer', 'write')
+
+    def __init__(self, source, target, config):
+        self.cm = CM.CoreModule()
+        self.config = config
+        if not (self.cm.set_source_switch(source)[0] and
+                self.cm.set_target_switch(target)[0]):
+            raise ValueError('Cannot create switches for translation')
+
+    def normalize(self):
+        self.cm._init_switch(self.cm.source)
+        config, _ = self.cm.source.normalize_config(self.config)
+        self.config, _ = self.cm.source.expand_macros(config)
+
+    def parse(self):
+        for line in self.config:
+            self.cm.source.configure(line)
+
+    def map(self):
+        self.cm._init_switch(self.cm.target)
+        if not (self.cm._create_port_mapping()[0] and
+                self.cm._create_lag_mapping()[0]):
+            raise ValueError('Cannot map ports for translation')
+
+    def transfer(self):
+        self.cm.transfer_config()
+
+    def write(self):
+        self.cm.target.create_config(False)
+
+
+class CallCounter:
+
+    """Count Python and built-in function calls while active."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def _profile(self, frame, event, arg):
+        if event == 'call' or event == 'c_call':
+            self.calls += 1
+
+    def __enter__(self):
+        sys.setprofile(self._profile)
+        return self
+
+    def __exit__(self, *exc):
+        sys.setprofile(None)
+
+
+def measure(source, target, config):
+    """Return the number of calls and peak memory of every phase."""
+    calls = {}
+    pipeline = Pipeline(source, target, config)
+    for phase in Pipeline.PHASES:
+        with CallCounter() as counter:
+            getattr(pipeline, phase)()
+        calls[phase] = counter.calls
+    memory = {}
+    pipeline = Pipeline(source, target, config)
+    for phase in Pipeline.PHASES:
+        tracemalloc.start()
+        try:
+            getattr(pipeline, phase)()
+            memory[phase] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return calls, memory
+
+
+def stack(model, units):
+    return ','.join([model] * units)
+
+
+def port_config(units):
+    config = []
+    for unit in range(1, units + 1):
+        for port in range(1, 49):
+            name = 'ge.{}.{}'.format(unit, port)
+            config += ['set port alias {} port_{}_{}'.format(name, unit, port),
+                       'set port jumbo enable ' + name,
+                       'set port disable ' + name]
+    return config
+
+
+def vlan_config(vlans):
+    config = []
+    for tag in range(2, vlans + 2):
+        config += ['set vlan create {}'.format(tag),
+                   'set vlan name {0} VLAN_{0}'.format(tag),
+                   'set vlan egress {} ge.1.{} tagged'.format(tag,
+                                                              tag % 48 + 1)]
+    return config
+
+
+def acl_config(entries):
+    config = ['router', 'enable', 'configure']
+    for i in range(entries):
+        config.append('access-list 100 permit ip host 10.{}.{}.{} any'.format(
+            i >> 16, i >> 8 & 255, i & 255))
+    return config + ['exit', 'exit', 'exit']
+
+
+def lag_config(units):
+    config = []
+    for unit in range(1, units + 1):
+        for port in range(1, 49):
+            config.append('set port lacp port ge.{}.{} aadminkey {} '
+                          'enable'.format(unit, port, port % 6 + 1))
+    for lag in range(1, 7):
+        config.append('set lacp aadminkey lag.0.{0} {0}'.format(lag))
+    return config
+
+
+def mst_config(instances):
+    config = ['set spantree version mstp']
+    for sid in range(1, instances + 1):
+        config += ['set vlan create {}'.format(sid + 1),
+                   'set spantree msti sid {} create'.format(sid),
+                   'set spantree mstmap {} sid {}'.format(sid + 1, sid)]
+    return config
+
+
+class Scaling_test(unittest.TestCase):
+
+    def check_scaling(self, what, size, create_config, stacked=False):
+        """Compare the translation of size and SIZE_FACTOR * size what."""
+        results = []
+        for n in size, size * SIZE_FACTOR:
+            units = n if stacked else 1
+            results.append(measure(stack(SOURCE, units),
+                                   stack(TARGET, units), create_config(n)))
+        (small_calls, small_mem), (large_calls, large_mem) = results
+        for phase in Pipeline.PHASES:
+            for kind, small, large, floor in (
+                    ('calls', small_calls, large_calls, CALLS_FLOOR),
+                    ('peak memory', small_mem, large_mem, MEMORY_FLOOR)):
+                growth = max(large[phase], floor) / max(small[phase], floor)
+                with self.subTest(phase=phase, measure=kind):
+                    self.assertLessEqual(
+                        growth, MAX_GROWTH,
+                        '{} of phase "{}" grew {:.1f} times from {} to {} {}'
+                        ' ({:.4g} to {:.4g})'.format(
+                            kind, phase, growth, size, size * SIZE_FACTOR,
+                            what, small[phase], large[phase]))
+
+    def test_ports(self):
+        self.check_scaling('stack units', 2, port_config, stacked=True)
+
+    def test_vlans(self):
+        self.check_scaling('VLANs', 500, vlan_config)
+
+    def test_acl_entries(self):
+        self.check_scaling('ACL entries', 1000, acl_config)
+
+    def test_lag_members(self):
+        self.check_scaling('stack units with LAG members', 2, lag_config,
+                           stacked=True)
+
+    def test_mst_instances(self):
+        self.check_scaling('MST instances', 64, mst_config)
+
+
+if __name__ == '__main__':
+    unittest.main()
+
+# vim:filetype=python:expandtab:shiftwidth=4:tabstop=4
@@ -0,0 +1,716 @@
+# CDDL HEADER START
+#
+# The contents of this file are subject to the terms
+# of the Common Development and Distribution License
+# (the "License").  You may not use this file except
+# in compliance with the License.
+#
+# You can obtain a copy of the license at
+# LICENSE.txt or http://opensource.org/licenses/CDDL-1.0.
+# See the License for the specific language governing
+# permissions and limitations under the License.
+#
+# When distributing Covered Code, include this CDDL
+# HEADER in each file and include the License file at
+# LICENSE.txt  If applicable,
+# add the following below this CDDL HEADER, with the
+# fields enclosed by brackets "[]" replaced with your
+# own identifying information: Portions Copyright [yyyy]
+# [name of copyright owner]
+#
+# CDDL HEADER END
+
+# Copyright 2014-2017 Extreme Networks, Inc.  All rights reserved.
+# Use is subject to license terms.
+
+# This file is part of e2x (translate EOS switch configuration to ExtremeXOS)
+
+
+import copy
+import random
+import sys
+import unittest
+
+sys.path.extend(['../src'])
+
+import Port
+import Schema
+import STP
+import Switch
+from Utils import conf_value
+
+
+# The hand-written transfer_config() code replaced by the schema driven
+# transfer, kept as reference implementation.
+
+def legacy_port_transfer(self, from_port):
+
+    """Transfer configuration of from_port to this port."""
+
+    reason_def = 'transfer_def'
+    reason_conf = 'transfer_conf'
+
+    t_speed = from_port.get_speed()
+    if t_speed is not None and self._speed[0] != t_speed:
+        if from_port.get_speed_reason() == 'default':
+            self._speed = conf_value(t_speed, reason_def)
+        else:
+            self._speed = conf_value(t_speed, reason_conf)
+
+    t_duplex = from_port.get_duplex()
+    if t_duplex is not None and self._duplex[0] != t_duplex:
+        if from_port.get_duplex_reason() == 'default':
+            self._duplex = conf_value(t_duplex, reason_def)
+        else:
+            self._duplex = conf_value(t_duplex, reason_conf)
+
+    t_auto_neg = from_port.get_auto_neg()
+    if t_auto_neg is not None and self._auto_neg[0] != t_auto_neg:
+        if from_port.get_auto_neg_reason() == 'default':
+            self._auto_neg = conf_value(t_auto_neg, reason_def)
+        else:
+            self._auto_neg = conf_value(t_auto_neg, reason_conf)
+
+    t_admin_state = from_port.get_admin_state()
+    if self._admin_state[0] != t_admin_state:
+        if from_port.get_admin_state_reason() == 'default':
+            self._admin_state = conf_value(t_admin_state, reason_def)
+        else:
+            self._admin_state = conf_value(t_admin_state, reason_conf)
+
+    t_description = from_port.get_description()
+    if self._description[0] != t_description:
+        if from_port.get_description_reason() == 'default':
+            self._description = conf_value(t_description, reason_def)
+        else:
+            self._description = conf_value(t_description, reason_conf)
+
+    t_short_description = from_port.get_short_description()
+    if self._short_description[0] != t_short_description:
+        if from_port.get_short_description_reason() == 'default':
+            self._short_description = conf_value(t_short_description,
+                                                 reason_def)
+        else:
+            self._short_description = conf_value(t_short_description,
+                                                 reason_conf)
+
+    t_jumbo = from_port.get_jumbo()
+    if t_jumbo is not None and self._jumbo[0] != t_jumbo:
+        if from_port.get_jumbo_reason() == 'default':
+            self._jumbo = conf_value(t_jumbo, reason_def)
+        else:
+            self._jumbo = conf_value(t_jumbo, reason_conf)
+
+    t_lacp_enabled = from_port.get_lacp_enabled()
+    if self._lacp_enabled[0] != t_lacp_enabled:
+        t_reason = (reason_def
+                    if from_port.get_lacp_enabled_reason() == 'default'
+                    else reason_conf)
+        self._lacp_enabled = conf_value(t_lacp_enabled, t_reason)
+
+    t_lacp_aadminkey = from_port.get_lacp_aadminkey()
+    if self._lacp_aadminkey[0] != t_lacp_aadminkey:
+        t_reason = (reason_def
+                    if from_port.get_lacp_aadminkey_reason() == 'default'
+                    else reason_conf)
+        self._lacp_aadminkey = conf_value(t_lacp_aadminkey, t_reason)
+
+    t_stp_enabled = from_port.get_stp_enabled()
+    if self._stp_enabled[0] != t_stp_enabled:
+        t_reason = (reason_def
+                    if from_port.get_stp_enabled_reason() == 'default'
+                    else reason_conf)
+        self._stp_enabled = conf_value(t_stp_enabled, t_reason)
+
+    t_stp_auto_edge = from_port.get_stp_auto_edge()
+    if self._stp_auto_edge[0] != t_stp_auto_edge:
+        t_reason = (reason_def
+                    if from_port.get_stp_auto_edge_reason() == 'default'
+                    else reason_conf)
+        self._stp_auto_edge = conf_value(t_stp_auto_edge, t_reason)
+
+    t_stp_edge = from_port.get_stp_edge()
+    if self._stp_edge[0] != t_stp_edge:
+        t_reason = (reason_def
+                    if from_port.get_stp_edge_reason() == 'default'
+                    else reason_conf)
+        self._stp_edge = conf_value(t_stp_edge, t_reason)
+
+    t_stp_bpdu_guard = from_port.get_stp_bpdu_guard()
+    if self._stp_bpdu_guard[0] != t_stp_bpdu_guard:
+        t_reason = (reason_def
+                    if from_port.get_stp_bpdu_guard_reason() == 'default'
+                    else reason_conf)
+        self._stp_bpdu_guard = conf_value(t_stp_bpdu_guard, t_reason)
+
+    t_stp_bpdu_guard_recovery_time = \
+        from_port.get_stp_bpdu_guard_recovery_time()
+    if (self._stp_bpdu_guard_recovery_time[0] !=
+            t_stp_bpdu_guard_recovery_time):
+        t_reason = \
+            (reason_def
+             if (from_port.get_stp_bpdu_guard_recovery_time_reason() ==
+                 'default')
+             else reason_conf)
+        self._stp_bpdu_guard_recovery_time = conf_value(
+            t_stp_bpdu_guard_recovery_time, t_reason)
+
+    t_ipv4_acl_in = from_port.get_ipv4_acl_in()
+    if t_ipv4_acl_in is not None and self._ipv4_acl_in[0] != t_ipv4_acl_in:
+        if from_port.get_ipv4_acl_in_reason() == 'default':
+            self._ipv4_acl_in = conf_value(t_ipv4_acl_in, reason_def)
+        else:
+            self._ipv4_acl_in = conf_value(t_ipv4_acl_in, reason_conf)
+
+
+def legacy_stp_transfer(self, from_stp):
+
+    def trans_reason(r):
+        return 'transfer_conf' if r == 'config' else 'transfer_def'
+
+    from_name = from_stp.get_name()
+    if from_name is not None and from_name != self._name[0]:
+        from_reason = from_stp.get_name_reason()
+        self._name = conf_value(from_name, trans_reason(from_reason))
+
+    from_enabled = from_stp.is_enabled()
+    if from_enabled != self.is_enabled():
+        from_reason = from_stp.get_enabled_reason()
+        self._enabled = conf_value(from_enabled, trans_reason(from_reason))
+
+    from_version = from_stp.get_version()
+    if from_version is not None and from_version != self._version[0]:
+        from_reason = from_stp.get_version_reason()
+        self._version = conf_value(from_version, trans_reason(from_reason))
+
+    from_priority = from_stp.get_priority()
+    if from_priority is not None and from_priority != self._priority[0]:
+        from_reason = from_stp.get_priority_reason()
+        self._priority = conf_value(from_priority,
+                                    trans_reason(from_reason))
+
+    from_mst_cfgname = from_stp.get_mst_cfgname()
+    if (from_mst_cfgname is not None and
+            from_mst_cfgname != self._mst_cfgname[0]):
+        from_reason = from_stp.get_mst_cfgname_reason()
+        self._mst_cfgname = conf_value(from_mst_cfgname,
+                                       trans_reason(from_reason))
+
+    from_mst_rev = from_stp.get_mst_rev()
+    if from_mst_rev is not None and from_mst_rev != self._mst_rev[0]:
+        from_reason = from_stp.get_mst_rev_reason()
+        self._mst_rev = conf_value(from_mst_rev, trans_reason(from_reason))
+
+    from_mst_instance = from_stp.get_mst_instance()
+    if (from_mst_instance is not None and
+            self._mst_instance[0] != from_mst_instance):
+        from_reason = from_stp.get_mst_instance_reason()
+        self._mst_instance = conf_value(from_mst_instance,
+                                        trans_reason(from_reason))
+
+    from_vlans = from_stp.get_vlan_bitmap()
+    if from_vlans and from_vlans != self._vlans[0]:
+        from_reason = from_stp.get_vlans_reason()
+        self._vlans = (from_vlans, trans_reason(from_reason))
+
+
+def legacy_switch_transfer(self, from_switch):
+    reason_def = 'transfer_def'
+    reason_conf = 'transfer_conf'
+
+    t_lacp_support = from_switch.get_lacp_support()
+    if self._lacp_support[0] != t_lacp_support:
+        if from_switch.get_lacp_support_reason() == 'default':
+            self._lacp_support = (t_lacp_support, reason_def)
+        else:
+            self._lacp_support = (t_lacp_support, reason_conf)
+
+    t_max_lag = from_switch.get_max_lag()
+    if self._max_lag[0] != t_max_lag:
+        if from_switch.get_max_lag_reason() == 'default':
+            self._max_lag = (t_max_lag, reason_def)
+        else:
+            self._max_lag = (t_max_lag, reason_conf)
+
+    t_single_port_lag = from_switch.get_single_port_lag()
+    if self._single_port_lag[0] != t_single_port_lag:
+        if from_switch.get_single_port_lag_reason() == 'default':
+            self._single_port_lag = (t_single_port_lag, reason_def)
+        else:
+            self._single_port_lag = (t_single_port_lag, reason_conf)
+
+    t_prompt = from_switch.get_prompt()
+    if t_prompt is not None and self._prompt[0] != t_prompt:
+        if from_switch.get_prompt_reason() == 'default':
+            self._prompt = (t_prompt, reason_def)
+        else:
+            self._prompt = (t_prompt, reason_conf)
+
+    t_snmp_sys_name = from_switch.get_snmp_sys_name()
+    if (t_snmp_sys_name is not None and
+       self._snmp_sys_name[0] != t_snmp_sys_name):
+        if from_switch.get_snmp_sys_name_reason() == 'default':
+            self._snmp_sys_name = (t_snmp_sys_name, reason_def)
+        else:
+            self._snmp_sys_name = (t_snmp_sys_name, reason_conf)
+
+    t_snmp_sys_contact = from_switch.get_snmp_sys_contact()
+    if (t_snmp_sys_contact is not None and
+       self._snmp_sys_contact[0] != t_snmp_sys_contact):
+        if from_switch.get_snmp_sys_contact_reason() == 'default':
+            self._snmp_sys_contact = (t_snmp_sys_contact, reason_def)
+        else:
+            self._snmp_sys_contact = (t_snmp_sys_contact, reason_conf)
+
+    t_snmp_sys_location = from_switch.get_snmp_sys_location()
+    if (t_snmp_sys_location is not None and
+       self._snmp_sys_location[0] != t_snmp_sys_location):
+        if from_switch.get_snmp_sys_location_reason() == 'default':
+            self._snmp_sys_location = (t_snmp_sys_location, reason_def)
+        else:
+            self._snmp_sys_location = (t_snmp_sys_location, reason_conf)
+
+    t_banner_login_ack = from_switch.get_banner_login_ack()
+    if (t_banner_login_ack is not None and
+       self._banner_login_ack[0] != t_banner_login_ack):
+        if from_switch.get_banner_login_ack_reason() == 'default':
+            self._banner_login_ack = (t_banner_login_ack, reason_def)
+        else:
+            self._banner_login_ack = (t_banner_login_ack, reason_conf)
+
+    t_banner_login = from_switch.get_banner_login()
+    if (t_banner_login is not None and
+       self._banner_login[0] != t_banner_login):
+        if from_switch.get_banner_login_reason() == 'default':
+            self._banner_login = (t_banner_login, reason_def)
+        else:
+            self._banner_login = (t_banner_login, reason_conf)
+
+    t_banner_motd = from_switch.get_banner_motd()
+    if (t_banner_motd is not None and
+       self._banner_motd[0] != t_banner_motd):
+        if from_switch.get_banner_motd_reason() == 'default':
+            self._banner_motd = (t_banner_motd, reason_def)
+        else:
+            self._banner_motd = (t_banner_motd, reason_conf)
+
+    t_telnet_inbound = from_switch.get_telnet_inbound()
+    if (t_telnet_inbound is not None and
+       self._telnet_inbound[0] != t_telnet_inbound):
+        if from_switch.get_telnet_inbound_reason() == 'default':
+            self._telnet_inbound = (t_telnet_inbound, reason_def)
+        else:
+            self._telnet_inbound = (t_telnet_inbound, reason_conf)
+
+    t_telnet_outbound = from_switch.get_telnet_outbound()
+    if (t_telnet_outbound is not None and
+       self._telnet_outbound[0] != t_telnet_outbound):
+        if from_switch.get_telnet_outbound_reason() == 'default':
+            self._telnet_outbound = (t_telnet_outbound, reason_def)
+        else:
+            self._telnet_outbound = (t_telnet_outbound, reason_conf)
+
+    t_ssh_inbound = from_switch.get_ssh_inbound()
+    if (t_ssh_inbound is not None and
+       self._ssh_inbound[0] != t_ssh_inbound):
+        if from_switch.get_ssh_inbound_reason() == 'default':
+            self._ssh_inbound = (t_ssh_inbound, reason_def)
+        else:
+            self._ssh_inbound = (t_ssh_inbound, reason_conf)
+
+    t_ssh_outbound = from_switch.get_ssh_outbound()
+    if (t_ssh_outbound is not None and
+       self._ssh_outbound[0] != t_ssh_outbound):
+        if from_switch.get_ssh_outbound_reason() == 'default':
+            self._ssh_outbound = (t_ssh_outbound, reason_def)
+        else:
+            self._ssh_outbound = (t_ssh_outbound, reason_conf)
+
+    t_ssl = from_switch.get_ssl()
+    if (t_ssl is not None and
+       self._ssl[0] != t_ssl):
+        if from_switch.get_ssl_reason() == 'default':
+            self._ssl = (t_ssl, reason_def)
+        else:
+            self._ssl = (t_ssl, reason_conf)
+
+    t_http = from_switch.get_http()
+    if (t_http is not None and
+       self._http[0] != t_http):
+        if from_switch.get_http_reason() == 'default':
+            self._http = (t_http, reason_def)
+        else:
+            self._http = (t_http, reason_conf)
+
+    t_http_secure = from_switch.get_http_secure()
+    if (t_http_secure is not None and
+       self._http_secure[0] != t_http_secure):
+        if from_switch.get_http_secure_reason() == 'default':
+            self._http_secure = (t_http_secure, reason_def)
+        else:
+            self._http_secure = (t_http_secure, reason_conf)
+
+    t_mgmt_ip = from_switch.get_mgmt_ip()
+    if (t_mgmt_ip is not None and
+       self._mgmt_ip[0] != t_mgmt_ip):
+        if from_switch.get_mgmt_ip_reason() == 'default':
+            self._mgmt_ip = (t_mgmt_ip, reason_def)
+        else:
+            self._mgmt_ip = (t_mgmt_ip, reason_conf)
+
+    t_mgmt_mask = from_switch.get_mgmt_mask()
+    if (t_mgmt_mask is not None and
+       self._mgmt_mask[0] != t_mgmt_mask):
+        if from_switch.get_mgmt_mask_reason() == 'default':
+            self._mgmt_mask = (t_mgmt_mask, reason_def)
+        else:
+            self._mgmt_mask = (t_mgmt_mask, reason_conf)
+
+    t_mgmt_vlan = from_switch.get_mgmt_vlan()
+    if (t_mgmt_vlan is not None and
+       self._mgmt_vlan[0] != t_mgmt_vlan):
+        if from_switch.get_mgmt_vlan_reason() == 'default':
+            self._mgmt_vlan = (t_mgmt_vlan, reason_def)
+        else:
+            self._mgmt_vlan = (t_mgmt_vlan, reason_conf)
+
+    t_mgmt_gw = from_switch.get_mgmt_gw()
+    if (t_mgmt_gw is not None and
+       self._mgmt_gw[0] != t_mgmt_gw):
+        if from_switch.get_mgmt_gw_reason() == 'default':
+            self._mgmt_gw = (t_mgmt_gw, reason_def)
+        else:
+            self._mgmt_gw = (t_mgmt_gw, reason_conf)
+
+    t_mgmt_protocol = from_switch.get_mgmt_protocol()
+    if (t_mgmt_protocol is not None and
+       self._mgmt_protocol[0] != t_mgmt_protocol):
+        if from_switch.get_mgmt_protocol_reason() == 'default':
+            self._mgmt_protocol = (t_mgmt_protocol, reason_def)
+        else:
+            self._mgmt_protocol = (t_mgmt_protocol, reason_conf)
+
+    t_idle_timer = from_switch.get_idle_timer()
+    if (t_idle_timer is not None and
+       self._idle_timer[0] != t_idle_timer):
+        if from_switch.get_idle_timer_reason() == 'default':
+            self._idle_timer = (t_idle_timer, reason_def)
+        else:
+            self._idle_timer = (t_idle_timer, reason_conf)
+
+    t_sntp_client = from_switch.get_sntp_client()
+    if (t_sntp_client is not None and
+       self._sntp_client[0] != t_sntp_client):
+        if from_switch.get_sntp_client_reason() == 'default':
+            self._sntp_client = (t_sntp_client, reason_def)
+        else:
+            self._sntp_client = (t_sntp_client, reason_conf)
+
+    t_ipv4_routing = from_switch.get_ipv4_routing()
+    if (t_ipv4_routing is not None and
+       self._ipv4_routing[0] != t_ipv4_routing):
+        if from_switch.get_ipv4_routing_reason() == 'default':
+            self._ipv4_routing = (t_ipv4_routing, reason_def)
+        else:
+            self._ipv4_routing = (t_ipv4_routing, reason_conf)
+
+    t_tz_name = from_switch.get_tz_name()
+    if (t_tz_name is not None and
+       self._tz_name[0] != t_tz_name):
+        if from_switch.get_tz_name_reason() == 'default':
+            self._tz_name = (t_tz_name, reason_def)
+        else:
+            self._tz_name = (t_tz_name, reason_conf)
+
+    t_tz_off_min = from_switch.get_tz_off_min()
+    if (t_tz_off_min is not None and
+       self._tz_off_min[0] != t_tz_off_min):
+        if from_switch.get_tz_off_min_reason() == 'default':
+            self._tz_off_min = (t_tz_off_min, reason_def)
+        else:
+            self._tz_off_min = (t_tz_off_min, reason_conf)
+
+    t_tz_dst_state = from_switch.get_tz_dst_state()
+    if (t_tz_dst_state is not None and
+       self._tz_dst_state[0] != t_tz_dst_state):
+        if from_switch.get_tz_dst_state_reason() == 'default':
+            self._tz_dst_state = (t_tz_dst_state, reason_def)
+        else:
+            self._tz_dst_state = (t_tz_dst_state, reason_conf)
+
+    t_tz_dst_name = from_switch.get_tz_dst_name()
+    if (t_tz_dst_name is not None and
+       self._tz_dst_name[0] != t_tz_dst_name):
+        if from_switch.get_tz_dst_name_reason() == 'default':
+            self._tz_dst_name = (t_tz_dst_name, reason_def)
+        else:
+            self._tz_dst_name = (t_tz_dst_name, reason_conf)
+
+    t_tz_dst_start = from_switch.get_tz_dst_start()
+    if (t_tz_dst_start is not None and
+       self._tz_dst_start[0] != t_tz_dst_start):
+        if from_switch.get_tz_dst_start_reason() == 'default':
+            self._tz_dst_start = (t_tz_dst_start, reason_def)
+        else:
+            self._tz_dst_start = (t_tz_dst_start, reason_conf)
+
+    t_tz_dst_end = from_switch.get_tz_dst_end()
+    if (t_tz_dst_end is not None and
+       self._tz_dst_end[0] != t_tz_dst_end):
+        if from_switch.get_tz_dst_end_reason() == 'default':
+            self._tz_dst_end = (t_tz_dst_end, reason_def)
+        else:
+            self._tz_dst_end = (t_tz_dst_end, reason_conf)
+
+    t_tz_dst_off_min = from_switch.get_tz_dst_off_min()
+    if (t_tz_dst_off_min is not None and
+       self._tz_dst_off_min[0] != t_tz_dst_off_min):
+        if from_switch.get_tz_dst_off_min_reason() == 'default':
+            self._tz_dst_off_min = (t_tz_dst_off_min, reason_def)
+        else:
+            self._tz_dst_off_min = (t_tz_dst_off_min, reason_conf)
+
+    t_radius_mgmt_acc_enabled = from_switch.get_radius_mgmt_acc_enabled()
+    if (t_radius_mgmt_acc_enabled is not None and
+       self._radius_mgmt_acc_enabled[0] != t_radius_mgmt_acc_enabled):
+        if from_switch.get_radius_mgmt_acc_enabled_reason() == 'default':
+            self._radius_mgmt_acc_enabled = (t_radius_mgmt_acc_enabled,
+                                             reason_def)
+        else:
+            self._radius_mgmt_acc_enabled = (t_radius_mgmt_acc_enabled,
+                                             reason_conf)
+
+    t_tacacs_enabled = from_switch.get_tacacs_enabled()
+    if (t_tacacs_enabled is not None and
+       self._tacacs_enabled[0] != t_tacacs_enabled):
+        if from_switch.get_tacacs_enabled_reason() == 'default':
+            self._tacacs_enabled = (t_tacacs_enabled, reason_def)
+        else:
+            self._tacacs_enabled = (t_tacacs_enabled, reason_conf)
+
+    t_radius_interface = from_switch.get_radius_interface()
+    if (t_radius_interface is not None and
+       self._radius_interface[0] != t_radius_interface):
+        if from_switch.get_radius_interface_reason() == 'default':
+            self._radius_interface = (t_radius_interface, reason_def)
+        else:
+            self._radius_interface = (t_radius_interface, reason_conf)
+
+    t_tacacs_interface = from_switch.get_tacacs_interface()
+    if (t_tacacs_interface is not None and
+       self._tacacs_interface[0] != t_tacacs_interface):
+        if from_switch.get_tacacs_interface_reason() == 'default':
+            self._tacacs_interface = (t_tacacs_interface, reason_def)
+        else:
+            self._tacacs_interface = (t_tacacs_interface, reason_conf)
+
+
+PORT_DATA = {'type': 'rj45', 'speedrange': [10, 100, 1000], 'PoE': 'no'}
+VALUES = [None, True, False, 0, 1, 100, 'a', 'b']
+REASONS = [None, 'default', 'config', 'init', 'transfer_conf', 'written']
+
+
+class Schema_test(unittest.TestCase):
+
+    def setUp(self):
+        self.rnd = random.Random(42)
+
+    def random_state(self, slots, values=VALUES):
+        return {slot: (self.rnd.choice(values), self.rnd.choice(REASONS))
+                for slot in slots}
+
+    def state(self, obj, slots):
+        return {slot: getattr(obj, slot) for slot in slots}
+
+    def create(self, factory, state):
+        obj = factory()
+        for slot, value in state.items():
+            setattr(obj, slot, (copy.copy(value[0]), value[1]))
+        return obj
+
+    def check_equivalence(self, factory, slots, legacy, random_state,
+                          rounds):
+        for _ in range(rounds):
+            source = self.create(factory, random_state())
+            target_state = random_state()
+            expected = self.create(factory, target_state)
+            target = self.create(factory, target_state)
+
+            legacy(expected, source)
+            target.transfer_config(source)
+
+            self.assertEqual(self.state(expected, slots),
+                             self.state(target, slots))
+
+    def test_attribute_defaults(self):
+        self.assertEqual(('speed', True, None), Schema.Attribute('speed'))
+
+    def test_transfer_returns_transferred_attributes(self):
+        source = Port.Port('1', '1', PORT_DATA)
+        target = Port.Port('2', '2', PORT_DATA)
+        source.set_speed(100, 'config')
+        source.set_admin_state(True, 'default')
+        target.set_admin_state(True, 'config')
+
+        result = Port.Port.SCHEMA.transfer(target, source)
+
+        self.assertEqual(['speed'], result)
+        self.assertEqual((100, 'transfer_conf'), target._speed)
+        self.assertEqual((True, 'config'), target._admin_state)
+
+    def test_transfer_skips_none(self):
+        schema = Schema.Schema([Schema.Attribute('speed'),
+                                Schema.Attribute('duplex', skip_none=False)])
+        source = Port.Port('1', '1', PORT_DATA)
+        target = Port.Port('2', '2', PORT_DATA)
+        target.set_speed(100, 'config')
+        target.set_duplex('full', 'config')
+
+        result = schema.transfer(target, source)
+
+        self.assertEqual(['duplex'], result)
+        self.assertEqual((100, 'config'), target._speed)
+        self.assertEqual((None, 'transfer_conf'), target._duplex)
+
+    def test_transfer_from_other_class_uses_getters(self):
+        class PortProxy:
+            def __init__(self, port):
+                self._port = port
+
+            def __getattr__(self, name):
+                if not name.startswith('get_'):
+                    raise AttributeError(name)
+                return getattr(self._port, name)
+
+        names = Port.Port.SCHEMA.names()
+        names.remove('ipv4_acl_in')
+        slots = Port.Port.__slots__
+        for _ in range(500):
+            source = self.create(lambda: Port.Port('1', '1', PORT_DATA),
+                                 self.random_state(['_' + n for n in names]))
+            target_state = self.random_state(['_' + n for n in names])
+            expected = self.create(lambda: Port.Port('2', '2', PORT_DATA),
+                                   target_state)
+            target = self.create(lambda: Port.Port('2', '2', PORT_DATA),
+                                 target_state)
+
+            result = Port.Port.SCHEMA.transfer(expected, source)
+
+            self.assertEqual(result, Port.Port.SCHEMA.transfer(
+                target, PortProxy(source)))
+            self.assertEqual(self.state(expected, slots),
+                             self.state(target, slots))
+
+    def test_switch_schema_covers_configurable_attributes(self):
+        sw = Switch.Switch()
+        configurable = {attr[1:] for attr, value in vars(sw).items()
+                        if value == (None, None)}
+
+        self.assertEqual(configurable, set(Switch.Switch.SCHEMA.names()))
+
+    def test_port_transfer_equals_legacy_transfer(self):
+        names = Port.Port.SCHEMA.names()
+        names.remove('ipv4_acl_in')
+
+        def random_state():
+            state = self.random_state(['_' + n for n in names])
+            state.update(self.random_state(['_ipv4_acl_in'],
+                                           [None, [], [1], [1, 2]]))
+            return state
+
+        self.check_equivalence(lambda: Port.Port('1', '1', PORT_DATA),
+                               Port.Port.__slots__, legacy_port_transfer,
+                               random_state, 2000)
+
+    def test_stp_transfer_equals_legacy_transfer(self):
+        def random_state():
+            state = self.random_state(['_' + n
+                                       for n in STP.STP.SCHEMA.names()])
+            state.update(self.random_state(['_enabled'], [None, True, False]))
+            state.update(self.random_state(['_vlans'], [0, 2, 6]))
+            return state
+
+        self.check_equivalence(STP.STP, STP.STP.__slots__,
+                               legacy_stp_transfer, random_state, 2000)
+
+    def test_switch_transfer_equals_legacy_transfer(self):
+        slots = ['_' + n for n in Switch.Switch.SCHEMA.names()]
+
+        self.check_equivalence(Switch.Switch, slots, legacy_switch_transfer,
+                               lambda: self.random_state(slots), 200)
+
+
+
+class Tracked_test(unittest.TestCase):
+
+    def setUp(self):
+        self.port = Port.Port('1', '1', PORT_DATA)
+
+    def test_new_port_is_clean(self):
+        self.assertFalse(self.port.is_dirty())
+        self.assertEqual(set(), self.port.get_dirty())
+
+    def test_transfer_reason_marks_attribute_dirty(self):
+        self.port.set_speed(100, 'transfer_conf')
+        self.port.set_stp_edge(True, 'transfer_def')
+        self.port.set_jumbo(True, 'config')
+
+        self.assertTrue(self.port.is_dirty())
+        self.assertTrue(self.port.is_dirty('port'))
+        self.assertTrue(self.port.is_dirty('stp'))
+        self.assertFalse(self.port.is_dirty('lag'))
+        self.assertEqual({'speed'}, self.port.get_dirty('port'))
+        self.assertEqual({'speed', 'stp_edge'}, self.port.get_dirty())
+
+    def test_written_attribute_is_clean(self):
+        self.port.set_speed(100, 'transfer_conf')
+
+        self.port.set_speed(100, 'written')
+
+        self.assertFalse(self.port.is_dirty())
+
+    def test_transfer_config_marks_transferred_attributes_dirty(self):
+        source = Port.Port('2', '2', PORT_DATA)
+        source.set_description('uplink', 'config')
+        source.set_lacp_enabled(True, 'default')
+
+        self.port.transfer_config(source)
+
+        self.assertEqual({'description'}, self.port.get_dirty('port'))
+        self.assertEqual({'lacp_enabled'}, self.port.get_dirty('lag'))
+
+    def test_init_conf_values_cleans_port(self):
+        self.port.set_speed(100, 'transfer_conf')
+
+        self.port.init_conf_values()
+
+        self.assertFalse(self.port.is_dirty())
+
+    def test_copy_tracks_independently(self):
+        self.port.set_speed(100, 'transfer_conf')
+
+        port = copy.deepcopy(self.port)
+        port.set_speed(100, 'written')
+
+        self.assertTrue(self.port.is_dirty('port'))
+        self.assertFalse(port.is_dirty('port'))
+
+    def test_switch_tracks_attributes_by_feature(self):
+        sw = Switch.Switch()
+        snapshot = sw.snapshot()
+        sw.set_max_lag(4, 'transfer_conf')
+        sw.set_prompt('sw1', 'transfer_def')
+
+        self.assertEqual({'max_lag'}, sw.get_dirty('lag'))
+        self.assertEqual({'prompt'}, sw.get_dirty('mgmt'))
+        self.assertFalse(sw.is_dirty('basic_layer_3'))
+
+        sw.restore(snapshot)
+
+        self.assertFalse(sw.is_dirty())
+
+
+if __name__ == '__main__':
+    unittest.main()
+
+# vim:filetype=python:expandtab:shiftwidth=4:tabstop=4
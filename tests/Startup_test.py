@@ -0,0 +1,88 @@
+# CDDL HEADER START
+#
+# The contents of this file are subject to the terms
+# of the Common Development and Distribution License
+# (the "License").  You may not use this file except
+# in compliance with the License.
+#
+# You can obtain a copy of the license at
+# LICENSE.txt or http://opensource.org/licenses/CDDL-1.0.
+# See the License for the specific language governing
+# permissions and limitations under the License.
+#
+# When distributing Covered Code, include this CDDL
+# HEADER in each file and include the License file at
+# LICENSE.txt  If applicable,
+# add the following below this CDDL HEADER, with the
+# fields enclosed by brackets "[]" replaced with your
+# own identifying information: Portions Copyright [yyyy]
+# [name of copyright owner]
+#
+# CDDL HEADER END
+
+# Copyright 2014-2017 Extreme Networks, Inc.  All rights reserved.
+# Use is subject to license terms.
+
+# This file is part of e2x (translate EOS switch configuration to ExtremeXOS)
+
+"""Start-up time benchmark of the command line interface.
+
+Short jobs are dominated by start-up time, thus modules needed for
+interactive mode or a specific switch OS only must not be imported on
+start-up. The import time of cli is measured using 'python -X importtime'.
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                       os.pardir, 'src')
+
+# cumulative import time budget of cli in microseconds
+IMPORT_TIME_BUDGET = 120000
+# modules to import on demand only
+LAZY_MODULES = ['EOS', 'EOS_read', 'XOS', 'XOS_read', 'XOS_write',
+                'InteractiveModeHandler', 'E2XConsole', 'HowToHandler',
+                'curses', 'asyncio', 'concurrent.futures',
+                'TranslationServer', 'AsyncTranslator']
+
+
+def import_times(module):
+    """Return a dictionary of cumulative import times of module."""
+    env = dict(os.environ, PYTHONPATH=SRC_DIR)
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c',
+                           'import ' + module],
+                          env=env, stdout=subprocess.PIPE,
+                          stderr=subprocess.PIPE, universal_newlines=True,
+                          check=True)
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line.split('|')
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+class Startup_test(unittest.TestCase):
+
+    def test_lazy_modules_are_not_imported_on_startup(self):
+        times = import_times('cli')
+
+        self.assertIn('cli', times)
+        for module in LAZY_MODULES:
+            self.assertNotIn(module, times)
+
+    def test_import_time_within_budget(self):
+        best = min(import_times('cli')['cli'] for _ in range(3))
+
+        self.assertLess(best, IMPORT_TIME_BUDGET)
+
+
+if __name__ == '__main__':
+    unittest.main()
+
+# vim:filetype=python:expandtab:shiftwidth=4:tabstop=4
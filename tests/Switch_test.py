@@ -146,6 +146,21 @@ class Switch_test(unittest.TestCase):
         self.assertEqual(1, len(portList))
         self.assertEqual(port1Name, portList[0].get_name())
 
+    def test_get_ports_by_name_after_adding_ports(self):
+        self._add_ports_to_switch('ge.1.1', 'ge.1.2')
+        self.assertEqual([], self.sw.get_ports_by_name('ge.1.3'))
+        self._add_ports_to_switch('ge.1.3', 'ge.1.4')
+        self._add_lags_to_switch('lag.0.1', 'ge.1.3')
+
+        portList = self.sw.get_ports_by_name('ge.1.3')
+
+        self.assertEqual(['ge.1.3', 'ge.1.3'],
+                         [p.get_name() for p in portList])
+        self.assertEqual([self.sw._ports[2]],
+                         self.sw.get_physical_ports_by_name('ge.1.3'))
+        self.assertEqual([self.sw._lags[1]],
+                         self.sw.get_lags_by_name('ge.1.3'))
+
     def test_set_combo_using_sfp_ok(self):
         sfpList = ['ge.1.47', 'ge.1.48']
         port47Name = 'ge.1.47'
@@ -383,6 +398,47 @@ class Switch_test(unittest.TestCase):
 
         self.assertEqual(expected, result)
 
+    def test_get_lag_of_port(self):
+        lag = LAG.LAG(1, name='lag.0.1')
+        lag.add_member_port('ge.1.1')
+        self.sw.add_lag(lag)
+        lag.add_member_port('ge.1.2')
+
+        self.assertIs(lag, self.sw.get_lag_of_port('ge.1.1'))
+        self.assertIs(lag, self.sw.get_lag_of_port('ge.1.2'))
+        self.assertIsNone(self.sw.get_lag_of_port('ge.1.3'))
+        lag.remove_member_port('ge.1.1')
+        self.assertIsNone(self.sw.get_lag_of_port('ge.1.1'))
+
+    def test_get_non_master_lag_ports(self):
+        lag1, lag2 = LAG.LAG(1, name='lag.0.1'), LAG.LAG(2, name='lag.0.2')
+        self.sw.add_lag(lag1)
+        self.sw.add_lag(lag2)
+        for port_name in 'ge.1.1', 'ge.1.2', 'ge.1.3':
+            lag1.add_member_port(port_name)
+        lag2.add_member_port('ge.1.4')
+        lag2.add_member_port('ge.1.5')
+
+        self.assertEqual(['ge.1.2', 'ge.1.3', 'ge.1.5'],
+                         self.sw.get_non_master_lag_ports())
+        lag1.remove_member_port('ge.1.1')
+        self.assertEqual(['ge.1.3', 'ge.1.5'],
+                         self.sw.get_non_master_lag_ports())
+
+    def test_get_logical_ports(self):
+        data = {'type': 'rj45', 'speedrange': [1000], 'PoE': 'no'}
+        ports = [Port.Port(str(i), 'ge.1.' + str(i), data)
+                 for i in range(1, 5)]
+        self.sw._ports = ports
+        lag = LAG.LAG(1, name='lag.0.1')
+        self.sw.add_lag(lag)
+        lag.add_member_port('ge.1.2')
+        lag.add_member_port('ge.1.3')
+
+        result = self.sw.get_logical_ports()
+
+        self.assertEqual([ports[0], ports[3], lag], result)
+
     def test_set_get_max_lag_ok(self):
         reasen = 'test'
         max_lags = 2
@@ -603,6 +659,41 @@ class Switch_test(unittest.TestCase):
 
         self.assertEqual(expected, result)
 
+    def test_get_vlan_after_tag_change(self):
+        vlan2 = VLAN.VLAN(name='two', tag=2)
+        vlan3 = VLAN.VLAN(name='three', tag=3)
+        self.sw.add_vlan(vlan2)
+        self.sw.add_vlan(vlan3)
+        self.assertIs(vlan2, self.sw.get_vlan(tag=2))
+
+        self.assertTrue(self.sw.set_vlan_tag(vlan2, 4))
+
+        self.assertIsNone(self.sw.get_vlan(tag=2))
+        self.assertIs(vlan2, self.sw.get_vlan(tag=4))
+        self.assertIs(vlan2, self.sw.get_vlan(name='two', tag=4))
+        self.assertIsNone(self.sw.get_vlan(name='three', tag=4))
+
+    def test_set_vlan_tag_does_not_affect_other_switches(self):
+        other = Switch.Switch()
+        vlan2 = VLAN.VLAN(name='two', tag=2)
+        self.sw.add_vlan(vlan2)
+        other.add_vlan(VLAN.VLAN(name='two', tag=2))
+        self.assertIsNotNone(other.get_vlan(tag=2))
+
+        self.assertFalse(self.sw.set_vlan_tag(vlan2, 'x'))
+        self.sw.set_vlan_tag(vlan2, 5)
+
+        self.assertIs(vlan2, self.sw.get_vlan(tag=5))
+        self.assertEqual('two', other.get_vlan(tag=2).get_name())
+        self.assertIsNone(other.get_vlan(tag=5))
+
+    def test_get_vlan_with_duplicate_tag(self):
+        self.sw.add_vlan(VLAN.VLAN(name='one', tag=2))
+        self.sw.add_vlan(VLAN.VLAN(name='two', tag=2))
+
+        self.assertIsNone(self.sw.get_vlan(tag=2))
+        self.assertEqual('two', self.sw.get_vlan(name='two', tag=2).get_name())
+
     def test_get_all_vlans(self):
         self.sw._vlans.append(self.mockVlan1)
         expected = [self.mockVlan1]
@@ -704,6 +795,22 @@ class Switch_test(unittest.TestCase):
 
         self.assertEqual(stp, result)
 
+    def test_get_stp_by_mst_instance_after_changes(self):
+        stp1, stp2 = STP.STP(), STP.STP()
+        stp1.set_mst_instance(1, 'test')
+        stp2.set_mst_instance(2, 'test')
+        self.sw.add_stp(stp1)
+        self.sw.add_stp(stp2)
+        self.assertIs(stp1, self.sw.get_stp_by_mst_instance(1))
+
+        stp1.set_mst_instance(3, 'test')
+        self.assertIsNone(self.sw.get_stp_by_mst_instance(1))
+        self.assertIs(stp1, self.sw.get_stp_by_mst_instance(3))
+        self.sw.delete_stp_by_instance_id(2)
+        self.assertIsNone(self.sw.get_stp_by_mst_instance(2))
+        self.sw.add_stp(stp2)
+        self.assertIs(stp2, self.sw.get_stp_by_mst_instance(2))
+
     def test_delete_stp_by_instance_id_id_not_present(self):
         id = 2
         self.sw.add_stp(self.mockStp)
@@ -787,6 +894,111 @@ class Switch_test(unittest.TestCase):
         self.assertEqual(nr_of_acls, len(self.sw._acls))
         self.assertIn('ERROR', result)
 
+    def test_get_acl_by_number_and_name(self):
+        acl1, acl2 = ACL(number=1), ACL(name='test')
+        self.sw.add_complete_acl(acl1)
+        self.sw.add_complete_acl(acl2)
+        self.sw.add_complete_acl(ACL(number=1))
+
+        self.assertIs(acl1, self.sw.get_acl_by_number(1))
+        self.assertIs(acl2, self.sw.get_acl_by_name('test'))
+        self.assertIsNone(self.sw.get_acl_by_number(2))
+        self.assertIsNone(self.sw.get_acl_by_name('other'))
+
+    def test_set_acl_name_keeps_first_acl_of_a_name(self):
+        acl1, acl2 = ACL(name='a'), ACL(name='b')
+        self.sw.add_complete_acl(acl1)
+        self.sw.add_complete_acl(acl2)
+
+        self.sw.set_acl_name(acl2, 'a')
+
+        self.assertIs(acl1, self.sw.get_acl_by_name('a'))
+        self.assertIsNone(self.sw.get_acl_by_name('b'))
+
+    def test_add_many_named_acls(self):
+        names = ['acl' + str(i) for i in range(4000)]
+        for name in names:
+            self.assertEqual('', self.sw.add_acl(name=name))
+        for acl in self.sw.get_acls():
+            self.sw.set_acl_name(acl, 'acl_' + acl.get_name())
+
+        self.assertEqual(4000, len(self.sw.get_acls()))
+        self.assertEqual(4000, len(self.sw._acls_by_name))
+        self.assertIsNone(self.sw.get_acl_by_name('acl1'))
+        self.assertEqual('acl_acl3999',
+                         self.sw.get_acl_by_name('acl_acl3999').get_name())
+        self.assertIn('ERROR', self.sw.add_acl(name='acl_acl0'))
+
+    def test_get_acl_by_name_after_renaming_acl(self):
+        acl = ACL(number=1)
+        self.sw.add_complete_acl(acl)
+        self.sw.get_acl_by_name('acl_1')
+
+        self.sw.set_acl_name(acl, 'acl_1')
+
+        self.assertIs(acl, self.sw.get_acl_by_name('acl_1'))
+        self.sw.set_acl_number(acl, 2)
+        self.assertIsNone(self.sw.get_acl_by_number(1))
+        self.assertIs(acl, self.sw.get_acl_by_number(2))
+
+    #
+    # Snapshot
+    #
+    def test_restore_snapshot(self):
+        self.sw.init_conf_values()
+        self.sw.set_prompt('before', 'default')
+        snapshot = self.sw.snapshot()
+        self.sw.set_prompt('after', 'config')
+        self.sw.add_complete_acl(ACL(number=1))
+        self.sw.add_vlan(VLAN.VLAN(tag=2, switch=self.sw))
+        self.sw._cmd._state.append('router')
+
+        self.sw.restore(snapshot)
+
+        self.assertEqual('before', self.sw.get_prompt())
+        self.assertEqual([], self.sw._acls)
+        self.assertEqual([1], [v.get_tag() for v in self.sw.get_all_vlans()])
+        self.assertIs(self.sw, self.sw.get_vlan(tag=1)._switch)
+        self.assertEqual([], self.sw._cmd._state)
+
+    def test_restore_snapshot_twice(self):
+        self.sw.init_conf_values()
+        snapshot = self.sw.snapshot()
+        self.sw.restore(snapshot)
+        self.sw.get_vlan(tag=1).set_name('changed')
+
+        self.sw.restore(snapshot)
+
+        self.assertIsNone(self.sw.get_vlan(tag=1).get_name())
+
+    def test_parse_stats_report_lists_slowest_paths_first(self):
+        stats = Switch.ParseStats()
+        stats.lines = {'set vlan create': 3, 'set port vlan': 1,
+                       '(unknown)': 1}
+        stats.seconds = {'set vlan create': 0.001, 'set port vlan': 0.003,
+                         '(unknown)': 0.001}
+        stats.unknown = 1
+
+        report = stats.report()
+
+        self.assertEqual('Parse statistics: 5 lines in 5.0 ms', report[0])
+        self.assertEqual(['set port vlan', '(unknown)', 'set vlan create'],
+                         [l.split(None, 3)[3] for l in report[2:-1]])
+        self.assertIn(' 60.0 ', report[2])
+        self.assertEqual('Unknown lines: 1, ignored lines: 0, comments: 0',
+                         report[-1])
+
+    def test_parse_stats_reset(self):
+        stats = Switch.ParseStats()
+        stats.lines, stats.seconds = {'set': 1}, {'set': 0.1}
+        stats.comments = 2
+
+        stats.reset()
+
+        self.assertEqual(({}, {}, 0), (stats.lines, stats.seconds,
+                                       stats.comments))
+
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -0,0 +1,205 @@
+# CDDL HEADER START
+#
+# The contents of this file are subject to the terms
+# of the Common Development and Distribution License
+# (the "License").  You may not use this file except
+# in compliance with the License.
+#
+# You can obtain a copy of the license at
+# LICENSE.txt or http://opensource.org/licenses/CDDL-1.0.
+# See the License for the specific language governing
+# permissions and limitations under the License.
+#
+# When distributing Covered Code, include this CDDL
+# HEADER in each file and include the License file at
+# LICENSE.txt  If applicable,
+# add the following below this CDDL HEADER, with the
+# fields enclosed by brackets "[]" replaced with your
+# own identifying information: Portions Copyright [yyyy]
+# [name of copyright owner]
+#
+# CDDL HEADER END
+
+# Copyright 2014-2017 Extreme Networks, Inc.  All rights reserved.
+# Use is subject to license terms.
+# This file is part of e2x (translate EOS switch configuration to ExtremeXOS)
+
+import os
+import socket
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.extend(['../src'])
+
+import TranslationServer
+
+
+class TranslationService_test(unittest.TestCase):
+
+    def setUp(self):
+        self.service = TranslationServer.TranslationService(
+            'C5K125-48P2', 'SummitX460-48p+2sf')
+
+    def test_translate_ok(self):
+        request = {'config': 'set port disable ge.1.1\n'}
+
+        response = self.service.translate(request)
+
+        self.assertIn('disable ports 1\n', response['config'])
+        self.assertEqual({}, response['acls'])
+        self.assertFalse(response['error'])
+
+    def test_translate_acl(self):
+        request = {'config': ['router', 'enable', 'configure',
+                              'access-list 1 permit host 10.0.0.1']}
+
+        response = self.service.translate(request)
+
+        self.assertEqual(['acl_1.pol'], list(response['acls']))
+        self.assertIn('source-address 10.0.0.1/',
+                      response['acls']['acl_1.pol'])
+
+    def test_translate_unknown_model(self):
+        request = {'config': [], 'source': 'foo'}
+
+        response = self.service.translate(request)
+
+        self.assertTrue(response['error'])
+        self.assertEqual(['ERROR: Unknown switch name "foo"'],
+                         response['messages'])
+
+    def test_translate_unknown_option(self):
+        request = {'config': [], 'options': {'foo': True}}
+
+        response = self.service.translate(request)
+
+        self.assertTrue(response['error'])
+        self.assertEqual(['ERROR: Unknown option "foo"'],
+                         response['messages'])
+
+    def test_translate_options(self):
+        request = {'config': ['foo'],
+                   'options': {'keep_unknown_lines': True,
+                               'err_unknown_lines': True}}
+
+        response = self.service.translate(request)
+
+        self.assertTrue(response['config'].endswith('\nfoo\n'))
+        self.assertIn('ERROR: Ignoring unknown command "foo"',
+                      response['messages'])
+
+    def test_translate_abort_on_error(self):
+        request = {'config': ['foo'],
+                   'options': {'err_unknown_lines': True,
+                               'abort_on_error': True}}
+
+        response = self.service.translate(request)
+
+        self.assertTrue(response['error'])
+        self.assertEqual('', response['config'])
+
+    def test_translate_reuses_core_module(self):
+        self.service.translate({'config': ['set port disable ge.1.1']})
+
+        response = self.service.translate({'config': []})
+
+        self.assertNotIn('disable ports 1\n', response['config'])
+        self.assertEqual(1, sum(len(l) for l in self.service._idle.values()))
+
+    def test_idle_core_modules_are_limited_per_key(self):
+        service = TranslationServer.TranslationService(
+            'C5K125-48P2', 'SummitX460-48p+2sf', max_idle=2)
+        core_modules = [object() for _ in range(3)]
+
+        for c in core_modules:
+            service._release('key', c)
+
+        self.assertEqual(core_modules[:2], service._idle['key'])
+        self.assertIs(core_modules[1],
+                      service._acquire('key', None, None, None)[0])
+
+    def test_idle_core_modules_are_limited_to_recent_keys(self):
+        service = TranslationServer.TranslationService(
+            'C5K125-48P2', 'SummitX460-48p+2sf', max_keys=2)
+        for key in ('a', 'b', 'a'):
+            service._release(key, object())
+        service._release('c', object())
+
+        self.assertEqual(['a', 'c'], list(service._idle))
+        self.assertEqual(2, len(service._idle['a']))
+
+    def test_translate_with_other_options_keeps_recent_keys(self):
+        service = TranslationServer.TranslationService(
+            'C5K125-48P2', 'SummitX460-48p+2sf', max_keys=1)
+
+        service.translate({'config': []})
+        response = service.translate(
+            {'config': [], 'options': {'ignore_defaults': True}})
+
+        self.assertFalse(response['error'])
+        self.assertEqual(1, len(service._idle))
+
+
+class TranslationServer_test(unittest.TestCase):
+
+    def _start_server(self, address):
+        service = TranslationServer.TranslationService(
+            'C5K125-48P2', 'SummitX460-48p+2sf')
+        server = TranslationServer.create_server(address, service)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server
+
+    def test_translate_via_tcp(self):
+        server = self._start_server('127.0.0.1:0')
+        host, port = server.server_address
+        client = TranslationServer.TranslationClient(host + ':' + str(port))
+
+        response = client.translate('set port disable ge.1.1')
+
+        self.assertIn('disable ports 1\n', response['config'])
+        self.assertIn('SummitX460-48p+2sf', client.get_models()['target'])
+
+    @unittest.skipUnless(hasattr(socket, 'AF_UNIX'), 'needs Unix sockets')
+    def test_translate_via_unix_socket(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        path = os.path.join(tmpdir.name, 'e2x.sock')
+        self._start_server(path)
+        client = TranslationServer.TranslationClient(path)
+
+        response = client.translate(['set port disable ge.1.1'],
+                                    target='SummitX460-24t')
+
+        self.assertIn('disable ports 1\n', response['config'])
+
+    def test_concurrent_requests(self):
+        server = self._start_server('127.0.0.1:0')
+        host, port = server.server_address
+        client = TranslationServer.TranslationClient(host + ':' + str(port))
+        configs = ['set port alias ge.1.' + str(i) + ' port' + str(i)
+                   for i in range(1, 9)]
+        expected = [client.translate(conf) for conf in configs]
+        results = [None] * len(configs)
+
+        def translate(i):
+            results[i] = client.translate(configs[i])
+
+        threads = [threading.Thread(target=translate, args=(i,))
+                   for i in range(len(configs))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(expected, results)
+
+if __name__ == '__main__':
+    unittest.main()
+
+# vim:filetype=python:expandtab:shiftwidth=4:tabstop=4
@@ -0,0 +1,68 @@
+# CDDL HEADER START
+#
+# The contents of this file are subject to the terms
+# of the Common Development and Distribution License
+# (the "License").  You may not use this file except
+# in compliance with the License.
+#
+# You can obtain a copy of the license at
+# LICENSE.txt or http://opensource.org/licenses/CDDL-1.0.
+# See the License for the specific language governing
+# permissions and limitations under the License.
+#
+# When distributing Covered Code, include this CDDL
+# HEADER in each file and include the License file at
+# LICENSE.txt  If applicable,
+# add the following below this CDDL HEADER, with the
+# fields enclosed by brackets "[]" replaced with your
+# own identifying information: Portions Copyright [yyyy]
+# [name of copyright owner]
+#
+# CDDL HEADER END
+
+# Copyright 2014-2017 Extreme Networks, Inc.  All rights reserved.
+# Use is subject to license terms.
+
+# This file is part of e2x (translate EOS switch configuration to ExtremeXOS)
+
+"""Microbenchmark of translating commands in interactive mode.
+
+Every command line covered by the unit tests of the default pattern table
+is translated repeatedly by Translator.translate() and by the translation
+loop used before the patterns were compiled and indexed. Run it from the
+tests directory, optionally giving how often each command is translated:
+
+    python3 TranslatorBenchmark.py [COUNT]
+"""
+
+import sys
+sys.path.extend(['../src'])
+from Translator import Translator
+from Translator_test import COMMANDS, legacy_translate
+from WriterBenchmark import best_of
+
+COUNT = 20
+
+
+def main(count=COUNT):
+    tlr = Translator()
+    commands = COMMANDS * count
+    # compile the patterns of the legacy loop beforehand
+    for line in COMMANDS:
+        legacy_translate(tlr.pattern_replacements, line)
+    legacy = best_of(lambda: [legacy_translate(tlr.pattern_replacements, l)
+                              for l in commands])
+    indexed = best_of(lambda: [tlr.translate(l) for l in commands])
+    print('{} commands, {} patterns'.format(len(commands),
+                                            len(tlr.pattern_replacements)))
+    print('legacy translation loop:  {:8.2f} us/command'.format(
+        legacy / len(commands) * 1e6))
+    print('Translator.translate():   {:8.2f} us/command'.format(
+        indexed / len(commands) * 1e6))
+    print('speed-up:                 {:8.1f}x'.format(legacy / indexed))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:2]])
+
+# vim:filetype=python:expandtab:shiftwidth=4:tabstop=4
@@ -25,11 +25,85 @@
 
 # This file is part of e2x (translate EOS switch configuration to ExtremeXOS)
 
+import re
 import unittest
 import sys
 sys.path.extend(['../src'])
 
-from Translator import Translator, PatternReplacement
+from Translator import Translator, PatternReplacement, Translation
+
+# command lines covering the default pattern table, including lines
+# matched by no pattern and lines matched in the middle
+COMMANDS = [
+    'show switch 2', 'show switch', 'show arp', 'show ip arp',
+    'show ip arp vlan 10', 'show ip route connected', 'show ip route static',
+    'show ip route ospf', 'show ip route rip', 'show ip route summary',
+    'show ip route', 'show ip interface vlan 10', 'show ip interface vlan10',
+    'show ip interface loopback 1', 'show ip interface', 'reset', 'reset 2',
+    'set telnet enable all', 'set telnet disable inbound',
+    'set telnet disable outbound', 'show telnet', 'set ssh enabled',
+    'set ssh disabled', 'show ssh', 'show webview', 'show ssl',
+    'set ip address 10.0.0.1 mask 255.255.255.0 gateway 10.0.0.254',
+    'set ip address 10.0.0.1 mask 255.255.255.0', 'set ip address 10.0.0.1',
+    'show ip address', 'show config all', 'show config all port',
+    'show config', 'show config vlan', 'save config',
+    'set logging server 1 ip-addr 10.0.0.2 severity 6 state enable',
+    'show logging server', 'set port vlan ge.1.1 10 modify-egress',
+    'set port vlan ge.1.1 10', 'show port vlan', 'show port vlan ge.1.1',
+    'show vlan portinfo port ge.1.1', 'show vlan portinfo',
+    'show vlan static 10', 'show vlan 10', 'show vlan static', 'show vlan',
+    'show port status', 'show port status ge.1.1',
+    'show port negotiation ge.1.1', 'set port broadcast ge.1.1 100',
+    'show port broadcast', 'set port trap ge.1.1 enable', 'show port trap',
+    'show radius', 'show banner motd', 'show banner login',
+    'copy tftp://10.0.0.3/images/fw.bin system:image', 'dir',
+    'set boot system fw.bin', 'set logout 10', 'set logout 0', 'show logout',
+    'set system login admin super-user enable password secret',
+    'set system login admin super-user enable',
+    'set system login admin read-write disable password secret',
+    'set system login admin read-write disable',
+    'set system login guest read-only enable password secret',
+    'set system login guest read-only enable',
+    'set system login guest read-only disable password secret',
+    'set system login guest read-only disable',
+    'clear system login guest', 'show system login', 'clear config',
+    'clear config all', 'clear ip address', 'set ip protocol dhcp',
+    'show sntp', 'show time', 'show summertime', 'show version',
+    'show support', 'set sntp server 10.0.0.4 precedence 1',
+    'set sntp server 10.0.0.4', 'set sntp client disable',
+    'set sntp client broadcast', 'set sntp client unicast',
+    'set port enable ge.1.1', 'set port disable ge.1.1-4',
+    'show port egress ge.1.1', 'ip route 0.0.0.0 0.0.0.0 10.0.0.254',
+    'ip route 10.1.0.0 255.255.0.0 10.0.0.254',
+    'set time 12/24/2016 10:11:12', 'set time 10:11:12',
+    'set time 12/24/2016', 'set time', 'show mac address 00:11:22:33:44:55',
+    'show mac port ge.1.1', 'show mac fid 10', 'show mac',
+    'show spantree stats active', 'show spantree stats',
+    'show neighbors ge.1.1', 'show neighbors', 'set password admin',
+    'no access-list 100', 'set port mirroring create ge.1.1 ge.1.2',
+    'show port alias', 'show port inlinepower ge.1.1',
+    'set port alias ge.1.1 uplink', 'set vlan egress 10 ge.1.1 tagged',
+    'set port inlinepower ge.1.1 admin off',
+    'set port inlinepower ge.1.1 admin auto', 'clear port vlan ge.1.1',
+    'clear vlan egress 10 ge.1.1', 'show port transceiver ge.1.1 all',
+    'show users', 'set flowcontrol disable', 'set flowcontrol enable',
+    'SHOW SWITCH 3', 'Show Ip Route', 'please show ssl', 'presets',
+    'set vlan create 10', 'show', 'foo bar', 'ip route']
+
+
+def legacy_translate(pattern_replacements, configline):
+    """The translation loop used before patterns were indexed."""
+    configline = ' '.join(configline.strip().split())
+    transl = Translation(eos=configline)
+    for pr in pattern_replacements:
+        tl, n = re.subn(pr.pattern + r'\s*$', pr.replacement, configline,
+                        flags=re.IGNORECASE)
+        if n:
+            transl.set_hint(pr.hint)
+            transl.set_xos(tl)
+            break
+        transl.set_hint('Config line not supported for translation (yet)!')
+    return transl
 
 
 class Translator_test(unittest.TestCase):
@@ -137,6 +211,25 @@ class Translator_test(unittest.TestCase):
         self.assertEqual(configline, transl.get_xos())
         self.assertEqual(hint, transl.get_hint())
 
+    def test_translate_shouldUseFirstMatchingPatternOfTable(self):
+        tlr = Translator([PatternReplacement('show (ip )?arp', 'first'),
+                          PatternReplacement('show ip arp', 'second'),
+                          PatternReplacement('ip arp', 'third')])
+
+        self.assertEqual('first', tlr.translate('show ip arp').get_xos())
+        self.assertEqual('x third', tlr.translate('x ip arp').get_xos())
+
+    def test_translate_shouldMatchLegacyTranslationOfDefaultTable(self):
+        tlr = Translator()
+
+        for line in COMMANDS:
+            expected = legacy_translate(tlr.pattern_replacements, line)
+            transl = tlr.translate(line)
+
+            self.assertEqual((expected.get_xos(), expected.get_hint()),
+                             (transl.get_xos(), transl.get_hint()), line)
+
+
 if __name__ == '__main__':
     unittest.main()
 
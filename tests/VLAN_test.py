@@ -315,6 +315,16 @@ class VLAN_test(unittest.TestCase):
         self.assertEqual(expectedLen, len(self.vl._ingress_ports))
         self.assertEqual(expectedLen, len(self.vl._egress_ports))
 
+    def test_del_ports(self):
+        self.vl._egress_ports.extend([('p1', 'untagged'), ('p2', 'tagged'),
+                                      ('p3', 'tagged')])
+        self.vl._ingress_ports.extend([('p1', 'untagged'), ('p3', 'tagged')])
+
+        self.vl.del_ports({'p1', 'p3', 'p4'})
+
+        self.assertEqual([('p2', 'tagged')], self.vl._egress_ports)
+        self.assertEqual([], self.vl._ingress_ports)
+
     def test_del_all_ports(self):
         self.vl._egress_ports.append(('i1', 'untagged'))
         self.vl._ingress_ports.append(('e1', 'tagged'))
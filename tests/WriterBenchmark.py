@@ -0,0 +1,108 @@
+# CDDL HEADER START
+#
+# The contents of this file are subject to the terms
+# of the Common Development and Distribution License
+# (the "License").  You may not use this file except
+# in compliance with the License.
+#
+# You can obtain a copy of the license at
+# LICENSE.txt or http://opensource.org/licenses/CDDL-1.0.
+# See the License for the specific language governing
+# permissions and limitations under the License.
+#
+# When distributing Covered Code, include this CDDL
+# HEADER in each file and include the License file at
+# LICENSE.txt  If applicable,
+# add the following below this CDDL HEADER, with the
+# fields enclosed by brackets "[]" replaced with your
+# own identifying information: Portions Copyright [yyyy]
+# [name of copyright owner]
+#
+# CDDL HEADER END
+
+# Copyright 2014-2017 Extreme Networks, Inc.  All rights reserved.
+# Use is subject to license terms.
+
+# This file is part of e2x (translate EOS switch configuration to ExtremeXOS)
+
+"""Microbenchmark of writing the XOS configuration.
+
+A configuration with thousands of named VLANs and port descriptions on a
+stack is translated, and the write phase is timed, as well as the name
+and description helpers of XosConfigWriter called once per VLAN or port.
+Run it from the tests directory, optionally giving the number of VLANs:
+
+    python3 WriterBenchmark.py [VLANS]
+"""
+
+import gc
+import sys
+import time
+sys.path.extend(['../src'])
+from Scaling_test import Pipeline, stack
+
+VLANS = 4000
+UNITS = 8
+REPEAT = 5
+SOURCE = 'C5K125-48'
+TARGET = 'SummitX460-48t'
+# VLAN names cycle through plain names, XOS keywords, and special characters
+NAMES = ['data_{}', 'vlan', 'voice:{}', 'mgmt_{}', 'ports', 'guest&{}']
+
+
+def named_vlan_config(vlans, units):
+    config = []
+    for tag in range(2, vlans + 2):
+        name = NAMES[tag % len(NAMES)].format(tag)
+        config += ['set vlan create {}'.format(tag),
+                   'set vlan name {} "{}"'.format(tag, name),
+                   'set vlan egress {} ge.1.{} tagged'.format(tag,
+                                                              tag % 48 + 1)]
+    for unit in range(1, units + 1):
+        for port in range(1, 49):
+            config.append('set port alias ge.{0}.{1} "<unit {0}> port: {1}"'
+                          .format(unit, port))
+    return config
+
+
+def best_of(func, repeat=REPEAT):
+    """Return the best runtime of func in seconds, without GC."""
+    best = float('inf')
+    for _ in range(repeat):
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return best
+
+
+def main(vlans=VLANS, units=UNITS):
+    config = named_vlan_config(vlans, units)
+    write = float('inf')
+    for _ in range(REPEAT):
+        pipeline = Pipeline(stack(SOURCE, units), stack(TARGET, units),
+                            config)
+        for phase in Pipeline.PHASES[:-1]:
+            getattr(pipeline, phase)()
+        write = min(write, best_of(pipeline.write, 1))
+    writer = pipeline.cm.target._writer
+    names = [NAMES[tag % len(NAMES)].format(tag)
+             for tag in range(2, vlans + 2)]
+    keyword = best_of(lambda: [writer._is_exos_keyword(n) for n in names])
+    replace = best_of(lambda: [writer._replace_special_characters(n)
+                               for n in names])
+    print('{} named VLANs, {} port descriptions'.format(vlans, units * 48))
+    print('write phase:                  {:8.2f} ms'.format(write * 1e3))
+    print('_is_exos_keyword:             {:8.3f} us/call'.format(
+        keyword / vlans * 1e6))
+    print('_replace_special_characters:  {:8.3f} us/call'.format(
+        replace / vlans * 1e6))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:2]])
+
+# vim:filetype=python:expandtab:shiftwidth=4:tabstop=4
@@ -40,7 +40,7 @@ import STP
 from ACL import ACL
 from ACL import ACE
 
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 
 class XosConfigWriter_test(unittest.TestCase):
@@ -116,6 +116,12 @@ class XosConfigWriter_test(unittest.TestCase):
         self.lag = LAG.LAG(1, name='lag1', use_lacp=True, aadminkey=100)
         self.stp = STP.STP()
 
+    def _set_basic_stp_config(self, is_basic):
+        patcher = patch.object(STP.STP, 'is_basic_stp_config',
+                               return_value=is_basic)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
     def test_port_ok_reason_is_default(self):
         reason = 'default'
         expectedConf = [self.confPortsDisplStr,
@@ -694,7 +700,9 @@ class XosConfigWriter_test(unittest.TestCase):
         self.assertEqual(exp, result)
 
     def test_get_all_non_master_lag_ports_only_one_port_in_lag(self):
-        self.mockSwitch.get_lags.return_value = [self.mockLag]
+        self.cw._switch = self._create_tmp_switch()
+        self.cw._switch.add_lag(self.lag)
+        self.lag.add_member_port(self.portName)
 
         result = self.cw._get_all_non_master_lag_ports()
 
@@ -702,7 +710,8 @@ class XosConfigWriter_test(unittest.TestCase):
 
     def test_get_all_non_master_lag_ports_two_ports_in_lag(self):
         nonMasterPortName = 'ge.1.2'
-        self.mockSwitch.get_lags.return_value = [self.lag]
+        self.cw._switch = self._create_tmp_switch()
+        self.cw._switch.add_lag(self.lag)
         self.lag.add_member_port(self.portName)
         self.lag.add_member_port(nonMasterPortName)
 
@@ -857,7 +866,7 @@ class XosConfigWriter_test(unittest.TestCase):
         self.stp.set_name('s0', 'test')
         self.stp.set_enabled(True, 'test')
         self.stp.set_version('mstp', 'test')
-        self.stp.is_basic_stp_config = MagicMock(return_value=True)
+        self._set_basic_stp_config(True)
 
         expErrLst = [self.InfoStart + 'Creating XOS equivalent of EOS ' +
                      'default MSTP respectively RSTP configuration']
@@ -884,7 +893,7 @@ class XosConfigWriter_test(unittest.TestCase):
         self.stp.set_enabled(True, 'test')
         self.stp.set_version('mstp', 'test')
         self.stp.set_priority(100, 'transfer_conf')
-        self.stp.is_basic_stp_config = MagicMock(return_value=True)
+        self._set_basic_stp_config(True)
 
         expErrLst = [self.InfoStart + 'Creating XOS equivalent of EOS ' +
                      'default MSTP respectively RSTP configuration']
@@ -910,7 +919,7 @@ class XosConfigWriter_test(unittest.TestCase):
         self.stp.set_name('s0', 'test')
         self.stp.set_enabled(True, 'test')
         self.stp.set_version('mstp', 'test')
-        self.stp.is_basic_stp_config = MagicMock(return_value=False)
+        self._set_basic_stp_config(False)
 
         expErrLst = [self.errXosNeedsOneInstance,
                      self.errNoVlansAssoc,
@@ -929,7 +938,7 @@ class XosConfigWriter_test(unittest.TestCase):
         self.mockSwitch.get_stps.return_value = [self.stp]
         self.stp.set_name('s0', 'test')
         self.stp.set_enabled(False, 'test')
-        self.stp.is_basic_stp_config = MagicMock(return_value=False)
+        self._set_basic_stp_config(False)
 
         expErrLst = []
         expConf = []
@@ -1051,7 +1060,7 @@ class XosConfigWriter_test(unittest.TestCase):
         self.stp.set_name('s0', 'test')
         self.stp.set_version('stp', 'transfer_def')
         self.stp.set_enabled(True, 'test')
-        self.stp.is_basic_stp_config = MagicMock(return_value=False)
+        self._set_basic_stp_config(False)
         expErrLst = [self.errXosNeedsOneInstance,
                      self.errNoVlansAssoc,
                      self.warnDefVlanNotInInstance]
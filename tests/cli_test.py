@@ -25,11 +25,18 @@
 
 # This file is part of e2x (translate EOS switch configuration to ExtremeXOS)
 
+import json
+import os
 import sys
+import tempfile
 sys.path.extend(['../src'])
 import unittest
 from unittest import mock
 import cli
+from Messages import Message
+
+# imported by cli on demand only
+INT_MODE_HANDLER = 'InteractiveModeHandler.InteractiveModeHandler'
 
 
 class args:
@@ -40,12 +47,26 @@ class args:
     keep_unknown_lines = True
     comment_unknown_lines = True
     disable_unused_ports = True
+    optimize_acls = False
+    jobs = 1
+    parse_stats = False
+    diff_against = None
+    export_model = None
+    log_level = 'NOTICE'
+    messages_as_comments = False
+    err_warnings = False
+    err_unknown_lines = False
     mgmt_port = False
     source = ""
     target = ""
+    sfp_list = None
+    serve = None
+    save_model = None
+    load_model = None
+    translate_commands = False
 
 
-def parse():
+def parse(*_):
     return args
 
 
@@ -55,7 +76,7 @@ class cli_test(unittest.TestCase):
     def test_shouldNotSwitchToInteractiveMode(self, mock_function):
         args.interactive = False
 
-        with mock.patch('cli.InteractiveModeHandler.run') as int_int_run:
+        with mock.patch(INT_MODE_HANDLER + '.run') as int_int_run:
 
             cli.main('')
 
@@ -64,7 +85,7 @@ class cli_test(unittest.TestCase):
     @mock.patch('cli.CommandLineParser.parse', side_effect=parse)
     def test_shouldSwitchToInteractiveModeAndReturnZero(self, mock_function):
         args.interactive = True
-        with mock.patch('cli.InteractiveModeHandler.run') as int_int_run:
+        with mock.patch(INT_MODE_HANDLER + '.run') as int_int_run:
             int_int_run.return_value = 0
 
             ret = cli.main('')
@@ -77,7 +98,7 @@ class cli_test(unittest.TestCase):
                                                             mock_function):
         args.interactive = True
         expected = "--interactive -D"
-        with mock.patch('cli.InteractiveModeHandler') as int_int:
+        with mock.patch(INT_MODE_HANDLER) as int_int:
 
             cli.main(expected.split())
 
@@ -85,6 +106,335 @@ class cli_test(unittest.TestCase):
                                             progver=cli.progver)
 
 
+class messages_test(unittest.TestCase):
+
+    def setUp(self):
+        self.messages = cli.normalize_messages([
+            'DEBUG: Macro expansion of: foo\nNOTICE: Ignoring unknown '
+            'command "foo"',
+            Message('INFO', 'Port "{}" not mapped', 'ge.1.1'),
+            'WARN: Could not map port ge.1.2',
+            ''])
+
+    def test_normalize_messages(self):
+        self.assertEqual(['DEBUG', 'NOTICE', 'INFO', 'WARN'],
+                         [m.level for m in self.messages])
+        self.assertEqual('Ignoring unknown command "foo"',
+                         self.messages[1].text)
+
+    def test_filter_messages(self):
+        result = list(cli.filter_messages(self.messages, 'NOTICE'))
+
+        self.assertEqual(['NOTICE: Ignoring unknown command "foo"',
+                          'WARN: Could not map port ge.1.2'],
+                         [str(m) for m in result])
+
+    def test_unknown_to_error(self):
+        result = cli.unknown_to_error(self.messages)
+
+        self.assertEqual(['DEBUG', 'ERROR', 'INFO', 'WARN'],
+                         [m.level for m in result])
+        self.assertEqual('ERROR: Ignoring unknown command "foo"', result[1])
+
+    def test_warn_to_error(self):
+        result = cli.warn_to_error(self.messages)
+
+        self.assertEqual(['DEBUG', 'NOTICE', 'INFO', 'ERROR'],
+                         [m.level for m in result])
+
+    def test_translation_log_level(self):
+        self.assertEqual('NOTICE', cli.translation_log_level('NOTICE'))
+        self.assertEqual('WARN', cli.translation_log_level(
+            'ERROR', err_warnings=True))
+        self.assertEqual('NOTICE', cli.translation_log_level(
+            'ERROR', err_warnings=True, err_unknown_lines=True))
+        self.assertEqual('INFO', cli.translation_log_level(
+            'ERROR', messages_as_comments=True))
+        self.assertEqual('DEBUG', cli.translation_log_level(
+            'DEBUG', messages_as_comments=True, debug=True))
+
+
+class write_acl_files_test(unittest.TestCase):
+
+    def setUp(self):
+        self.acl_list = [('acl_' + str(n) + '.pol', 'entry ' + str(n))
+                         for n in range(1, 21)]
+
+    def check_files(self, acl_dir, messages):
+        expected = ['NOTICE: Writing translated ACL file "' + acl_dir +
+                    '/' + name + '"' for name, _ in self.acl_list]
+        self.assertEqual(expected, messages)
+        for name, policy in self.acl_list:
+            with open(acl_dir + '/' + name) as f:
+                self.assertEqual(policy + '\n', f.read())
+
+    def test_write_acl_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            acl_dir = os.path.join(tmp, 'config.acls')
+
+            messages = cli.write_acl_files(acl_dir, self.acl_list)
+
+            self.check_files(acl_dir, messages)
+
+    def test_write_acl_files_using_executor(self):
+        import concurrent.futures
+        with tempfile.TemporaryDirectory() as tmp:
+            acl_dir = os.path.join(tmp, 'config.acls')
+            os.mkdir(acl_dir)
+
+            with concurrent.futures.ThreadPoolExecutor(4) as pool:
+                messages = cli.write_acl_files(acl_dir, self.acl_list, pool)
+
+            self.check_files(acl_dir, messages)
+
+    def test_write_acl_files_without_acls(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            acl_dir = os.path.join(tmp, 'config.acls')
+
+            self.assertEqual([], cli.write_acl_files(acl_dir, []))
+            self.assertFalse(os.path.exists(acl_dir))
+
+
+
+class multi_target_test(unittest.TestCase):
+
+    def setUp(self):
+        self.target = mock.Mock()
+        self.target.get_os.return_value = 'XOS'
+        self.target.get_model.return_value = 'SummitX460-24t'
+
+    def test_output_name(self):
+        self.assertEqual('sw.xsf', cli.output_name('in/sw.cfg', self.target))
+        self.assertEqual('-', cli.output_name('-', self.target))
+        self.assertEqual('out/x.cfg',
+                         cli.output_name('sw.cfg', self.target, 'x.cfg',
+                                         'out'))
+
+    def test_output_name_multi_target(self):
+        self.target.get_model.return_value = 'SummitX460-24t,SummitX460-24t'
+
+        self.assertEqual('sw.SummitX460-24t_SummitX460-24t.xsf',
+                         cli.output_name('sw.cfg', self.target,
+                                         multi_target=True))
+        self.assertEqual('-', cli.output_name('-', self.target,
+                                              multi_target=True))
+
+    def test_target_summary(self):
+        messages = cli.normalize_messages([
+            'WARN: Could not map port ge.1.25',
+            'ERROR: LAG "lag.0.1" is configured, but not mapped to target '
+            'switch',
+            'NOTICE: Port "25" of target switch is not used',
+            'WARN: XOS does not support automatic edge port detection'])
+
+        summary = cli.target_summary('SummitX460-24t', messages)
+
+        self.assertEqual('NOTICE: Target "SummitX460-24t": 1 errors, 2 '
+                         'warnings, 2 ports or LAGs not mapped, 1 target '
+                         'ports not used', str(summary))
+
+
+class translate_commands_test(unittest.TestCase):
+
+    RUNBOOK = ['show switch 1', '! check routes', '', 'show ip  route',
+               'set telnet disable outbound', 'foo bar']
+    EXPECTED = ['show slot 1', '# check routes', '', 'show iproute',
+                '# set telnet disable outbound',
+                '# Outbound telnet cannot be disabled on XOS (always '
+                'enabled)',
+                '# foo bar',
+                '# Config line not supported for translation (yet)!']
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _write_runbook(self, name):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, 'w') as f:
+            f.write('\n'.join(self.RUNBOOK) + '\n')
+        return path
+
+    def _read(self, path):
+        with open(path) as f:
+            return f.read().split('\n')[:-1]
+
+    def test_translate_commands(self):
+        infile = self._write_runbook('runbook.txt')
+        outname = infile + '.xsf'
+
+        messages, unsupported = cli.translate_commands([infile], outname,
+                                                       chunk_size=2)
+
+        self.assertEqual(self.EXPECTED, self._read(outname))
+        self.assertEqual(1, unsupported)
+        self.assertEqual(['NOTICE: Writing translated commands to file "' +
+                          outname + '"',
+                          'WARN: 1 of 4 commands in "' + infile +
+                          '" not translated'], [str(m) for m in messages])
+
+    def test_translate_commands_fails_for_missing_file(self):
+        infile = os.path.join(self.tmp.name, 'missing.txt')
+
+        messages, unsupported = cli.translate_commands([infile], '-')
+
+        self.assertEqual(1, len(messages))
+        self.assertEqual('ERROR', messages[0].level)
+
+    def _translate_command_files(self, jobs):
+        files = [self._write_runbook('a.txt'), self._write_runbook('b.txt')]
+        cmd_args = mock.Mock(FILE=files, outfile=None, outdir=self.tmp.name,
+                             jobs=jobs, err_unknown_lines=True,
+                             log_level='ERROR')
+
+        with mock.patch('sys.stderr'):
+            result = cli.translate_command_files(cmd_args)
+
+        self.assertEqual(1, result)
+        for f in files:
+            self.assertEqual(self.EXPECTED, self._read(f + '.xsf'))
+
+    def test_translate_command_files(self):
+        self._translate_command_files(1)
+
+    def test_translate_command_files_with_jobs(self):
+        self._translate_command_files(2)
+
+    def test_translate_command_files_to_one_outfile_serially(self):
+        files = [self._write_runbook('a.txt'), self._write_runbook('b.txt')]
+        cmd_args = mock.Mock(FILE=files, outfile='out.xsf',
+                             outdir=self.tmp.name, jobs=2,
+                             err_unknown_lines=False, log_level='NOTICE')
+        outname = self.tmp.name + '/out.xsf'
+        messages = []
+
+        with mock.patch('concurrent.futures.ProcessPoolExecutor') as pool:
+            result = cli.translate_command_files(cmd_args,
+                                                 report=messages.append)
+
+        self.assertEqual(0, result)
+        pool.assert_not_called()
+        self.assertEqual(self.EXPECTED * 2, self._read(outname))
+        self.assertEqual(['NOTICE: Writing translated commands to file "' +
+                          outname + '"'],
+                         [str(m) for m in messages
+                          if m.level == 'NOTICE'])
+
+
+class run_test(unittest.TestCase):
+
+    SWITCHES = ['--source', 'C5K125-48P2', '--target', 'SummitX460-48p+2sf']
+    CONFIG = ('set vlan create 10\n'
+              'router\nenable\nconfigure\n'
+              'access-list 1 permit host 55.1.2.3\n'
+              'exit\nexit\nexit\n')
+
+    def setUp(self):
+        self.addCleanup(cli._run_core_modules.clear)
+
+    def test_run_honours_arguments(self):
+        result = cli.run(['--version'])
+
+        self.assertEqual(0, result.status)
+        self.assertEqual(cli.progname + ' ' + cli.progver + '\n',
+                         result.stdout)
+        self.assertEqual(2, cli.run(['--no-such-option']).status)
+
+    def test_run_reads_and_writes_memory_files(self):
+        fs = cli.MemoryFS({'in/switch.cfg': self.CONFIG})
+
+        result = cli.run(self.SWITCHES + ['in/switch.cfg'], fs=fs)
+
+        self.assertEqual(0, result.status)
+        self.assertEqual('', result.stdout)
+        self.assertEqual(['switch.xsf', os.path.join('switch.acls',
+                                                     'acl_1.pol')],
+                         list(result.files))
+        self.assertIn('create vlan VLAN_0010', result.files['switch.xsf'])
+        self.assertEqual({p: fs.files[p] for p in result.files},
+                         result.files)
+        self.assertIn(Message('NOTICE', 'Writing translated configuration to'
+                              ' file "{}"', 'switch.xsf'),
+                      result.messages)
+        self.assertEqual(''.join(str(m) + '\n' for m in result.messages),
+                         result.stderr)
+
+    def test_run_writes_acl_files(self):
+        fs = cli.MemoryFS({'switch.cfg': self.CONFIG})
+
+        result = cli.run(self.SWITCHES + ['switch.cfg'], fs=fs)
+
+        self.assertEqual(0, result.status)
+        self.assertIn(os.path.join('switch.acls', 'acl_1.pol'), result.files)
+
+    def test_run_reads_stdin(self):
+        result = cli.run(self.SWITCHES, stdin=self.CONFIG)
+
+        self.assertEqual(0, result.status)
+        self.assertIn('create vlan VLAN_0010', result.stdout)
+        self.assertEqual({}, result.files)
+
+    def test_run_fails_for_missing_file(self):
+        with self.assertRaises(FileNotFoundError):
+            cli.run(self.SWITCHES + ['missing.cfg'])
+
+    def test_run_writes_config_diff(self):
+        fs = cli.MemoryFS({'old.cfg': self.CONFIG,
+                           'new.cfg': 'set vlan create 10,20\n'})
+
+        result = cli.run(self.SWITCHES + ['--diff-against', 'old.cfg',
+                                          'new.cfg'], fs=fs)
+        both = cli.run(self.SWITCHES + ['--diff-against', 'old.cfg',
+                                        '--target', 'SummitX460-24t',
+                                        'new.cfg'], fs=fs)
+
+        self.assertEqual(0, result.status)
+        self.assertEqual(['new.xsf'], list(result.files))
+        self.assertIn('create vlan VLAN_0020 tag 20\n',
+                      result.files['new.xsf'])
+        self.assertIn('rm acl_1.pol\n', result.files['new.xsf'])
+        self.assertNotIn('VLAN_0010', result.files['new.xsf'])
+        self.assertEqual(1, both.status)
+
+    def test_run_exports_target_model(self):
+        fs = cli.MemoryFS({'switch.cfg': self.CONFIG})
+
+        result = cli.run(self.SWITCHES + ['--export-model', 'json',
+                                          'switch.cfg'], fs=fs)
+        to_stdout = cli.run(self.SWITCHES + ['--export-model', 'json'],
+                            stdin=self.CONFIG)
+
+        self.assertEqual(0, result.status)
+        model = json.loads(result.files['switch.json'])
+        self.assertIn(10, [v['tag'] for v in model['vlans']])
+        self.assertIn(Message('NOTICE', 'Writing target switch model to '
+                              'file "{}"', 'switch.json'), result.messages)
+        self.assertEqual(1, to_stdout.status)
+
+    def test_run_prints_parse_stats(self):
+        result = cli.run(self.SWITCHES + ['--parse-stats'], stdin=self.CONFIG)
+        again = cli.run(self.SWITCHES + ['--parse-stats'],
+                        stdin='set vlan create 20\n')
+
+        self.assertEqual(0, result.status)
+        self.assertIn('Parse statistics: 8 lines in ', result.stderr)
+        self.assertRegex(result.stderr, r'\n +[0-9.]+ +[0-9.]+ +1  '
+                                        r'access-list\n')
+        self.assertIn('Parse statistics: 1 lines in ', again.stderr)
+
+    def test_run_reuses_core_module(self):
+        first = cli.run(self.SWITCHES, stdin=self.CONFIG)
+        core_modules = list(cli._run_core_modules.values())
+        second = cli.run(self.SWITCHES, stdin='set vlan create 20\n')
+        third = cli.run(self.SWITCHES, stdin=self.CONFIG)
+
+        self.assertEqual(1, len(core_modules))
+        self.assertEqual(core_modules, list(cli._run_core_modules.values()))
+        self.assertIn('VLAN_0020', second.stdout)
+        self.assertNotIn('VLAN_0010', second.stdout)
+        self.assertEqual(first, third)
+
+
 if __name__ == '__main__':
     unittest.main(buffer=True)
 
@@ -84,14 +84,14 @@ class Mapping_test(unittest.TestCase):
         self.cm = CM.CoreModule()
 
     def __listContainsLinesStartingWith(self, startStr, strList):
-        for line in strList:
+        for line in map(str, strList):
             if line.startswith(startStr):
                 return True
         return False
 
     def __mappingInfoNoticesEqualMappingDict(self, strList, mappingDict):
         noticeDict = {}
-        for line in strList:
+        for line in map(str, strList):
             # Example: NOTICE: Mapping port "tg.1.25" to port "51"
             if (line.startswith(self.MappingNoticeStart) or
                     line.startswith(self.MappingInfoStart)):
@@ -103,7 +103,7 @@ class Mapping_test(unittest.TestCase):
 
     def __unusedPortNoticesEqualList(self, strList, unusedPortsList):
         noticeList = []
-        for line in strList:
+        for line in map(str, strList):
             # Example: NOTICE: Port "49" of target switch is not used
             if (line.startswith(self.UnusedPortStart) and
                     line.endswith(self.UnusedPortEnd)):
@@ -112,7 +112,7 @@ class Mapping_test(unittest.TestCase):
 
     def __unmappedPortWarningsEqualList(self, strList, unmappedPorts):
         warnList = []
-        for line in strList:
+        for line in map(str, strList):
             # Example: WARN: Could not map port tg.1.49
             if line.startswith(self.UnmappedPortStart):
                 warnList.append(line.split()[-1])
@@ -884,6 +884,224 @@ class Translation_test(unittest.TestCase):
         for exp in messages:
             self.assertIn(exp, err)
 
+    def test_translate_twice_without_carrying_over_config(self):
+        configured = ['set port disable ge.1.1',
+                      'set spantree disable',
+                      'set logging server 1 ip-addr 10.0.0.1 state enable',
+                      'router', 'enable', 'configure',
+                      'access-list 1 permit host 10.0.0.1']
+        unconfigured = ['set port alias ge.1.2 foo']
+        self.cm.set_source_switch('C5K125-48P2')
+        self.cm.set_target_switch('SummitX460-48p+2sf')
+        expected = self.cm.translate(unconfigured)
+
+        self.cm.translate(configured)
+        result = self.cm.translate(unconfigured)
+
+        self.assertEqual(expected, result)
+
+    def test_translate_with_acl_optimization(self):
+        config = ['router', 'enable', 'configure',
+                  'access-list 1 permit 10.0.0.0 0.0.0.127',
+                  'access-list 1 permit 10.0.0.128 0.0.0.127',
+                  'access-list 1 deny host 10.0.0.1']
+        self.cm.set_source_switch('C5K125-48P2')
+        self.cm.set_target_switch('SummitX460-48p+2sf')
+        self.cm.enable_acl_optimization()
+
+        expected = ['acl_1', 'entry 10 {\n  if {\n    source-address'
+                    ' 10.0.0.0/255.255.255.0;\n  } then {\n    permit;'
+                    '\n  }\n}\n',
+                    self.acl_deny_any]
+
+        translation, messages = self.cm.translate(config)
+
+        self.assertIn(expected, translation)
+        self.assertIn('NOTICE: Optimized ACL "1" from 3 to 1 entries',
+                      messages)
+
+    def test_translate_with_log_level(self):
+        config = ['set vlan create 10', 'set vlan egress 10 ge.1.1 tagged']
+        self.cm.set_source_switch('C5K125-48P2')
+        self.cm.set_target_switch('SummitX460-48p+2sf')
+        self.cm.set_log_level('NOTICE')
+
+        translation, messages = self.cm.translate(config)
+
+        self.assertIn('configure vlan VLAN_0010 add ports 1 tagged',
+                      translation)
+        self.assertTrue(messages)
+        self.assertEqual([], [m for m in messages
+                              if m.level in ('DEBUG', 'INFO')])
+
+    def test_translate_messages_are_records(self):
+        config = ['set vlan create 10', 'set vlan egress 10 ge.1.1 tagged']
+        self.cm.set_source_switch('C5K125-48P2')
+        self.cm.set_target_switch('SummitX460-48p+2sf')
+
+        translation, messages = self.cm.translate(config)
+
+        self.assertIn('DEBUG: Ports shadowed by LAGs: []', messages)
+        self.assertIn('INFO: Mapping port "ge.1.1" to port "1"', messages)
+        self.assertLessEqual({'DEBUG', 'INFO', 'NOTICE'},
+                             {m.level for m in messages})
+
+    def _multi_target_config(self):
+        return ['set port jumbo disable *.*.*',
+                'set vlan create 10,20',
+                'set vlan name 10 DATA',
+                'set port vlan ge.1.1-10 10 modify-egress',
+                'set vlan egress 20 ge.1.1-16 tagged',
+                'set port alias ge.1.1 "uplink"',
+                'set lacp aadminkey lag.0.1 100',
+                'set port lacp port ge.1.11-12 aadminkey 100',
+                'set port lacp port ge.1.11-12 enable',
+                'set spantree version rstp',
+                'set snmp group company security-model v1',
+                'router', 'enable', 'configure',
+                'access-list 1 permit host 10.0.0.1',
+                'exit', 'exit']
+
+    def _check_translate_targets(self, jobs):
+        targets = ['SummitX460-48p+2sf', 'SummitX460-24t',
+                   'SummitX460-48p+2sf,SummitX460-48p+2sf']
+        config = self._multi_target_config()
+        expected = []
+        for target in targets:
+            cm = CM.CoreModule()
+            cm.enable_copy_unknown()
+            cm.enable_comment_unknown()
+            cm.set_source_switch('C5K125-48P2')
+            cm.set_target_switch(target)
+            expected.append(cm.translate(config))
+        self.cm.enable_copy_unknown()
+        self.cm.enable_comment_unknown()
+        self.cm.set_source_switch('C5K125-48P2')
+        self.cm.set_target_switches(targets)
+        self.cm.set_jobs(jobs)
+
+        result = self.cm.translate_targets(config)
+        again = self.cm.translate_targets(config)
+
+        self.assertEqual(expected, result)
+        self.assertEqual(expected, again)
+        self.assertNotEqual(result[0], result[1])
+
+    def test_translate_targets(self):
+        self._check_translate_targets(1)
+
+    def test_translate_targets_with_jobs(self):
+        self._check_translate_targets(2)
+
+    def _translate_diff(self, old_config, config):
+        self.cm.set_source_switch('C5K125-48P2')
+        self.cm.set_target_switch('SummitX460-48p+2sf')
+        return self.cm.translate_diff(old_config, config)
+
+    def test_translate_diff_of_same_config_is_empty(self):
+        config = ['set vlan create 10', 'set vlan name 10 data',
+                  'set vlan egress 10 ge.1.1 untagged',
+                  'set port vlan ge.1.1 10', 'set port disable ge.1.7']
+
+        diff, err = self._translate_diff(config, config)
+
+        self.assertEqual([], diff)
+        self.assertIn('INFO: No configuration changes', err)
+
+    def test_translate_diff_vlans(self):
+        old_config = ['set vlan create 10,20,30', 'set vlan name 10 data',
+                      'set vlan egress 10 ge.1.1-4 untagged',
+                      'set vlan egress 20 ge.1.5 untagged',
+                      'set port vlan ge.1.1-4 10', 'set port vlan ge.1.5 20',
+                      'set vlan egress 30 ge.1.10 tagged']
+        config = ['set vlan create 10,20,40', 'set vlan name 10 clients',
+                  'set vlan egress 10 ge.1.1-3 untagged',
+                  'set vlan egress 20 ge.1.4-5 untagged',
+                  'set port vlan ge.1.1-3 10', 'set port vlan ge.1.4-5 20',
+                  'set vlan egress 40 ge.1.10 tagged']
+        expected = ['delete vlan VLAN_0030',
+                    'configure vlan data name clients',
+                    'configure vlan clients delete ports 4',
+                    'create vlan VLAN_0040 tag 40',
+                    'configure vlan VLAN_0020 add ports 4 untagged',
+                    'configure vlan VLAN_0040 add ports 10 tagged',
+                    'enable stpd s1 auto-bind vlan VLAN_0040']
+
+        diff, err = self._translate_diff(old_config, config)
+
+        self.assertEqual(expected, diff)
+
+    def test_translate_diff_ports(self):
+        old_config = ['set port disable ge.1.7',
+                      'set port alias ge.1.2 printer',
+                      'set port alias ge.1.3 scanner']
+        config = ['set port alias ge.1.2 copier',
+                  'set port jumbo disable ge.1.4']
+        expected = ['configure ports 2 display-string copier',
+                    'configure ports 2 description-string "copier"',
+                    'unconfigure ports 3 display-string',
+                    'unconfigure ports 3 description-string',
+                    'disable jumbo-frame ports 4',
+                    'enable ports 7']
+
+        diff, err = self._translate_diff(old_config, config)
+
+        self.assertEqual(expected, diff)
+
+    def test_translate_diff_lags(self):
+        old_config = ['set lacp static lag.0.1 key 100 ge.1.1-2']
+        config = ['set lacp static lag.0.1 key 100 ge.1.1-3']
+        expected = ['disable sharing 1',
+                    'enable sharing 1 grouping 1-3 algorithm address-based L3',
+                    'configure vlan Default delete ports 3']
+
+        diff, err = self._translate_diff(old_config, config)
+
+        self.assertEqual(expected, diff)
+
+    def test_translate_diff_acls(self):
+        acl = ['set vlan create 10', 'router', 'enable', 'configure',
+               'access-list 1 permit host 10.0.0.1', 'interface vlan 10',
+               'ip access-group 1 in', 'exit', 'exit', 'exit', 'exit']
+        changed_acl = [l.replace('10.0.0.1', '10.0.0.2') for l in acl]
+        expected_policy = [
+            'acl_1', 'entry 10 {\n  if {\n    source-address '
+            '10.0.0.2/255.255.255.255;\n  } then {\n    permit;\n  }\n}\n',
+            self.acl_deny_any]
+
+        changed, err = self._translate_diff(acl, changed_acl)
+        removed, err = self._translate_diff(acl, acl[:1])
+
+        self.assertEqual([expected_policy, 'refresh policy acl_1'], changed)
+        self.assertEqual(['unconfigure access-list acl_1 vlan VLAN_0010 '
+                          'ingress', 'rm acl_1.pol'], removed)
+
+    def test_translate_diff_mgmt_servers(self):
+        old_config = ['set logging server 1 ip-addr 10.0.0.1 state enable',
+                      'set sntp server 10.0.0.5']
+        config = ['set logging server 1 ip-addr 10.0.0.2 state enable',
+                  'set sntp server 10.0.0.5']
+        expected = ['configure syslog delete 10.0.0.1:514 local4',
+                    'configure syslog add 10.0.0.2:514 local4',
+                    'configure log target syslog 10.0.0.2:514 local4 '
+                    'severity debug-data',
+                    'enable log target syslog 10.0.0.2:514 local4']
+
+        diff, err = self._translate_diff(old_config, config)
+
+        self.assertEqual(expected, diff)
+
+    def test_set_target_switches_fails_for_unknown_model(self):
+        self.cm.set_target_switch('SummitX460-24t')
+
+        ret, err = self.cm.set_target_switches(['SummitX460-48p+2sf',
+                                                'no-such-switch'])
+
+        self.assertFalse(ret)
+        self.assertIn('no-such-switch', err)
+        self.assertEqual('SummitX460-24t', self.cm.target.get_model())
+
+
 if __name__ == '__main__':
     unittest.main()
 